@@ -15,3 +15,8 @@ class Reader:
         """OCR 결과 스텁 반환. Return stub OCR results."""
 
         return []
+
+    def readtext_batched(self, images: Sequence[object], **_: object) -> List[List[Tuple[None, str, float]]]:
+        """배치 OCR 결과 스텁 반환. Return stub batched OCR results."""
+
+        return [[] for _ in images]
@@ -5,22 +5,47 @@ Playwright 기반 비동기 스크래핑 및 MACHO-GPT AI 통합
 
 import asyncio
 import hashlib
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from playwright.async_api import Browser, BrowserContext, Locator, Page
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Browser, BrowserContext, Page
 from playwright.async_api import async_playwright
 
+from ..core.chat_index import CHAT_INDEX, ChatIndex, open_chat
+from ..core.columnar_sink import DEFAULT_PARQUET_ROOT, ParquetMessageSink
+from ..core.history_backfill import (
+    DEFAULT_CHECKPOINT_DIR,
+    BackfillResult,
+    HistoryBackfill,
+    parse_pre_plain_text,
+)
+from ..core.message_search import DEFAULT_SEARCH_DB, MessageSearchIndex
+from ..core.metrics import METRICS, ScraperMetrics, chromium_rss_bytes
+from ..core.persistence import JSON_WRITER, JsonWriter
+from ..core.pii_sanitizer import PIISanitizer
+from ..core.resource_filter import ResourceFilter
+from ..core.selector_resolver import SELECTOR_RESOLVER, SelectorResolver
+from .browser_pool import BrowserPool, BrowserSlot, PageHealth, launch_browser_slot, probe_page
 from .enhancements import LoadingOptimizer, StealthFeatures
+from .page_watchdog import PageWatchdog, WatchdogPolicy
 from .group_config import GroupConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _message_key(sender: str, text: str, timestamp: Optional[str]) -> str:
+    """중복 판별 키/Dedupe key shared by live scraping and history backfill.
+
+    ``timestamp`` is the ISO send time when known, so the same text sent at
+    the same clock time on another day is not treated as a duplicate.
+    """
+
+    # textContent/innerText 공백 차이를 흡수
+    return f"{sender}_{' '.join(text.split())}_{timestamp}"
+
+
 class AsyncGroupScraper:
     """
     비동기 단일 그룹 WhatsApp 스크래퍼
@@ -40,6 +65,9 @@ class AsyncGroupScraper:
         timeout: int = 30000,
         ai_integration: Optional[Dict[str, Any]] = None,
         enhancements: Optional[Dict[str, Any]] = None,
+        metrics: Optional[ScraperMetrics] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        json_writer: Optional[JsonWriter] = None,
     ):
         """
         Args:
@@ -49,6 +77,9 @@ class AsyncGroupScraper:
             timeout: 타임아웃 (ms)
             ai_integration: AI 통합 설정
             enhancements: Enhancement 설정
+            metrics: 단계별 메트릭 수집기 (기본: 전역 METRICS)
+            browser_pool: 장애 시 교체할 대기 브라우저 풀
+            json_writer: JSON 저장 스레드 (기본: 전역 JSON_WRITER)
         """
         self.group_config = group_config
         self.chrome_data_dir = chrome_data_dir
@@ -56,6 +87,18 @@ class AsyncGroupScraper:
         self.timeout = timeout
         self.ai_integration = ai_integration or {}
         self.enhancements = enhancements or {}
+        self.metrics = metrics if metrics is not None else METRICS
+        self.browser_pool = browser_pool
+        self.json_writer = json_writer if json_writer is not None else JSON_WRITER
+        self.standby_wait = self.enhancements.get("browser_pool", {}).get("standby_wait", 10.0)
+        self.user_data_dir: Optional[Path] = None
+        self.slot: Optional[BrowserSlot] = None
+        self.last_rss = 0
+        self.page_watchdog = PageWatchdog(
+            WatchdogPolicy.from_settings(self.enhancements.get("page_watchdog")),
+            metrics=self.metrics,
+            group_name=group_config.name,
+        )
 
         # Enhancement 모듈 초기화
         self.loading_optimizer = LoadingOptimizer(
@@ -66,6 +109,46 @@ class AsyncGroupScraper:
         self.stealth_features = StealthFeatures(
             enabled=self.enhancements.get("stealth_features", {}).get("enabled", False)
         )
+        self.pii_sanitizer: Optional[PIISanitizer] = (
+            PIISanitizer()
+            if self.enhancements.get("pii_sanitizer", {}).get("enabled", True)
+            else None
+        )
+        parquet_settings = self.enhancements.get("parquet_sink", {})
+        self.parquet_sink: Optional[ParquetMessageSink] = (
+            ParquetMessageSink(parquet_settings.get("root", DEFAULT_PARQUET_ROOT))
+            if parquet_settings.get("enabled", False)
+            else None
+        )
+        search_settings = self.enhancements.get("search_index", {})
+        self.search_index: Optional[MessageSearchIndex] = (
+            MessageSearchIndex(search_settings.get("db_path", DEFAULT_SEARCH_DB))
+            if search_settings.get("enabled", False)
+            else None
+        )
+
+        selector_settings = self.enhancements.get("selector_resolver", {})
+        self.selector_resolver: SelectorResolver = (
+            SelectorResolver(selector_settings["cache_path"])
+            if selector_settings.get("cache_path")
+            else SELECTOR_RESOLVER
+        )
+        chat_index_settings = self.enhancements.get("chat_index", {})
+        self.chat_index: Optional[ChatIndex] = None
+        if chat_index_settings.get("enabled", True):
+            self.chat_index = (
+                ChatIndex(chat_index_settings["cache_path"])
+                if chat_index_settings.get("cache_path")
+                else CHAT_INDEX
+            )
+
+        # 텍스트 전용 그룹은 이미지/미디어/폰트 요청 차단
+        self.resource_filter = ResourceFilter.for_group(
+            group_config.media_ocr,
+            self.enhancements.get("resource_filter"),
+            metrics=self.metrics,
+            group_name=group_config.name,
+        )
 
         # Playwright 객체들
         self.playwright = None
@@ -75,6 +158,7 @@ class AsyncGroupScraper:
 
         # 상태 관리
         self.is_running = False
+        self._stop_event: Optional[asyncio.Event] = None
         self.scraped_messages = set()  # 중복 방지용
 
         logger.info(f"AsyncGroupScraper initialized for group: {group_config.name}")
@@ -88,36 +172,16 @@ class AsyncGroupScraper:
                 self.group_config.name.encode("utf-8")
             ).hexdigest()[:8]
             storage_dir = Path(self.chrome_data_dir) / f"profile_{group_hash}"
-            storage_dir.mkdir(parents=True, exist_ok=True)
 
             # Chrome 브라우저 시작 (영구 세션 유지)
-            self.context = await self.playwright.chromium.launch_persistent_context(
-                str(storage_dir),
+            slot = await launch_browser_slot(
+                self.playwright,
+                storage_dir,
                 headless=self.headless,
-                args=[
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-web-security",
-                    "--disable-features=VizDisplayCompositor",
-                ],
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                viewport={"width": 1920, "height": 1080},
+                timeout=self.timeout,
+                navigate=False,
             )
-
-            # launch_persistent_context는 BrowserContext를 반환하며 browser 속성을 노출함
-            self.browser = self.context.browser
-
-            if self.context.pages:
-                self.page = self.context.pages[0]
-            else:
-                self.page = await self.context.new_page()
-
-            self.context.set_default_timeout(self.timeout)
-            self.context.set_default_navigation_timeout(self.timeout)
-
-            # 스텔스 설정 적용
-            await self.stealth_features.apply_stealth_settings(self.context)
+            await self._attach_slot(slot)
 
             # WhatsApp Web으로 이동
             await self.page.goto(
@@ -133,6 +197,111 @@ class AsyncGroupScraper:
             )
             raise
 
+    async def _attach_slot(self, slot: BrowserSlot) -> None:
+        """브라우저 슬롯 연결 (스텔스/리소스 필터 적용)"""
+        self.slot = slot
+        self.user_data_dir = slot.profile_dir
+        # launch_persistent_context는 BrowserContext를 반환하며 browser 속성을 노출함
+        self.context = slot.context
+        self.browser = slot.browser
+        self.page = slot.page
+        self.page_watchdog.reset()
+
+        # 스텔스 설정 적용
+        await self.stealth_features.apply_stealth_settings(self.context)
+        await self.resource_filter.install(self.context)
+
+    async def check_health(self) -> PageHealth:
+        """페이지 상태 점검 (하트비트, 로그인, 휴대폰 연결)"""
+        return await probe_page(self.page)
+
+    async def _replace_browser(self) -> None:
+        """대기 브라우저로 교체 (없으면 같은 프로필 재실행)"""
+        old_slot = self.slot
+        standby = (
+            await self.browser_pool.acquire(timeout=self.standby_wait)
+            if self.browser_pool is not None
+            else None
+        )
+        if standby is not None:
+            self.browser_pool.retire(old_slot)
+            await self._attach_slot(standby)
+            logger.info(f"{self.group_config.name} switched to standby {standby.profile_dir}")
+            return
+
+        if old_slot is not None:
+            await old_slot.close()
+        profile_dir = old_slot.profile_dir if old_slot else self.user_data_dir
+        slot = await launch_browser_slot(
+            self.playwright, profile_dir, headless=self.headless, timeout=self.timeout
+        )
+        await self._attach_slot(slot)
+
+    async def watch_memory(self, messages_last_cycle: int) -> None:
+        """
+        메모리 감시 표본 수집 및 조용한 사이클에 재로딩/재시작
+
+        Args:
+            messages_last_cycle: 직전 사이클의 신규 메시지 수 (0이면 조용한 구간)
+        """
+        if not self.page_watchdog.enabled or self.page is None:
+            return
+        sample = await self.page_watchdog.sample(self.context, self.page, self.last_rss)
+        self.page_watchdog.evaluate(sample)
+        action = self.page_watchdog.due(messages_last_cycle)
+        if action is None:
+            return
+
+        group_name = self.group_config.name
+        try:
+            with self.metrics.phase(group_name, f"watchdog_{action}"):
+                if action == "recycle":
+                    await self._replace_browser()
+                else:
+                    await self.page.reload(wait_until="domcontentloaded")
+                # 채팅 복원 (중복 방지 집합은 그대로 유지되어 커서 역할)
+                if await self.wait_for_whatsapp_login():
+                    await self.find_and_click_group()
+            self.page_watchdog.completed()
+            logger.info(f"Watchdog {action} completed for {group_name}")
+        except Exception as e:
+            logger.error(f"Watchdog {action} failed for {group_name}: {e}")
+
+    async def recover(self, health: PageHealth) -> bool:
+        """
+        비정상 페이지 복구
+
+        응답하는 페이지는 새로고침을 먼저 시도하고, 실패하거나 렌더러가 죽은
+        경우 대기 브라우저로 교체(없으면 같은 프로필 재실행)한 뒤 그룹을 다시 연다.
+        중복 방지 집합(커서)은 스크래퍼에 남아 새 페이지로 그대로 인계된다.
+
+        Args:
+            health: 점검 결과
+
+        Returns:
+            bool: 복구 성공 여부
+        """
+        group_name = self.group_config.name
+        self.metrics.record_error(group_name, f"health_{health.reason}")
+        logger.warning(f"Unhealthy page for {group_name}: {health.reason}, recovering")
+
+        try:
+            with self.metrics.phase(group_name, "recovery"):
+                if health.reason in {"phone_disconnected", "not_ready"}:
+                    await self.page.reload(wait_until="domcontentloaded")
+                    if await self.wait_for_whatsapp_login():
+                        return await self.find_and_click_group()
+
+                await self._replace_browser()
+
+                if not await self.wait_for_whatsapp_login():
+                    return False
+                return await self.find_and_click_group()
+
+        except Exception as e:
+            logger.error(f"Recovery failed for {group_name}: {e}")
+            return False
+
     async def wait_for_whatsapp_login(self, timeout: int = 60) -> bool:
         """
         WhatsApp 로그인 대기
@@ -165,109 +334,9 @@ class AsyncGroupScraper:
             logger.warning(f"WhatsApp login timeout for {self.group_config.name}: {e}")
             return False
 
-    async def _locate_search_box(self) -> Locator:
-        """그룹 검색 입력창 탐색/Locate the group search box."""
-
-        if not self.page:
-            raise RuntimeError("Playwright page is not initialized")
-
-        toggle_selectors = [
-            'button[data-testid="chat-list-search"]',
-            'button[aria-label*="Search"]',
-            'button[title*="Search"]',
-        ]
-
-        for selector in toggle_selectors:
-            toggle = self.page.locator(selector)
-            try:
-                if await toggle.count() > 0 and await toggle.first.is_visible():
-                    await toggle.first.click()
-                    await self.page.wait_for_timeout(200)
-                    break
-            except PlaywrightTimeoutError:
-                continue
-            except Exception:
-                continue
-
-        search_selectors = [
-            '[data-testid="chat-list-search"]',
-            'input[aria-label="Search input textbox"]',
-            'input[type="text"][role="combobox"]',
-            'div[contenteditable="true"][data-tab="3"]',
-            'div[role="textbox"][contenteditable="true"][data-tab="3"]',
-            'div[role="textbox"][data-testid="chat-list-search"]',
-        ]
-
-        for selector in search_selectors:
-            locator = self.page.locator(selector)
-            try:
-                await locator.first.wait_for(state="visible", timeout=5000)
-                return locator.first
-            except PlaywrightTimeoutError:
-                continue
-
-        await self.page.keyboard.press("Control+K")
-        await self.page.wait_for_timeout(200)
-        fallback = self.page.locator('div[role="textbox"][contenteditable="true"]')
-        await fallback.first.wait_for(state="visible", timeout=5000)
-        return fallback.first
-
-    async def _fill_search_box(self, locator: Locator, value: str) -> None:
-        """검색창에 텍스트 입력/Fill the located search box with text."""
-
-        try:
-            await locator.click()
-        except PlaywrightTimeoutError:
-            pass
-
-        try:
-            await locator.fill(value)
-            return
-        except Exception:
-            # 일부 contenteditable 요소는 fill이 지원되지 않음
-            pass
-
-        try:
-            await locator.press("Control+A")
-            await locator.press("Delete")
-        except Exception:  # noqa: BLE001 - broad fallback for varying DOM elements
-            await locator.evaluate(
-                "el => { if (el.value !== undefined) { el.value = ''; } else { el.textContent = ''; } }"
-            )
-
-        await locator.type(value, delay=50)
-
-    async def _wait_for_group_entry(self, group_name: str) -> Locator:
-        """그룹 항목 탐색/Wait for the group entry in the search results."""
-
-        if not self.page:
-            raise RuntimeError("Playwright page is not initialized")
-
-        group_selectors = [
-            f'[data-testid="cell-frame-title"] span[title="{group_name}"]',
-            f'span[title="{group_name}"]',
-            f'div[role="gridcell"] [title="{group_name}"]',
-        ]
-
-        last_error: Optional[Exception] = None
-        for selector in group_selectors:
-            locator = self.page.locator(selector)
-            try:
-                await locator.first.wait_for(state="visible", timeout=10000)
-                return locator.first
-            except (
-                Exception
-            ) as error:  # noqa: BLE001 - Playwright raises generic errors
-                last_error = error
-                continue
-
-        raise RuntimeError(
-            f"Failed to locate group entry: {group_name}"
-        ) from last_error
-
     async def find_and_click_group(self) -> bool:
         """
-        지정된 그룹 찾기 및 클릭
+        지정된 그룹 찾기 및 클릭 (채팅 인덱스 우선, 실패 시 검색)
 
         Returns:
             bool: 그룹 찾기 성공 여부
@@ -276,20 +345,14 @@ class AsyncGroupScraper:
             if not self.page:
                 raise RuntimeError("Playwright page is not initialized")
 
-            search_box = await self._locate_search_box()
-            await self._fill_search_box(search_box, self.group_config.name)
-
-            group_entry = await self._wait_for_group_entry(self.group_config.name)
-            await group_entry.click()
-
-            await self.loading_optimizer.wait_for_element_with_retry(
+            method = await open_chat(
                 self.page,
-                '[data-testid="conversation-panel-messages"]',
-                max_retries=5,
-                timeout=5000,
+                self.group_config.name,
+                index=self.chat_index,
+                resolver=self.selector_resolver,
             )
 
-            logger.info(f"Successfully opened group: {self.group_config.name}")
+            logger.info(f"Successfully opened group: {self.group_config.name} (via {method})")
             return True
 
         except Exception as e:
@@ -341,19 +404,47 @@ class AsyncGroupScraper:
                             sender = (
                                 await sender_element.text_content()
                                 if sender_element
-                                else "Unknown"
+                                else None
+                            )
+
+                            # 백필과 같은 방식으로 발신자/시각 해석 (data-pre-plain-text)
+                            meta_element = await element.query_selector(
+                                "[data-pre-plain-text]"
+                            )
+                            pre_plain = (
+                                await meta_element.get_attribute("data-pre-plain-text")
+                                if meta_element
+                                else None
+                            )
+                            sent_at, pre_sender = parse_pre_plain_text(
+                                pre_plain or "",
+                                day_first=self.enhancements.get("history_backfill", {}).get(
+                                    "day_first", False
+                                ),
                             )
+                            sender = (sender or "").strip() or pre_sender or "Unknown"
+
+                            # 저장 전 개인정보 마스킹
+                            clean_text = text.strip()
+                            if self.pii_sanitizer:
+                                clean_text = self.pii_sanitizer.sanitize(clean_text)
 
                             message_data = {
-                                "text": text.strip(),
-                                "sender": sender.strip() if sender else "Unknown",
+                                "text": clean_text,
+                                "sender": sender,
                                 "timestamp": timestamp.strip() if timestamp else None,
+                                # 화면의 HH:MM만으로는 날짜를 알 수 없으므로 전체 발송 시각 보존
+                                "sent_at": sent_at.isoformat() if sent_at else None,
                                 "scraped_at": datetime.now().isoformat(),
                                 "group_name": self.group_config.name,
                             }
 
-                            # 중복 체크
-                            message_id = f"{sender}_{text}_{timestamp}"
+                            # 중복 체크 (백필이 기록한 키와 동일한 형식)
+                            message_id = _message_key(
+                                sender,
+                                clean_text,
+                                message_data["sent_at"] or message_data["timestamp"],
+                            )
                             if message_id not in self.scraped_messages:
                                 messages.append(message_data)
                                 self.scraped_messages.add(message_id)
@@ -368,6 +459,7 @@ class AsyncGroupScraper:
             return messages
 
         except Exception as e:
+            self.metrics.record_error(self.group_config.name, "scrape_messages")
             logger.error(
                 f"Failed to scrape messages from {self.group_config.name}: {e}"
             )
@@ -383,30 +475,84 @@ class AsyncGroupScraper:
         if not messages:
             return
 
-        try:
-            # 기존 메시지 로드
-            save_path = Path(self.group_config.save_file)
-            existing_messages = []
-
-            if save_path.exists():
-                with open(save_path, "r", encoding="utf-8") as f:
-                    existing_messages = json.load(f)
-
-            # 새 메시지 추가
+        def append(existing_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             existing_messages.extend(messages)
+            return existing_messages
 
-            # 파일 저장
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(existing_messages, f, ensure_ascii=False, indent=2)
+        try:
+            # 기존 메시지에 추가 (writer 스레드에서 로드/저장, 대기 중 저장과 병합)
+            await self.json_writer.update(
+                self.group_config.save_file, append, default=list
+            )
 
             logger.info(
                 f"Saved {len(messages)} messages to {self.group_config.save_file}"
             )
 
+            # Parquet/검색 색인 기록도 이벤트 루프 밖에서 수행
+            if self.parquet_sink is not None:
+                await asyncio.to_thread(
+                    self.parquet_sink.write, messages, self.group_config.name
+                )
+            if self.search_index is not None:
+                await asyncio.to_thread(
+                    self.search_index.add_messages, messages, self.group_config.name
+                )
+
         except Exception as e:
+            self.metrics.record_error(self.group_config.name, "save_messages")
             logger.error(f"Failed to save messages: {e}")
 
+    async def backfill_history(
+        self,
+        *,
+        until: Optional[datetime] = None,
+        max_messages: Optional[int] = None,
+    ) -> BackfillResult:
+        """
+        가상화된 메시지 목록을 거슬러 올라가며 과거 메시지 백필
+
+        Args:
+            until: 이 시각보다 오래된 메시지에서 중단
+            max_messages: 최대 백필 메시지 수
+
+        Returns:
+            BackfillResult: 백필 결과 (체크포인트로 중단 지점부터 재개)
+        """
+        settings = self.enhancements.get("history_backfill", {})
+        backfill = HistoryBackfill(
+            self.group_config.name,
+            checkpoint_dir=settings.get("checkpoint_dir", DEFAULT_CHECKPOINT_DIR),
+            batch_size=settings.get("batch_size", 200),
+            day_first=settings.get("day_first", False),
+        )
+
+        async def persist(batch: List[Dict[str, Any]]) -> None:
+            messages = []
+            for message in batch:
+                if not message["text"]:
+                    continue
+                # 원문 행 텍스트는 저장하지 않고 본문만 마스킹 후 저장
+                message.pop("raw_text", None)
+                if self.pii_sanitizer:
+                    message["text"] = self.pii_sanitizer.sanitize(message["text"])
+                # 이후 scrape_messages가 같은 메시지를 다시 저장하지 않도록 기록
+                message_id = _message_key(
+                    message["sender"],
+                    message["text"],
+                    message["sent_at"] or message["timestamp"],
+                )
+                if message_id in self.scraped_messages:
+                    continue
+                self.scraped_messages.add(message_id)
+                messages.append(message)
+            await self.save_messages(messages)
+
+        with self.metrics.phase(self.group_config.name, "backfill"):
+            return await backfill.run(
+                self.page, persist, until=until, max_messages=max_messages
+            )
+
     async def integrate_with_ai_summarizer(
         self, messages: List[Dict[str, Any]]
     ) -> Optional[Dict[str, Any]]:
@@ -445,6 +591,7 @@ class AsyncGroupScraper:
                 return summary
 
         except Exception as e:
+            self.metrics.record_error(self.group_config.name, "ai_summarize")
             logger.error(f"Failed to integrate with AI summarizer: {e}")
 
         return None
@@ -462,19 +609,24 @@ class AsyncGroupScraper:
             "messages_scraped": 0,
             "ai_summary": None,
             "error": None,
+            "resource_filter": None,
         }
 
+        group_name = self.group_config.name
         try:
             # 메시지 스크래핑
-            messages = await self.scrape_messages()
+            with self.metrics.phase(group_name, "scrape_messages"):
+                messages = await self.scrape_messages()
 
             if messages:
                 # 메시지 저장
-                await self.save_messages(messages)
+                with self.metrics.phase(group_name, "save_messages"):
+                    await self.save_messages(messages)
 
                 # AI 요약 (설정된 경우)
                 if self.ai_integration.get("summarize_on_extraction", False):
-                    ai_summary = await self.integrate_with_ai_summarizer(messages)
+                    with self.metrics.phase(group_name, "ai_summarize"):
+                        ai_summary = await self.integrate_with_ai_summarizer(messages)
                     result["ai_summary"] = ai_summary
 
                 result["messages_scraped"] = len(messages)
@@ -491,30 +643,78 @@ class AsyncGroupScraper:
             logger.error(f"Scraping cycle failed for {self.group_config.name}: {e}")
             result["error"] = str(e)
 
+        self.metrics.record_cycle(
+            group_name,
+            "error" if result["error"] else "success",
+            result["messages_scraped"],
+        )
+        if self.resource_filter.enabled:
+            saved = self.resource_filter.take_cycle_stats()
+            result["resource_filter"] = saved
+            logger.info(
+                f"Resource filter for {group_name}: {saved['blocked_requests']} requests, "
+                f"~{saved['estimated_bytes_saved'] // 1024} KiB saved this cycle"
+            )
+        await self.record_browser_rss()
         return result
 
+    async def record_browser_rss(self) -> None:
+        """Chromium RSS 기록/Record the resident memory of this group's browser."""
+
+        if self.user_data_dir is None:
+            return
+        try:
+            rss = await asyncio.to_thread(chromium_rss_bytes, self.user_data_dir)
+        except Exception as e:  # pragma: no cover - platform specific
+            logger.debug(f"Browser RSS sampling failed for {self.group_config.name}: {e}")
+            return
+        self.last_rss = rss
+        self.metrics.browser_rss.set(rss, group=self.group_config.name)
+
     async def run(self) -> None:
         """
         메인 실행 루프
         """
         self.is_running = True
+        self._stop_event = asyncio.Event()
+        group_name = self.group_config.name
 
         try:
             # 브라우저 초기화
-            await self.initialize()
+            with self.metrics.phase(group_name, "initialize"):
+                await self.initialize()
 
             # WhatsApp 로그인 대기
-            if not await self.wait_for_whatsapp_login():
+            with self.metrics.phase(group_name, "login"):
+                logged_in = await self.wait_for_whatsapp_login()
+            if not logged_in:
+                self.metrics.record_error(group_name, "login")
                 logger.error(
                     f"Failed to login to WhatsApp for {self.group_config.name}"
                 )
                 return
 
             # 그룹 찾기 및 클릭
-            if not await self.find_and_click_group():
+            with self.metrics.phase(group_name, "find_and_click_group"):
+                group_opened = await self.find_and_click_group()
+            if not group_opened:
+                self.metrics.record_error(group_name, "find_and_click_group")
                 logger.error(f"Failed to find group {self.group_config.name}")
                 return
 
+            # 과거 기록 백필 (설정된 경우, 중단 시 체크포인트부터 재개)
+            backfill_settings = self.enhancements.get("history_backfill", {})
+            if backfill_settings.get("enabled", False):
+                until = backfill_settings.get("until")
+                try:
+                    await self.backfill_history(
+                        until=datetime.fromisoformat(until) if until else None,
+                        max_messages=backfill_settings.get("max_messages"),
+                    )
+                except Exception as e:
+                    self.metrics.record_error(group_name, "backfill")
+                    logger.error(f"History backfill failed for {group_name}: {e}")
+
             # 스크래핑 루프
             while self.is_running:
                 try:
@@ -525,8 +725,17 @@ class AsyncGroupScraper:
                             f"Scraping error for {self.group_config.name}: {result['error']}"
                         )
 
+                    # 페이지 상태 점검 후 필요 시 복구 (대기 브라우저 교체)
+                    health = await self.check_health()
+                    if not health.healthy and not await self.recover(health):
+                        await self._pause(5)
+                        continue
+
+                    # 메모리 감시 (조용한 사이클에 재로딩/재시작)
+                    await self.watch_memory(result["messages_scraped"])
+
                     # 다음 사이클까지 대기
-                    await asyncio.sleep(self.group_config.scrape_interval)
+                    await self._pause(self.group_config.scrape_interval)
 
                 except asyncio.CancelledError:
                     logger.info(f"Scraping cancelled for {self.group_config.name}")
@@ -535,7 +744,7 @@ class AsyncGroupScraper:
                     logger.error(
                         f"Unexpected error in scraping loop for {self.group_config.name}: {e}"
                     )
-                    await asyncio.sleep(5)  # 오류 시 5초 대기 후 재시도
+                    await self._pause(5)  # 오류 시 5초 대기 후 재시도
 
         except Exception as e:
             logger.error(f"Fatal error in scraper for {self.group_config.name}: {e}")
@@ -546,6 +755,15 @@ class AsyncGroupScraper:
     async def close(self) -> None:
         """리소스 정리"""
         try:
+            if (
+                self.browser_pool is not None
+                and self.slot is not None
+                and self.browser_pool.owns(self.slot.profile_dir)
+            ):
+                # 인계받은 대기 프로필은 풀에 반환 (풀이 종료 후 다음 대기로 재실행)
+                self.browser_pool.retire(self.slot)
+                self.slot = None
+                self.page = self.context = self.browser = None
             if self.page:
                 await self.page.close()
             if self.context:
@@ -554,6 +772,10 @@ class AsyncGroupScraper:
                 await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
+            if self.parquet_sink is not None:
+                self.parquet_sink.close()
+            if self.search_index is not None:
+                self.search_index.close()
 
             self.is_running = False
             logger.info(f"Scraper closed for group: {self.group_config.name}")
@@ -561,9 +783,22 @@ class AsyncGroupScraper:
         except Exception as e:
             logger.error(f"Error closing scraper for {self.group_config.name}: {e}")
 
+    async def _pause(self, seconds: float) -> None:
+        """대기 (stop 요청 시 즉시 종료)/Sleep that wakes up on :meth:`stop`."""
+
+        if self._stop_event is None:
+            await asyncio.sleep(seconds)
+            return
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
     def stop(self) -> None:
         """스크래핑 중지"""
         self.is_running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
         logger.info(f"Stop requested for group: {self.group_config.name}")
 
 
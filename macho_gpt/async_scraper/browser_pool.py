@@ -0,0 +1,322 @@
+"""
+브라우저 풀 및 상태 점검
+Warm standby browser pool with page health probes for fast failover.
+
+Each group scraper owns one persistent Chromium profile. When the renderer
+crashes, hangs or WhatsApp drops the session, the scraper used to retry the
+cycle forever on a dead page. :func:`probe_page` classifies a page with a JS
+heartbeat (renderer responsiveness) and login/phone-connection markers, and
+:class:`BrowserPool` keeps pre-launched, already logged-in standby profiles so
+a scraper can swap its context for a healthy one in seconds. A failed
+standby profile is relaunched in the background and becomes the next standby;
+a group's own profile is only closed, never queued, because Chromium locks a
+profile to one process and the group relaunches it when it restarts.
+
+Standby profiles are separate linked devices (``<root>/standby_<n>``); link
+each one once with the QR setup tool before enabling the pool, since a
+WhatsApp Web session cannot be shared by two live browsers.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from playwright.async_api import async_playwright
+
+logger = logging.getLogger(__name__)
+
+WHATSAPP_URL = "https://web.whatsapp.com"
+LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor",
+]
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# 로그인/QR/휴대폰 연결 경고 표식 확인 (응답 시간 = 렌더러 하트비트)
+_HEALTH_JS = """
+() => ({
+  readyState: document.readyState,
+  loggedIn: !!document.querySelector('#pane-side, [data-testid="chat-list"]'),
+  qr: !!document.querySelector('[data-testid="qrcode"], canvas[aria-label*="Scan"], div[data-ref] canvas'),
+  phoneAlert: !!document.querySelector(
+    '[data-testid="alert-phone"], [data-testid="alert-phone-connection"], span[data-icon="alert-phone"]'
+  ),
+})
+"""
+
+
+@dataclass(slots=True)
+class PageHealth:
+    """페이지 상태/Outcome of a health probe."""
+
+    healthy: bool
+    reason: str = "ok"
+    heartbeat_ms: float = 0.0
+    logged_in: bool = False
+
+
+@dataclass(slots=True)
+class BrowserSlot:
+    """브라우저 슬롯/One persistent Chromium profile with its context and page."""
+
+    profile_dir: Path
+    context: Any
+    page: Any
+    launched_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def browser(self) -> Any:
+        return getattr(self.context, "browser", None)
+
+    async def close(self) -> None:
+        try:
+            await self.context.close()
+        except Exception as e:  # 이미 종료된 브라우저
+            logger.debug(f"Closing browser slot {self.profile_dir} failed: {e}")
+
+
+async def launch_browser_slot(
+    playwright: Any,
+    profile_dir: Path,
+    *,
+    headless: bool = True,
+    timeout: int = 30000,
+    navigate: bool = True,
+) -> BrowserSlot:
+    """
+    영구 프로필로 Chromium 실행
+
+    Args:
+        playwright: 시작된 Playwright 인스턴스
+        profile_dir: 사용자 데이터 디렉토리
+        headless: 헤드리스 모드 여부
+        timeout: 기본 타임아웃 (ms)
+        navigate: WhatsApp Web으로 바로 이동할지 여부
+
+    Returns:
+        BrowserSlot: 실행된 슬롯
+    """
+    profile_dir = Path(profile_dir)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    context = await playwright.chromium.launch_persistent_context(
+        str(profile_dir),
+        headless=headless,
+        args=LAUNCH_ARGS,
+        user_agent=DEFAULT_USER_AGENT,
+        viewport={"width": 1920, "height": 1080},
+    )
+    page = context.pages[0] if context.pages else await context.new_page()
+    context.set_default_timeout(timeout)
+    context.set_default_navigation_timeout(timeout)
+    if navigate:
+        await page.goto(WHATSAPP_URL, wait_until="domcontentloaded")
+    return BrowserSlot(profile_dir=profile_dir, context=context, page=page)
+
+
+async def probe_page(page: Any, *, timeout_ms: int = 3000) -> PageHealth:
+    """
+    페이지 상태 점검
+
+    Args:
+        page: Playwright Page
+        timeout_ms: 하트비트 응답 제한 (초과 시 렌더러 무응답)
+
+    Returns:
+        PageHealth: reason은 "ok", "closed", "crashed", "unresponsive",
+        "logged_out", "phone_disconnected", "not_ready" 중 하나
+    """
+    if page is None or page.is_closed():
+        return PageHealth(False, "closed")
+
+    started = time.perf_counter()
+    try:
+        state = await asyncio.wait_for(page.evaluate(_HEALTH_JS), timeout_ms / 1000)
+    except asyncio.TimeoutError:
+        return PageHealth(False, "unresponsive", (time.perf_counter() - started) * 1000)
+    except Exception as e:  # Target crashed / closed 등 Playwright 오류
+        reason = "closed" if "closed" in str(e).lower() else "crashed"
+        return PageHealth(False, reason, (time.perf_counter() - started) * 1000)
+
+    heartbeat_ms = (time.perf_counter() - started) * 1000
+    logged_in = bool(state.get("loggedIn"))
+    if state.get("qr"):
+        return PageHealth(False, "logged_out", heartbeat_ms)
+    if state.get("phoneAlert"):
+        return PageHealth(False, "phone_disconnected", heartbeat_ms, logged_in)
+    if not logged_in:
+        return PageHealth(False, "not_ready", heartbeat_ms)
+    return PageHealth(True, "ok", heartbeat_ms, True)
+
+
+class BrowserPool:
+    """
+    대기 브라우저 풀
+
+    Features:
+    - 로그인된 대기 프로필 사전 실행
+    - 인계 전 상태 재점검
+    - 실패한 대기 프로필을 백그라운드에서 재실행하여 다음 대기로 사용
+    """
+
+    def __init__(
+        self,
+        profile_root: Path,
+        *,
+        standby: int = 1,
+        headless: bool = True,
+        timeout: int = 30000,
+        login_timeout: float = 60.0,
+        launcher: Optional[Callable[[Path], Awaitable[BrowserSlot]]] = None,
+    ):
+        """
+        Args:
+            profile_root: 대기 프로필 루트 디렉토리
+            standby: 유지할 대기 브라우저 수
+            headless: 헤드리스 모드 여부
+            timeout: 기본 타임아웃 (ms)
+            login_timeout: 대기 브라우저 로그인 확인 제한 (초)
+            launcher: 슬롯 실행 함수 (기본: launch_browser_slot)
+        """
+        self.profile_root = Path(profile_root)
+        self.standby = standby
+        self.headless = headless
+        self.timeout = timeout
+        self.login_timeout = login_timeout
+        self._launcher = launcher
+        self._playwright = None
+        self._ready: "asyncio.Queue[BrowserSlot]" = asyncio.Queue()
+        # 예열 작업 -> 프로필 디렉토리
+        self._warming: Dict[asyncio.Task, Path] = {}
+        self.failovers = 0
+
+    @property
+    def ready_count(self) -> int:
+        return self._ready.qsize()
+
+    async def _launch(self, profile_dir: Path) -> BrowserSlot:
+        if self._launcher is not None:
+            return await self._launcher(profile_dir)
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return await launch_browser_slot(
+            self._playwright, profile_dir, headless=self.headless, timeout=self.timeout
+        )
+
+    async def start(self) -> None:
+        """대기 브라우저 예열 시작"""
+        for index in range(self.standby):
+            self._schedule_warm(self.profile_root / f"standby_{index}")
+        logger.info(f"Browser pool warming {self.standby} standby profile(s)")
+
+    def _schedule_warm(self, profile_dir: Path) -> None:
+        self._track(asyncio.create_task(self._warm(profile_dir)), profile_dir)
+
+    def _track(self, task: asyncio.Task, profile_dir: Path) -> None:
+        self._warming[task] = Path(profile_dir)
+        task.add_done_callback(lambda done: self._warming.pop(done, None))
+
+    async def _warm(self, profile_dir: Path) -> None:
+        try:
+            slot = await self._launch(profile_dir)
+        except Exception as e:
+            logger.error(f"Failed to launch standby browser {profile_dir}: {e}")
+            return
+
+        try:
+            deadline = time.monotonic() + self.login_timeout
+            health = await probe_page(slot.page)
+            while not health.healthy and time.monotonic() < deadline:
+                if health.reason in {"logged_out", "closed", "crashed"}:
+                    break
+                await asyncio.sleep(1)
+                health = await probe_page(slot.page)
+        except asyncio.CancelledError:
+            # close()로 취소되면 실행한 브라우저가 프로필을 잡고 남지 않도록 종료
+            await asyncio.shield(slot.close())
+            raise
+
+        if not health.healthy:
+            logger.warning(
+                f"Standby browser {profile_dir} not usable ({health.reason}); "
+                "link the profile with the QR setup tool"
+            )
+            await slot.close()
+            return
+
+        await self._ready.put(slot)
+        logger.info(f"Standby browser ready: {profile_dir}")
+
+    async def acquire(self, *, timeout: float = 0.0) -> Optional[BrowserSlot]:
+        """
+        건강한 대기 브라우저 인계
+
+        Args:
+            timeout: 대기 브라우저가 없을 때 예열 완료를 기다릴 시간 (초)
+
+        Returns:
+            Optional[BrowserSlot]: 인계할 슬롯 (없으면 None)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if self._ready.empty() and timeout > 0 and self._warming:
+                    remaining = max(0.0, deadline - time.monotonic())
+                    slot = await asyncio.wait_for(self._ready.get(), remaining)
+                else:
+                    slot = self._ready.get_nowait()
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                return None
+
+            health = await probe_page(slot.page)
+            if health.healthy:
+                self.failovers += 1
+                return slot
+            logger.warning(f"Discarding stale standby {slot.profile_dir} ({health.reason})")
+            self.retire(slot)
+
+    def owns(self, profile_dir: Path) -> bool:
+        """풀 소유 대기 프로필(``<root>/standby_<n>``) 여부"""
+        return Path(profile_dir).parent == self.profile_root
+
+    def retire(self, slot: Optional[BrowserSlot]) -> None:
+        """
+        실패했거나 반환된 슬롯 종료
+
+        대기 프로필은 같은 디렉토리로 재실행하여 다음 대기로 사용하고, 그룹 자체
+        프로필은 다른 그룹이 인계받지 않도록 종료만 한다 (그룹 재시작 시 재실행).
+        """
+        if slot is None:
+            return
+
+        async def recycle() -> None:
+            await asyncio.shield(slot.close())
+            if self.owns(slot.profile_dir):
+                await self._warm(slot.profile_dir)
+
+        self._track(asyncio.create_task(recycle()), slot.profile_dir)
+
+    async def close(self) -> None:
+        """모든 대기 브라우저 종료"""
+        for task in list(self._warming):
+            task.cancel()
+        if self._warming:
+            await asyncio.gather(*self._warming, return_exceptions=True)
+
+        slots: List[BrowserSlot] = []
+        while not self._ready.empty():
+            slots.append(self._ready.get_nowait())
+        for slot in slots:
+            await slot.close()
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
@@ -3,12 +3,13 @@
 extract_whatsapp_loadfix.py에서 추출한 개선사항들을 통합
 """
 
-import asyncio
 import random
 import logging
 from typing import List, Optional
 from playwright.async_api import Page
 
+from ...core.readiness import wait_for_selector_ready
+
 logger = logging.getLogger(__name__)
 
 
@@ -112,7 +113,7 @@ class LoadingOptimizer:
         self, page: Page, selector: str, max_retries: int = 3, timeout: int = 5000
     ) -> bool:
         """
-        재시도 로직이 포함된 요소 대기
+        재시도 로직이 포함된 요소 대기 (고정 대기 없이 DOM 이벤트 기반)
 
         Args:
             page: Playwright Page 객체
@@ -124,14 +125,10 @@ class LoadingOptimizer:
             bool: 요소 발견 여부
         """
         for attempt in range(max_retries):
-            try:
-                await page.wait_for_selector(selector, timeout=timeout)
+            if await wait_for_selector_ready(page, selector, timeout_ms=timeout):
                 logger.info(f"요소 발견: {selector} (시도 {attempt + 1})")
                 return True
-            except Exception as e:
-                logger.debug(f"요소 대기 실패 (시도 {attempt + 1}): {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(1)  # 1초 대기 후 재시도
+            logger.debug(f"요소 대기 실패 (시도 {attempt + 1}): {selector}")
 
         logger.warning(f"요소를 찾을 수 없음: {selector}")
         return False
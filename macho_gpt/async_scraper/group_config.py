@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
 
 import yaml  # type: ignore[import-untyped]
 
@@ -18,6 +18,7 @@ class GroupConfig:
     scrape_interval: int = 60
     priority: str = "MEDIUM"
     max_messages: int = 50
+    media_ocr: bool = False
 
     def __post_init__(self) -> None:
         """설정 유효성 검증/Validate group configuration."""
@@ -106,6 +107,7 @@ class MultiGroupConfig:
     whatsapp_groups: List[GroupConfig] = field(default_factory=list)
     scraper_settings: ScraperSettings = field(default_factory=ScraperSettings)
     ai_integration: AIIntegrationSettings = field(default_factory=AIIntegrationSettings)
+    enhancements: Dict[str, Any] = field(default_factory=dict)
 
     @staticmethod
     def load_from_yaml(config_path: str) -> "MultiGroupConfig":
@@ -130,6 +132,7 @@ class MultiGroupConfig:
                 scrape_interval=group_data.get("scrape_interval", 60),
                 priority=group_data.get("priority", "MEDIUM"),
                 max_messages=group_data.get("max_messages", 50),
+                media_ocr=group_data.get("media_ocr", False),
             )
             groups.append(group)
 
@@ -162,10 +165,16 @@ class MultiGroupConfig:
             confidence_threshold=ai_data.get("confidence_threshold", 0.90),
         )
 
+        # 모듈별 세부 설정은 스크래퍼가 직접 해석 (알 수 없는 키 보존)
+        enhancements = data.get("enhancements") or {}
+        if not isinstance(enhancements, dict):
+            raise ValueError("enhancements는 매핑이어야 합니다")
+
         return MultiGroupConfig(
             whatsapp_groups=groups,
             scraper_settings=scraper_settings,
             ai_integration=ai_integration,
+            enhancements=enhancements,
         )
 
     def validate(self) -> bool:
@@ -9,14 +9,32 @@ import signal
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.metrics import (
+    METRICS,
+    EventLoopLagMonitor,
+    ScraperMetrics,
+    start_metrics_server,
+)
+from ..core.persistence import JSON_WRITER
 from .group_config import GroupConfig, MultiGroupConfig
 from .async_scraper import AsyncGroupScraper
+from .browser_pool import BrowserPool
+
+if TYPE_CHECKING:
+    from ..core.coordination import LeaseCoordinator
 
 logger = logging.getLogger(__name__)
 
 
+def chrome_profile_name(group_name: str) -> str:
+    """그룹 프로필 디렉토리 이름/Filesystem-safe profile directory name for a group."""
+
+    safe_name = "".join(char if char.isalnum() else "_" for char in group_name).strip("_")
+    return safe_name or "group"
+
+
 class MultiGroupManager:
     """
     멀티 그룹 병렬 스크래핑 매니저
@@ -36,15 +54,24 @@ class MultiGroupManager:
         ai_integration: Optional[Dict[str, Any]] = None,
         *,
         chrome_data_root: str = "chrome-data",
+        standby_root: Optional[str] = None,
         headless: bool = True,
         timeout: int = 30000,
         enhancements: Optional[Dict[str, Any]] = None,
+        metrics: Optional[ScraperMetrics] = None,
+        metrics_port: Optional[int] = None,
+        metrics_json: Optional[str] = None,
     ):
         """
         Args:
             group_configs: 스크래핑할 그룹 설정 리스트
             max_parallel_groups: 최대 병렬 처리 그룹 수
             ai_integration: AI 통합 설정
+            chrome_data_root: 그룹별 Chrome 프로필 루트
+            standby_root: 대기 브라우저 프로필 루트 (기본: chrome_data_root/standby)
+            metrics: 메트릭 수집기 (기본: 전역 METRICS)
+            metrics_port: /metrics HTTP 엔드포인트 포트 (None이면 비활성)
+            metrics_json: 종료 시 메트릭 JSON 덤프 경로
         """
         self.group_configs = group_configs
         self.max_parallel_groups = min(max_parallel_groups, len(group_configs))
@@ -53,6 +80,25 @@ class MultiGroupManager:
         self.headless = headless
         self.timeout = timeout
         self.enhancements = enhancements or {}
+        self.metrics = metrics if metrics is not None else METRICS
+        self.metrics_port = metrics_port
+        self.metrics_json = metrics_json
+        self._loop_lag_monitor = EventLoopLagMonitor(self.metrics)
+        self._metrics_server: Optional[asyncio.AbstractServer] = None
+
+        # 장애 대비 대기 브라우저 풀 (설정된 경우)
+        pool_settings = self.enhancements.get("browser_pool", {})
+        self.browser_pool: Optional[BrowserPool] = (
+            BrowserPool(
+                Path(standby_root) if standby_root else Path(chrome_data_root) / "standby",
+                standby=pool_settings.get("standby", 1),
+                headless=headless,
+                timeout=timeout,
+                login_timeout=pool_settings.get("login_timeout", 60.0),
+            )
+            if pool_settings.get("enabled", False)
+            else None
+        )
 
         # 스크래퍼 인스턴스들
         self.scrapers: Dict[str, AsyncGroupScraper] = {}
@@ -60,6 +106,7 @@ class MultiGroupManager:
         # 상태 관리
         self.is_running = False
         self.tasks: List[asyncio.Task] = []
+        self.group_tasks: Dict[str, asyncio.Task] = {}
 
         # 통계
         self.stats = {
@@ -90,6 +137,8 @@ class MultiGroupManager:
             timeout=self.timeout,
             ai_integration=self.ai_integration,
             enhancements=self.enhancements,
+            metrics=self.metrics,
+            browser_pool=self.browser_pool,
         )
 
         return scraper
@@ -97,14 +146,7 @@ class MultiGroupManager:
     def _build_chrome_storage_dir(self, group_config: GroupConfig) -> str:
         """그룹별 Chrome 프로필 디렉토리 생성/Return a unique profile directory per group."""
 
-        safe_name = "".join(
-            char if char.isalnum() else "_" for char in group_config.name
-        ).strip("_")
-
-        if not safe_name:
-            safe_name = "group"
-
-        return str(Path(self.chrome_data_root) / safe_name)
+        return str(Path(self.chrome_data_root) / chrome_profile_name(group_config.name))
 
     async def _scrape_group(self, group_config: GroupConfig) -> Dict[str, Any]:
         """
@@ -137,7 +179,8 @@ class MultiGroupManager:
             self.stats["active_groups"] += 1
 
             # 스크래핑 실행
-            await scraper.run()
+            with self.metrics.phase(group_config.name, "group_run"):
+                await scraper.run()
 
             result["success"] = True
             logger.info(
@@ -189,6 +232,9 @@ class MultiGroupManager:
         logger.info(f"Starting parallel scraping for {len(self.group_configs)} groups")
         self.is_running = True
         self.stats["start_time"] = datetime.now().isoformat()
+        await self._start_metrics()
+        if self.browser_pool is not None:
+            await self.browser_pool.start()
 
         try:
             # 모든 그룹에 대한 태스크 생성
@@ -249,6 +295,9 @@ class MultiGroupManager:
         )
         self.is_running = True
         self.stats["start_time"] = datetime.now().isoformat()
+        await self._start_metrics()
+        if self.browser_pool is not None:
+            await self.browser_pool.start()
 
         results = []
 
@@ -308,6 +357,109 @@ class MultiGroupManager:
             self.is_running = False
             await self.cleanup()
 
+    async def start_group(self, group_config: GroupConfig) -> None:
+        """그룹 스크래퍼 시작/Start one group's scraper task if it is not running."""
+
+        task = self.group_tasks.get(group_config.name)
+        if task is not None and not task.done():
+            return
+        task = asyncio.create_task(self._scrape_group(group_config))
+        self.group_tasks[group_config.name] = task
+        self.tasks.append(task)
+
+    async def stop_group(self, group_name: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+        """
+        그룹 스크래퍼 중지 (임대 상실/반환 시)
+
+        Args:
+            group_name: 그룹 이름
+            timeout: 정상 종료 대기 시간 (초과 시 태스크 취소)
+
+        Returns:
+            Optional[Dict]: 실행 결과 (실행 중이 아니면 None)
+        """
+        task = self.group_tasks.pop(group_name, None)
+        if task is None:
+            return None
+        scraper = self.scrapers.get(group_name)
+        if scraper is not None:
+            scraper.stop()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            task.cancel()
+            return (await asyncio.gather(task, return_exceptions=True))[0]
+
+    async def run_coordinated(
+        self,
+        coordinator: "LeaseCoordinator",
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        노드 간 임대 조정 하에 그룹 스크래핑
+
+        임대를 획득한 그룹만 스크래핑하고, 임대를 잃거나 반환한 그룹은 즉시
+        중지합니다. 죽은 노드의 그룹은 TTL 만료 후 다른 노드가 이어받습니다.
+
+        Args:
+            coordinator: 그룹 임대 조정기
+            stop_event: 설정되면 모든 그룹 중지 및 임대 반환
+
+        Returns:
+            List[Dict]: 소유 기간별 실행 결과
+        """
+        configs = {group.name: group for group in self.group_configs}
+        results: List[Dict[str, Any]] = []
+        self.is_running = True
+        self.stats["start_time"] = datetime.now().isoformat()
+        await self._start_metrics()
+        if self.browser_pool is not None:
+            await self.browser_pool.start()
+
+        async def on_acquire(name: str) -> None:
+            if name in configs:
+                await self.start_group(configs[name])
+
+        async def on_release(name: str) -> None:
+            # 잃었거나 자가 차단된 그룹은 임대 만료 전에 멈춰야 함
+            result = await self.stop_group(name, timeout=coordinator.stop_timeout(name))
+            if isinstance(result, dict):
+                results.append(result)
+                self.stats["total_messages"] += result.get("messages_scraped", 0)
+
+        try:
+            await coordinator.run(on_acquire, on_release, stop_event)
+            return results
+        finally:
+            self.is_running = False
+            await self.cleanup()
+
+    async def _start_metrics(self) -> None:
+        """메트릭 수집 시작/Start loop-lag sampling and the optional endpoint."""
+
+        self._loop_lag_monitor.start()
+        if self.metrics_port is not None and self._metrics_server is None:
+            try:
+                self._metrics_server = await start_metrics_server(
+                    self.metrics.registry, port=self.metrics_port
+                )
+            except OSError as e:
+                logger.error(f"Failed to start metrics endpoint: {e}")
+
+    async def _stop_metrics(self) -> None:
+        """메트릭 수집 종료/Stop sampling, close the endpoint and dump JSON."""
+
+        await self._loop_lag_monitor.stop()
+        if self._metrics_server is not None:
+            self._metrics_server.close()
+            await self._metrics_server.wait_closed()
+            self._metrics_server = None
+        if self.metrics_json:
+            try:
+                self.metrics.registry.dump_json(self.metrics_json)
+            except OSError as e:
+                logger.error(f"Failed to write metrics JSON: {e}")
+
     async def stop_all(self) -> None:
         """모든 스크래퍼 중지"""
         logger.info("Stopping all scrapers...")
@@ -329,6 +481,7 @@ class MultiGroupManager:
 
         # 태스크 정리
         self.tasks.clear()
+        self.group_tasks.clear()
         self.scrapers.clear()
 
     async def shutdown(self) -> None:
@@ -339,6 +492,11 @@ class MultiGroupManager:
         """리소스 정리"""
         try:
             await self.stop_all()
+            # 대기 중인 JSON 저장 완료 보장
+            await JSON_WRITER.aflush()
+            if self.browser_pool is not None:
+                await self.browser_pool.close()
+            await self._stop_metrics()
             logger.info("MultiGroupManager cleanup completed")
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
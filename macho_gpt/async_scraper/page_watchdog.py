@@ -0,0 +1,179 @@
+"""
+페이지 메모리 감시
+Memory-leak watchdog that schedules page reloads and browser recycles.
+
+WhatsApp Web tabs left open for days accumulate JS heap and DOM nodes until
+the host runs out of memory. :class:`PageWatchdog` samples the page's JS heap
+and node counts through CDP ``Performance.getMetrics`` together with the
+Chromium process RSS and page age, exports them as metrics and decides when
+to act:
+
+* JS heap or page age over the limit -> ``"reload"`` (frees the renderer heap)
+* Chromium RSS over the limit -> ``"recycle"`` (relaunch or swap the browser)
+
+Actions are deferred until a quiet cycle (no new messages) so a busy chat is
+not interrupted, but are forced after ``max_defer_cycles``.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from ..core.metrics import METRICS, ScraperMetrics
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+@dataclass(slots=True)
+class WatchdogPolicy:
+    """감시 임계값/Thresholds for the page watchdog."""
+
+    enabled: bool = True
+    max_js_heap_mb: float = 1024.0
+    max_rss_mb: float = 3072.0
+    max_age_hours: float = 24.0
+    max_defer_cycles: int = 10
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict[str, Any]]) -> "WatchdogPolicy":
+        settings = settings or {}
+        known = {name: settings[name] for name in cls.__dataclass_fields__ if name in settings}
+        return cls(**known)
+
+
+@dataclass(slots=True)
+class PageSample:
+    """메모리 표본/One watchdog sample."""
+
+    js_heap_used: int = 0
+    js_heap_total: int = 0
+    dom_nodes: int = 0
+    rss: int = 0
+    age_seconds: float = 0.0
+
+
+class PageWatchdog:
+    """
+    페이지 메모리 감시기
+
+    Features:
+    - CDP Performance.getMetrics 기반 JS 힙/DOM 노드 표본
+    - Chromium RSS 및 페이지 수명 기반 판정
+    - 조용한 사이클까지 조치 지연 (최대 max_defer_cycles)
+    """
+
+    def __init__(
+        self,
+        policy: Optional[WatchdogPolicy] = None,
+        *,
+        metrics: Optional[ScraperMetrics] = None,
+        group_name: str = "",
+    ):
+        """
+        Args:
+            policy: 임계값 설정
+            metrics: 메트릭 수집기 (기본: 전역 METRICS)
+            group_name: 메트릭 라벨용 그룹 이름
+        """
+        self.policy = policy or WatchdogPolicy()
+        self.metrics = metrics if metrics is not None else METRICS
+        self.group_name = group_name
+        self.page_started = time.monotonic()
+        self.pending: Optional[str] = None
+        self.pending_reason: str = ""
+        self.deferred = 0
+        self._session = None
+        self._session_page = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.policy.enabled
+
+    async def _cdp_metrics(self, context: Any, page: Any) -> Dict[str, float]:
+        if self._session is None or self._session_page is not page:
+            self._session = await context.new_cdp_session(page)
+            self._session_page = page
+            await self._session.send("Performance.enable")
+        response = await self._session.send("Performance.getMetrics")
+        return {entry["name"]: entry["value"] for entry in response.get("metrics", [])}
+
+    async def sample(self, context: Any, page: Any, rss: int = 0) -> PageSample:
+        """
+        표본 수집 및 메트릭 기록
+
+        Args:
+            context: 페이지의 BrowserContext (CDP 세션 생성용)
+            page: 감시할 Page
+            rss: 같은 프로필 Chromium 프로세스 RSS (bytes)
+
+        Returns:
+            PageSample: 수집된 표본 (CDP 실패 시 힙/노드는 0)
+        """
+        sample = PageSample(rss=rss, age_seconds=time.monotonic() - self.page_started)
+        try:
+            values = await self._cdp_metrics(context, page)
+            sample.js_heap_used = int(values.get("JSHeapUsedSize", 0))
+            sample.js_heap_total = int(values.get("JSHeapTotalSize", 0))
+            sample.dom_nodes = int(values.get("Nodes", 0))
+        except Exception as e:  # CDP는 Chromium 전용이며 페이지 종료 시 실패
+            self._session = None
+            logger.debug(f"CDP metrics unavailable for {self.group_name}: {e}")
+
+        group = self.group_name
+        self.metrics.js_heap.set(sample.js_heap_used, group=group)
+        self.metrics.dom_nodes.set(sample.dom_nodes, group=group)
+        self.metrics.page_age.set(sample.age_seconds, group=group)
+        return sample
+
+    def evaluate(self, sample: PageSample) -> Optional[str]:
+        """임계값 판정/Return ``"recycle"``, ``"reload"`` or None and remember it."""
+
+        policy = self.policy
+        action, reason = None, ""
+        if policy.max_rss_mb and sample.rss > policy.max_rss_mb * MB:
+            action, reason = "recycle", "rss"
+        elif policy.max_js_heap_mb and sample.js_heap_used > policy.max_js_heap_mb * MB:
+            action, reason = "reload", "js_heap"
+        elif policy.max_age_hours and sample.age_seconds > policy.max_age_hours * 3600:
+            action, reason = "reload", "age"
+
+        # 더 강한 조치(recycle)가 이미 예약되어 있으면 유지
+        if action and (self.pending is None or action == "recycle"):
+            if self.pending is None:
+                logger.info(
+                    f"Watchdog scheduled {action} for {self.group_name} ({reason}: "
+                    f"heap {sample.js_heap_used // MB} MiB, rss {sample.rss // MB} MiB, "
+                    f"age {sample.age_seconds / 3600:.1f} h)"
+                )
+            self.pending, self.pending_reason = action, reason
+        return self.pending
+
+    def due(self, messages_last_cycle: int) -> Optional[str]:
+        """조치 시점 판단/Return the pending action once the chat is quiet or deferral ran out."""
+
+        if self.pending is None:
+            return None
+        if messages_last_cycle == 0 or self.deferred >= self.policy.max_defer_cycles:
+            return self.pending
+        self.deferred += 1
+        return None
+
+    def completed(self) -> None:
+        """조치 완료/Record the action and start a fresh page lifetime."""
+
+        if self.pending is not None:
+            self.metrics.page_recycles.inc(
+                group=self.group_name, action=self.pending, reason=self.pending_reason
+            )
+        self.pending, self.pending_reason, self.deferred = None, "", 0
+        self.reset()
+
+    def reset(self) -> None:
+        """새 페이지/Start a fresh page lifetime and drop the cached CDP session."""
+
+        self.page_started = time.monotonic()
+        self._session = None
+        self._session_page = None
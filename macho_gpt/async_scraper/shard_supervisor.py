@@ -0,0 +1,420 @@
+"""
+멀티 프로세스 그룹 샤딩
+Supervisor that shards groups across worker processes.
+
+:class:`MultiGroupManager` runs every group on one event loop, so a blocking
+JSON write, regex pass or OCR call stalls all groups and one crash takes them
+all down. :class:`ShardSupervisor` splits the groups into shards balanced by
+priority, runs each shard's ``MultiGroupManager`` in its own process (own
+event loop, own browsers) and talks to the workers over a multiprocessing
+queue:
+
+* workers report periodic stats and final results, aggregated by the parent
+* a worker that dies without reporting completion is restarted with
+  exponential backoff
+* a shard that keeps crashing is split in two so a poison group ends up
+  isolated, and a single-group shard past ``max_restarts`` is marked failed
+* splitting crashed shards is the only rebalancing; healthy shards keep
+  their groups for the whole run
+* group profiles stay at ``<chrome_data_root>/<group>`` (stable across
+  restarts and splits, so linked logins survive) while standby browsers get a
+  per-slot root, ``<chrome_data_root>/standby/shard<slot>``; slots are the
+  worker indexes ``0..workers-1``, so a split half keeps its parent's linked
+  standby profiles instead of pointing at a fresh directory
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue as queue_module
+import signal
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .group_config import GroupConfig
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_WEIGHTS = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+
+# 워커 실행 함수: (그룹, 옵션, 통계 보고 콜백) -> 그룹별 결과
+ShardRunner = Callable[
+    [List[GroupConfig], Dict[str, Any], Callable[[Dict[str, Any]], None]],
+    Awaitable[List[Dict[str, Any]]],
+]
+
+
+def assign_shards(groups: List[GroupConfig], workers: int) -> List[List[GroupConfig]]:
+    """
+    우선순위 가중치 기반 그룹 분배 (가장 가벼운 샤드에 순차 배치)
+
+    Args:
+        groups: 그룹 설정 리스트
+        workers: 워커 프로세스 수
+
+    Returns:
+        List[List[GroupConfig]]: 비어 있지 않은 샤드 목록
+    """
+    shards: List[List[GroupConfig]] = [[] for _ in range(max(1, min(workers, len(groups))))]
+    loads = [0] * len(shards)
+    ordered = sorted(groups, key=lambda group: PRIORITY_WEIGHTS.get(group.priority, 1), reverse=True)
+    for group in ordered:
+        target = loads.index(min(loads))
+        shards[target].append(group)
+        loads[target] += PRIORITY_WEIGHTS.get(group.priority, 1)
+    return [shard for shard in shards if shard]
+
+
+async def run_manager_shard(
+    groups: List[GroupConfig],
+    options: Dict[str, Any],
+    report: Callable[[Dict[str, Any]], None],
+) -> List[Dict[str, Any]]:
+    """기본 샤드 실행: 워커 프로세스 안에서 MultiGroupManager 실행"""
+    from .multi_group_manager import MultiGroupManager
+
+    options = dict(options)
+    interval = options.pop("stats_interval", 5.0)
+    manager = MultiGroupManager(group_configs=groups, **options)
+
+    async def report_stats() -> None:
+        while True:
+            await asyncio.sleep(interval)
+            report(manager.get_stats())
+
+    reporter = asyncio.create_task(report_stats())
+    try:
+        return await manager.run_all_groups()
+    finally:
+        reporter.cancel()
+        report(manager.get_stats())
+
+
+def _worker_main(
+    shard_id: int,
+    group_dicts: List[Dict[str, Any]],
+    options: Dict[str, Any],
+    channel: Any,
+    runner: ShardRunner,
+) -> None:
+    """워커 프로세스 진입점 (spawn 호환을 위해 모듈 수준 함수)"""
+    groups = [GroupConfig(**data) for data in group_dicts]
+
+    def report(stats: Dict[str, Any]) -> None:
+        channel.put(("stats", shard_id, stats))
+
+    async def main() -> List[Dict[str, Any]]:
+        task = asyncio.current_task()
+        # Ctrl+C는 프로세스 그룹 전체에 전달되므로 SIGINT도 SIGTERM처럼 정상 중지로 처리
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                asyncio.get_running_loop().add_signal_handler(signum, task.cancel)
+            except (NotImplementedError, RuntimeError):  # Windows
+                pass
+        return await runner(groups, options, report)
+
+    channel.put(("started", shard_id, {"pid": multiprocessing.current_process().pid}))
+    try:
+        results = asyncio.run(main())
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        channel.put(("stopped", shard_id, {}))
+        return
+    channel.put(("done", shard_id, {"results": results}))
+
+
+@dataclass(slots=True)
+class ShardState:
+    """샤드 상태/Bookkeeping for one shard."""
+
+    shard_id: int
+    groups: List[GroupConfig]
+    slot: int = 0
+    process: Any = None
+    restarts: int = 0
+    crashes_in_row: int = 0
+    next_start: float = 0.0
+    done: bool = False
+    failed: bool = False
+    split: bool = False
+    stopped: bool = False
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+class ShardSupervisor:
+    """
+    멀티 프로세스 샤드 감독자
+
+    Features:
+    - 우선순위 가중치 기반 그룹 샤딩
+    - 워커별 독립 이벤트 루프/브라우저
+    - IPC 기반 통계/결과 집계
+    - 지수 백오프 재시작 및 반복 크래시 샤드 분할
+    """
+
+    def __init__(
+        self,
+        group_configs: List[GroupConfig],
+        workers: int,
+        manager_options: Optional[Dict[str, Any]] = None,
+        *,
+        runner: ShardRunner = run_manager_shard,
+        max_restarts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        split_after: int = 2,
+        stats_interval: float = 5.0,
+        start_method: str = "spawn",
+    ):
+        """
+        Args:
+            group_configs: 전체 그룹 설정
+            workers: 워커 프로세스 수
+            manager_options: 워커의 MultiGroupManager 인자 (피클 가능해야 함)
+            runner: 워커에서 실행할 샤드 함수 (모듈 수준 함수)
+            max_restarts: 샤드당 최대 재시작 횟수
+            backoff_base: 재시작 백오프 시작값 (초)
+            backoff_max: 재시작 백오프 상한 (초)
+            split_after: 연속 크래시 몇 번 후 샤드를 분할할지
+            stats_interval: 워커 통계 보고 주기 (초)
+            start_method: multiprocessing 시작 방식
+        """
+        from .multi_group_manager import chrome_profile_name
+
+        # 그룹 프로필은 샤드 간 공유 루트 아래에 있으므로 디렉토리 이름이 겹치면 안 됨
+        profiles: Dict[str, str] = {}
+        for group in group_configs:
+            other = profiles.setdefault(chrome_profile_name(group.name), group.name)
+            if other != group.name:
+                raise ValueError(
+                    f"그룹 '{other}'와 '{group.name}'이(가) 같은 Chrome 프로필 디렉토리를 사용합니다"
+                )
+
+        self.group_configs = group_configs
+        self.workers = workers
+        self.manager_options = manager_options or {}
+        self.runner = runner
+        self.max_restarts = max_restarts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.split_after = split_after
+        self.stats_interval = stats_interval
+        self._mp = multiprocessing.get_context(start_method)
+        self._channel = self._mp.Queue()
+        self._next_id = 0
+        self.shards: Dict[int, ShardState] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.restarts = 0
+        self._stopping = False
+        self._run_thread: Optional[int] = None
+
+    def _shard_options(self, state: ShardState) -> Dict[str, Any]:
+        shard_id = state.shard_id
+        options = dict(self.manager_options, stats_interval=self.stats_interval)
+        # 그룹 프로필(<root>/<그룹>)은 샤드 간 겹치지 않지만 대기 브라우저는 슬롯마다 따로 둠
+        # (분할로 새 샤드 ID가 생겨도 슬롯은 유지되어 연결된 대기 프로필을 그대로 사용)
+        chrome_root = Path(options.get("chrome_data_root", "chrome-data"))
+        options["standby_root"] = str(chrome_root / "standby" / f"shard{state.slot}")
+        if options.get("metrics_port") is not None:
+            options["metrics_port"] = options["metrics_port"] + shard_id
+        if options.get("metrics_json"):
+            path = Path(options["metrics_json"])
+            options["metrics_json"] = str(path.with_name(f"{path.stem}.shard{shard_id}{path.suffix}"))
+        return options
+
+    def _add_shard(
+        self, groups: List[GroupConfig], *, slot: int, restarts: int = 0, delay: float = 0.0
+    ) -> ShardState:
+        state = ShardState(
+            self._next_id, groups, slot=slot, restarts=restarts, next_start=time.monotonic() + delay
+        )
+        self.shards[state.shard_id] = state
+        self._next_id += 1
+        return state
+
+    def _free_slot(self) -> int:
+        """실행 중인 샤드가 쓰지 않는 가장 작은 슬롯 (없으면 연결되지 않은 새 슬롯)"""
+        used = {state.slot for state in self._pending()}
+        for slot in range(self.workers):
+            if slot not in used:
+                return slot
+        slot = max(used) + 1
+        logger.warning(
+            f"No free standby slot for a split shard; standby/shard{slot} must be linked "
+            "before its browser pool can fail over"
+        )
+        return slot
+
+    def _start(self, state: ShardState) -> None:
+        state.process = self._mp.Process(
+            target=_worker_main,
+            args=(
+                state.shard_id,
+                [asdict(group) for group in state.groups],
+                self._shard_options(state),
+                self._channel,
+                self.runner,
+            ),
+            name=f"shard-{state.shard_id}",
+            daemon=False,
+        )
+        state.process.start()
+        logger.info(
+            f"Started shard {state.shard_id} (pid {state.process.pid}): "
+            f"{[group.name for group in state.groups]}"
+        )
+
+    def _handle(self, kind: str, shard_id: int, payload: Dict[str, Any]) -> None:
+        state = self.shards.get(shard_id)
+        if state is None:
+            return
+        if kind == "stats":
+            state.stats = payload
+        elif kind == "done":
+            state.done = True
+            for result in payload.get("results", []):
+                self.results[result["group_name"]] = {**result, "shard": shard_id}
+        elif kind == "stopped":
+            # 신호로 중지된 워커는 크래시가 아니므로 재시작하지 않음
+            state.stopped = True
+        elif kind == "started":
+            logger.debug(f"Shard {shard_id} running as pid {payload.get('pid')}")
+
+    def _drain(self, timeout: float) -> None:
+        try:
+            message = self._channel.get(timeout=timeout)
+        except queue_module.Empty:
+            return
+        self._handle(*message)
+        while True:
+            try:
+                self._handle(*self._channel.get_nowait())
+            except queue_module.Empty:
+                return
+
+    def _on_exit(self, state: ShardState) -> None:
+        exitcode = state.process.exitcode
+        state.process = None
+        if state.done or state.stopped or self._stopping:
+            state.crashes_in_row = 0
+            return
+
+        state.crashes_in_row += 1
+        names = [group.name for group in state.groups]
+        if state.restarts >= self.max_restarts:
+            state.failed = True
+            logger.error(f"Shard {state.shard_id} {names} failed permanently (exit {exitcode})")
+            for group in state.groups:
+                self.results.setdefault(
+                    group.name,
+                    {"group_name": group.name, "success": False, "error": f"worker exit {exitcode}"},
+                )
+            return
+
+        self.restarts += 1
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (state.crashes_in_row - 1)))
+        if len(state.groups) > 1 and state.crashes_in_row >= self.split_after:
+            # 반복 크래시 샤드를 둘로 나눠 문제 그룹을 격리
+            state.split = True
+            middle = len(state.groups) // 2
+            # 앞쪽 절반은 부모 슬롯을 물려받고 뒤쪽 절반은 비어 있는 슬롯을 사용
+            self._add_shard(
+                state.groups[:middle], slot=state.slot, restarts=state.restarts + 1, delay=delay
+            )
+            self._add_shard(
+                state.groups[middle:], slot=self._free_slot(), restarts=state.restarts + 1, delay=delay
+            )
+            logger.warning(f"Shard {state.shard_id} {names} crashed repeatedly; split into two shards")
+            return
+
+        state.restarts += 1
+        state.next_start = time.monotonic() + delay
+        logger.warning(
+            f"Shard {state.shard_id} {names} exited with {exitcode}; restarting in {delay:.1f}s"
+        )
+
+    def _pending(self) -> List[ShardState]:
+        return [
+            state
+            for state in self.shards.values()
+            if not (state.done or state.failed or state.split or state.stopped)
+        ]
+
+    def run(self, poll_interval: float = 0.2) -> List[Dict[str, Any]]:
+        """
+        모든 샤드 실행 후 결과 집계 (블로킹)
+
+        Returns:
+            List[Dict]: 그룹별 결과 (원래 그룹 순서)
+        """
+        for slot, groups in enumerate(assign_shards(self.group_configs, self.workers)):
+            self._add_shard(groups, slot=slot)
+
+        self._run_thread = threading.get_ident()
+        try:
+            while self._pending() and not self._stopping:
+                now = time.monotonic()
+                for state in self._pending():
+                    if state.process is None and now >= state.next_start:
+                        self._start(state)
+                self._drain(poll_interval)
+                for state in self._pending():
+                    if state.process is not None and not state.process.is_alive():
+                        state.process.join()
+                        # 종료 직전 보낸 메시지 반영 후 판정
+                        self._drain(0.05)
+                        self._on_exit(state)
+        except KeyboardInterrupt:
+            logger.info("Shard supervisor interrupted")
+        finally:
+            self._run_thread = None
+            self.stop()
+
+        for state in self.shards.values():
+            if state.stopped:
+                for group in state.groups:
+                    self.results.setdefault(
+                        group.name, {"group_name": group.name, "success": False, "error": "stopped"}
+                    )
+        return [
+            self.results.get(group.name, {"group_name": group.name, "success": False, "error": "not run"})
+            for group in self.group_configs
+        ]
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        모든 워커 종료 (SIGTERM 후 대기, 시간 초과 시 kill)
+
+        다른 스레드에서 실행 중인 :meth:`run`에 대해 호출하면 중지만 요청하고,
+        워커 종료는 :meth:`run`이 자기 스레드에서 마무리한다.
+        """
+        self._stopping = True
+        if self._run_thread is not None and self._run_thread != threading.get_ident():
+            return
+        running = [state for state in self.shards.values() if state.process is not None]
+        for state in running:
+            if state.process.is_alive():
+                state.process.terminate()
+        deadline = time.monotonic() + timeout
+        for state in running:
+            state.process.join(max(0.0, deadline - time.monotonic()))
+            if state.process.is_alive():
+                state.process.kill()
+                state.process.join()
+            state.process = None
+        self._drain(0.05)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """샤드 통계 합산 (분할/실패한 샤드의 마지막 보고는 제외)"""
+        live = [state for state in self.shards.values() if not (state.split or state.failed)]
+        totals: Dict[str, Any] = {
+            "shards": len(live),
+            "running_shards": sum(1 for state in self.shards.values() if state.process is not None),
+            "failed_shards": sum(1 for state in self.shards.values() if state.failed),
+            "restarts": self.restarts,
+        }
+        for key in ("total_groups", "active_groups", "completed_cycles", "total_messages", "errors"):
+            totals[key] = sum(int(state.stats.get(key, 0) or 0) for state in live)
+        return totals
@@ -5,5 +5,6 @@ WhatsApp 메시지 처리 및 분석 핵심 기능
 """
 
 from .logi_whatsapp_241219 import WhatsAppProcessor, WhatsAppMessage
+from .pii_sanitizer import PIISanitizer
 
-__all__ = ["WhatsAppProcessor", "WhatsAppMessage"] 
\ No newline at end of file
+__all__ = ["WhatsAppProcessor", "WhatsAppMessage", "PIISanitizer"] 
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""채팅 인덱스. Direct chat navigation from a cached sidebar index.
+
+Opening a group through the search box costs a focus, a fill (or typed
+fallback) and a wait for the result list on every switch. The chat index
+sweeps the sidebar once, caches a ``name -> scroll offset`` map and then opens
+a chat with a single in-page call: find the mounted row whose title matches,
+or scroll the virtualized sidebar to the cached offset first, and click it.
+The search path stays as the fallback for chats the index cannot find.
+
+WhatsApp offers no deep link for group chats (``/send?phone=`` only targets
+individual numbers) and its internal store is not a stable API, so the
+sidebar list is the navigation surface used here.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .readiness import wait_for_message_list_stable, wait_for_search_results_settled
+from .selector_resolver import (
+    SelectorResolver,
+    fill_search_box,
+    locate_search_box,
+    wait_for_group_entry,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHAT_INDEX = Path("data") / "chat_index.json"
+SIDEBAR_SELECTOR = "#pane-side"
+
+# 사이드바 행/제목/오프셋 도우미 (각 스크립트 앞에 붙여 사용)
+_ROW_HELPERS = """
+const ROW_SELECTOR = '[role="listitem"], [role="row"], [data-testid="cell-frame-container"]';
+const TITLE_SELECTOR = '[data-testid="cell-frame-title"] span[title], span[title][dir="auto"]';
+const frame = () => new Promise(done => requestAnimationFrame(() => requestAnimationFrame(done)));
+const mountedRows = root => {
+  const seen = new Set();
+  const rows = [];
+  for (const span of root.querySelectorAll(TITLE_SELECTOR)) {
+    const row = span.closest(ROW_SELECTOR) || span;
+    if (seen.has(row)) continue;
+    seen.add(row);
+    rows.push({row, title: span.getAttribute('title')});
+  }
+  return rows;
+};
+const offsetOf = (root, row) =>
+  Math.round(row.getBoundingClientRect().top - root.getBoundingClientRect().top + root.scrollTop);
+"""
+
+# 사이드바 전체를 한 번 훑어 이름 -> 오프셋 수집 (스크롤 위치 복원)
+_BUILD_JS = (
+    "async ({pane, maxSteps}) => {"
+    + _ROW_HELPERS
+    + """
+  const root = document.querySelector(pane);
+  if (!root) return null;
+  const entries = {};
+  const collect = () => {
+    for (const {row, title} of mountedRows(root)) {
+      if (title && !(title in entries)) entries[title] = offsetOf(root, row);
+    }
+  };
+  const start = root.scrollTop;
+  root.scrollTop = 0;
+  await frame();
+  collect();
+  for (let step = 0; step < maxSteps && root.scrollTop + root.clientHeight < root.scrollHeight - 1; step++) {
+    root.scrollTop += Math.max(1, root.clientHeight - 40);
+    await frame();
+    collect();
+  }
+  root.scrollTop = start;
+  return entries;
+}"""
+)
+
+# 이름으로 행을 찾아(필요 시 캐시된 오프셋으로 스크롤) 클릭 후 헤더 전환 확인
+_OPEN_JS = (
+    "async ({pane, name, offset, confirmMs}) => {"
+    + _ROW_HELPERS
+    + """
+  const root = document.querySelector(pane);
+  if (!root) return {opened: false, confirmed: false, offset: null};
+  const find = () => {
+    const match = mountedRows(root).find(entry => entry.title === name);
+    return match ? match.row : null;
+  };
+  let row = find();
+  if (!row && offset !== null) {
+    root.scrollTop = Math.max(0, offset - root.clientHeight / 2);
+    await frame();
+    row = find();
+  }
+  if (!row) return {opened: false, confirmed: false, offset: null};
+  const rowOffset = offsetOf(root, row);
+  const target = row.querySelector('[data-testid="cell-frame-container"]') || row;
+  for (const type of ['mousedown', 'mouseup', 'click']) {
+    target.dispatchEvent(new MouseEvent(type, {bubbles: true, cancelable: true, view: window, button: 0}));
+  }
+  const confirmed = () => {
+    const header = document.querySelector('#main header');
+    return !!header && Array.from(header.querySelectorAll('[title]')).some(el => el.getAttribute('title') === name);
+  };
+  const started = performance.now();
+  while (!confirmed() && performance.now() - started < confirmMs) await frame();
+  return {opened: true, confirmed: confirmed(), offset: rowOffset};
+}"""
+)
+
+
+class ChatIndex:
+    """사이드바 채팅 인덱스/Cached ``name -> sidebar offset`` map for direct navigation."""
+
+    def __init__(
+        self,
+        cache_path: Optional[str | Path] = DEFAULT_CHAT_INDEX,
+        *,
+        pane_selector: str = SIDEBAR_SELECTOR,
+        rebuild_interval: float = 300.0,
+    ) -> None:
+        """
+        Args:
+            cache_path: 인덱스 저장 경로 (None이면 세션 메모리에만 유지)
+            pane_selector: 사이드바 스크롤 컨테이너 셀렉터
+            rebuild_interval: 미발견 시 재구축 최소 간격 (초)
+        """
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.pane_selector = pane_selector
+        self.rebuild_interval = rebuild_interval
+        self.offsets: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self._built_at: Optional[float] = None
+        self._load()
+
+    def _load(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable chat index %s: %s", self.cache_path, exc)
+            return
+        self.offsets = {name: int(offset) for name, offset in data.get("offsets", {}).items()}
+
+    def save(self) -> None:
+        """원자적 저장/Persist the index via ``os.replace``."""
+
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(
+            prefix=".chat-index-", suffix=".tmp", dir=str(self.cache_path.parent)
+        )
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                json.dump({"offsets": self.offsets}, temp_file, ensure_ascii=False, indent=2)
+            os.replace(temp_name, self.cache_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    def _save_quietly(self) -> None:
+        try:
+            self.save()
+        except OSError as exc:
+            logger.warning("Failed to persist chat index: %s", exc)
+
+    async def build(self, page: Any, *, max_steps: int = 40) -> int:
+        """인덱스 구축/Sweep the sidebar once and cache every chat's offset.
+
+        Returns:
+            int: 인덱싱된 채팅 수 (사이드바가 없으면 0)
+        """
+        entries = await page.evaluate(
+            _BUILD_JS, {"pane": self.pane_selector, "maxSteps": max_steps}
+        )
+        self._built_at = time.monotonic()
+        if not entries:
+            return 0
+        self.offsets = {name: int(offset) for name, offset in entries.items()}
+        self._save_quietly()
+        logger.info("Chat index built with %d chats", len(self.offsets))
+        return len(self.offsets)
+
+    def _may_rebuild(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at >= self.rebuild_interval
+
+    async def open(self, page: Any, name: str, *, confirm_ms: int = 3000) -> bool:
+        """채팅 바로 열기/Open ``name`` with one in-page call; rebuild once on a miss.
+
+        A click the chat header does not confirm counts as a miss: the cached
+        entry is dropped so the caller falls back to the search path instead of
+        scraping whichever chat is open.
+
+        Returns:
+            bool: 사이드바에서 행을 클릭하고 헤더에서 전환을 확인했는지 여부
+        """
+        for attempt in range(2):
+            outcome = await page.evaluate(
+                _OPEN_JS,
+                {
+                    "pane": self.pane_selector,
+                    "name": name,
+                    "offset": self.offsets.get(name),
+                    "confirmMs": confirm_ms,
+                },
+            ) or {}
+            if outcome.get("opened") and not outcome.get("confirmed"):
+                # 다른 채팅이 열렸을 수 있음: 항목을 무효화하고 검색 경로로 넘김
+                logger.info("Chat index click on %s was not confirmed; falling back to search", name)
+                if self.offsets.pop(name, None) is not None:
+                    self._save_quietly()
+                break
+            if outcome.get("opened"):
+                self.hits += 1
+                if outcome.get("offset") is not None and self.offsets.get(name) != outcome["offset"]:
+                    self.offsets[name] = int(outcome["offset"])
+                    self._save_quietly()
+                return True
+            if attempt or not self._may_rebuild():
+                break
+            await self.build(page)
+        self.misses += 1
+        return False
+
+
+CHAT_INDEX = ChatIndex()
+
+
+async def open_chat(
+    page: Any,
+    name: str,
+    *,
+    index: Optional[ChatIndex] = None,
+    resolver: Optional[SelectorResolver] = None,
+    timeout_ms: int = 25000,
+) -> str:
+    """채팅 열기/Open a chat via the index, falling back to the search box.
+
+    Args:
+        page: Playwright Page
+        name: 채팅(그룹) 이름
+        index: 채팅 인덱스 (None이면 검색 경로만 사용)
+        resolver: 검색 경로용 셀렉터 해석기
+        timeout_ms: 메시지 목록 안정화 최대 대기
+
+    Returns:
+        str: 사용한 경로 ("index" 또는 "search")
+
+    Raises:
+        RuntimeError: 검색 결과에서도 채팅을 찾지 못했을 때
+    """
+    method = "search"
+    opened = False
+    if index is not None:
+        try:
+            opened = await index.open(page, name)
+        except Exception as exc:  # noqa: BLE001 - Playwright raises generic errors
+            logger.debug("Chat index navigation to %s failed: %s", name, exc)
+
+    if opened:
+        method = "index"
+        readiness = await wait_for_message_list_stable(page, timeout_ms=timeout_ms)
+    else:
+        search_box = await locate_search_box(page, resolver)
+        await wait_for_search_results_settled(
+            page, action=lambda: fill_search_box(search_box, name)
+        )
+        entry = await wait_for_group_entry(page, name, resolver)
+        readiness = await wait_for_message_list_stable(
+            page, action=entry.click, timeout_ms=timeout_ms
+        )
+
+    if not readiness.settled:
+        logger.warning(
+            "Message list for %s still changing after %d ms", name, readiness.elapsed_ms
+        )
+    logger.debug("Opened %s via %s", name, method)
+    return method
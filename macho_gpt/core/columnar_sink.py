@@ -0,0 +1,350 @@
+"""컬럼형 메시지 저장소. Partitioned Parquet sink for scraped WhatsApp messages.
+
+Messages from every backend (Playwright scraper, whatsapp-web.js bridge, RPA
+extractor) are normalised to one schema and written under
+``<root>/group=<name>/date=<YYYY-MM-DD>/part-*.parquet``, where the date is the
+message's send date (the scrape date when only a clock time is known). Each sink keeps one
+open ``ParquetWriter`` per partition and appends a row group per
+:meth:`ParquetMessageSink.write` call, so analytics jobs can prune partitions
+and read only the columns they need.
+
+An open file has no footer yet, so it is written as ``part-*.parquet.tmp`` and
+renamed when it is finalised (rotation or :meth:`ParquetMessageSink.close`).
+:func:`read_messages` only reads finalised files. A file is also finalised by
+the first write after it is ``max_file_age`` seconds old, which bounds how many
+row groups a crash can lose: rows written to a ``.tmp`` file since it was opened
+are unreadable after a crash. When a sink opens, it deletes ``.tmp`` files left
+by writer processes that are no longer running (checked via the pid in the file
+name; on Windows they are kept, since there is no safe liveness probe).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+if PYARROW_AVAILABLE:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+else:  # pragma: no cover - optional dependency
+    pa = None
+    ds = None
+    pq = None
+
+DEFAULT_PARQUET_ROOT = Path("data/parquet/messages")
+
+# part-<시각>-<pid>-<순번>.parquet.tmp
+_TEMP_FILE_PATTERN = re.compile(r"^part-[^-]+-(?P<pid>\d+)-\d+\.parquet\.tmp$")
+
+# 컬럼 이름/순서. Column order of the message schema.
+MESSAGE_COLUMNS: Tuple[str, ...] = (
+    "message_id",
+    "group_name",
+    "sender",
+    "text",
+    "sent_at",
+    "scraped_at",
+    "backend",
+)
+
+
+def message_schema() -> "pa.Schema":
+    """메시지 스키마. Arrow schema with dictionary-encoded low-cardinality columns."""
+
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("message_id", pa.string()),
+            ("group_name", dictionary),
+            ("sender", dictionary),
+            ("text", pa.string()),
+            ("sent_at", pa.string()),
+            ("scraped_at", pa.timestamp("us", tz="UTC")),
+            ("backend", dictionary),
+        ]
+    )
+
+
+def _parse_datetime(value: Any) -> datetime:
+    """일시 파싱. Parse ISO strings or epoch seconds, defaulting to now (UTC)."""
+
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float)):
+        parsed = datetime.fromtimestamp(value, tz=timezone.utc)
+    elif isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            parsed = datetime.now(timezone.utc)
+    else:
+        parsed = datetime.now(timezone.utc)
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def send_date(sent_at: Optional[str]) -> Optional[str]:
+    """발송일 추출. ``YYYY-MM-DD`` of an ISO send time, or None for bare clock times.
+
+    Offset-aware values are converted to UTC like ``scraped_at``; naive values
+    (backfilled WhatsApp wall-clock times) keep their own calendar day.
+    """
+
+    if not sent_at or len(sent_at) < 10:
+        return None
+    try:
+        parsed = datetime.fromisoformat(sent_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y-%m-%d")
+
+
+def normalize_message(
+    message: Any, group_name: str, backend: str
+) -> Dict[str, Any]:
+    """메시지 정규화. Map any backend's message shape onto the sink schema.
+
+    Accepts scraper dicts (``text``/``sender``/``timestamp``/``scraped_at``),
+    history backfill dicts (``message_id``/``sent_at``), whatsapp-web.js dicts
+    (``id``/``body``/``author``/``timestampIso``) and the plain strings
+    produced by the RPA extractor. Full send times win over bare ``HH:MM``
+    clock times, and WhatsApp's own ids over the derived hash.
+    """
+
+    if isinstance(message, str):
+        message = {"text": message}
+    text = str(message.get("text", message.get("body", "")) or "")
+    sender = message.get("sender") or message.get("author") or "Unknown"
+    sent_at = message.get("sent_at") or message.get("timestampIso") or message.get("timestamp")
+    scraped_at = _parse_datetime(message.get("scraped_at"))
+    message_id = message.get("message_id") or message.get("id") or hashlib.sha1(
+        f"{group_name}\x1f{sender}\x1f{sent_at}\x1f{text}".encode("utf-8")
+    ).hexdigest()
+    return {
+        "message_id": str(message_id),
+        "group_name": message.get("group_name") or group_name,
+        "sender": str(sender),
+        "text": text,
+        "sent_at": None if sent_at is None else str(sent_at),
+        "scraped_at": scraped_at,
+        "backend": backend,
+    }
+
+
+def _process_alive(pid: int) -> bool:
+    """프로세스 생존 여부 (POSIX)"""
+
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # 다른 사용자의 프로세스
+        return True
+    return True
+
+
+def partition_path(root: Path, group_name: str, date_key: str) -> Path:
+    """파티션 경로. Hive-style ``group=<name>/date=<day>`` directory."""
+
+    return root / f"group={quote(group_name, safe='')}" / f"date={date_key}"
+
+
+class ParquetMessageSink:
+    """Parquet 메시지 싱크/Incremental, partitioned Parquet writer.
+
+    Writers stay open between cycles so each :meth:`write` appends a row group
+    to the current ``.tmp`` file; a file is finalised (renamed to
+    ``.parquet``) after ``max_row_groups_per_file`` row groups, by the first
+    write after it is ``max_file_age`` seconds old, and on :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = DEFAULT_PARQUET_ROOT,
+        *,
+        max_row_groups_per_file: int = 64,
+        max_file_age: float = 300.0,
+        compression: str = "zstd",
+    ) -> None:
+        """
+        Args:
+            root: 데이터셋 루트 디렉터리
+            max_row_groups_per_file: 파일당 최대 row group 수
+            max_file_age: 열린 파일을 마감할 최대 경과 시간 (초)
+            compression: Parquet 압축 코덱
+        """
+        self.root = Path(root)
+        self.max_row_groups_per_file = max_row_groups_per_file
+        self.max_file_age = max_file_age
+        self.compression = compression
+        self.rows_written = 0
+        # 파티션 -> (writer, 임시 경로, row group 수, 생성 시각)
+        self._writers: Dict[Tuple[str, str], Tuple[Any, Path, int, float]] = {}
+        self._file_seq = 0
+        self._lock = threading.Lock()
+        if not PYARROW_AVAILABLE:
+            logger.warning("pyarrow is not installed; Parquet export is disabled")
+        else:
+            self._remove_stale_temp_files()
+
+    @property
+    def enabled(self) -> bool:
+        """사용 가능 여부/Whether pyarrow is available."""
+
+        return PYARROW_AVAILABLE
+
+    def _remove_stale_temp_files(self) -> None:
+        """크래시 잔여 파일 정리/Delete footerless ``.tmp`` files of dead writers."""
+
+        if os.name == "nt" or not self.root.is_dir():
+            return
+        for path in self.root.rglob("part-*.parquet.tmp"):
+            match = _TEMP_FILE_PATTERN.match(path.name)
+            if match is None or _process_alive(int(match.group("pid"))):
+                continue
+            try:
+                path.unlink()
+                logger.warning("Removed unfinalised Parquet file %s left by a crashed writer", path)
+            except OSError as exc:
+                logger.error("Failed to remove stale Parquet file %s: %s", path, exc)
+
+    def write(
+        self,
+        messages: Iterable[Any],
+        group_name: str,
+        *,
+        backend: str = "playwright",
+    ) -> int:
+        """메시지 추가 기록/Append messages as one row group per partition.
+
+        Returns:
+            int: 기록된 행 수
+        """
+        if not self.enabled:
+            return 0
+
+        partitions: Dict[str, List[Dict[str, Any]]] = {}
+        for message in messages:
+            row = normalize_message(message, group_name, backend)
+            # 발송일 기준 파티션, 발송일이 없을 때만 수집일 사용
+            date_key = send_date(row["sent_at"]) or row["scraped_at"].strftime("%Y-%m-%d")
+            partitions.setdefault(date_key, []).append(row)
+
+        written = 0
+        schema = message_schema()
+        with self._lock:
+            for date_key, rows in partitions.items():
+                table = pa.Table.from_pydict(
+                    {column: [row[column] for row in rows] for column in MESSAGE_COLUMNS},
+                    schema=schema,
+                )
+                writer = self._writer_for(group_name, date_key, schema)
+                writer.write_table(table)
+                written += table.num_rows
+                self._rotate_full(group_name, date_key)
+        self.rows_written += written
+        return written
+
+    def _writer_for(self, group_name: str, date_key: str, schema: "pa.Schema") -> Any:
+        """파티션 writer 조회/Return the open writer for a partition, opening a new file."""
+
+        key = (group_name, date_key)
+        entry = self._writers.get(key)
+        if entry is None:
+            directory = partition_path(self.root, group_name, date_key)
+            directory.mkdir(parents=True, exist_ok=True)
+            self._file_seq += 1
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            temp_path = directory / f"part-{stamp}-{os.getpid()}-{self._file_seq}.parquet.tmp"
+            writer = pq.ParquetWriter(
+                str(temp_path),
+                schema,
+                compression=self.compression,
+                use_dictionary=["group_name", "sender", "backend"],
+            )
+            entry = (writer, temp_path, 0, time.monotonic())
+        writer, temp_path, row_groups, opened_at = entry
+        self._writers[key] = (writer, temp_path, row_groups + 1, opened_at)
+        return writer
+
+    def _rotate_full(self, group_name: str, date_key: str) -> None:
+        key = (group_name, date_key)
+        _, _, row_groups, opened_at = self._writers[key]
+        if (
+            row_groups >= self.max_row_groups_per_file
+            or time.monotonic() - opened_at >= self.max_file_age
+        ):
+            self._finalise(key)
+
+    def _finalise(self, key: Tuple[str, str]) -> None:
+        """파일 마감/Write the footer and expose the file under its final name."""
+
+        writer, temp_path, _, _ = self._writers.pop(key)
+        try:
+            writer.close()
+            os.replace(temp_path, temp_path.with_suffix(""))
+        except Exception as exc:  # pragma: no cover - defensive guard
+            logger.error("Failed to finalise Parquet file %s: %s", temp_path, exc)
+
+    def close(self) -> None:
+        """파일 마감/Finalise all open Parquet files."""
+
+        with self._lock:
+            for key in list(self._writers):
+                self._finalise(key)
+
+    def __enter__(self) -> "ParquetMessageSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_messages(
+    root: str | Path = DEFAULT_PARQUET_ROOT,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    groups: Optional[Sequence[str]] = None,
+    dates: Optional[Sequence[str]] = None,
+) -> "pa.Table":
+    """파티션 선택 읽기/Read selected columns, pruning group/date partitions."""
+
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required to read Parquet message exports")
+
+    partition_schema = pa.schema([("group", pa.string()), ("date", pa.string())])
+    partitioning = ds.partitioning(partition_schema, flavor="hive")
+    # 작성 중인 part-*.parquet.tmp (footer 없음)는 제외하고 마감된 파일만 읽음
+    files = sorted(str(path) for path in Path(root).rglob("part-*.parquet"))
+    dataset = ds.dataset(
+        files,
+        schema=None if files else pa.unify_schemas([message_schema(), partition_schema]),
+        format="parquet",
+        partitioning=partitioning,
+        partition_base_dir=str(root),
+    )
+    expression = None
+    if groups:
+        expression = ds.field("group").isin(list(groups))
+    if dates:
+        date_filter = ds.field("date").isin(list(dates))
+        expression = date_filter if expression is None else expression & date_filter
+    return dataset.to_table(columns=list(columns) if columns else None, filter=expression)
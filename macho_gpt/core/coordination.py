@@ -0,0 +1,549 @@
+"""노드 간 그룹 임대 조정. Lease-based group ownership across scraper nodes.
+
+Several scraper nodes (VMs or processes) share one lease store. Each node
+keeps a ``node:<id>`` lease alive as its heartbeat and holds time-bounded
+``group:<name>`` leases for the groups it scrapes:
+
+* every tick the node renews its leases; a lease it could not renew is
+  reported as lost so the caller stops that group
+* the fair share is ``ceil(groups / live nodes)``; nodes above it hand off
+  their least-preferred groups, nodes below it claim free or expired ones
+* a hand-off keeps renewing the lease until the caller has stopped the
+  scraper (:meth:`LeaseCoordinator.finish_release`), so two nodes never
+  scrape the same group; stops run as tasks so heartbeats keep going
+* preference uses rendezvous hashing, so assignments stay stable while
+  nodes come and go
+* a node that cannot reach the store drops all its groups (self-fencing)
+  once ``ttl - heartbeat`` has passed since the last successful renewal, and
+  stops them within the time left on the lease, so its scrapers are down
+  before another node can take the expired leases
+
+Backends: :class:`SqliteLeaseBackend` (single file, also usable on NFS),
+:class:`FileLeaseBackend` (JSON file guarded by an OS file lock) and
+:class:`RedisLeaseBackend` (any Redis-compatible server, optional ``redis``
+package). Lease times use the wall clock, so nodes need NTP-synchronised
+clocks with skew well below the TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import math
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import (
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import urlparse
+
+from .file_lock import exclusive_file_lock
+
+logger = logging.getLogger(__name__)
+
+REDIS_AVAILABLE = importlib.util.find_spec("redis") is not None
+if REDIS_AVAILABLE:
+    import redis  # type: ignore
+else:  # pragma: no cover - optional dependency
+    redis = None
+
+NODE_PREFIX = "node:"
+GROUP_PREFIX = "group:"
+
+
+@dataclass(slots=True)
+class Lease:
+    """임대/A time-bounded ownership record with a fencing token."""
+
+    key: str
+    owner: str
+    expires_at: float
+    token: int = 1
+
+
+def _claim(
+    leases: Dict[str, Lease], key: str, owner: str, ttl: float, now: float, *, renew_only: bool
+) -> Optional[Lease]:
+    current = leases.get(key)
+    if current is not None and current.owner != owner and current.expires_at > now:
+        return None
+    if renew_only and (current is None or current.owner != owner):
+        return None
+    # 소유자가 바뀔 때만 펜싱 토큰 증가
+    token = current.token if current is not None and current.owner == owner else (current.token + 1 if current else 1)
+    lease = Lease(key, owner, now + ttl, token)
+    leases[key] = lease
+    return lease
+
+
+class LeaseBackend(ABC):
+    """임대 저장소 인터페이스/Lease store with atomic acquire, renew and release."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+
+    @abstractmethod
+    def acquire(self, key: str, owner: str, ttl: float) -> Optional[Lease]:
+        """임대 획득/Take ``key`` if free, expired or already ours."""
+
+    @abstractmethod
+    def renew(self, key: str, owner: str, ttl: float) -> Optional[Lease]:
+        """임대 갱신/Extend ``key`` only if ``owner`` still holds it."""
+
+    @abstractmethod
+    def release(self, key: str, owner: str) -> None:
+        """임대 반환/Drop ``key`` if ``owner`` holds it."""
+
+    @abstractmethod
+    def active(self, prefix: str = "") -> Dict[str, Lease]:
+        """유효 임대 목록/Unexpired leases whose key starts with ``prefix``."""
+
+
+class TransactionalLeaseBackend(LeaseBackend):
+    """읽기-수정-쓰기 임대 저장소/Lease store built on one locked transaction.
+
+    Subclasses implement :meth:`_transact`, which loads every lease under an
+    exclusive lock, lets a function mutate the mapping and persists it.
+    """
+
+    @abstractmethod
+    def _transact(self) -> ContextManager[Dict[str, Lease]]:
+        """잠금 트랜잭션/Context manager yielding the mutable lease mapping."""
+
+    def acquire(self, key: str, owner: str, ttl: float) -> Optional[Lease]:
+        with self._transact() as leases:
+            return _claim(leases, key, owner, ttl, self.clock(), renew_only=False)
+
+    def renew(self, key: str, owner: str, ttl: float) -> Optional[Lease]:
+        with self._transact() as leases:
+            return _claim(leases, key, owner, ttl, self.clock(), renew_only=True)
+
+    def release(self, key: str, owner: str) -> None:
+        with self._transact() as leases:
+            current = leases.get(key)
+            if current is not None and current.owner == owner:
+                # 토큰 연속성을 위해 만료 상태로 남김
+                current.expires_at = 0.0
+
+    def active(self, prefix: str = "") -> Dict[str, Lease]:
+        now = self.clock()
+        with self._transact() as leases:
+            return {
+                key: Lease(lease.key, lease.owner, lease.expires_at, lease.token)
+                for key, lease in leases.items()
+                if key.startswith(prefix) and lease.expires_at > now
+            }
+
+
+class SqliteLeaseBackend(TransactionalLeaseBackend):
+    """SQLite 임대 저장소/Lease table in one SQLite file (``BEGIN IMMEDIATE`` locking)."""
+
+    def __init__(self, path: str | Path, clock: Callable[[], float] = time.time) -> None:
+        super().__init__(clock)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "key TEXT PRIMARY KEY, owner TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, token INTEGER NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # NFS에서는 WAL을 쓸 수 없으므로 기본 롤백 저널 사용
+        return sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+
+    @contextmanager
+    def _transact(self) -> Iterator[Dict[str, Lease]]:
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute("SELECT key, owner, expires_at, token FROM leases").fetchall()
+            leases = {row[0]: Lease(*row) for row in rows}
+            before = {key: asdict(lease) for key, lease in leases.items()}
+            try:
+                yield leases
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            for key, lease in leases.items():
+                if before.get(key) != asdict(lease):
+                    connection.execute(
+                        "INSERT OR REPLACE INTO leases (key, owner, expires_at, token) VALUES (?, ?, ?, ?)",
+                        (lease.key, lease.owner, lease.expires_at, lease.token),
+                    )
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+
+class FileLeaseBackend(TransactionalLeaseBackend):
+    """파일 잠금 임대 저장소/JSON lease file guarded by an exclusive OS file lock."""
+
+    def __init__(self, directory: str | Path, clock: Callable[[], float] = time.time) -> None:
+        super().__init__(clock)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.data_path = self.directory / "leases.json"
+        self.lock_path = self.directory / "leases.lock"
+
+    @contextmanager
+    def _transact(self) -> Iterator[Dict[str, Lease]]:
+        with exclusive_file_lock(self.lock_path):
+            try:
+                with open(self.data_path, "r", encoding="utf-8") as handle:
+                    raw = json.load(handle)
+            except FileNotFoundError:
+                raw = {}
+            leases = {key: Lease(**value) for key, value in raw.items()}
+            yield leases
+            payload = {key: asdict(lease) for key, lease in leases.items()}
+            if payload == raw:
+                return
+            handle_fd, temp_name = tempfile.mkstemp(
+                prefix=".leases-", suffix=".tmp", dir=str(self.directory)
+            )
+            try:
+                with os.fdopen(handle_fd, "w", encoding="utf-8") as temp_file:
+                    json.dump(payload, temp_file, ensure_ascii=False)
+                os.replace(temp_name, self.data_path)
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+
+
+# 현재 값이 비었거나 자신이면 설정; 소유자 변경 시 토큰 증가
+_REDIS_ACQUIRE = """
+local current = redis.call('GET', KEYS[1])
+if current and current ~= ARGV[1] then return false end
+if ARGV[3] == '1' and current ~= ARGV[1] then return false end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+if current == ARGV[1] then
+  return tonumber(redis.call('GET', KEYS[2]) or '1')
+end
+return redis.call('INCR', KEYS[2])
+"""
+
+_REDIS_RELEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+
+class RedisLeaseBackend(LeaseBackend):
+    """Redis 임대 저장소/Leases as expiring keys on a Redis-compatible server."""
+
+    def __init__(self, url: str, *, namespace: str = "macho:lease:", clock: Callable[[], float] = time.time) -> None:
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis is required for the Redis lease backend")
+        super().__init__(clock)
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.namespace = namespace
+        self._acquire = self.client.register_script(_REDIS_ACQUIRE)
+        self._release = self.client.register_script(_REDIS_RELEASE)
+
+    def _keys(self, key: str) -> List[str]:
+        return [f"{self.namespace}{key}", f"{self.namespace}token:{key}"]
+
+    def _set(self, key: str, owner: str, ttl: float, renew_only: bool) -> Optional[Lease]:
+        token = self._acquire(keys=self._keys(key), args=[owner, int(ttl * 1000), "1" if renew_only else "0"])
+        if token is None:
+            return None
+        return Lease(key, owner, self.clock() + ttl, int(token))
+
+    def acquire(self, key: str, owner: str, ttl: float) -> Optional[Lease]:
+        return self._set(key, owner, ttl, renew_only=False)
+
+    def renew(self, key: str, owner: str, ttl: float) -> Optional[Lease]:
+        return self._set(key, owner, ttl, renew_only=True)
+
+    def release(self, key: str, owner: str) -> None:
+        self._release(keys=self._keys(key)[:1], args=[owner])
+
+    def active(self, prefix: str = "") -> Dict[str, Lease]:
+        leases: Dict[str, Lease] = {}
+        now = self.clock()
+        for name in self.client.scan_iter(match=f"{self.namespace}{prefix}*"):
+            key = name[len(self.namespace):]
+            if key.startswith("token:"):
+                continue
+            owner = self.client.get(name)
+            remaining_ms = self.client.pttl(name)
+            if owner is None or remaining_ms <= 0:
+                continue
+            token = int(self.client.get(self._keys(key)[1]) or 1)
+            leases[key] = Lease(key, owner, now + remaining_ms / 1000, token)
+        return leases
+
+
+def backend_from_url(url: str) -> LeaseBackend:
+    """URL로 백엔드 생성/``sqlite:///path.db``, ``file:///dir`` or ``redis://host:6379/0``."""
+
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        return SqliteLeaseBackend(parsed.netloc + parsed.path)
+    if parsed.scheme == "file":
+        return FileLeaseBackend(parsed.netloc + parsed.path)
+    if parsed.scheme in {"redis", "rediss", "unix"}:
+        return RedisLeaseBackend(url)
+    raise ValueError(f"Unsupported coordination backend: {url}")
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseCoordinator:
+    """그룹 임대 조정기/Keep this node's fair share of group leases."""
+
+    def __init__(
+        self,
+        backend: LeaseBackend,
+        groups: Sequence[str],
+        *,
+        node_id: Optional[str] = None,
+        ttl: float = 30.0,
+        heartbeat: Optional[float] = None,
+        fence_after: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            backend: 임대 저장소
+            groups: 조정 대상 그룹 이름
+            node_id: 노드 식별자 (기본: 호스트명-PID)
+            ttl: 임대 유효 시간 (초)
+            heartbeat: 갱신 주기 (기본: ttl / 3)
+            fence_after: 저장소 장애 시 자가 차단까지의 시간 (기본/상한: ttl - heartbeat)
+        """
+        self.backend = backend
+        self.groups = list(dict.fromkeys(groups))
+        self.node_id = node_id or default_node_id()
+        self.ttl = ttl
+        self.heartbeat = heartbeat if heartbeat is not None else ttl / 3
+        # 임대 만료 전에 스크래퍼가 멈추도록 TTL보다 한 하트비트 먼저 차단
+        self.fence_after = min(
+            fence_after if fence_after is not None else self.ttl - self.heartbeat,
+            self.ttl - self.heartbeat,
+        )
+        self.owned: Dict[str, Lease] = {}
+        # 반환 예정 그룹: 스크래퍼가 멈출 때까지 임대를 계속 갱신
+        self.draining: Dict[str, Lease] = {}
+        self.closing = False
+        self._last_ok = time.monotonic()
+
+    def _score(self, node: str, group: str) -> int:
+        return int(hashlib.sha1(f"{node}|{group}".encode("utf-8")).hexdigest()[:12], 16)
+
+    def _preference(self, group: str, nodes: Sequence[str]) -> Tuple[bool, int]:
+        # 랑데부 해싱: 살아 있는 노드 중 자신이 최고 점수인 그룹을 우선
+        mine = self._score(self.node_id, group)
+        winner = all(mine >= self._score(node, group) for node in nodes)
+        return winner, mine
+
+    def _drop_all(self) -> List[str]:
+        lost = list(self.owned)
+        self.owned.clear()
+        self.draining.clear()
+        return lost
+
+    def tick(self) -> Tuple[List[str], List[str]]:
+        """
+        임대 갱신/재분배 1회
+
+        Groups above the fair share (or every group once :attr:`closing` is
+        set) move to :attr:`draining` and are returned as released; their
+        leases are only given up by :meth:`finish_release`.
+
+        Returns:
+            Tuple: (새로 획득한 그룹, 잃었거나 반환 예정인 그룹)
+        """
+        acquired: List[str] = []
+        released: List[str] = []
+        # 갱신 시작 시각 기준: 임대는 이 시각 이후에 갱신되므로 만료 시점을 보수적으로 추정
+        started = time.monotonic()
+        try:
+            self.backend.acquire(f"{NODE_PREFIX}{self.node_id}", self.node_id, self.ttl)
+            for group in list(self.owned):
+                lease = self.backend.renew(f"{GROUP_PREFIX}{group}", self.node_id, self.ttl)
+                if lease is None:
+                    del self.owned[group]
+                    released.append(group)
+                    logger.warning(f"Lease for {group} lost by {self.node_id}")
+                else:
+                    self.owned[group] = lease
+            for group in list(self.draining):
+                lease = self.backend.renew(f"{GROUP_PREFIX}{group}", self.node_id, self.ttl)
+                if lease is None:
+                    del self.draining[group]
+                    logger.warning(f"Lease for {group} lost by {self.node_id} while stopping")
+                else:
+                    self.draining[group] = lease
+
+            nodes = sorted(
+                {lease.owner for lease in self.backend.active(NODE_PREFIX).values()} | {self.node_id}
+            )
+            share = math.ceil(len(self.groups) / len(nodes)) if self.groups else 0
+            if self.closing:
+                share = 0
+
+            if len(self.owned) > share:
+                extras = sorted(self.owned, key=lambda group: self._preference(group, nodes))
+                for group in extras[: len(self.owned) - share]:
+                    self.draining[group] = self.owned.pop(group)
+                    released.append(group)
+
+            if len(self.owned) < share:
+                held = self.backend.active(GROUP_PREFIX)
+                candidates = [
+                    group
+                    for group in self.groups
+                    if group not in self.owned and f"{GROUP_PREFIX}{group}" not in held
+                ]
+                candidates.sort(key=lambda group: self._preference(group, nodes), reverse=True)
+                for group in candidates:
+                    if len(self.owned) >= share:
+                        break
+                    lease = self.backend.acquire(f"{GROUP_PREFIX}{group}", self.node_id, self.ttl)
+                    if lease is not None:
+                        self.owned[group] = lease
+                        acquired.append(group)
+
+            self._last_ok = started
+        except Exception as e:  # 저장소 장애 (NFS/Redis 연결 등)
+            logger.error(f"Lease store unavailable for {self.node_id}: {e}")
+            if (self.owned or self.draining) and time.monotonic() - self._last_ok >= self.fence_after:
+                # 임대가 만료되어 다른 노드가 가져가기 전에 스스로 중단
+                logger.warning(f"{self.node_id} fencing itself: lease store unreachable")
+                released.extend(self._drop_all())
+
+        if acquired or released:
+            logger.info(
+                f"{self.node_id} owns {sorted(self.owned)} (acquired {acquired}, released {released})"
+            )
+        return acquired, released
+
+    def stop_timeout(self, group: str, default: float = 30.0) -> float:
+        """
+        그룹 중지 대기 한도 (초)
+
+        Handed-off groups keep renewing their lease, so they may stop
+        gracefully within ``default``. Lost or fenced groups must be down
+        before their last renewal expires.
+        """
+        if group in self.draining:
+            return default
+        remaining = self._last_ok + self.ttl - time.monotonic()
+        return max(0.0, min(default, remaining))
+
+    def finish_release(self, group: str) -> None:
+        """반환 완료/Give up a drained lease once the group's scraper has stopped."""
+
+        if self.draining.pop(group, None) is None:
+            return
+        try:
+            self.backend.release(f"{GROUP_PREFIX}{group}", self.node_id)
+        except Exception as e:  # 만료되면 다른 노드가 가져감
+            logger.warning(f"Failed to release lease for {group}: {e}")
+
+    def close(self) -> List[str]:
+        """모든 임대 반환/Release every lease held by this node."""
+
+        released = [*self.owned, *self.draining]
+        self._drop_all()
+        try:
+            for group in released:
+                self.backend.release(f"{GROUP_PREFIX}{group}", self.node_id)
+            self.backend.release(f"{NODE_PREFIX}{self.node_id}", self.node_id)
+        except Exception as e:
+            logger.warning(f"Failed to release leases for {self.node_id}: {e}")
+        return released
+
+    async def run(
+        self,
+        on_acquire: Callable[[str], Awaitable[None]],
+        on_release: Callable[[str], Awaitable[None]],
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> None:
+        """
+        하트비트 루프 (저장소 호출은 스레드에서 실행)
+
+        Callbacks run as per-group tasks chained in order, so a slow stop
+        never delays heartbeats. A handed-off lease is released only after
+        ``on_release`` returns.
+
+        Args:
+            on_acquire: 그룹 획득 시 호출 (스크래퍼 시작)
+            on_release: 그룹 상실/반환 시 호출 (스크래퍼 중지)
+            stop_event: 설정되면 모든 그룹을 중지한 뒤 임대 반환
+        """
+        stop_event = stop_event or asyncio.Event()
+        transitions: Dict[str, asyncio.Task] = {}
+
+        def schedule(group: str, callback: Callable[[str], Awaitable[None]]) -> None:
+            previous = transitions.get(group)
+
+            async def step() -> None:
+                if previous is not None:
+                    await asyncio.gather(previous, return_exceptions=True)
+                try:
+                    await callback(group)
+                finally:
+                    if callback is on_release:
+                        await asyncio.to_thread(self.finish_release, group)
+
+            def finished(task: asyncio.Task) -> None:
+                if transitions.get(group) is task:
+                    del transitions[group]
+                if not task.cancelled() and task.exception() is not None:
+                    logger.error(f"Lease callback for {group} failed: {task.exception()}")
+
+            task = asyncio.ensure_future(step())
+            transitions[group] = task
+            task.add_done_callback(finished)
+
+        try:
+            while True:
+                # 종료 요청 시 모든 그룹을 반환 예정으로 돌리고 중지될 때까지 하트비트 유지
+                self.closing = stop_event.is_set()
+                acquired, released = await asyncio.to_thread(self.tick)
+                for group in released:
+                    schedule(group, on_release)
+                for group in acquired:
+                    schedule(group, on_acquire)
+                if self.closing:
+                    if not (self.owned or self.draining or transitions):
+                        break
+                    if transitions:
+                        await asyncio.wait(list(transitions.values()), timeout=self.heartbeat)
+                    else:
+                        await asyncio.sleep(self.heartbeat)
+                    continue
+                try:
+                    await asyncio.wait_for(stop_event.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if transitions:
+                await asyncio.gather(*transitions.values(), return_exceptions=True)
+            # 비정상 종료 시 남은 그룹도 먼저 중지한 뒤 임대 반환
+            for group in [*self.owned, *self.draining]:
+                await on_release(group)
+            await asyncio.to_thread(self.close)
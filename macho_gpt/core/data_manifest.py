@@ -0,0 +1,235 @@
+"""데이터 매니페스트. Sidecar manifest of per-file summaries for ``data/`` outputs.
+
+Writers call :func:`record_data_file` after saving a JSON output; the summary
+(status, message count, last timestamp) is stored with the file's mtime and
+size in ``<dir>/_manifest.json``. Readers such as ``tools/status_monitor.py``
+use :meth:`DataManifest.refresh`, which only re-parses files whose mtime or
+size no longer match the manifest.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .file_lock import exclusive_file_lock
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_manifest.json"
+LOCK_NAME = "_manifest.lock"
+MANIFEST_VERSION = 1
+
+_MANIFEST_LOCK = threading.Lock()
+
+
+def _latest(values: Iterable[Any]) -> Optional[str]:
+    """최신 시각 선택/Return the greatest non-empty ISO timestamp string."""
+
+    candidates = [str(value) for value in values if value]
+    return max(candidates) if candidates else None
+
+
+def summarize_payload(payload: Any) -> Dict[str, Any]:
+    """출력 요약/Summarize a scraper, RPA or extraction JSON payload.
+
+    Returns:
+        Dict: status, message_count, last_timestamp 및 채팅방별 entries
+    """
+
+    entries: List[Dict[str, Any]] = []
+    if isinstance(payload, list):
+        if payload and all(isinstance(item, dict) and "status" in item for item in payload):
+            entries = [
+                {
+                    "chat_title": item.get("chat_title", "Unknown"),
+                    "status": item.get("status", "Unknown"),
+                    "message_count": int(item.get("message_count", 0) or 0),
+                }
+                for item in payload
+            ]
+            success = sum(1 for entry in entries if entry["status"] == "SUCCESS")
+            return {
+                "kind": "results",
+                "status": f"{success}/{len(entries)}",
+                "success_count": success,
+                "total_count": len(entries),
+                "message_count": sum(entry["message_count"] for entry in entries),
+                "last_timestamp": _latest(
+                    item.get("extraction_time") or item.get("timestamp") for item in payload
+                ),
+                "entries": entries,
+            }
+        messages = [item for item in payload if isinstance(item, dict)]
+        return {
+            "kind": "messages",
+            "status": "SUCCESS",
+            "message_count": len(payload),
+            "last_timestamp": _latest(message.get("scraped_at") for message in messages),
+        }
+
+    if isinstance(payload, dict):
+        group = payload.get("group")
+        if isinstance(group, dict):
+            messages = group.get("messages", [])
+            return {
+                "kind": "webjs",
+                "status": payload.get("status", "Unknown"),
+                "message_count": len(messages),
+                "last_timestamp": payload.get("saved_at")
+                or _latest(message.get("timestampIso") for message in messages),
+            }
+        if "status" in payload:
+            return {
+                "kind": "result",
+                "status": payload.get("status", "Unknown"),
+                "message_count": int(payload.get("message_count", 0) or 0),
+                "last_timestamp": payload.get("extraction_time") or payload.get("timestamp"),
+            }
+        snapshots = [value for value in payload.values() if isinstance(value, dict)]
+        return {
+            "kind": "snapshots",
+            "status": "SUCCESS" if snapshots else "Unknown",
+            "message_count": sum(int(item.get("message_count", 0) or 0) for item in snapshots),
+            "last_timestamp": _latest(item.get("extraction_time") for item in snapshots),
+            "entries": [
+                {
+                    "chat_title": item.get("chat_title", "Unknown"),
+                    "status": "SUCCESS",
+                    "message_count": int(item.get("message_count", 0) or 0),
+                }
+                for item in snapshots
+            ],
+        }
+
+    return {"kind": "unknown", "status": "Unknown", "message_count": 0, "last_timestamp": None}
+
+
+class DataManifest:
+    """데이터 디렉터리 매니페스트/Per-directory manifest of output summaries."""
+
+    def __init__(self, directory: str | Path = "data") -> None:
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_NAME
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.rescanned = 0
+        self._load()
+
+    @contextmanager
+    def locked(self) -> Iterator["DataManifest"]:
+        """갱신 잠금/Reload and hold the manifest for a read-modify-write cycle.
+
+        Shard workers and other nodes sharing the directory update the same
+        file, so the process-local lock is combined with an OS file lock and
+        the manifest is re-read under it before changes are applied.
+        """
+
+        with _MANIFEST_LOCK, exclusive_file_lock(self.directory / LOCK_NAME):
+            self.files = {}
+            self._load()
+            yield self
+
+    def _load(self) -> None:
+        """매니페스트 로드/Load the manifest, tolerating a missing or corrupt file."""
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable data manifest %s: %s", self.path, exc)
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.files = dict(data.get("files", {}))
+
+    def save(self) -> None:
+        """원자적 저장/Write the manifest via a temporary file and ``os.replace``."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = {"version": MANIFEST_VERSION, "files": self.files}
+        handle, temp_name = tempfile.mkstemp(
+            prefix=".manifest-", suffix=".tmp", dir=str(self.directory)
+        )
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                json.dump(payload, temp_file, ensure_ascii=False)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_name, self.path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _signature(path: Path) -> Dict[str, int]:
+        stat = path.stat()
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def record(self, path: str | Path, payload: Any) -> Dict[str, Any]:
+        """파일 요약 기록/Store the summary of a freshly written file."""
+
+        file_path = Path(path)
+        entry = {**summarize_payload(payload), **self._signature(file_path)}
+        self.files[file_path.name] = entry
+        return entry
+
+    def refresh(self, paths: Iterable[str | Path]) -> Dict[str, Dict[str, Any]]:
+        """변경분만 재스캔/Return summaries, re-parsing files whose mtime changed.
+
+        Entries for files that no longer exist are dropped and the manifest is
+        saved only when something changed.
+        """
+
+        with self.locked():
+            return self._refresh(paths)
+
+    def _refresh(self, paths: Iterable[str | Path]) -> Dict[str, Dict[str, Any]]:
+        summaries: Dict[str, Dict[str, Any]] = {}
+        changed = False
+        self.rescanned = 0
+        for path in paths:
+            file_path = Path(path)
+            try:
+                signature = self._signature(file_path)
+            except FileNotFoundError:
+                continue
+            entry = self.files.get(file_path.name)
+            if entry is None or any(entry.get(key) != value for key, value in signature.items()):
+                try:
+                    with open(file_path, "r", encoding="utf-8") as handle:
+                        payload = json.load(handle) if signature["size"] else None
+                    entry = {**summarize_payload(payload), **signature}
+                except (OSError, json.JSONDecodeError) as exc:
+                    entry = {"kind": "error", "status": "Unknown", "message_count": 0,
+                             "last_timestamp": None, "error": str(exc), **signature}
+                self.files[file_path.name] = entry
+                self.rescanned += 1
+                changed = True
+            summaries[file_path.name] = entry
+
+        for name in [name for name in self.files if not (self.directory / name).exists()]:
+            del self.files[name]
+            changed = True
+        if changed:
+            self.save()
+        return summaries
+
+
+def record_data_file(path: str | Path, payload: Any) -> None:
+    """작성자 훅/Update the manifest next to ``path`` after a JSON write."""
+
+    file_path = Path(path)
+    try:
+        manifest = DataManifest(file_path.parent)
+        with manifest.locked():
+            manifest.record(file_path, payload)
+            manifest.save()
+    except OSError as exc:
+        logger.warning("Failed to update data manifest for %s: %s", file_path, exc)
@@ -0,0 +1,41 @@
+"""프로세스 간 파일 잠금. Exclusive advisory lock on a sidecar lock file.
+
+``threading.Lock`` only serialises writers inside one process. Shard workers
+and scraper nodes that share ``data/`` need an OS-level lock around their
+read-modify-write cycles: POSIX record locks (``fcntl.lockf``, which also work
+on NFS) or ``msvcrt.locking`` on Windows.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+if os.name == "nt":  # pragma: no cover - platform specific
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def exclusive_file_lock(path: str | Path) -> Iterator[None]:
+    """배타 잠금/Hold an exclusive lock on ``path`` (created if missing)."""
+
+    lock_path = Path(path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as handle:
+        if os.name == "nt":  # pragma: no cover - platform specific
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.lockf(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":  # pragma: no cover - platform specific
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.lockf(handle.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,416 @@
+"""대화 기록 백필. Adaptive history backfill for WhatsApp Web's virtualized message list.
+
+WhatsApp Web only keeps a window of message rows mounted; rows scrolled past
+are unmounted. Reading the list once after a fixed number of PageUp presses
+therefore loses everything outside the final window. :class:`HistoryBackfill`
+scrolls the conversation upward in adaptive steps and harvests the rows that
+are mounted after every step, deduplicating by ``data-id``:
+
+* consecutive harvests must overlap; when they do not, the step was too large
+  and the engine scrolls back and halves it, so no row is skipped
+* steps grow while a scroll yields few new rows and shrink when it yields many
+* harvested rows are streamed to an ``on_batch`` callback and only a bounded
+  window of recent ids is kept in memory
+* the run stops at a target date, a message count, the cursor stored by the
+  previous completed run, or the top of the history
+* progress is checkpointed after each flushed batch, so an interrupted run
+  resumes past the oldest message it already delivered
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .readiness import MESSAGE_PANEL_SELECTOR, wait_for_dom_quiet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = Path("data") / "backfill"
+
+# 스크롤 컨테이너 탐색 후 step 픽셀만큼 위로 이동
+_SCROLL_JS = """
+({selector, step}) => {
+  const panel = document.querySelector(selector);
+  if (!panel) return null;
+  const scrollable = el => el && el.scrollHeight > el.clientHeight + 1
+    && ['auto', 'scroll'].includes(getComputedStyle(el).overflowY);
+  let container = panel;
+  for (let depth = 0; container && depth < 6 && !scrollable(container); depth++) {
+    container = container.parentElement;
+  }
+  if (!scrollable(container)) container = panel;
+  const before = container.scrollTop;
+  container.scrollTop = Math.max(0, before + step);
+  return {before, after: container.scrollTop, viewport: container.clientHeight};
+}
+"""
+
+# 현재 마운트된 최상위 메시지 행 수집 (DOM 순서 = 오래된 순)
+_HARVEST_JS = """
+(selector) => {
+  const panel = document.querySelector(selector);
+  if (!panel) return [];
+  return Array.from(panel.querySelectorAll('[data-id]'))
+    .filter(row => !row.parentElement.closest('[data-id]'))
+    .map(row => {
+      const textNode = row.querySelector('[data-testid="msg-text"], span.selectable-text');
+      const meta = row.querySelector('[data-pre-plain-text]');
+      const sender = row.querySelector('[data-testid="msg-sender"]');
+      return {
+        id: row.getAttribute('data-id'),
+        text: textNode ? textNode.innerText : '',
+        pre_plain: meta ? meta.getAttribute('data-pre-plain-text') : '',
+        sender: sender ? sender.innerText : '',
+        raw_text: row.innerText || '',
+      };
+    });
+}
+"""
+
+_PRE_PLAIN_PATTERN = re.compile(r"^\[(?P<time>[^,\]]+),\s*(?P<date>[^\]]+)\]\s*(?P<sender>.*?):\s*$")
+
+
+def parse_pre_plain_text(value: str, *, day_first: bool = False) -> Tuple[Optional[datetime], str]:
+    """``data-pre-plain-text`` 파싱/Parse ``"[10:32, 7/25/2025] Sender: "``.
+
+    Handles 12/24-hour clocks (AM/PM, 오전/오후) and M/D/Y, D/M/Y and
+    ``2025. 7. 25.`` dates. Ambiguous numeric dates follow ``day_first``.
+
+    Returns:
+        Tuple: (발송 시각 또는 None, 발신자)
+    """
+    match = _PRE_PLAIN_PATTERN.match(value.strip()) if value else None
+    if not match:
+        return None, ""
+    sender = match.group("sender").strip()
+    clock = match.group("time")
+    date_parts = [int(part) for part in re.findall(r"\d+", match.group("date"))]
+    time_parts = [int(part) for part in re.findall(r"\d+", clock)]
+    if len(date_parts) != 3 or len(time_parts) < 2:
+        return None, sender
+
+    if date_parts[0] > 31:
+        year, month, day = date_parts
+    else:
+        first, second, year = date_parts
+        if first > 12 or (day_first and second <= 12):
+            day, month = first, second
+        else:
+            month, day = first, second
+        if year < 100:
+            year += 2000
+
+    hour, minute = time_parts[0], time_parts[1]
+    lowered = clock.lower()
+    if ("pm" in lowered or "오후" in clock) and hour < 12:
+        hour += 12
+    elif ("am" in lowered or "오전" in clock) and hour == 12:
+        hour = 0
+    try:
+        return datetime(year, month, day, hour, minute), sender
+    except ValueError:
+        return None, sender
+
+
+@dataclass(slots=True)
+class BackfillCheckpoint:
+    """백필 체크포인트/Resumable backfill progress for one group."""
+
+    group_name: str
+    cursor_id: Optional[str] = None
+    newest_id: Optional[str] = None
+    oldest_id: Optional[str] = None
+    oldest_sent_at: Optional[str] = None
+    harvested: int = 0
+    complete: bool = False
+    updated_at: Optional[str] = None
+
+    @staticmethod
+    def path_for(group_name: str, directory: str | Path = DEFAULT_CHECKPOINT_DIR) -> Path:
+        group_hash = hashlib.md5(group_name.encode("utf-8")).hexdigest()[:8]
+        return Path(directory) / f"backfill_{group_hash}.json"
+
+    @classmethod
+    def load(cls, group_name: str, directory: str | Path = DEFAULT_CHECKPOINT_DIR) -> "BackfillCheckpoint":
+        path = cls.path_for(group_name, directory)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return cls(group_name)
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable backfill checkpoint %s: %s", path, exc)
+            return cls(group_name)
+        known = {name: data[name] for name in cls.__dataclass_fields__ if name in data}
+        known["group_name"] = group_name
+        return cls(**known)
+
+    def save(self, directory: str | Path = DEFAULT_CHECKPOINT_DIR) -> None:
+        """원자적 저장/Write the checkpoint via a temporary file and ``os.replace``."""
+
+        path = self.path_for(self.group_name, directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.updated_at = datetime.now(timezone.utc).isoformat()
+        handle, temp_name = tempfile.mkstemp(prefix=".backfill-", suffix=".tmp", dir=str(path.parent))
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                json.dump(asdict(self), temp_file, ensure_ascii=False, indent=2)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+
+@dataclass(slots=True)
+class BackfillResult:
+    """백필 결과/Summary of one backfill run."""
+
+    harvested: int = 0
+    steps: int = 0
+    backtracks: int = 0
+    stop_reason: str = ""
+    oldest_sent_at: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    resumed: bool = False
+
+
+class HistoryBackfill:
+    """적응형 기록 백필 엔진/Scroll upward adaptively and stream unseen rows."""
+
+    def __init__(
+        self,
+        group_name: str,
+        *,
+        checkpoint_dir: Optional[str | Path] = DEFAULT_CHECKPOINT_DIR,
+        initial_step_px: int = 600,
+        min_step_px: int = 150,
+        max_step_px: int = 4000,
+        target_new_per_step: int = 30,
+        batch_size: int = 200,
+        dedupe_window: int = 5000,
+        max_idle_steps: int = 3,
+        day_first: bool = False,
+        return_to_latest: bool = True,
+    ) -> None:
+        """
+        Args:
+            group_name: 그룹 이름 (체크포인트 키)
+            checkpoint_dir: 체크포인트 디렉터리 (None이면 저장 안 함)
+            initial_step_px: 첫 스크롤 간격
+            min_step_px: 최소 스크롤 간격
+            max_step_px: 최대 스크롤 간격
+            target_new_per_step: 스텝당 목표 신규 메시지 수
+            batch_size: on_batch 호출 단위
+            dedupe_window: 메모리에 유지할 최근 data-id 수
+            max_idle_steps: 새 행 없이 맨 위에 머문 횟수 한도
+            day_first: 모호한 날짜를 D/M/Y로 해석할지 여부
+            return_to_latest: 종료 후 최신 메시지 위치로 되돌릴지 여부
+        """
+        self.group_name = group_name
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir is not None else None
+        self.initial_step_px = initial_step_px
+        self.min_step_px = min_step_px
+        self.max_step_px = max_step_px
+        self.target_new_per_step = target_new_per_step
+        self.batch_size = batch_size
+        self.dedupe_window = dedupe_window
+        self.max_idle_steps = max_idle_steps
+        self.day_first = day_first
+        self.return_to_latest = return_to_latest
+
+    def load_checkpoint(self) -> BackfillCheckpoint:
+        if self.checkpoint_dir is None:
+            return BackfillCheckpoint(self.group_name)
+        return BackfillCheckpoint.load(self.group_name, self.checkpoint_dir)
+
+    def _save_checkpoint(self, checkpoint: BackfillCheckpoint) -> None:
+        if self.checkpoint_dir is not None:
+            checkpoint.save(self.checkpoint_dir)
+
+    def _normalize(self, row: Dict[str, Any], scraped_at: str) -> Dict[str, Any]:
+        sent_at, pre_sender = parse_pre_plain_text(row.get("pre_plain", ""), day_first=self.day_first)
+        sender = (row.get("sender") or pre_sender or "Unknown").strip()
+        text = (row.get("text") or "").strip()
+        return {
+            "message_id": row["id"],
+            "text": text,
+            "sender": sender,
+            "timestamp": sent_at.strftime("%H:%M") if sent_at else None,
+            "sent_at": sent_at.isoformat() if sent_at else None,
+            "scraped_at": scraped_at,
+            "group_name": self.group_name,
+            "raw_text": (row.get("raw_text") or "").strip(),
+        }
+
+    async def _scroll(self, page: Any, step_px: int) -> Tuple[Dict[str, Any], int]:
+        position: Dict[str, Any] = {}
+
+        async def action() -> None:
+            position.update(
+                await page.evaluate(_SCROLL_JS, {"selector": MESSAGE_PANEL_SELECTOR, "step": step_px})
+                or {}
+            )
+
+        readiness = await wait_for_dom_quiet(
+            page, MESSAGE_PANEL_SELECTOR, action=action, quiet_ms=350, grace_ms=500, timeout_ms=8000
+        )
+        return position, readiness.mutations
+
+    async def run(
+        self,
+        page: Any,
+        on_batch: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        *,
+        until: Optional[datetime] = None,
+        max_messages: Optional[int] = None,
+        max_steps: int = 5000,
+    ) -> BackfillResult:
+        """백필 실행/Scroll upward from the current position and stream unseen rows.
+
+        Args:
+            page: 대화방이 열린 Playwright Page
+            on_batch: 신규 메시지 배치를 받을 비동기 콜백 (처리 후 체크포인트 저장)
+            until: 이 시각보다 오래된 메시지에 도달하면 중단
+            max_messages: 전달할 최대 메시지 수
+            max_steps: 안전용 최대 스크롤 횟수
+
+        Returns:
+            BackfillResult: stop_reason은 "until", "max_messages", "cursor",
+            "top", "max_steps" 중 하나
+        """
+        started = time.perf_counter()
+        checkpoint = self.load_checkpoint()
+        resume_id = checkpoint.oldest_id if not checkpoint.complete else None
+        seeking = resume_id is not None
+        result = BackfillResult(resumed=seeking)
+        if not seeking:
+            checkpoint.newest_id = None
+            checkpoint.oldest_id = None
+            checkpoint.oldest_sent_at = None
+            checkpoint.harvested = 0
+            checkpoint.complete = False
+        scraped_at = datetime.now(timezone.utc).isoformat()
+
+        seen: "OrderedDict[str, None]" = OrderedDict()
+        pending: List[Dict[str, Any]] = []
+        step_px = self.initial_step_px
+        idle_steps = 0
+        previous_ids: set[str] = set()
+
+        async def flush() -> None:
+            if not pending:
+                return
+            batch = list(pending)
+            pending.clear()
+            await on_batch(batch)
+            oldest = batch[0]
+            checkpoint.oldest_id = oldest["message_id"]
+            if oldest["sent_at"]:
+                checkpoint.oldest_sent_at = oldest["sent_at"]
+            checkpoint.harvested += len(batch)
+            result.harvested += len(batch)
+            self._save_checkpoint(checkpoint)
+
+        def remember(message_id: str) -> None:
+            seen[message_id] = None
+            if len(seen) > self.dedupe_window:
+                seen.popitem(last=False)
+
+        while True:
+            rows = await page.evaluate(_HARVEST_JS, MESSAGE_PANEL_SELECTOR) or []
+            row_ids = {row["id"] for row in rows if row.get("id")}
+
+            if previous_ids and rows and not (row_ids & previous_ids) and step_px > self.min_step_px:
+                # 이전 수집과 겹치지 않음 → 행을 건너뛰었을 수 있으므로 절반만큼 되돌아가 재수집
+                step_px = max(self.min_step_px, step_px // 2)
+                result.backtracks += 1
+                await self._scroll(page, step_px)
+                continue
+
+            fresh: List[Dict[str, Any]] = []
+            stop_reason = ""
+            # 아래(최신)부터 위(과거)로 진행하므로 역순으로 검사
+            for row in reversed(rows):
+                message_id = row.get("id")
+                if not message_id or message_id in seen:
+                    continue
+                remember(message_id)
+                if checkpoint.cursor_id and message_id == checkpoint.cursor_id:
+                    stop_reason = "cursor"
+                    break
+                if seeking:
+                    if message_id == resume_id:
+                        seeking = False
+                    continue
+                message = self._normalize(row, scraped_at)
+                if until is not None and message["sent_at"] and datetime.fromisoformat(message["sent_at"]) < until:
+                    stop_reason = "until"
+                    break
+                if checkpoint.newest_id is None:
+                    checkpoint.newest_id = message_id
+                fresh.append(message)
+                if max_messages is not None and result.harvested + len(pending) + len(fresh) >= max_messages:
+                    stop_reason = "max_messages"
+                    break
+
+            fresh.reverse()
+            pending[:0] = fresh
+            if len(pending) >= self.batch_size or stop_reason:
+                await flush()
+            if stop_reason:
+                result.stop_reason = stop_reason
+                break
+            if result.steps >= max_steps:
+                result.stop_reason = "max_steps"
+                break
+
+            # 신규 행 수에 따라 간격 조정
+            new_rows = len(fresh)
+            if new_rows < self.target_new_per_step // 2:
+                step_px = min(self.max_step_px, int(step_px * 1.5))
+            elif new_rows > self.target_new_per_step * 2:
+                step_px = max(self.min_step_px, step_px // 2)
+
+            previous_ids = row_ids
+            position, mutations = await self._scroll(page, -step_px)
+            result.steps += 1
+            at_top = position.get("after", 0) <= 0 and position.get("before", 0) <= 0
+            if at_top and mutations == 0:
+                idle_steps += 1
+                if idle_steps >= self.max_idle_steps:
+                    result.stop_reason = "top"
+                    break
+            else:
+                idle_steps = 0
+
+        await flush()
+        if self.return_to_latest:
+            await page.evaluate(_SCROLL_JS, {"selector": MESSAGE_PANEL_SELECTOR, "step": 10**9})
+        if result.stop_reason in {"until", "cursor", "top"}:
+            # 완료된 실행의 최신 id를 다음 증분 백필의 커서로 사용
+            if checkpoint.newest_id:
+                checkpoint.cursor_id = checkpoint.newest_id
+            checkpoint.complete = True
+            self._save_checkpoint(checkpoint)
+        result.oldest_sent_at = checkpoint.oldest_sent_at
+        result.elapsed_seconds = time.perf_counter() - started
+        logger.info(
+            "Backfill for %s stopped (%s): %d messages in %d steps, %d backtracks",
+            self.group_name,
+            result.stop_reason,
+            result.harvested,
+            result.steps,
+            result.backtracks,
+        )
+        return result
@@ -11,8 +11,11 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
+from concurrent.futures import Future
 from pathlib import Path
 
+from .persistence import JSON_WRITER
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -142,8 +145,14 @@ class WorkflowManager:
             logger.error(f"데이터 로드 오류: {str(e)}")
             self._create_default_data()
     
-    def save_data(self):
-        """워크플로우 데이터를 파일에 저장"""
+    def save_data(self) -> Future:
+        """
+        워크플로우 데이터를 파일에 저장
+
+        Returns:
+            Future: 저장 완료 Future (실패 시 result()가 예외 발생,
+            async 코드에서는 asyncio.wrap_future로 대기)
+        """
         try:
             data = {
                 'chat_rooms': [asdict(room) for room in self.chat_rooms.values()],
@@ -165,11 +174,14 @@ class WorkflowManager:
                 task_data['status'] = self.get_enum_value(task_data['status'])
                 task_data['priority'] = self.get_enum_value(task_data['priority'])
             
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 스냅샷만 만들고 파일 I/O는 writer 스레드에서 수행 (연속 저장은 병합)
+            return JSON_WRITER.submit_write(self.data_file, data, manifest=False)
                 
         except Exception as e:
             logger.error(f"데이터 저장 오류: {str(e)}")
+            failed: Future = Future()
+            failed.set_exception(e)
+            return failed
     
     def _create_default_data(self):
         """기본 대화방 및 태스크 데이터 생성"""
@@ -0,0 +1,271 @@
+"""메시지 전문 검색. Full-text search index over scraped WhatsApp messages.
+
+Messages are stored in sqlite with an FTS5 index using the ``trigram``
+tokenizer, which matches Korean text, B/L numbers and vessel names by
+substring without a language-specific segmenter. Scrapers feed the index
+incrementally through :meth:`MessageSearchIndex.add_messages`; existing JSON
+outputs can be backfilled with :meth:`MessageSearchIndex.index_json_file`.
+
+CLI::
+
+    python -m macho_gpt.core.message_search search "HVDC-BL-0042" --group "MR.CHA 전용"
+    python -m macho_gpt.core.message_search index data/*.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .columnar_sink import normalize_message, send_date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_DB = Path("data/search") / "messages.sqlite3"
+
+# trigram 토크나이저는 3자 미만 질의를 색인으로 찾을 수 없음
+TRIGRAM_MIN_QUERY = 3
+
+
+def _fts_tokenizer(connection: sqlite3.Connection) -> str:
+    """FTS5 토크나이저 선택. Prefer ``trigram``; fall back to ``unicode61``."""
+
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.tokenizer_probe USING fts5(x, tokenize='trigram')")
+        connection.execute("DROP TABLE temp.tokenizer_probe")
+        return "trigram"
+    except sqlite3.OperationalError:
+        logger.warning("sqlite FTS5 trigram tokenizer unavailable; using unicode61")
+        return "unicode61"
+
+
+class MessageSearchIndex:
+    """메시지 검색 색인/Incremental sqlite FTS5 index of scraped messages."""
+
+    def __init__(self, db_path: str | Path = DEFAULT_SEARCH_DB) -> None:
+        """
+        Args:
+            db_path: sqlite 데이터베이스 경로 (":memory:" 허용)
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.tokenizer = _fts_tokenizer(self._connection)
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY,
+                    message_id TEXT NOT NULL UNIQUE,
+                    group_name TEXT NOT NULL,
+                    sender TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    sent_at TEXT,
+                    scraped_at TEXT NOT NULL,
+                    day TEXT NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_messages_group_day ON messages (group_name, day)"
+            )
+            self._connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+                "text, sender, content='messages', content_rowid='id', "
+                f"tokenize='{self.tokenizer}')"
+            )
+
+    def add_messages(
+        self, messages: Iterable[Any], group_name: str, *, backend: str = "playwright"
+    ) -> int:
+        """메시지 색인 추가/Index new messages, skipping already indexed ids.
+
+        Messages are keyed on WhatsApp's ``data-id`` when the backend provides
+        one, and dated by their send date, falling back to the scrape date.
+
+        Returns:
+            int: 새로 색인된 메시지 수
+        """
+        added = 0
+        with self._lock, self._connection:
+            for message in messages:
+                row = normalize_message(message, group_name, backend)
+                scraped_at = row["scraped_at"]
+                day = send_date(row["sent_at"]) or scraped_at.strftime("%Y-%m-%d")
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO messages "
+                    "(message_id, group_name, sender, text, sent_at, scraped_at, day) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        row["message_id"],
+                        row["group_name"],
+                        row["sender"],
+                        row["text"],
+                        row["sent_at"],
+                        scraped_at.isoformat(),
+                        day,
+                    ),
+                )
+                if cursor.rowcount:
+                    self._connection.execute(
+                        "INSERT INTO messages_fts (rowid, text, sender) VALUES (?, ?, ?)",
+                        (cursor.lastrowid, row["text"], row["sender"]),
+                    )
+                    added += 1
+        return added
+
+    def index_json_file(self, file_path: str | Path) -> int:
+        """JSON 출력 색인/Backfill from a scraper, webjs or RPA JSON output file."""
+
+        path = Path(file_path)
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+
+        if isinstance(payload, list):
+            added = 0
+            by_group: Dict[str, List[Dict[str, Any]]] = {}
+            for message in payload:
+                if isinstance(message, dict):
+                    by_group.setdefault(message.get("group_name") or path.stem, []).append(message)
+            for group_name, messages in by_group.items():
+                added += self.add_messages(messages, group_name)
+            return added
+        if isinstance(payload, dict) and isinstance(payload.get("group"), dict):
+            group = payload["group"]
+            return self.add_messages(
+                group.get("messages", []), group.get("name") or path.stem, backend="webjs"
+            )
+        if isinstance(payload, dict):
+            added = 0
+            for entry in payload.values():
+                if isinstance(entry, dict) and "raw_messages" in entry:
+                    added += self.add_messages(
+                        entry["raw_messages"], entry.get("chat_title") or path.stem, backend="rpa"
+                    )
+            return added
+        return 0
+
+    def search(
+        self,
+        query: str,
+        groups: Optional[Sequence[str]] = None,
+        date_range: Optional[Tuple[Optional[str], Optional[str]]] = None,
+        *,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """메시지 검색/Return ranked messages matching ``query``.
+
+        Args:
+            query: 검색어 (부분 문자열 일치)
+            groups: 그룹 이름 필터
+            date_range: (시작일, 종료일) "YYYY-MM-DD" 발송일 기준, 양끝 포함
+            limit: 최대 결과 수
+        """
+        query = query.strip()
+        if not query:
+            return []
+
+        filters: List[str] = []
+        params: List[Any] = []
+        if groups:
+            filters.append(f"m.group_name IN ({', '.join('?' for _ in groups)})")
+            params.extend(groups)
+        if date_range:
+            start, end = date_range
+            if start:
+                filters.append("m.day >= ?")
+                params.append(start)
+            if end:
+                filters.append("m.day <= ?")
+                params.append(end)
+        extra = "".join(f" AND {clause}" for clause in filters)
+
+        use_fts = self.tokenizer != "trigram" or len(query) >= TRIGRAM_MIN_QUERY
+        if use_fts:
+            phrase = '"' + query.replace('"', '""') + '"'
+            sql = (
+                "SELECT m.message_id, m.group_name, m.sender, m.text, m.sent_at, m.scraped_at, "
+                "bm25(messages_fts) AS score "
+                "FROM messages_fts JOIN messages AS m ON m.id = messages_fts.rowid "
+                f"WHERE messages_fts MATCH ?{extra} ORDER BY score, m.id DESC LIMIT ?"
+            )
+            arguments = [phrase, *params, limit]
+        else:
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            sql = (
+                "SELECT m.message_id, m.group_name, m.sender, m.text, m.sent_at, m.scraped_at, "
+                "0.0 AS score FROM messages AS m "
+                f"WHERE m.text LIKE ? ESCAPE '\\'{extra} ORDER BY m.id DESC LIMIT ?"
+            )
+            arguments = [f"%{escaped}%", *params, limit]
+
+        with self._lock:
+            rows = self._connection.execute(sql, arguments).fetchall()
+        columns = ("message_id", "group_name", "sender", "text", "sent_at", "scraped_at", "score")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def count(self) -> int:
+        """색인된 메시지 수/Number of indexed messages."""
+
+        with self._lock:
+            return int(self._connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0])
+
+    def close(self) -> None:
+        """연결 종료/Close the sqlite connection."""
+
+        with self._lock:
+            self._connection.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """검색 CLI/Command line entry point."""
+
+    parser = argparse.ArgumentParser(description="WhatsApp 메시지 전문 검색")
+    parser.add_argument("--db", default=str(DEFAULT_SEARCH_DB), help="검색 색인 DB 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = subparsers.add_parser("search", help="메시지 검색")
+    search_parser.add_argument("query", help="검색어")
+    search_parser.add_argument("--group", action="append", dest="groups", help="그룹 필터 (반복 가능)")
+    search_parser.add_argument("--since", help="시작일 YYYY-MM-DD")
+    search_parser.add_argument("--until", help="종료일 YYYY-MM-DD")
+    search_parser.add_argument("--limit", type=int, default=20, help="최대 결과 수")
+
+    index_parser = subparsers.add_parser("index", help="JSON 출력 파일 색인")
+    index_parser.add_argument("files", nargs="+", help="색인할 JSON 파일")
+
+    args = parser.parse_args(argv)
+    index = MessageSearchIndex(args.db)
+    try:
+        if args.command == "index":
+            for file_path in args.files:
+                try:
+                    added = index.index_json_file(file_path)
+                except (OSError, json.JSONDecodeError) as exc:
+                    print(f"{file_path}: 색인 실패 ({exc})")
+                    continue
+                print(f"{file_path}: {added}개 메시지 색인")
+            return 0
+
+        date_range = (args.since, args.until) if args.since or args.until else None
+        results = index.search(args.query, args.groups, date_range, limit=args.limit)
+        for result in results:
+            print(
+                f"[{result['group_name']}] {result['scraped_at'][:19]} "
+                f"{result['sender']}: {result['text']}"
+            )
+        print(f"{len(results)}건")
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
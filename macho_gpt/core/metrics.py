@@ -0,0 +1,436 @@
+"""스크래퍼 메트릭. Prometheus-style counters, gauges and histograms for hot paths.
+
+The registry renders the Prometheus text exposition format and a JSON
+snapshot. :func:`start_metrics_server` exposes both over a tiny asyncio HTTP
+server (``/metrics`` and ``/metrics.json``), :class:`EventLoopLagMonitor`
+samples event-loop lag and :func:`chromium_rss_bytes` measures the resident
+memory of the Chromium processes behind one user-data directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+if PSUTIL_AVAILABLE:
+    import psutil  # type: ignore
+else:  # pragma: no cover - optional dependency
+    psutil = None
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+LOOP_LAG_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """메트릭 공통 기반/Shared label handling for metric types."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """카운터/Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"labels": dict(zip(self.labelnames, key)), "value": value}
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Gauge(Counter):
+    """게이지/Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """히스토그램/Cumulative-bucket histogram with sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 3))
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-1]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets + (float("inf"),), series):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative:g}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {series[-2]:g}")
+                lines.append(f"{self.name}_count{labels} {series[-1]:g}")
+        return lines
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "labels": dict(zip(self.labelnames, key)),
+                    "count": int(series[-1]),
+                    "sum": series[-2],
+                    "buckets": {
+                        ("+Inf" if bound == float("inf") else f"{bound:g}"): int(count)
+                        for bound, count in zip(self.buckets + (float("inf"),), series)
+                    },
+                }
+                for key, series in sorted(self._series.items())
+            ]
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리/Named collection of metrics."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 출력/Render the text exposition format."""
+
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())  # type: ignore[attr-defined]
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 스냅샷/Snapshot of all metrics."""
+
+        return {
+            "generated_at": time.time(),
+            "metrics": {
+                name: {"type": metric.kind, "help": metric.help_text,
+                       "series": metric.snapshot()}  # type: ignore[attr-defined]
+                for name, metric in list(self._metrics.items())
+            },
+        }
+
+    def dump_json(self, path: str | Path) -> None:
+        """JSON 덤프/Write the snapshot to ``path`` atomically."""
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f".{target.name}.tmp")
+        temp_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(temp_path, target)
+
+
+class ScraperMetrics:
+    """스크래퍼 메트릭 묶음/Standard scraper metrics on top of a registry."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.phase_seconds = self.registry.histogram(
+            "scraper_phase_seconds", "Latency of scraper phases", ("group", "phase")
+        )
+        self.phase_errors = self.registry.counter(
+            "scraper_phase_errors_total", "Failed scraper phases", ("group", "phase")
+        )
+        self.messages = self.registry.counter(
+            "scraper_messages_total", "Messages scraped", ("group",)
+        )
+        self.cycles = self.registry.counter(
+            "scraper_cycles_total", "Scraping cycles by outcome", ("group", "outcome")
+        )
+        self.browser_rss = self.registry.gauge(
+            "scraper_browser_rss_bytes", "Resident memory of the group's Chromium", ("group",)
+        )
+        self.blocked_requests = self.registry.counter(
+            "scraper_blocked_requests_total",
+            "Requests dropped by the resource filter",
+            ("group", "resource_type"),
+        )
+        self.bytes_saved = self.registry.counter(
+            "scraper_bytes_saved_estimated_total",
+            "Estimated bytes not downloaded thanks to the resource filter",
+            ("group",),
+        )
+        self.js_heap = self.registry.gauge(
+            "scraper_js_heap_used_bytes", "JS heap used by the group's page (CDP)", ("group",)
+        )
+        self.dom_nodes = self.registry.gauge(
+            "scraper_dom_nodes", "DOM nodes alive in the group's page (CDP)", ("group",)
+        )
+        self.page_age = self.registry.gauge(
+            "scraper_page_age_seconds", "Seconds since the group's page was last (re)loaded", ("group",)
+        )
+        self.page_recycles = self.registry.counter(
+            "scraper_page_recycles_total",
+            "Watchdog page reloads and browser recycles",
+            ("group", "action", "reason"),
+        )
+        self.loop_lag = self.registry.histogram(
+            "event_loop_lag_seconds", "Event loop scheduling lag", (), LOOP_LAG_BUCKETS
+        )
+        self.loop_lag_max = self.registry.gauge(
+            "event_loop_lag_max_seconds", "Largest event loop lag in the last interval"
+        )
+        self.persist_pending = self.registry.gauge(
+            "persist_pending_files", "Files with JSON writes waiting for the writer thread"
+        )
+        self.persist_seconds = self.registry.histogram(
+            "persist_write_seconds", "Time to serialize and atomically replace one JSON file"
+        )
+        self.persist_writes = self.registry.counter(
+            "persist_writes_total", "JSON file writes by outcome", ("outcome",)
+        )
+        self.persist_coalesced = self.registry.counter(
+            "persist_coalesced_total", "JSON writes merged into an already pending write"
+        )
+
+    @contextmanager
+    def phase(self, group: str, phase: str) -> Iterator[None]:
+        """단계 계측/Time a phase and count it as failed if it raises."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.phase_errors.inc(group=group, phase=phase)
+            raise
+        finally:
+            self.phase_seconds.observe(time.perf_counter() - started, group=group, phase=phase)
+
+    def record_error(self, group: str, phase: str) -> None:
+        self.phase_errors.inc(group=group, phase=phase)
+
+    def record_cycle(self, group: str, outcome: str, messages: int = 0) -> None:
+        self.cycles.inc(group=group, outcome=outcome)
+        if messages:
+            self.messages.inc(messages, group=group)
+
+
+METRICS = ScraperMetrics()
+
+
+class EventLoopLagMonitor:
+    """이벤트 루프 지연 모니터/Sample how late the loop wakes a sleeping task."""
+
+    def __init__(self, metrics: ScraperMetrics = METRICS, interval: float = 0.5) -> None:
+        self.metrics = metrics
+        self.interval = interval
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.metrics.loop_lag.observe(lag)
+            self.metrics.loop_lag_max.set(lag)
+
+
+async def start_metrics_server(
+    registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464
+) -> asyncio.AbstractServer:
+    """메트릭 HTTP 서버/Serve ``/metrics`` and ``/metrics.json`` on ``host:port``."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) >= 2 else ""
+            if path == "/metrics":
+                status, content_type = "200 OK", "text/plain; version=0.0.4; charset=utf-8"
+                body = registry.render_prometheus().encode("utf-8")
+            elif path == "/metrics.json":
+                status, content_type = "200 OK", "application/json; charset=utf-8"
+                body = json.dumps(registry.to_dict(), ensure_ascii=False).encode("utf-8")
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as exc:
+            logger.debug("Metrics request failed: %s", exc)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info("Metrics endpoint listening on http://%s:%d/metrics", host, port)
+    return server
+
+
+def _proc_rss_bytes(needle: str) -> int:
+    """/proc 기반 RSS 합계/Sum RSS of processes whose cmdline contains ``needle``."""
+
+    total = 0
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            cmdline = (entry / "cmdline").read_bytes().replace(b"\0", b" ").decode("utf-8", "ignore")
+            if needle not in cmdline:
+                continue
+            resident_pages = int((entry / "statm").read_text().split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        total += resident_pages * page_size
+    return total
+
+
+def chromium_rss_bytes(user_data_dir: str | Path) -> int:
+    """Chromium RSS 측정/Resident memory of Chromium processes for a profile.
+
+    Chromium passes ``--user-data-dir`` to every child process, so matching
+    on it attributes renderer and GPU processes to the right group.
+    """
+
+    needle = f"--user-data-dir={Path(user_data_dir).resolve()}"
+    if PSUTIL_AVAILABLE:
+        total = 0
+        for process in psutil.process_iter(["cmdline", "memory_info"]):
+            try:
+                cmdline = " ".join(process.info["cmdline"] or [])
+                if needle in cmdline:
+                    total += int(process.info["memory_info"].rss)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+    if Path("/proc").is_dir():
+        return _proc_rss_bytes(needle)
+    return 0
@@ -0,0 +1,239 @@
+"""비차단 JSON 저장. Non-blocking JSON persistence with write coalescing.
+
+Scrapers, the RPA and the workflow manager used to ``open`` + ``json.dump``
+inside coroutines, so one slow disk stalled every group on the event loop.
+:class:`JsonWriter` moves that I/O to one writer thread:
+
+* callers enqueue a full payload (:meth:`JsonWriter.write`) or a
+  read-modify-write function (:meth:`JsonWriter.update`) and await a future
+* pending work for the same file is coalesced: a full write replaces what is
+  queued, updates are applied in order on a single load and a single dump
+* every dump goes to a temporary file in the target directory and is moved
+  into place with ``os.replace``, so readers never see a partial file
+* :meth:`JsonWriter.flush` waits for the queue to drain; the shared
+  :data:`JSON_WRITER` is also flushed at interpreter exit
+
+Queue depth, write latency and coalesced writes are exported through
+:class:`~macho_gpt.core.metrics.ScraperMetrics`; the ``event_loop_lag``
+metrics show whether the loop still blocks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+from .data_manifest import record_data_file
+from .metrics import METRICS, ScraperMetrics
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def write_json_atomic(path: str | Path, payload: Any, *, indent: Optional[int] = 2) -> None:
+    """원자적 JSON 저장/Dump ``payload`` to a temp file and rename it over ``path``."""
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(target.parent))
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+            json.dump(payload, temp_file, ensure_ascii=False, indent=indent)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_name, target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    """대기 중 저장/Coalesced work queued for one file."""
+
+    path: Path
+    default: Callable[[], Any]
+    manifest: bool
+    ops: List[Tuple[str, Any]] = field(default_factory=list)
+    futures: List[Future] = field(default_factory=list)
+
+
+class JsonWriter:
+    """
+    JSON 저장 전용 스레드
+
+    Features:
+    - 이벤트 루프 밖에서 JSON 직렬화/디스크 I/O
+    - 같은 파일의 대기 작업 병합 (write는 덮어쓰기, update는 순차 적용)
+    - 임시 파일 + os.replace 원자적 교체
+    - flush/close로 종료 시 미저장 데이터 보장
+    """
+
+    def __init__(self, *, indent: Optional[int] = 2, metrics: Optional[ScraperMetrics] = None):
+        """
+        Args:
+            indent: json.dump 들여쓰기 (None이면 한 줄)
+            metrics: 메트릭 수집기 (기본: 전역 METRICS)
+        """
+        self.indent = indent
+        self.metrics = metrics if metrics is not None else METRICS
+        self._pending: "OrderedDict[Path, _PendingWrite]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._busy = False
+        self._stopping = False
+
+    def _enqueue(
+        self, path: str | Path, op: Tuple[str, Any], default: Callable[[], Any], manifest: bool
+    ) -> Future:
+        future: Future = Future()
+        target = Path(path)
+        with self._cond:
+            pending = self._pending.get(target)
+            if pending is None:
+                pending = self._pending[target] = _PendingWrite(target, default, manifest)
+            else:
+                self.metrics.persist_coalesced.inc()
+            if op[0] == "write":
+                # 전체 저장은 앞선 대기 작업을 대체
+                pending.ops = [op]
+            else:
+                pending.ops.append(op)
+            pending.manifest = pending.manifest or manifest
+            pending.futures.append(future)
+            self.metrics.persist_pending.set(len(self._pending))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="json-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return future
+
+    def submit_write(self, path: str | Path, payload: Any, *, manifest: bool = True) -> Future:
+        """전체 저장 예약/Queue ``payload`` as the new content of ``path``."""
+
+        return self._enqueue(path, ("write", payload), dict, manifest)
+
+    def submit_update(
+        self,
+        path: str | Path,
+        update: Callable[[Any], Any],
+        *,
+        default: Callable[[], Any] = dict,
+        manifest: bool = True,
+    ) -> Future:
+        """
+        읽기-수정-쓰기 예약 (writer 스레드에서 실행)
+
+        Args:
+            path: 대상 JSON 파일
+            update: 현재 내용을 받아 새 내용을 반환하는 함수
+            default: 파일이 없을 때의 초기값 생성 함수
+            manifest: 저장 후 data 매니페스트 갱신 여부
+        """
+        return self._enqueue(path, ("update", update), default, manifest)
+
+    async def write(self, path: str | Path, payload: Any, *, manifest: bool = True) -> None:
+        await asyncio.wrap_future(self.submit_write(path, payload, manifest=manifest))
+
+    async def update(
+        self,
+        path: str | Path,
+        update: Callable[[Any], Any],
+        *,
+        default: Callable[[], Any] = dict,
+        manifest: bool = True,
+    ) -> None:
+        await asyncio.wrap_future(
+            self.submit_update(path, update, default=default, manifest=manifest)
+        )
+
+    def _commit(self, pending: _PendingWrite) -> None:
+        data: Any = _MISSING
+        for kind, value in pending.ops:
+            if kind == "write":
+                data = value
+                continue
+            if data is _MISSING:
+                try:
+                    with open(pending.path, "r", encoding="utf-8") as handle:
+                        data = json.load(handle)
+                except FileNotFoundError:
+                    data = pending.default()
+            data = value(data)
+        write_json_atomic(pending.path, data, indent=self.indent)
+        if pending.manifest:
+            record_data_file(pending.path, data)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                _, pending = self._pending.popitem(last=False)
+                # 취소된 호출자는 건너뛰되 저장 자체는 수행
+                waiters = [future for future in pending.futures if future.set_running_or_notify_cancel()]
+                self._busy = True
+                self.metrics.persist_pending.set(len(self._pending))
+
+            started = time.perf_counter()
+            error: Optional[BaseException] = None
+            try:
+                self._commit(pending)
+            except Exception as e:
+                error = e
+                logger.error(f"Failed to write {pending.path}: {e}")
+            self.metrics.persist_seconds.observe(time.perf_counter() - started)
+            self.metrics.persist_writes.inc(outcome="error" if error else "ok")
+
+            for future in waiters:
+                if error is None:
+                    future.set_result(pending.path)
+                else:
+                    future.set_exception(error)
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """대기 작업 완료 대기/Block until every queued write has landed."""
+
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    async def aflush(self, timeout: Optional[float] = None) -> bool:
+        return await asyncio.to_thread(self.flush, timeout)
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """종료/Flush and stop the writer thread (a later write restarts it)."""
+
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            if self._pending:
+                logger.warning(f"JSON writer closed with {len(self._pending)} unsaved files")
+            self._stopping = False
+            if self._thread is thread:
+                self._thread = None
+
+
+JSON_WRITER = JsonWriter()
+atexit.register(JSON_WRITER.close)
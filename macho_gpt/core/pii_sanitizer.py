@@ -0,0 +1,174 @@
+"""PII 마스킹 엔진. Compiled PII sanitizer with priority-resolved spans for OCR and message text."""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_PII_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("ID_NUMBER", r"\d{6}-\d{7}"),
+    ("CARD_NUMBER", r"\d{4}-\d{4}-\d{4}-\d{4}"),
+    ("EMAIL", r"[\w.%-]+@[\w.-]+\.[A-Za-z]{2,4}"),
+    ("PHONE", r"(?:\+?\d{2,3}[- ]?)?\d{2,4}[- ]?\d{3,4}[- ]?\d{4}"),
+)
+
+# 기본 패턴은 모두 숫자 또는 '@'를 포함해야 일치함
+_DEFAULT_PREFILTER = re.compile(r"[\d@]")
+
+
+class PIISanitizer:
+    """PII 마스킹 엔진/Mask personal data with priority-resolved spans.
+
+    A single alternation of all patterns is only used as a fast "any PII?"
+    check: in one alternation the leftmost match wins, so a phone number
+    could start inside a longer ID or card number. Spans are therefore
+    resolved by priority, exactly like sequential substitution passes: each
+    pattern in declaration order claims matches only in text not yet claimed
+    by an earlier pattern.
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[Tuple[str, str]] = DEFAULT_PII_PATTERNS,
+        *,
+        stream_overlap: int = 256,
+    ) -> None:
+        """
+        Args:
+            patterns: (카테고리, 정규식) 목록
+            stream_overlap: 스트리밍 시 청크 경계에서 보류할 문자 수
+        """
+        self.categories = [name for name, _ in patterns]
+        self.stream_overlap = stream_overlap
+        self._pattern = re.compile(
+            "|".join(f"(?P<{name}>{regex})" for name, regex in patterns)
+        )
+        self._patterns = [(name, re.compile(regex)) for name, regex in patterns]
+        self._prefilter: Optional[re.Pattern[str]] = (
+            _DEFAULT_PREFILTER if tuple(patterns) == DEFAULT_PII_PATTERNS else None
+        )
+        self._counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """카테고리별 누적 마스킹 횟수/Cumulative match count per category."""
+
+        with self._lock:
+            return {category: self._counts.get(category, 0) for category in self.categories}
+
+    def reset_counts(self) -> None:
+        """누적 횟수 초기화/Reset cumulative counters."""
+
+        with self._lock:
+            self._counts.clear()
+
+    def sanitize(self, text: str) -> str:
+        """텍스트 마스킹/Return text with PII replaced by category markers."""
+
+        return self.sanitize_with_counts(text)[0]
+
+    def sanitize_with_counts(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """마스킹 및 횟수 반환/Sanitize text and return per-category matches."""
+
+        if not text or (self._prefilter is not None and not self._prefilter.search(text)):
+            return text, {}
+
+        if not self._pattern.search(text):
+            return text, {}
+
+        found: Counter[str] = Counter()
+        parts = []
+        position = 0
+        for start, end, category in self._spans(text):
+            found[category] += 1
+            parts.append(text[position:start])
+            parts.append(f"[{category}]")
+            position = end
+        parts.append(text[position:])
+        if found:
+            with self._lock:
+                self._counts.update(found)
+        return "".join(parts), dict(found)
+
+    def _spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """우선순위 구간 결정/Resolve non-overlapping spans, earlier patterns first."""
+
+        claimed: List[Tuple[int, int, str]] = []
+        for category, pattern in self._patterns:
+            gaps = []
+            position = 0
+            for start, end, _ in claimed:
+                gaps.append((position, start))
+                position = end
+            gaps.append((position, len(text)))
+            for gap_start, gap_end in gaps:
+                for match in pattern.finditer(text, gap_start, gap_end):
+                    if match.end() > match.start():
+                        claimed.append((match.start(), match.end(), category))
+            claimed.sort()
+        return claimed
+
+    def sanitize_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """스트리밍 마스킹/Sanitize an iterable of text chunks lazily.
+
+        The last ``stream_overlap`` characters of each buffer are held back so
+        a match spanning a chunk boundary is masked as a whole.
+        """
+
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            limit = len(buffer) - self.stream_overlap
+            if limit <= 0:
+                continue
+            output, buffer = self._drain(buffer, limit)
+            if output:
+                yield output
+        if buffer:
+            yield self.sanitize(buffer)
+
+    def _drain(self, buffer: str, limit: int) -> Tuple[str, str]:
+        """확정 구간 마스킹/Sanitize the settled prefix of a stream buffer."""
+
+        parts = []
+        found: Counter[str] = Counter()
+        position = 0
+        cut = limit
+        for start, end, category in self._spans(buffer):
+            if end > limit:
+                cut = min(cut, start)
+                break
+            found[category] += 1
+            parts.append(buffer[position:start])
+            parts.append(f"[{category}]")
+            position = end
+        cut = max(cut, position)
+        parts.append(buffer[position:cut])
+        if found:
+            with self._lock:
+                self._counts.update(found)
+        return "".join(parts), buffer[cut:]
+
+    def sanitize_message(
+        self, message: Dict[str, Any], fields: Sequence[str] = ("text",)
+    ) -> Dict[str, Any]:
+        """메시지 필드 마스킹/Return a copy of a message with fields sanitized."""
+
+        sanitized = dict(message)
+        for field in fields:
+            value = sanitized.get(field)
+            if isinstance(value, str):
+                sanitized[field] = self.sanitize(value)
+        return sanitized
+
+
+DEFAULT_SANITIZER = PIISanitizer()
+
+
+def sanitize_text(text: str) -> str:
+    """기본 엔진으로 마스킹/Sanitize text with the shared default engine."""
+
+    return DEFAULT_SANITIZER.sanitize(text)
@@ -0,0 +1,231 @@
+"""준비 상태 대기. Event-based readiness primitives for WhatsApp Web pages.
+
+Instead of sleeping a fixed or random number of milliseconds after a click,
+search or scroll, callers arm a ``MutationObserver`` on the relevant DOM
+subtree, perform the action and wait until the subtree has been quiet for a
+short window. If the action triggers no mutation at all (nothing to load,
+results already shown), the wait ends after a grace period.
+
+Predicates:
+
+* :func:`wait_for_message_list_stable` - conversation panel finished rendering
+* :func:`wait_for_search_results_settled` - chat list stopped updating after a search
+* :func:`scroll_and_wait_for_fetch` - a PageUp/PageDown history fetch completed
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_PANEL_SELECTOR = '[data-testid="conversation-panel-messages"]'
+CHAT_LIST_SELECTOR = '#pane-side, [data-testid="chat-list"]'
+MESSAGE_ROW_SELECTOR = '[data-testid="msg-container"], .message-in, .message-out'
+
+_TOKENS = itertools.count(1)
+
+# 관찰 대상 루트에 MutationObserver 설치 (즉시 반환)
+_ARM_JS = """
+({token, selector}) => {
+  const root = document.querySelector(selector);
+  if (!root) return false;
+  const registry = window.__machoReadiness || (window.__machoReadiness = {});
+  const state = {root, mutations: 0, last: performance.now(), armed: performance.now()};
+  state.observer = new MutationObserver(records => {
+    state.mutations += records.length;
+    state.last = performance.now();
+  });
+  state.observer.observe(root, {childList: true, subtree: true, characterData: true});
+  registry[token] = state;
+  return true;
+}
+"""
+
+# 정적 구간(quietMs) 또는 무변화 유예(graceMs)까지 대기 후 관찰 해제
+_WAIT_JS = """
+({token, quietMs, graceMs, timeoutMs, countSelector}) => new Promise(resolve => {
+  const registry = window.__machoReadiness || {};
+  const state = registry[token];
+  if (!state) {
+    resolve({settled: false, mutations: 0, elapsedMs: 0, count: -1});
+    return;
+  }
+  const finish = settled => {
+    clearInterval(poll);
+    state.observer.disconnect();
+    delete registry[token];
+    const count = countSelector ? state.root.querySelectorAll(countSelector).length : -1;
+    resolve({settled, mutations: state.mutations,
+             elapsedMs: Math.round(performance.now() - state.armed), count});
+  };
+  const check = () => {
+    const now = performance.now();
+    if (state.mutations > 0 ? now - state.last >= quietMs : now - state.armed >= graceMs) {
+      finish(true);
+    } else if (now - state.armed >= timeoutMs) {
+      finish(false);
+    }
+  };
+  const poll = setInterval(check, Math.max(16, Math.min(50, quietMs / 4)));
+  check();
+})
+"""
+
+
+@dataclass(slots=True)
+class ReadinessResult:
+    """대기 결과/Outcome of a quiescence wait."""
+
+    settled: bool
+    mutations: int = 0
+    elapsed_ms: int = 0
+    count: int = -1
+
+
+async def wait_for_dom_quiet(
+    page: Any,
+    selector: str,
+    *,
+    action: Optional[Callable[[], Awaitable[Any]]] = None,
+    quiet_ms: int = 300,
+    grace_ms: int = 500,
+    timeout_ms: int = 10000,
+    count_selector: Optional[str] = None,
+) -> ReadinessResult:
+    """DOM 정적 상태 대기/Run ``action`` and wait for ``selector``'s subtree to settle.
+
+    Args:
+        page: Playwright Page
+        selector: 관찰할 루트 CSS 셀렉터 (첫 일치 요소)
+        action: 관찰 설치 후 실행할 동작 (클릭, 키 입력 등)
+        quiet_ms: 마지막 변경 이후 정적으로 간주할 시간
+        grace_ms: 변경이 전혀 없을 때 종료까지의 유예 시간
+        timeout_ms: 최대 대기 시간 (루트 등장 대기 포함)
+        count_selector: 종료 시 루트 안에서 개수를 셀 셀렉터
+
+    Returns:
+        ReadinessResult: settled=False면 시간 초과
+    """
+    started = time.monotonic()
+    token = f"r{next(_TOKENS)}"
+    arm_args = {"token": token, "selector": selector}
+    armed = await page.evaluate(_ARM_JS, arm_args)
+    if not armed:
+        # 루트가 아직 없으면 동작 후 등장을 기다렸다가 관찰 시작
+        if action is not None:
+            await action()
+            action = None
+        try:
+            await page.wait_for_selector(selector, state="attached", timeout=timeout_ms)
+        except Exception as exc:  # noqa: BLE001 - Playwright raises generic errors
+            logger.debug("Readiness root %s did not appear: %s", selector, exc)
+            return ReadinessResult(settled=False, elapsed_ms=int((time.monotonic() - started) * 1000))
+        armed = await page.evaluate(_ARM_JS, arm_args)
+        if not armed:
+            return ReadinessResult(settled=False, elapsed_ms=int((time.monotonic() - started) * 1000))
+
+    if action is not None:
+        await action()
+
+    remaining_ms = max(0, timeout_ms - int((time.monotonic() - started) * 1000))
+    outcome = await page.evaluate(
+        _WAIT_JS,
+        {
+            "token": token,
+            "quietMs": quiet_ms,
+            "graceMs": grace_ms,
+            "timeoutMs": remaining_ms,
+            "countSelector": count_selector,
+        },
+    )
+    result = ReadinessResult(
+        settled=bool(outcome.get("settled")),
+        mutations=int(outcome.get("mutations", 0)),
+        elapsed_ms=int((time.monotonic() - started) * 1000),
+        count=int(outcome.get("count", -1)),
+    )
+    if not result.settled:
+        logger.debug("Readiness wait on %s timed out after %d ms", selector, result.elapsed_ms)
+    return result
+
+
+async def wait_for_message_list_stable(
+    page: Any,
+    *,
+    action: Optional[Callable[[], Awaitable[Any]]] = None,
+    quiet_ms: int = 400,
+    timeout_ms: int = 15000,
+) -> ReadinessResult:
+    """메시지 목록 안정화 대기/Wait until the conversation panel stops rendering."""
+
+    return await wait_for_dom_quiet(
+        page,
+        MESSAGE_PANEL_SELECTOR,
+        action=action,
+        quiet_ms=quiet_ms,
+        grace_ms=quiet_ms,
+        timeout_ms=timeout_ms,
+        count_selector=MESSAGE_ROW_SELECTOR,
+    )
+
+
+async def wait_for_search_results_settled(
+    page: Any,
+    *,
+    action: Optional[Callable[[], Awaitable[Any]]] = None,
+    quiet_ms: int = 300,
+    timeout_ms: int = 5000,
+) -> ReadinessResult:
+    """검색 결과 안정화 대기/Wait until the chat list settles after a search."""
+
+    return await wait_for_dom_quiet(
+        page,
+        CHAT_LIST_SELECTOR,
+        action=action,
+        quiet_ms=quiet_ms,
+        grace_ms=800,
+        timeout_ms=timeout_ms,
+    )
+
+
+async def scroll_and_wait_for_fetch(
+    page: Any,
+    key: str = "PageUp",
+    *,
+    quiet_ms: int = 350,
+    grace_ms: int = 600,
+    timeout_ms: int = 8000,
+) -> ReadinessResult:
+    """스크롤 후 기록 로딩 완료 대기/Press ``key`` and wait for the history fetch.
+
+    ``mutations == 0`` on the result means the scroll loaded nothing new, which
+    callers use to stop paging once the top of the history is reached.
+    """
+
+    return await wait_for_dom_quiet(
+        page,
+        MESSAGE_PANEL_SELECTOR,
+        action=lambda: page.keyboard.press(key),
+        quiet_ms=quiet_ms,
+        grace_ms=grace_ms,
+        timeout_ms=timeout_ms,
+        count_selector=MESSAGE_ROW_SELECTOR,
+    )
+
+
+async def wait_for_selector_ready(
+    page: Any, selector: str, *, timeout_ms: int = 15000, state: str = "visible"
+) -> bool:
+    """셀렉터 대기/Event-driven ``wait_for_selector`` returning a bool instead of raising."""
+
+    try:
+        await page.wait_for_selector(selector, state=state, timeout=timeout_ms)
+        return True
+    except Exception as exc:  # noqa: BLE001 - Playwright raises generic errors
+        logger.debug("Selector %s not ready within %d ms: %s", selector, timeout_ms, exc)
+        return False
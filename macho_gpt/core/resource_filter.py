@@ -0,0 +1,183 @@
+"""리소스 필터. ``context.route`` filter that blocks heavy resources for text scraping.
+
+Text-only groups never look at thumbnails, avatars, stickers, video previews
+or web fonts, yet WhatsApp Web downloads and decodes all of them. The filter
+aborts those requests (images are stubbed with a 1x1 GIF so ``onload``
+handlers settle instead of retrying) and counts what it saved. Bytes saved
+are estimated per resource type because aborted responses are never sized.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCKED_TYPES: Tuple[str, ...] = ("image", "media", "font")
+# mmg: 미디어/스티커, pps: 프로필 사진, *.cdn.whatsapp.net: 미디어 CDN
+DEFAULT_BLOCKED_HOSTS: Tuple[str, ...] = ("mmg.whatsapp.net", "pps.whatsapp.net", ".cdn.whatsapp.net")
+MEDIA_GROUP_BLOCKED_TYPES: Tuple[str, ...] = ("font",)
+
+# 유형별 평균 응답 크기 추정치 (bytes)
+ESTIMATED_BYTES: Dict[str, int] = {
+    "image": 24 * 1024,
+    "media": 512 * 1024,
+    "font": 64 * 1024,
+    "other": 16 * 1024,
+}
+
+_PIXEL_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+@dataclass(slots=True)
+class ResourceFilterStats:
+    """차단 통계/Counts of blocked requests and estimated bytes saved."""
+
+    blocked_requests: int = 0
+    stubbed_requests: int = 0
+    allowed_requests: int = 0
+    estimated_bytes_saved: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "blocked_requests": self.blocked_requests,
+            "stubbed_requests": self.stubbed_requests,
+            "allowed_requests": self.allowed_requests,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "by_type": dict(self.by_type),
+        }
+
+
+class ResourceFilter:
+    """요청 차단 필터/Route handler that drops resources a text scraper never reads."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+        blocked_hosts: Iterable[str] = DEFAULT_BLOCKED_HOSTS,
+        stub_images: bool = True,
+        metrics: Optional[Any] = None,
+        group_name: str = "",
+    ) -> None:
+        """
+        Args:
+            enabled: 필터 활성화 여부
+            blocked_types: 차단할 Playwright resource_type 목록
+            blocked_hosts: 차단할 호스트 (".cdn.example" 형식은 접미사 일치)
+            stub_images: 이미지 요청을 1x1 GIF로 대체할지 여부
+            metrics: 차단 수를 기록할 ScraperMetrics
+            group_name: 메트릭 라벨용 그룹 이름
+        """
+        self.enabled = enabled
+        self.blocked_types = frozenset(blocked_types)
+        hosts = tuple(blocked_hosts)
+        self._exact_hosts = frozenset(host for host in hosts if not host.startswith("."))
+        self._host_suffixes = tuple(host for host in hosts if host.startswith("."))
+        self.stub_images = stub_images
+        self.metrics = metrics
+        self.group_name = group_name
+        self.totals = ResourceFilterStats()
+        self.cycle = ResourceFilterStats()
+
+    @classmethod
+    def for_group(
+        cls,
+        media_ocr: bool,
+        settings: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> "ResourceFilter":
+        """그룹별 필터 생성/Build a filter; media-OCR groups keep images and media.
+
+        Args:
+            media_ocr: 미디어 OCR 그룹 여부 (True면 이미지/미디어 허용)
+            settings: ``enhancements["resource_filter"]`` 설정
+        """
+        settings = settings or {}
+        if media_ocr:
+            blocked_types: Iterable[str] = MEDIA_GROUP_BLOCKED_TYPES
+            blocked_hosts: Iterable[str] = ()
+        else:
+            blocked_types = settings.get("blocked_types", DEFAULT_BLOCKED_TYPES)
+            blocked_hosts = settings.get("blocked_hosts", DEFAULT_BLOCKED_HOSTS)
+        return cls(
+            enabled=settings.get("enabled", True),
+            blocked_types=blocked_types,
+            blocked_hosts=blocked_hosts,
+            stub_images=settings.get("stub_images", True),
+            **kwargs,
+        )
+
+    def _blocked_host(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        return host in self._exact_hosts or host.endswith(self._host_suffixes)
+
+    def classify(self, resource_type: str, url: str) -> Optional[str]:
+        """차단 판정/Return ``"stub"``, ``"abort"`` or None to let the request through."""
+
+        if url.startswith(("data:", "blob:")):
+            return None
+        if resource_type in self.blocked_types or self._blocked_host(url):
+            return "stub" if self.stub_images and resource_type == "image" else "abort"
+        return None
+
+    def _count(self, action: Optional[str], resource_type: str) -> None:
+        if action is None:
+            self.totals.allowed_requests += 1
+            self.cycle.allowed_requests += 1
+            return
+        saved = ESTIMATED_BYTES.get(resource_type, ESTIMATED_BYTES["other"])
+        for stats in (self.totals, self.cycle):
+            stats.blocked_requests += 1
+            stats.stubbed_requests += action == "stub"
+            stats.estimated_bytes_saved += saved
+            stats.by_type[resource_type] = stats.by_type.get(resource_type, 0) + 1
+        if self.metrics is not None:
+            self.metrics.blocked_requests.inc(group=self.group_name, resource_type=resource_type)
+            self.metrics.bytes_saved.inc(saved, group=self.group_name)
+
+    async def handle(self, route: Any) -> None:
+        """Playwright route 핸들러/Abort, stub or continue one request."""
+
+        request = route.request
+        resource_type = request.resource_type
+        action = self.classify(resource_type, request.url)
+        self._count(action, resource_type)
+        try:
+            if action == "stub":
+                await route.fulfill(status=200, content_type="image/gif", body=_PIXEL_GIF)
+            elif action == "abort":
+                await route.abort("blockedbyclient")
+            else:
+                await route.continue_()
+        except Exception as exc:  # 페이지 종료 중 취소된 요청
+            logger.debug("Route handling failed for %s: %s", request.url, exc)
+
+    async def install(self, context: Any) -> bool:
+        """컨텍스트에 설치/Register the handler on a browser context.
+
+        Returns:
+            bool: 필터가 설치되었는지 여부
+        """
+        if not self.enabled or not (self.blocked_types or self._exact_hosts or self._host_suffixes):
+            return False
+        await context.route("**/*", self.handle)
+        logger.info(
+            "Resource filter installed (types=%s, hosts=%d)",
+            ",".join(sorted(self.blocked_types)),
+            len(self._exact_hosts) + len(self._host_suffixes),
+        )
+        return True
+
+    def take_cycle_stats(self) -> Dict[str, Any]:
+        """사이클 통계 반환 후 초기화/Return and reset the per-cycle counters."""
+
+        stats = self.cycle.to_dict()
+        self.cycle = ResourceFilterStats()
+        return stats
@@ -0,0 +1,357 @@
+"""셀렉터 해석기. Racing selector resolver with a persisted per-key winner cache.
+
+WhatsApp Web renames ``data-testid`` attributes and ARIA labels regularly, so
+every lookup carries several candidate selectors. Trying them one after the
+other with a timeout each makes a miss cost the sum of all timeouts. The
+resolver instead evaluates every candidate in one in-page predicate polled on
+animation frames, so the worst case is a single timeout. The winning
+candidate is tried first on the next lookup and counted in per-selector
+hit-rate statistics. The cache file is rewritten as soon as a key's winner
+changes; statistics-only updates are written at most once per
+``save_interval`` and on interpreter exit, so steady-state lookups do not
+touch the disk.
+
+The shared WhatsApp helpers (:func:`locate_search_box`,
+:func:`fill_search_box`, :func:`wait_for_group_entry`) used by the Playwright
+scraper, the RPA extractor and the manual-auth setup live here as well.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SELECTOR_CACHE = Path("data") / "selector_cache.json"
+
+# 후보별 일치 여부를 우선순위 순서로 반환 (하나라도 일치하면 truthy)
+_PROBE_JS = """
+({selectors, visible}) => {
+  const isVisible = el => {
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none'
+      && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+  };
+  const matches = selectors.map(selector => {
+    try {
+      return Array.from(document.querySelectorAll(selector)).some(el => !visible || isVisible(el));
+    } catch (error) {
+      return false;
+    }
+  });
+  return matches.some(Boolean) ? matches : null;
+}
+"""
+
+SEARCH_TOGGLE_SELECTORS: Tuple[str, ...] = (
+    'button[data-testid="chat-list-search"]',
+    'button[aria-label*="Search"]',
+    'button[title*="Search"]',
+)
+SEARCH_BOX_SELECTORS: Tuple[str, ...] = (
+    '[data-testid="chat-list-search"]',
+    'input[aria-label="Search input textbox"]',
+    'input[type="text"][role="combobox"]',
+    'div[contenteditable="true"][data-tab="3"]',
+    'div[role="textbox"][contenteditable="true"][data-tab="3"]',
+    'div[role="textbox"][data-testid="chat-list-search"]',
+)
+SEARCH_BOX_FALLBACK_SELECTOR = 'div[role="textbox"][contenteditable="true"]'
+GROUP_ENTRY_SELECTORS: Tuple[str, ...] = (
+    '[data-testid="cell-frame-title"] span[title="{name}"]',
+    'span[title="{name}"]',
+    'div[role="gridcell"] [title="{name}"]',
+)
+
+
+class SelectorTimeoutError(RuntimeError):
+    """셀렉터 해석 시간 초과/No candidate matched within the timeout."""
+
+
+def css_string(value: str) -> str:
+    """CSS 문자열 이스케이프/Escape a value for use inside a double-quoted CSS string."""
+
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class SelectorResolver:
+    """셀렉터 경합 해석기/Race candidate selectors and remember the winner."""
+
+    def __init__(
+        self,
+        cache_path: Optional[str | Path] = DEFAULT_SELECTOR_CACHE,
+        *,
+        save_interval: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            cache_path: 승자/통계 저장 경로 (None이면 세션 메모리에만 유지)
+            save_interval: 통계만 바뀐 경우의 최소 저장 간격 (초)
+        """
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.save_interval = save_interval
+        self.winners: Dict[str, str] = {}
+        self.stats: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_saved = time.monotonic()
+        self._load()
+
+    def _load(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable selector cache %s: %s", self.cache_path, exc)
+            return
+        self.winners = dict(data.get("winners", {}))
+        self.stats = {key: dict(value) for key, value in data.get("stats", {}).items()}
+
+    def save(self) -> None:
+        """원자적 저장/Persist winners and statistics via ``os.replace``."""
+
+        if self.cache_path is None:
+            return
+        with self._lock:
+            payload = {"winners": self.winners, "stats": self.stats}
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            handle, temp_name = tempfile.mkstemp(
+                prefix=".selector-", suffix=".tmp", dir=str(self.cache_path.parent)
+            )
+            try:
+                with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                    json.dump(payload, temp_file, ensure_ascii=False, indent=2)
+                os.replace(temp_name, self.cache_path)
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+            self._dirty = False
+            self._last_saved = time.monotonic()
+
+    def _save_quietly(self) -> None:
+        try:
+            self.save()
+        except OSError as exc:
+            logger.warning("Failed to persist selector cache: %s", exc)
+
+    def _persist(self, winner_changed: bool) -> None:
+        # 승자 변경은 즉시, 통계만 바뀐 경우는 save_interval 간격으로 저장
+        self._dirty = True
+        if winner_changed or time.monotonic() - self._last_saved >= self.save_interval:
+            self._save_quietly()
+
+    def flush(self) -> None:
+        """미저장 통계 저장/Write pending statistics, if any."""
+
+        if self._dirty:
+            self._save_quietly()
+
+    def ordered(self, key: str, candidates: Sequence[str]) -> List[str]:
+        """후보 정렬/Return candidates with the cached winner first."""
+
+        winner = self.winners.get(key)
+        if winner in candidates:
+            return [winner, *(candidate for candidate in candidates if candidate != winner)]
+        return list(candidates)
+
+    def _record(self, key: str, templates: Sequence[str], matches: Sequence[bool]) -> bool:
+        key_stats = self.stats.setdefault(key, {})
+        for template, matched in zip(templates, matches):
+            entry = key_stats.setdefault(template, {"attempts": 0, "hits": 0})
+            entry["attempts"] += 1
+            entry["hits"] += int(bool(matched))
+        winner = next((template for template, matched in zip(templates, matches) if matched), None)
+        if winner is None:
+            return False
+        changed = self.winners.get(key) != winner
+        self.winners[key] = winner
+        return changed
+
+    def hit_rates(self, key: str) -> Dict[str, float]:
+        """적중률/Hit rate per candidate template for ``key``."""
+
+        return {
+            template: entry["hits"] / entry["attempts"]
+            for template, entry in self.stats.get(key, {}).items()
+            if entry["attempts"]
+        }
+
+    async def _matches(
+        self, page: Any, selectors: Sequence[str], *, visible: bool, timeout_ms: Optional[int]
+    ) -> Optional[List[bool]]:
+        arg = {"selectors": list(selectors), "visible": visible}
+        if timeout_ms is None:
+            return await page.evaluate(_PROBE_JS, arg)
+        handle = await page.wait_for_function(_PROBE_JS, arg=arg, polling="raf", timeout=timeout_ms)
+        try:
+            return await handle.json_value()
+        finally:
+            await handle.dispose()
+
+    async def _resolve(
+        self,
+        page: Any,
+        key: str,
+        candidates: Sequence[str],
+        *,
+        params: Optional[Dict[str, str]],
+        visible: bool,
+        timeout_ms: Optional[int],
+    ) -> Optional[Tuple[Any, str]]:
+        templates = self.ordered(key, candidates)
+        escaped = {name: css_string(value) for name, value in (params or {}).items()}
+        selectors = [template.format(**escaped) for template in templates]
+        started = time.perf_counter()
+        try:
+            matches = await self._matches(page, selectors, visible=visible, timeout_ms=timeout_ms)
+        except Exception as exc:  # noqa: BLE001 - Playwright raises generic timeout errors
+            self._record(key, templates, [False] * len(templates))
+            self._persist(False)
+            raise SelectorTimeoutError(
+                f"No selector for {key!r} matched within {timeout_ms} ms"
+            ) from exc
+        if not matches:
+            return None
+        changed = self._record(key, templates, matches)
+        index = next(position for position, matched in enumerate(matches) if matched)
+        selector = selectors[index]
+        logger.debug(
+            "Resolved %s via %s in %.0f ms", key, selector, (time.perf_counter() - started) * 1000
+        )
+        if changed:
+            logger.info("Selector winner for %s is now %s", key, templates[index])
+        self._persist(changed)
+        locator = page.locator(f"{selector} >> visible=true" if visible else selector).first
+        return locator, selector
+
+    async def resolve(
+        self,
+        page: Any,
+        key: str,
+        candidates: Sequence[str],
+        *,
+        params: Optional[Dict[str, str]] = None,
+        timeout_ms: int = 5000,
+        visible: bool = True,
+    ) -> Tuple[Any, str]:
+        """셀렉터 경합 해석/Wait until any candidate matches; return ``(locator, selector)``.
+
+        Args:
+            page: Playwright Page
+            key: 캐시 키 (예: "search_box")
+            candidates: 후보 셀렉터 템플릿 (``{name}`` 등 치환 가능)
+            params: 템플릿 치환값 (CSS 문자열 이스케이프 적용)
+            timeout_ms: 전체 후보에 대한 단일 타임아웃
+            visible: 보이는 요소만 일치로 간주할지 여부
+
+        Raises:
+            SelectorTimeoutError: 시간 내 일치 후보가 없을 때
+        """
+        resolved = await self._resolve(
+            page, key, candidates, params=params, visible=visible, timeout_ms=timeout_ms
+        )
+        if resolved is None:
+            raise SelectorTimeoutError(f"No selector for {key!r} matched")
+        return resolved
+
+    async def probe(
+        self,
+        page: Any,
+        key: str,
+        candidates: Sequence[str],
+        *,
+        params: Optional[Dict[str, str]] = None,
+        visible: bool = True,
+    ) -> Optional[Tuple[Any, str]]:
+        """즉시 확인/Check candidates once without waiting; None when nothing matches."""
+
+        return await self._resolve(
+            page, key, candidates, params=params, visible=visible, timeout_ms=None
+        )
+
+
+SELECTOR_RESOLVER = SelectorResolver()
+atexit.register(SELECTOR_RESOLVER.flush)
+
+
+async def locate_search_box(page: Any, resolver: Optional[SelectorResolver] = None) -> Any:
+    """WhatsApp 검색창 찾기/Locate the chat search box."""
+
+    resolver = resolver or SELECTOR_RESOLVER
+    toggle = await resolver.probe(page, "search_toggle", SEARCH_TOGGLE_SELECTORS)
+    if toggle is not None:
+        try:
+            await toggle[0].click()
+        except Exception as exc:  # noqa: BLE001 - toggle may vanish between probe and click
+            logger.debug("Search toggle click failed: %s", exc)
+
+    try:
+        locator, _ = await resolver.resolve(page, "search_box", SEARCH_BOX_SELECTORS, timeout_ms=5000)
+        return locator
+    except SelectorTimeoutError:
+        await page.keyboard.press("Control+K")
+        fallback = page.locator(SEARCH_BOX_FALLBACK_SELECTOR)
+        await fallback.first.wait_for(state="visible", timeout=5000)
+        return fallback.first
+
+
+async def fill_search_box(locator: Any, value: str) -> None:
+    """검색창 입력/Fill the located search box with text."""
+
+    try:
+        await locator.click()
+    except Exception:  # noqa: BLE001 - Playwright timeout while focusing
+        pass
+
+    try:
+        await locator.fill(value)
+        return
+    except Exception:
+        # 일부 contenteditable 요소는 fill이 지원되지 않음
+        pass
+
+    try:
+        await locator.press("Control+A")
+        await locator.press("Delete")
+    except Exception:  # noqa: BLE001 - broad fallback for varying DOM elements
+        await locator.evaluate(
+            "el => { if (el.value !== undefined) { el.value = ''; } else { el.textContent = ''; } }"
+        )
+
+    # 글자별 지연 입력 대신 단일 입력 이벤트로 삽입
+    await locator.page.keyboard.insert_text(value)
+
+
+async def wait_for_group_entry(
+    page: Any,
+    group_name: str,
+    resolver: Optional[SelectorResolver] = None,
+    *,
+    timeout_ms: int = 10000,
+) -> Any:
+    """그룹 항목 대기/Wait for the group entry in the search results."""
+
+    resolver = resolver or SELECTOR_RESOLVER
+    try:
+        locator, _ = await resolver.resolve(
+            page,
+            "group_entry",
+            GROUP_ENTRY_SELECTORS,
+            params={"name": group_name},
+            timeout_ms=timeout_ms,
+        )
+    except SelectorTimeoutError as error:
+        raise RuntimeError(f"Failed to locate group entry: {group_name}") from error
+    return locator
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 
@@ -36,6 +38,20 @@ class WarehouseMonthlyReporter:
         return {"level_0": level_0, "level_1": level_1}
 
 
+TRANSACTION_TYPES: List[str] = ["입고", "출고"]
+
+# 피벗 입력 열. Columns read from transaction logs for the monthly pivot.
+PIVOT_INPUT_COLUMNS: List[str] = ["date", "warehouse", "transaction_type", "quantity"]
+
+# 피벗 열 순서(유형, 창고 사전순). Pivot column order, sorted by type then warehouse.
+PIVOT_COLUMNS = pd.MultiIndex.from_product([TRANSACTION_TYPES, WAREHOUSE_COLUMNS]).sort_values()
+
+# 정규화된 창고명 조회표. Normalized warehouse names in WAREHOUSE_COLUMNS order.
+_NORMALIZED_WAREHOUSES = [
+    (candidate.replace(" ", "_").lower(), candidate) for candidate in WAREHOUSE_COLUMNS
+]
+
+
 def classify_location(row: Dict[str, str]) -> str:
     """위치 기반 창고 분류. Classify warehouse by location fields."""
 
@@ -49,26 +65,214 @@ def classify_location(row: Dict[str, str]) -> str:
     return location or warehouse or "Unknown"
 
 
+def _match_warehouse(warehouse: str) -> Optional[str]:
+    """창고명 부분 일치 검색. First WAREHOUSE_COLUMNS entry contained in a name."""
+
+    lowered = warehouse.lower()
+    for normalized, candidate in _NORMALIZED_WAREHOUSES:
+        if normalized in lowered:
+            return candidate
+    return None
+
+
+def classify_locations(dataframe: pd.DataFrame) -> pd.Series:
+    """벡터화 위치 분류. Vectorized :func:`classify_location` over a DataFrame.
+
+    The substring scan runs once per distinct ``warehouse`` value and the
+    result is broadcast back through factorized codes, returned as a
+    categorical Series.
+    """
+
+    size = len(dataframe)
+    location = (
+        dataframe["location"].fillna("").astype(str)
+        if "location" in dataframe
+        else pd.Series([""] * size, index=dataframe.index)
+    )
+    warehouse = (
+        dataframe["warehouse"].fillna("").astype(str)
+        if "warehouse" in dataframe
+        else pd.Series([""] * size, index=dataframe.index)
+    )
+
+    codes, uniques = pd.factorize(warehouse)
+    matched = np.array([_match_warehouse(value) or "" for value in uniques], dtype=object)
+    by_warehouse = matched[codes] if size else np.array([], dtype=object)
+
+    location_values = location.to_numpy(dtype=object)
+    warehouse_values = warehouse.to_numpy(dtype=object)
+    result = np.select(
+        [
+            location.isin(WAREHOUSE_COLUMNS).to_numpy(),
+            by_warehouse != "",
+            location_values != "",
+            warehouse_values != "",
+        ],
+        [location_values, by_warehouse, location_values, warehouse_values],
+        default="Unknown",
+    )
+    extra = sorted(set(result) - set(WAREHOUSE_COLUMNS))
+    return pd.Series(
+        pd.Categorical(result, categories=WAREHOUSE_COLUMNS + extra),
+        index=dataframe.index,
+        name="warehouse",
+    )
+
+
+def _empty_pivot() -> pd.DataFrame:
+    """빈 피벗. Empty pivot with the standard column layout."""
+
+    multi_columns = pd.MultiIndex.from_product(
+        [TRANSACTION_TYPES, WAREHOUSE_COLUMNS], names=["구분", "창고"]
+    )
+    return pd.DataFrame(columns=multi_columns)
+
+
+def _monthly_aggregates(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """월별 합계 계산. Sum quantities per month and pivot column with bincount.
+
+    Dates are parsed once per distinct value and every key is factorized to
+    integer codes, so the aggregation is a single ``np.bincount`` pass.
+    """
+
+    date_codes, date_uniques = pd.factorize(dataframe["date"])
+    date_months = pd.to_datetime(pd.Index(date_uniques)).to_period("M").astype(str)
+    month_of_date, months = pd.factorize(date_months)
+    # 결측 날짜(코드 -1)는 집계에서 제외됨
+    month_codes = np.where(date_codes >= 0, month_of_date[date_codes], -1)
+
+    type_codes, types = pd.factorize(dataframe["transaction_type"])
+    warehouse_codes, warehouses = pd.factorize(dataframe["warehouse"].astype(object))
+    positions = {column: index for index, column in enumerate(PIVOT_COLUMNS)}
+    column_lookup = np.array(
+        [[positions.get((kind, name), -1) for name in warehouses] + [-1] for kind in types]
+        + [[-1] * (len(warehouses) + 1)],
+        dtype=np.int64,
+    )
+    column_codes = column_lookup[type_codes, warehouse_codes]
+
+    quantity = dataframe["quantity"]
+    values = quantity.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (column_codes >= 0) & (month_codes >= 0) & ~np.isnan(values)
+    width = len(PIVOT_COLUMNS)
+    sums = np.bincount(
+        month_codes[valid] * width + column_codes[valid],
+        weights=values[valid],
+        minlength=len(months) * width,
+    ).reshape(len(months), width)
+
+    dtype = np.int64 if pd.api.types.is_integer_dtype(quantity.dtype) else np.float64
+    aggregates = pd.DataFrame(
+        sums.astype(dtype),
+        index=pd.Index(months, name="month"),
+        columns=PIVOT_COLUMNS,
+    )
+    return aggregates.sort_index()
+
+
+class IncrementalMonthlyPivot:
+    """증분 월별 피벗. Keep per-month aggregates and fold in new transactions.
+
+    Only the months present in each update are touched; untouched months keep
+    their stored sums, so refreshing after a small batch costs O(batch).
+    """
+
+    def __init__(self) -> None:
+        self._table: Optional[pd.DataFrame] = None
+
+    @property
+    def months(self) -> List[str]:
+        """집계된 월 목록. Months currently aggregated."""
+
+        return [] if self._table is None else list(self._table.index)
+
+    def update(self, transactions: pd.DataFrame) -> List[str]:
+        """거래 반영. Add transactions and return the months they touched."""
+
+        if transactions.empty:
+            return []
+        delta = _monthly_aggregates(transactions)
+        if self._table is None:
+            self._table = delta
+            return list(delta.index)
+
+        existing = delta.index.intersection(self._table.index)
+        if len(existing):
+            self._table.loc[existing] = self._table.loc[existing] + delta.loc[existing]
+        added = delta.index.difference(self._table.index)
+        if len(added):
+            self._table = pd.concat([self._table, delta.loc[added]]).sort_index()
+        return list(delta.index)
+
+    def update_chunks(self, chunks: Sequence[pd.DataFrame]) -> List[str]:
+        """청크 일괄 반영. Fold several transaction frames and return touched months."""
+
+        touched: List[str] = []
+        for chunk in chunks:
+            touched.extend(month for month in self.update(chunk) if month not in touched)
+        return touched
+
+    def pivot(self) -> pd.DataFrame:
+        """피벗 반환. Current pivot, in the layout of :func:`create_warehouse_monthly_pivot`."""
+
+        if self._table is None:
+            return _empty_pivot()
+        return self._table.copy()
+
+
 def create_warehouse_monthly_pivot(dataframe: pd.DataFrame) -> pd.DataFrame:
     """월별 창고 피벗 생성. Create monthly pivot table for warehouses."""
 
     if dataframe.empty:
-        multi_columns = pd.MultiIndex.from_product(
-            [["입고", "출고"], WAREHOUSE_COLUMNS], names=["구분", "창고"]
-        )
-        return pd.DataFrame(columns=multi_columns)
-
-    data = dataframe.copy()
-    data["date"] = pd.to_datetime(data["date"])
-    data["month"] = data["date"].dt.to_period("M").astype(str)
-    pivot = pd.pivot_table(
-        data,
-        index="month",
-        columns=["transaction_type", "warehouse"],
-        values="quantity",
-        aggfunc="sum",
-        fill_value=0,
-    )
-    pivot = pivot.reindex(columns=pd.MultiIndex.from_product([["입고", "출고"], WAREHOUSE_COLUMNS]), fill_value=0)
-    pivot.sort_index(axis=1, level=[0, 1], inplace=True)
-    return pivot
+        return _empty_pivot()
+    return _monthly_aggregates(dataframe)
+
+
+def iter_transaction_chunks(
+    source: str | Path,
+    *,
+    chunksize: int = 500_000,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """거래 로그 청크 읽기. Stream a CSV or Parquet transaction log in chunks.
+
+    Only ``columns`` are read; Parquet files are streamed record batch by
+    record batch through pyarrow so memory stays bounded by ``chunksize``.
+    """
+
+    path = Path(source)
+    selected = list(columns) if columns is not None else None
+    if path.suffix.lower() in {".parquet", ".pq"}:
+        import pyarrow.parquet as pq  # type: ignore
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=selected):
+            yield batch.to_pandas()
+        return
+
+    with pd.read_csv(path, chunksize=chunksize, usecols=selected) as reader:
+        yield from reader
+
+
+def create_warehouse_monthly_pivot_chunked(
+    source: str | Path,
+    *,
+    chunksize: int = 500_000,
+    classify: bool = False,
+) -> pd.DataFrame:
+    """청크 단위 월별 피벗. Out-of-core :func:`create_warehouse_monthly_pivot`.
+
+    Each chunk is partially aggregated per month/type/warehouse and merged
+    into an :class:`IncrementalMonthlyPivot`, so peak memory depends on
+    ``chunksize`` rather than file size. With ``classify=True`` the
+    ``warehouse`` column is first normalized by :func:`classify_locations`
+    (the log must then also contain ``location``).
+    """
+
+    columns = PIVOT_INPUT_COLUMNS + (["location"] if classify else [])
+    engine = IncrementalMonthlyPivot()
+    for chunk in iter_transaction_chunks(source, chunksize=chunksize, columns=columns):
+        if classify:
+            chunk = chunk.assign(warehouse=classify_locations(chunk))
+        engine.update(chunk)
+    return engine.pivot()
@@ -16,12 +16,11 @@ Confidence: ≥0.90 필요
 """
 
 import asyncio
-import json
 import logging
 import random
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 try:
     if hasattr(sys.stdout, "reconfigure"):
@@ -32,8 +31,7 @@ except (AttributeError, ValueError, OSError):
     pass
 from datetime import datetime
 
-from playwright.async_api import Browser, Locator, Page
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Browser, Page
 from playwright.async_api import async_playwright
 
 try:
@@ -43,12 +41,18 @@ except ImportError:
     stealth_async = None
     logging.warning("playwright_stealth not available, using basic mode")
 
+from macho_gpt.core.chat_index import CHAT_INDEX, open_chat
+from macho_gpt.core.columnar_sink import ParquetMessageSink
+from macho_gpt.core.history_backfill import HistoryBackfill
 from macho_gpt.core.logi_ai_summarizer_241219 import LogiAISummarizer
+from macho_gpt.core.resource_filter import ResourceFilter
 
 # MACHO-GPT 모듈 import
 from macho_gpt.core.logi_whatsapp_241219 import WhatsAppProcessor
+from macho_gpt.core.persistence import JSON_WRITER
 
 # 로깅 설정
+Path("logs").mkdir(exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -57,98 +61,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def _locate_search_box(page: Page) -> Locator:
-    """WhatsApp 검색창 찾기/Locate WhatsApp search box."""
-
-    toggle_selectors = [
-        'button[data-testid="chat-list-search"]',
-        'button[aria-label*="Search"]',
-        'button[title*="Search"]',
-    ]
-
-    for selector in toggle_selectors:
-        toggle = page.locator(selector)
-        try:
-            if await toggle.count() > 0 and await toggle.first.is_visible():
-                await toggle.first.click()
-                await page.wait_for_timeout(200)
-                break
-        except PlaywrightTimeoutError:
-            continue
-        except Exception:
-            continue
-
-    search_selectors = [
-        '[data-testid="chat-list-search"]',
-        'input[aria-label="Search input textbox"]',
-        'input[type="text"][role="combobox"]',
-        'div[contenteditable="true"][data-tab="3"]',
-        'div[role="textbox"][contenteditable="true"][data-tab="3"]',
-        'div[role="textbox"][data-testid="chat-list-search"]',
-    ]
-
-    for selector in search_selectors:
-        locator = page.locator(selector)
-        try:
-            await locator.first.wait_for(state="visible", timeout=5000)
-            return locator.first
-        except PlaywrightTimeoutError:
-            continue
-
-    await page.keyboard.press("Control+K")
-    await page.wait_for_timeout(200)
-    fallback = page.locator('div[role="textbox"][contenteditable="true"]')
-    await fallback.first.wait_for(state="visible", timeout=5000)
-    return fallback.first
-
-
-async def _fill_search_box(locator: Locator, value: str) -> None:
-    """검색창 입력/Fill the located search box."""
-
-    try:
-        await locator.click()
-    except PlaywrightTimeoutError:
-        pass
-
-    try:
-        await locator.fill(value)
-        return
-    except Exception:
-        pass
-
-    try:
-        await locator.press("Control+A")
-        await locator.press("Delete")
-    except Exception:
-        await locator.evaluate(
-            "el => { if (el.value !== undefined) { el.value = ''; } else { el.textContent = ''; } }"
-        )
-
-    await locator.type(value, delay=50)
-
-
-async def _wait_for_group_entry(page: Page, group_name: str) -> Locator:
-    """그룹 항목 대기/Wait for group entry in search results."""
-
-    selectors = [
-        f'[data-testid="cell-frame-title"] span[title="{group_name}"]',
-        f'span[title="{group_name}"]',
-        f'div[role="gridcell"] [title="{group_name}"]',
-    ]
-
-    last_error: Exception | None = None
-    for selector in selectors:
-        locator = page.locator(selector)
-        try:
-            await locator.first.wait_for(state="visible", timeout=10000)
-            return locator.first
-        except Exception as error:  # noqa: BLE001
-            last_error = error
-            continue
-
-    raise RuntimeError(f"채팅방을 찾을 수 없습니다: {group_name}") from last_error
-
-
 class WhatsAppRPAExtractor:
     """
     MACHO-GPT WhatsApp RPA 자동화 클래스
@@ -160,8 +72,15 @@ class WhatsAppRPAExtractor:
     - 오류 복구 메커니즘
     """
 
-    def __init__(self, mode: str = "LATTICE"):
+    def __init__(
+        self,
+        mode: str = "LATTICE",
+        parquet_dir: Optional[str] = None,
+        block_resources: bool = True,
+        history_limit: int = 500,
+    ):
         self.mode = mode
+        self.history_limit = history_limit
         self.confidence_threshold = 0.90
         self.auth_file = Path("auth.json")
         self.data_dir = Path("data")
@@ -174,6 +93,9 @@ class WhatsAppRPAExtractor:
         # 모듈 초기화
         self.whatsapp_processor = WhatsAppProcessor(mode=mode)
         self.ai_summarizer = LogiAISummarizer()
+        self.parquet_sink = ParquetMessageSink(parquet_dir) if parquet_dir else None
+        # 텍스트만 추출하므로 이미지/미디어/폰트 요청 차단
+        self.resource_filter = ResourceFilter(enabled=block_resources)
 
         # 스텔스 설정
         self.user_agents = [
@@ -264,6 +186,8 @@ class WhatsAppRPAExtractor:
                     timezone_id="Asia/Seoul",
                 )
 
+                await self.resource_filter.install(context)
+
                 page = await context.new_page()
                 # 스텔스 설정 적용 (fallback 지원)
                 if stealth_async:
@@ -292,6 +216,7 @@ class WhatsAppRPAExtractor:
                     "extraction_time": datetime.now().isoformat(),
                     "message_count": len(messages),
                     "confidence": self._calculate_extraction_confidence(messages),
+                    "resource_filter": self.resource_filter.take_cycle_stats(),
                 }
 
         except Exception as e:
@@ -323,28 +248,11 @@ class WhatsAppRPAExtractor:
     ) -> List[str]:
         """특정 채팅방에서 메시지 추출"""
         try:
-            # 채팅방 검색 및 선택
-            search_box = await _locate_search_box(page)
-            await _fill_search_box(search_box, chat_title)
-            await page.wait_for_timeout(2000)
-
-            # 채팅방 클릭
-            chat_entry = await _wait_for_group_entry(page, chat_title)
-            await chat_entry.click()
-
-            # 메시지 로딩 대기
-            await page.wait_for_timeout(random.randint(3000, 5000))
-
-            # 페이지 스크롤 (더 많은 메시지 로드)
-            await self._scroll_to_load_messages(page)
+            # 채팅방 선택 (사이드바 인덱스 우선, 실패 시 검색)
+            await open_chat(page, chat_title, index=CHAT_INDEX)
 
-            # 메시지 추출
-            messages = await page.locator(
-                '[data-testid="conversation-panel-messages"] .message-in, [data-testid="conversation-panel-messages"] .message-out'
-            ).all_text_contents()
-
-            # 빈 메시지 필터링
-            filtered_messages = [msg.strip() for msg in messages if msg.strip()]
+            # 가상화된 목록을 거슬러 올라가며 메시지 수집
+            filtered_messages = await self._harvest_history(page, chat_title)
 
             logger.info(f"📄 메시지 추출 완료 - {len(filtered_messages)}개")
             return filtered_messages
@@ -353,21 +261,24 @@ class WhatsAppRPAExtractor:
             logger.error(f"❌ 메시지 추출 오류: {str(e)}")
             return []
 
-    async def _scroll_to_load_messages(self, page: Page) -> None:
-        """메시지 로딩을 위한 스크롤"""
-        try:
-            # 위로 스크롤하여 더 많은 메시지 로드
-            for _ in range(5):
-                await page.keyboard.press("PageUp")
-                await page.wait_for_timeout(random.randint(1000, 2000))
+    async def _harvest_history(self, page: Page, chat_title: str) -> List[str]:
+        """가상화 목록 백필로 최근 메시지 수집 (오래된 순)"""
+        batches: List[List[Dict[str, Any]]] = []
 
-            # 아래로 스크롤하여 최신 메시지까지
-            for _ in range(3):
-                await page.keyboard.press("PageDown")
-                await page.wait_for_timeout(random.randint(1000, 2000))
+        async def collect(batch: List[Dict[str, Any]]) -> None:
+            # 배치는 점점 과거로 진행하므로 앞쪽에 삽입
+            batches.insert(0, batch)
 
+        backfill = HistoryBackfill(chat_title, checkpoint_dir=None)
+        try:
+            await backfill.run(page, collect, max_messages=self.history_limit)
         except Exception as e:
-            logger.warning(f"⚠️ 스크롤 처리 중 오류: {str(e)}")
+            logger.warning(f"⚠️ 기록 수집 중 오류: {str(e)}")
+
+        messages = [
+            message["raw_text"] or message["text"] for batch in batches for message in batch
+        ]
+        return [message for message in messages if message]
 
     async def _save_auth_state(self, context) -> None:
         """인증 상태 저장"""
@@ -429,16 +340,9 @@ class WhatsAppRPAExtractor:
             date_key = datetime.now().strftime("%Y-%m-%d")
             data_file = self.data_dir / f"whatsapp_data_{date_key}.json"
 
-            # 기존 데이터 로드
-            if data_file.exists():
-                with open(data_file, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
-            else:
-                existing_data = {}
-
-            # 새 데이터 추가
+            # 새 데이터 항목
             timestamp = datetime.now().strftime("%H:%M:%S")
-            existing_data[timestamp] = {
+            entry = {
                 "chat_title": result.get("chat_title", ""),
                 "summary": result.get("summary", ""),
                 "tasks": result.get("tasks", []),
@@ -455,12 +359,25 @@ class WhatsAppRPAExtractor:
                 ],  # 최대 50개 메시지만 저장
             }
 
-            # 파일 저장
-            with open(data_file, "w", encoding="utf-8") as f:
-                json.dump(existing_data, f, ensure_ascii=False, indent=2)
+            def add_entry(existing_data: Dict[str, Any]) -> Dict[str, Any]:
+                existing_data[timestamp] = entry
+                return existing_data
+
+            # 기존 데이터 로드/추가/저장은 writer 스레드에서 수행
+            await JSON_WRITER.update(data_file, add_entry)
 
             logger.info(f"💾 데이터 저장 완료 - {data_file}")
 
+            if self.parquet_sink is not None:
+                await asyncio.to_thread(
+                    self.parquet_sink.write,
+                    result.get("messages", []),
+                    result.get("chat_title", ""),
+                    backend="rpa",
+                )
+                # 추출은 간헐적으로 실행되므로 매번 파일을 마감해 바로 읽을 수 있게 함
+                await asyncio.to_thread(self.parquet_sink.close)
+
         except Exception as e:
             logger.error(f"❌ 데이터 저장 오류: {str(e)}")
 
@@ -12,7 +12,6 @@ Features:
 
 import argparse
 import asyncio
-import json
 import logging
 import sys
 from dataclasses import asdict
@@ -28,6 +27,11 @@ from macho_gpt.async_scraper.group_config import (
     MultiGroupConfig,
 )
 from macho_gpt.async_scraper.multi_group_manager import MultiGroupManager  # noqa: E402
+from macho_gpt.async_scraper.shard_supervisor import ShardSupervisor  # noqa: E402
+from macho_gpt.core.columnar_sink import ParquetMessageSink  # noqa: E402
+from macho_gpt.core.coordination import LeaseCoordinator, backend_from_url  # noqa: E402
+from macho_gpt.core.message_search import MessageSearchIndex  # noqa: E402
+from macho_gpt.core.persistence import JSON_WRITER  # noqa: E402
 from setup.whatsapp_webjs.whatsapp_webjs_bridge import WhatsAppWebJSBridge  # noqa: E402
 
 try:
@@ -160,14 +164,14 @@ def _resolve_backend_sequence(selected: str, fallback: bool) -> List[str]:
     return ["webjs"]
 
 
-def _persist_webjs_group(
-    group_payload: Dict[str, Any], group_config: GroupConfig
+async def _persist_webjs_group(
+    group_payload: Dict[str, Any],
+    group_config: GroupConfig,
+    parquet_sink: Optional[ParquetMessageSink] = None,
+    search_index: Optional[MessageSearchIndex] = None,
 ) -> None:
     """webjs 결과 저장/Persist whatsapp-web.js group payload."""
 
-    target_path = Path(group_config.save_file)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-
     payload = {
         "status": "SUCCESS",
         "backend": "webjs",
@@ -175,8 +179,23 @@ def _persist_webjs_group(
         "group": group_payload,
     }
 
-    with open(target_path, "w", encoding="utf-8") as handle:
-        json.dump(payload, handle, ensure_ascii=False, indent=2)
+    # 이벤트 루프 밖 writer 스레드에서 원자적 저장 (매니페스트 포함)
+    await JSON_WRITER.write(group_config.save_file, payload)
+
+    if parquet_sink is not None:
+        await asyncio.to_thread(
+            parquet_sink.write,
+            group_payload.get("messages", []),
+            group_config.name,
+            backend="webjs",
+        )
+    if search_index is not None:
+        await asyncio.to_thread(
+            search_index.add_messages,
+            group_payload.get("messages", []),
+            group_config.name,
+            backend="webjs",
+        )
 
 
 async def _run_playwright_backend(
@@ -188,6 +207,18 @@ async def _run_playwright_backend(
     max_messages: int,
     timeout: int,
     headless: bool,
+    parquet_dir: Optional[str] = None,
+    search_db: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    metrics_json: Optional[str] = None,
+    block_resources: bool = True,
+    backfill_until: Optional[str] = None,
+    backfill_max: Optional[int] = None,
+    standby_browsers: int = 0,
+    workers: int = 1,
+    coordination: Optional[str] = None,
+    node_id: Optional[str] = None,
+    lease_ttl: float = 30.0,
 ) -> List[Dict[str, Any]]:
     """Playwright 백엔드 실행/Run the Playwright backend."""
 
@@ -202,16 +233,77 @@ async def _run_playwright_backend(
     for group in groups:
         group.max_messages = min(group.max_messages, max_messages)
 
-    manager = MultiGroupManager(
-        group_configs=groups,
+    enhancements = dict(config.enhancements)
+    if parquet_dir:
+        enhancements["parquet_sink"] = {"enabled": True, "root": parquet_dir}
+    if search_db:
+        enhancements["search_index"] = {"enabled": True, "db_path": search_db}
+    if not block_resources:
+        enhancements["resource_filter"] = {"enabled": False}
+    if backfill_until or backfill_max:
+        backfill = dict(enhancements.get("history_backfill", {}), enabled=True)
+        if backfill_until:
+            backfill["until"] = backfill_until
+        if backfill_max:
+            backfill["max_messages"] = backfill_max
+        enhancements["history_backfill"] = backfill
+    if standby_browsers > 0:
+        enhancements["browser_pool"] = dict(
+            enhancements.get("browser_pool", {}), enabled=True, standby=standby_browsers
+        )
+
+    manager_options = dict(
         max_parallel_groups=config.scraper_settings.max_parallel_groups,
         ai_integration=asdict(config.ai_integration),
         chrome_data_root=config.scraper_settings.chrome_data_dir,
         headless=config.scraper_settings.headless,
         timeout=config.scraper_settings.timeout,
-        enhancements=getattr(config, "enhancements", {}),
+        enhancements=enhancements,
+        metrics_port=metrics_port,
+        metrics_json=metrics_json,
     )
 
+    if coordination:
+        # 여러 호스트가 임대 저장소를 공유하며 그룹 소유권을 나눔
+        if workers > 1:
+            logger.warning("--workers is ignored when --coordination is set")
+        coordinator = LeaseCoordinator(
+            backend_from_url(coordination),
+            [group.name for group in groups],
+            node_id=node_id,
+            ttl=lease_ttl,
+        )
+        manager = MultiGroupManager(group_configs=groups, **manager_options)
+        logger.info(
+            "Playwright backend coordinating %d groups as node %s via %s",
+            len(groups),
+            coordinator.node_id,
+            coordination,
+        )
+        return await manager.run_coordinated(coordinator)
+
+    if workers > 1 and len(groups) > 1:
+        # 그룹을 워커 프로세스로 샤딩 (프로세스별 이벤트 루프/브라우저)
+        supervisor = ShardSupervisor(groups, workers, manager_options)
+        logger.info(
+            "Playwright backend starting for %d groups across %d worker processes",
+            len(groups),
+            min(workers, len(groups)),
+        )
+        run = asyncio.ensure_future(asyncio.to_thread(supervisor.run))
+        try:
+            results = await asyncio.shield(run)
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            # 스레드 안의 run()은 KeyboardInterrupt를 받지 못하므로 직접 중지 후 종료를 기다림
+            logger.info("Stopping shard workers")
+            supervisor.stop()
+            await run
+            raise
+        logger.info("Playwright backend completed: %s", supervisor.get_stats())
+        return results
+
+    manager = MultiGroupManager(group_configs=groups, **manager_options)
+
     logger.info("Playwright backend starting for %d groups", len(groups))
     results = await manager.run_all_groups()
     logger.info("Playwright backend completed")
@@ -224,6 +316,8 @@ async def _run_webjs_backend(
     *,
     max_messages: int,
     include_media: bool,
+    parquet_dir: Optional[str] = None,
+    search_db: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """whatsapp-web.js 백엔드 실행/Run the whatsapp-web.js backend."""
 
@@ -245,6 +339,9 @@ async def _run_webjs_backend(
         group.name: loop.time() - max(group.scrape_interval, 1) for group in groups
     }
 
+    parquet_sink = ParquetMessageSink(parquet_dir) if parquet_dir else None
+    search_index = MessageSearchIndex(search_db) if search_db else None
+
     logger.info("whatsapp-web.js backend polling started for %d groups", len(groups))
 
     try:
@@ -291,7 +388,9 @@ async def _run_webjs_backend(
                 if not group_config:
                     continue
 
-                _persist_webjs_group(group_payload, group_config)
+                await _persist_webjs_group(
+                    group_payload, group_config, parquet_sink, search_index
+                )
                 latest_results[name] = {
                     "group_name": name,
                     "success": True,
@@ -308,6 +407,12 @@ async def _run_webjs_backend(
     except Exception as exc:  # pragma: no cover - safety net for runtime errors
         logger.exception("whatsapp-web.js backend failed: %s", exc)
         raise
+    finally:
+        await JSON_WRITER.aflush()
+        if parquet_sink is not None:
+            parquet_sink.close()
+        if search_index is not None:
+            search_index.close()
 
     return list(latest_results.values())
 
@@ -324,6 +429,18 @@ async def run_optimal_scraper(
     backend: Optional[str] = None,
     webjs_fallback: Optional[bool] = None,
     include_media: bool = False,
+    parquet_dir: Optional[str] = None,
+    search_db: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    metrics_json: Optional[str] = None,
+    block_resources: bool = True,
+    backfill_until: Optional[str] = None,
+    backfill_max: Optional[int] = None,
+    standby_browsers: int = 0,
+    workers: int = 1,
+    coordination: Optional[str] = None,
+    node_id: Optional[str] = None,
+    lease_ttl: float = 30.0,
 ) -> List[Dict[str, Any]]:
     """최적화된 스크래퍼 실행/Run the optimal scraper."""
 
@@ -362,6 +479,18 @@ async def run_optimal_scraper(
                     max_messages=max_messages,
                     timeout=timeout,
                     headless=headless,
+                    parquet_dir=parquet_dir,
+                    search_db=search_db,
+                    metrics_port=metrics_port,
+                    metrics_json=metrics_json,
+                    block_resources=block_resources,
+                    backfill_until=backfill_until,
+                    backfill_max=backfill_max,
+                    standby_browsers=standby_browsers,
+                    workers=workers,
+                    coordination=coordination,
+                    node_id=node_id,
+                    lease_ttl=lease_ttl,
                 )
             if backend_name == "webjs":
                 return await _run_webjs_backend(
@@ -369,6 +498,8 @@ async def run_optimal_scraper(
                     selected_groups,
                     max_messages=max_messages,
                     include_media=include_media,
+                    parquet_dir=parquet_dir,
+                    search_db=search_db,
                 )
             raise ValueError(f"Unsupported backend requested: {backend_name}")
         except Exception as exc:
@@ -464,6 +595,81 @@ def main():
 
     parser.add_argument("--timeout", type=int, default=30000, help="타임아웃 (밀리초)")
 
+    parser.add_argument(
+        "--parquet-dir",
+        default=None,
+        help="메시지를 그룹/날짜별 Parquet으로도 저장할 디렉터리",
+    )
+
+    parser.add_argument(
+        "--search-db",
+        default=None,
+        help="메시지 전문 검색 색인(sqlite) 경로",
+    )
+
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Playwright 백엔드 /metrics HTTP 엔드포인트 포트",
+    )
+
+    parser.add_argument(
+        "--metrics-json",
+        default=None,
+        help="종료 시 메트릭 스냅샷을 저장할 JSON 경로",
+    )
+
+    parser.add_argument(
+        "--no-resource-filter",
+        action="store_true",
+        help="텍스트 전용 그룹의 이미지/미디어/폰트 요청 차단 비활성화",
+    )
+
+    parser.add_argument(
+        "--backfill-until",
+        default=None,
+        help="이 날짜(YYYY-MM-DD)까지 과거 메시지 백필 (중단 시 체크포인트에서 재개)",
+    )
+
+    parser.add_argument(
+        "--backfill-max",
+        type=int,
+        default=None,
+        help="그룹당 최대 백필 메시지 수",
+    )
+
+    parser.add_argument(
+        "--standby-browsers",
+        type=int,
+        default=0,
+        help="장애 시 교체할 로그인된 대기 브라우저 수 (0이면 비활성)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="그룹을 나눠 실행할 워커 프로세스 수 (1이면 단일 프로세스)",
+    )
+
+    parser.add_argument(
+        "--coordination",
+        help="호스트 간 그룹 임대 저장소 URL (sqlite:///path.db, file:///dir, redis://host:6379/0)",
+    )
+
+    parser.add_argument(
+        "--node-id",
+        help="임대 조정용 노드 식별자 (기본: 호스트명-PID)",
+    )
+
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        default=30.0,
+        help="그룹 임대 유효 시간(초); 죽은 노드의 그룹은 이 시간 후 재분배",
+    )
+
     parser.add_argument(
         "--no-headless", action="store_true", help="헤드리스 모드 비활성화"
     )
@@ -499,6 +705,18 @@ def main():
                 backend=args.backend,
                 webjs_fallback=args.webjs_fallback,
                 include_media=args.include_media,
+                parquet_dir=args.parquet_dir,
+                search_db=args.search_db,
+                metrics_port=args.metrics_port,
+                metrics_json=args.metrics_json,
+                block_resources=not args.no_resource_filter,
+                backfill_until=args.backfill_until,
+                backfill_max=args.backfill_max,
+                standby_browsers=args.standby_browsers,
+                workers=args.workers,
+                coordination=args.coordination,
+                node_id=args.node_id,
+                lease_ttl=args.lease_ttl,
             )
         )
 
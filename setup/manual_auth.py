@@ -20,8 +20,6 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-from playwright.async_api import Locator, Page
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
 try:
@@ -34,7 +32,17 @@ except (AttributeError, ValueError, OSError):
 
 # MACHO-GPT 모듈 import
 try:
+    from macho_gpt.core.data_manifest import record_data_file
+    from macho_gpt.core.readiness import (
+        wait_for_message_list_stable,
+        wait_for_search_results_settled,
+    )
     from macho_gpt.core.role_config import RoleConfigManager
+    from macho_gpt.core.selector_resolver import (
+        fill_search_box,
+        locate_search_box,
+        wait_for_group_entry,
+    )
     from macho_gpt.rpa.logi_rpa_whatsapp_241219 import WhatsAppRPAExtractor
 except ImportError as e:
     print(f"❌ MACHO-GPT 모듈 import 오류: {e}")
@@ -52,98 +60,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def _locate_search_box(page: Page) -> Locator:
-    """WhatsApp 검색창 찾기/Locate WhatsApp search box."""
-
-    toggle_selectors = [
-        'button[data-testid="chat-list-search"]',
-        'button[aria-label*="Search"]',
-        'button[title*="Search"]',
-    ]
-
-    for selector in toggle_selectors:
-        toggle = page.locator(selector)
-        try:
-            if await toggle.count() > 0 and await toggle.first.is_visible():
-                await toggle.first.click()
-                await page.wait_for_timeout(200)
-                break
-        except PlaywrightTimeoutError:
-            continue
-        except Exception:
-            continue
-
-    search_selectors = [
-        '[data-testid="chat-list-search"]',
-        'input[aria-label="Search input textbox"]',
-        'input[type="text"][role="combobox"]',
-        'div[contenteditable="true"][data-tab="3"]',
-        'div[role="textbox"][contenteditable="true"][data-tab="3"]',
-        'div[role="textbox"][data-testid="chat-list-search"]',
-    ]
-
-    for selector in search_selectors:
-        locator = page.locator(selector)
-        try:
-            await locator.first.wait_for(state="visible", timeout=5000)
-            return locator.first
-        except PlaywrightTimeoutError:
-            continue
-
-    await page.keyboard.press("Control+K")
-    await page.wait_for_timeout(200)
-    fallback = page.locator('div[role="textbox"][contenteditable="true"]')
-    await fallback.first.wait_for(state="visible", timeout=5000)
-    return fallback.first
-
-
-async def _fill_search_box(locator: Locator, value: str) -> None:
-    """검색창 입력/Fill the located search box."""
-
-    try:
-        await locator.click()
-    except PlaywrightTimeoutError:
-        pass
-
-    try:
-        await locator.fill(value)
-        return
-    except Exception:
-        pass
-
-    try:
-        await locator.press("Control+A")
-        await locator.press("Delete")
-    except Exception:
-        await locator.evaluate(
-            "el => { if (el.value !== undefined) { el.value = ''; } else { el.textContent = ''; } }"
-        )
-
-    await locator.type(value, delay=50)
-
-
-async def _wait_for_group_entry(page: Page, group_name: str) -> Locator:
-    """그룹 항목 대기/Wait for group entry in search results."""
-
-    selectors = [
-        f'[data-testid="cell-frame-title"] span[title="{group_name}"]',
-        f'span[title="{group_name}"]',
-        f'div[role="gridcell"] [title="{group_name}"]',
-    ]
-
-    last_error: Exception | None = None
-    for selector in selectors:
-        locator = page.locator(selector)
-        try:
-            await locator.first.wait_for(state="visible", timeout=10000)
-            return locator.first
-        except Exception as error:  # noqa: BLE001
-            last_error = error
-            continue
-
-    raise RuntimeError(f"채팅방을 찾을 수 없습니다: {group_name}") from last_error
-
-
 class WhatsAppRPAManualExtractor:
     """WhatsApp RPA 수동 추출 관리자"""
 
@@ -208,13 +124,14 @@ class WhatsAppRPAManualExtractor:
 
                 # 채팅방 검색 및 선택
                 print(f"\n🔍 채팅방 검색 중: {chat_title}")
-                search_box = await _locate_search_box(page)
-                await _fill_search_box(search_box, chat_title)
-                await page.wait_for_timeout(2000)
+                search_box = await locate_search_box(page)
+                await wait_for_search_results_settled(
+                    page, action=lambda: fill_search_box(search_box, chat_title)
+                )
 
                 # 채팅방 클릭
                 try:
-                    chat_entry = await _wait_for_group_entry(page, chat_title)
+                    chat_entry = await wait_for_group_entry(page, chat_title)
                     await chat_entry.click()
                     print(f"✅ 채팅방 선택 완료: {chat_title}")
                 except Exception:
@@ -236,7 +153,7 @@ class WhatsAppRPAManualExtractor:
 
                 # 메시지 로딩 대기
                 print("📄 메시지 로딩 중...")
-                await page.wait_for_timeout(3000)
+                await wait_for_message_list_stable(page)
 
                 # 메시지 추출
                 print("📄 메시지 추출 중...")
@@ -313,6 +230,7 @@ async def main():
 
             with open(output_file, "w", encoding="utf-8") as f:
                 json.dump(result, f, ensure_ascii=False, indent=2)
+            record_data_file(output_file, result)
 
             print(f"💾 결과가 저장되었습니다: {output_file}")
 
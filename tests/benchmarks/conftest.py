@@ -0,0 +1,172 @@
+"""벤치마크 공용 픽스처. Shared fixtures for the throughput benchmark suite.
+
+Benchmarks are opt-in: set ``MACHO_BENCHMARK=1`` and install
+``pytest-benchmark``. Corpus sizes default to 1k/10k messages; add 100k with
+``MACHO_BENCHMARK_FULL=1``. Throughput floors live in ``thresholds.json`` and
+can be relaxed on slow runners with ``MACHO_BENCHMARK_THRESHOLD_SCALE``.
+
+WhatsApp Web DOM fixtures are rendered from the snapshot templates in
+``fixtures/`` (or ``MACHO_BENCHMARK_SNAPSHOT_DIR``, for snapshots recorded
+with ``page.content()`` alongside ``tools/dom_analyzer.py``) and served from a
+local static HTTP server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+BENCHMARK_DIR = Path(__file__).parent
+FIXTURE_DIR = Path(os.environ.get("MACHO_BENCHMARK_SNAPSHOT_DIR", BENCHMARK_DIR / "fixtures"))
+THRESHOLDS = json.loads((BENCHMARK_DIR / "thresholds.json").read_text(encoding="utf-8"))
+
+BENCHMARK_ENABLED = os.environ.get("MACHO_BENCHMARK") == "1"
+FULL_CORPUS = os.environ.get("MACHO_BENCHMARK_FULL") == "1"
+CORPUS_SIZES = (1_000, 10_000, 100_000) if FULL_CORPUS else (1_000, 10_000)
+MEDIA_CORPUS_SIZES = (100, 1_000)
+
+SENDERS = ("MR.CHA", "DSV Ops", "Port Control", "팀장", "Customs Broker")
+TEMPLATES = (
+    "MV HYUNDAI {n} 입항 예정, B/L HVDC-BL-{n:05d} 확인 부탁드립니다.",
+    "DSV Indoor 창고 입고 완료 - 케이스 {n} 건",
+    "긴급: MOSB 하역 일정 변경, 컨테이너 {n} 대기 중",
+    "AGI 현장 반출 승인 요청 #{n}",
+    "Customs clearance pending for shipment {n}, ASAP please",
+)
+
+
+def pytest_collection_modifyitems(config: Any, items: List[Any]) -> None:
+    """벤치마크 게이트. Skip benchmarks unless ``MACHO_BENCHMARK=1``."""
+
+    if BENCHMARK_ENABLED:
+        return
+    skip = pytest.mark.skip(reason="set MACHO_BENCHMARK=1 to run benchmarks")
+    for item in items:
+        if BENCHMARK_DIR in Path(str(item.fspath)).parents:
+            item.add_marker(skip)
+
+
+def synthetic_messages(count: int) -> List[Dict[str, str]]:
+    """합성 메시지 코퍼스. Deterministic corpus of logistics chat messages."""
+
+    return [
+        {
+            "index": index,
+            "sender": SENDERS[index % len(SENDERS)],
+            "text": TEMPLATES[index % len(TEMPLATES)].format(n=index),
+            "timestamp": f"2025-07-{1 + index // 86400 % 28:02d} "
+            f"{index // 3600 % 24:02d}:{index // 60 % 60:02d}:{index % 60:02d}",
+        }
+        for index in range(count)
+    ]
+
+
+def render_chat_snapshot(messages: List[Dict[str, Any]], group_name: str) -> str:
+    """채팅 스냅샷 렌더링. Fill the recorded page shell with message rows."""
+
+    shell = (FIXTURE_DIR / "whatsapp_chat_snapshot.html").read_text(encoding="utf-8")
+    row = (FIXTURE_DIR / "message_row.html").read_text(encoding="utf-8")
+    rows = "".join(
+        row.format(
+            index=message["index"],
+            sender=escape(message["sender"]),
+            text=escape(message["text"]),
+            timestamp=message["timestamp"],
+        )
+        for message in messages
+    )
+    return shell.replace("{group_name}", escape(group_name)).replace("<!--MESSAGES-->", rows)
+
+
+def assert_throughput(benchmark: Any, name: str, size: int) -> float:
+    """처리량 회귀 검사. Fail when items/second falls below the recorded floor."""
+
+    scale = float(os.environ.get("MACHO_BENCHMARK_THRESHOLD_SCALE", "1.0"))
+    mean_seconds = benchmark.stats.stats.mean
+    throughput = size / mean_seconds if mean_seconds else float("inf")
+    benchmark.extra_info["items"] = size
+    benchmark.extra_info["throughput_per_sec"] = round(throughput, 1)
+    floor = THRESHOLDS[name][str(size)] * scale
+    assert throughput >= floor, (
+        f"{name}[{size}] throughput regressed: {throughput:.1f}/s < {floor:.1f}/s"
+    )
+    return throughput
+
+
+@pytest.fixture(scope="session")
+def static_server(tmp_path_factory: Any) -> Iterator[Dict[str, Any]]:
+    """로컬 정적 서버. Serve rendered snapshots over HTTP on 127.0.0.1."""
+
+    root = tmp_path_factory.mktemp("snapshots")
+    handler = functools.partial(_QuietHandler, directory=str(root))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield {"root": root, "url": f"http://127.0.0.1:{server.server_address[1]}"}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+class BrowserHarness:
+    """동기 브라우저 하네스. Own an event loop and a headless Chromium page.
+
+    pytest-benchmark drives synchronous callables, so coroutines are executed
+    on a private loop with :meth:`run`.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._playwright: Any = None
+        self.browser: Any = None
+        self.page: Any = None
+
+    def run(self, coroutine: Any) -> Any:
+        return self.loop.run_until_complete(coroutine)
+
+    async def start(self) -> None:
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(headless=True)
+        self.page = await self.browser.new_page()
+
+    async def stop(self) -> None:
+        if self.browser is not None:
+            await self.browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+
+@pytest.fixture
+def browser_harness() -> Iterator[BrowserHarness]:
+    """Chromium 하네스. Skip when Playwright or its browser is unavailable."""
+
+    pytest.importorskip("playwright.async_api")
+    harness = BrowserHarness()
+    try:
+        harness.run(harness.start())
+    except Exception as exc:  # 브라우저 미설치 등
+        harness.run(harness.stop())
+        harness.loop.close()
+        pytest.skip(f"Chromium unavailable: {exc}")
+    try:
+        yield harness
+    finally:
+        harness.run(harness.stop())
+        harness.loop.close()
@@ -0,0 +1,76 @@
+"""텍스트/OCR 처리량 벤치마크. Throughput benchmarks for parsing and media OCR."""
+
+import asyncio
+import io
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from macho_gpt.core.logi_whatsapp_241219 import WhatsAppProcessor
+
+from .conftest import CORPUS_SIZES, MEDIA_CORPUS_SIZES, assert_throughput, synthetic_messages
+
+
+class _StaticReader:
+    """고정 결과 OCR 리더. Constant reader so the benchmark measures pipeline overhead."""
+
+    def readtext(self, image, **kwargs):
+        return [(None, "HVDC-BL-00042 DSV MOSB", 0.93)]
+
+    def readtext_batched(self, images, **kwargs):
+        return [self.readtext(image) for image in images]
+
+
+@pytest.mark.parametrize("size", CORPUS_SIZES)
+def test_parse_whatsapp_text_throughput(benchmark, size):
+    """parse_whatsapp_text 처리량 측정"""
+    raw_text = "\n".join(
+        f"[{message['timestamp']}] {message['sender']}: {message['text']}"
+        for message in synthetic_messages(size)
+    )
+    processor = WhatsAppProcessor(mode="PRIME")
+
+    messages = benchmark(processor.parse_whatsapp_text, raw_text)
+
+    assert len(messages) == size
+    assert_throughput(benchmark, "parse_whatsapp_text", size)
+
+
+@pytest.mark.parametrize("size", MEDIA_CORPUS_SIZES)
+def test_ocr_pipeline_throughput(benchmark, monkeypatch, size):
+    """메모리 OCR 파이프라인(디코딩·해시·캐시) 처리량 측정"""
+    image_module = pytest.importorskip("PIL.Image")
+    extractor_module = pytest.importorskip("whatsapp_media_ocr_extractor")
+
+    images = []
+    for index in range(size):
+        buffer = io.BytesIO()
+        image = image_module.new("L", (160, 48), color=255)
+        image.putpixel((index % 160, index // 160 % 48), 0)
+        image.paste(0, (index % 120, 10, index % 120 + 40, 30))
+        image.save(buffer, format="PNG")
+        images.append(buffer.getvalue())
+
+    loop = asyncio.new_event_loop()
+    state = {}
+
+    def reset():
+        processor = extractor_module.MediaOCRProcessor(
+            cache=extractor_module.OCRResultCache(":memory:"), near_duplicate_distance=None
+        )
+        processor.reader = _StaticReader()
+        state["processor"] = processor
+
+    async def run_corpus():
+        processor = state["processor"]
+        return [await processor.process_image_bytes(data) for data in images]
+
+    monkeypatch.setattr(extractor_module, "EASYOCR_AVAILABLE", True)
+    try:
+        results = benchmark.pedantic(lambda: loop.run_until_complete(run_corpus()), setup=reset, rounds=3)
+    finally:
+        loop.close()
+
+    assert len(results) == size
+    assert_throughput(benchmark, "ocr_process_image_bytes", size)
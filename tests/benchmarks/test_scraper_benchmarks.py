@@ -0,0 +1,73 @@
+"""스크래퍼 처리량 벤치마크. Throughput benchmarks for the Playwright scraper."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from macho_gpt.async_scraper.async_scraper import AsyncGroupScraper
+from macho_gpt.async_scraper.group_config import GroupConfig
+
+from .conftest import CORPUS_SIZES, assert_throughput, render_chat_snapshot, synthetic_messages
+
+GROUP_NAME = "HVDC 물류팀"
+
+
+def _scraper(save_file):
+    return AsyncGroupScraper(GroupConfig(name=GROUP_NAME, save_file=str(save_file)))
+
+
+@pytest.mark.parametrize("size", CORPUS_SIZES)
+def test_scrape_messages_throughput(benchmark, browser_harness, static_server, tmp_path, size):
+    """스냅샷 DOM에서 scrape_messages 처리량 측정"""
+    snapshot = static_server["root"] / f"chat_{size}.html"
+    snapshot.write_text(render_chat_snapshot(synthetic_messages(size), GROUP_NAME), encoding="utf-8")
+    browser_harness.run(
+        browser_harness.page.goto(f"{static_server['url']}/{snapshot.name}", timeout=120_000)
+    )
+    scraper = _scraper(tmp_path / "messages.json")
+    scraper.page = browser_harness.page
+
+    def reset():
+        scraper.scraped_messages.clear()
+
+    messages = benchmark.pedantic(
+        lambda: browser_harness.run(scraper.scrape_messages()),
+        setup=reset,
+        rounds=3 if size < 100_000 else 1,
+    )
+
+    assert len(messages) == size
+    assert_throughput(benchmark, "scrape_messages", size)
+
+
+@pytest.mark.parametrize("size", CORPUS_SIZES)
+def test_save_messages_throughput(benchmark, tmp_path, size):
+    """save_messages 저장 경로 처리량 측정"""
+    save_file = tmp_path / "messages.json"
+    scraper = _scraper(save_file)
+    messages = [
+        {
+            "text": message["text"],
+            "sender": message["sender"],
+            "timestamp": message["timestamp"],
+            "scraped_at": "2025-07-25T09:00:00",
+            "group_name": GROUP_NAME,
+        }
+        for message in synthetic_messages(size)
+    ]
+
+    def reset():
+        save_file.unlink(missing_ok=True)
+
+    loop = asyncio.new_event_loop()
+    try:
+        benchmark.pedantic(
+            lambda: loop.run_until_complete(scraper.save_messages(messages)), setup=reset, rounds=5
+        )
+    finally:
+        loop.close()
+
+    assert save_file.stat().st_size > 0
+    assert_throughput(benchmark, "save_messages", size)
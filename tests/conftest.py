@@ -4,11 +4,21 @@ from __future__ import annotations
 
 import asyncio
 import inspect
+import sys
 from typing import Any
 
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def isolated_ocr_cache(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    """OCR 영구 캐시를 테스트별 임시 경로로 격리. Keep the OCR cache out of the checkout."""
+
+    module = sys.modules.get("whatsapp_media_ocr_extractor")
+    if module is not None:
+        monkeypatch.setattr(module, "OCR_CACHE_PATH", tmp_path / "ocr_cache" / "ocr_results.sqlite3")
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_pyfunc_call(pyfuncitem: Any) -> bool | None:
     """비동기 테스트 실행 지원. Execute async tests without external plugins."""
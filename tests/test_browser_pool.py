@@ -0,0 +1,187 @@
+"""브라우저 풀 테스트. Tests for page health probes and standby failover."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from macho_gpt.async_scraper.async_scraper import AsyncGroupScraper
+from macho_gpt.async_scraper.browser_pool import BrowserPool, BrowserSlot, PageHealth, probe_page
+from macho_gpt.async_scraper.group_config import GroupConfig
+
+
+class FakePage:
+    """상태 점검 응답을 흉내 내는 페이지 대역"""
+
+    def __init__(self, state=None, *, closed=False, error=None, hang=False):
+        self.state = state if state is not None else {"loggedIn": True, "qr": False, "phoneAlert": False}
+        self.closed = closed
+        self.error = error
+        self.hang = hang
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, script):
+        if self.hang:
+            await asyncio.sleep(1)
+        if self.error:
+            raise self.error
+        return self.state
+
+
+def make_slot(name, page=None):
+    return BrowserSlot(profile_dir=Path(name), context=AsyncMock(), page=page or FakePage())
+
+
+@pytest.mark.parametrize(
+    "page, reason",
+    [
+        (FakePage(), "ok"),
+        (FakePage(closed=True), "closed"),
+        (FakePage(error=RuntimeError("Target crashed")), "crashed"),
+        (FakePage(hang=True), "unresponsive"),
+        (FakePage({"loggedIn": False, "qr": True, "phoneAlert": False}), "logged_out"),
+        (FakePage({"loggedIn": True, "qr": False, "phoneAlert": True}), "phone_disconnected"),
+        (FakePage({"loggedIn": False, "qr": False, "phoneAlert": False}), "not_ready"),
+    ],
+)
+async def test_probe_page_classifies_failures(page, reason):
+    """하트비트/로그인/휴대폰 연결 상태 분류 테스트"""
+    health = await probe_page(page, timeout_ms=50)
+
+    assert health.reason == reason
+    assert health.healthy is (reason == "ok")
+
+
+async def test_pool_hands_over_standby_and_recycles_failed_profile(tmp_path):
+    """대기 브라우저 인계 후 실패한 대기 프로필만 다음 대기로 재사용되는지 테스트"""
+    launched = []
+
+    async def launcher(profile_dir):
+        launched.append(profile_dir.name)
+        return make_slot(profile_dir)
+
+    pool = BrowserPool(tmp_path, standby=1, launcher=launcher, login_timeout=0.1)
+    await pool.start()
+
+    standby = await pool.acquire(timeout=1.0)
+    assert standby.profile_dir.name == "standby_0"
+    assert pool.ready_count == 0
+
+    own = make_slot(tmp_path.parent / "profile_group")
+    pool.retire(own)
+    assert await pool.acquire(timeout=0.2) is None
+    own.context.close.assert_awaited_once()
+
+    pool.retire(standby)
+    recycled = await pool.acquire(timeout=1.0)
+
+    standby.context.close.assert_awaited_once()
+    assert recycled.profile_dir.name == "standby_0"
+    assert launched == ["standby_0", "standby_0"]
+    assert pool.failovers == 2
+    await pool.close()
+
+
+async def test_logged_out_standby_is_not_offered(tmp_path):
+    """QR이 필요한 대기 프로필은 인계하지 않는지 테스트"""
+    qr_page = FakePage({"loggedIn": False, "qr": True, "phoneAlert": False})
+    pool = BrowserPool(
+        tmp_path, standby=1, launcher=AsyncMock(return_value=make_slot("standby_0", qr_page))
+    )
+    await pool.start()
+
+    assert await pool.acquire(timeout=0.2) is None
+    await pool.close()
+
+
+async def test_scraper_fails_over_to_standby_and_keeps_cursor(tmp_path):
+    """크래시 시 대기 브라우저로 교체하고 중복 방지 커서를 유지하는지 테스트"""
+    standby = make_slot(tmp_path / "standby_0")
+    pool = AsyncMock()
+    pool.acquire.return_value = standby
+    pool.retire = lambda slot: retired.append(slot)
+    retired = []
+
+    scraper = AsyncGroupScraper(
+        GroupConfig(name="HVDC Project", save_file=str(tmp_path / "hvdc.json")),
+        browser_pool=pool,
+        enhancements={"chat_index": {"enabled": False}},
+    )
+    crashed = make_slot(tmp_path / "profile_group", FakePage(error=RuntimeError("Target crashed")))
+    await scraper._attach_slot(crashed)
+    scraper.scraped_messages.add("Kim_hello_10:00")
+    scraper.wait_for_whatsapp_login = AsyncMock(return_value=True)
+    scraper.find_and_click_group = AsyncMock(return_value=True)
+
+    health = await scraper.check_health()
+    assert health == PageHealth(False, "crashed", health.heartbeat_ms)
+
+    assert await scraper.recover(health)
+    assert retired == [crashed]
+    assert scraper.page is standby.page
+    assert scraper.user_data_dir == standby.profile_dir
+    assert "Kim_hello_10:00" in scraper.scraped_messages
+    scraper.find_and_click_group.assert_awaited_once()
+    assert (await scraper.check_health()).healthy
+
+
+async def test_group_profile_is_never_handed_to_another_group(tmp_path):
+    """A 장애 → B 인계 시도 → A 재시작 순서에서 A 프로필이 B에 넘어가지 않는지 테스트"""
+    launched = []
+
+    async def launcher(profile_dir):
+        launched.append(profile_dir)
+        return make_slot(profile_dir)
+
+    pool = BrowserPool(tmp_path / "standby", standby=1, launcher=launcher, login_timeout=0.1)
+    await pool.start()
+
+    def scraper(name):
+        return AsyncGroupScraper(
+            GroupConfig(name=name, save_file=str(tmp_path / f"{name}.json")),
+            chrome_data_dir=str(tmp_path / "chrome"),
+            browser_pool=pool,
+            enhancements={"chat_index": {"enabled": False}},
+        )
+
+    group_a = scraper("A")
+    profile_a = tmp_path / "chrome" / "profile_A"
+    crashed = make_slot(profile_a, FakePage(error=RuntimeError("Target crashed")))
+    await group_a._attach_slot(crashed)
+    group_a.wait_for_whatsapp_login = AsyncMock(return_value=True)
+    group_a.find_and_click_group = AsyncMock(return_value=True)
+    assert await group_a.recover(await group_a.check_health())
+    assert group_a.slot.profile_dir.name == "standby_0"
+
+    # B는 A의 실패 프로필을 받지 않고 대기 브라우저 부족으로 None
+    assert await pool.acquire(timeout=0.2) is None
+    crashed.context.close.assert_awaited_once()
+
+    # A 종료(재시작 전) 시 빌린 standby_0만 풀로 돌아감
+    await group_a.close()
+    handed = await pool.acquire(timeout=1.0)
+    assert handed.profile_dir.name == "standby_0"
+    assert profile_a not in launched
+    await pool.close()
+
+
+async def test_scraper_returns_borrowed_standby_on_close(tmp_path):
+    """스크래퍼 종료 시 인계받은 대기 프로필을 풀에 반환하는지 테스트"""
+    pool = BrowserPool(tmp_path / "standby", launcher=AsyncMock())
+    pool.retire = lambda slot: retired.append(slot)
+    retired = []
+    scraper = AsyncGroupScraper(
+        GroupConfig(name="HVDC Project", save_file=str(tmp_path / "hvdc.json")),
+        browser_pool=pool,
+        enhancements={"chat_index": {"enabled": False}},
+    )
+    standby = make_slot(tmp_path / "standby" / "standby_0")
+    await scraper._attach_slot(standby)
+
+    await scraper.close()
+
+    assert retired == [standby]
+    standby.context.close.assert_not_awaited()
@@ -0,0 +1,107 @@
+"""채팅 인덱스 테스트. Tests for direct chat navigation from the sidebar index."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from macho_gpt.core import chat_index, readiness
+from macho_gpt.core.chat_index import ChatIndex, open_chat
+
+
+class SidebarPage:
+    """가상화된 사이드바를 흉내 내는 페이지 대역"""
+
+    def __init__(self, chats, mounted, unconfirmed=()):
+        self.chats = dict(chats)
+        self.mounted = set(mounted)
+        self.unconfirmed = set(unconfirmed)
+        self.calls = []
+
+    async def evaluate(self, script, args=None):
+        if script is readiness._ARM_JS:
+            return True
+        if script is readiness._WAIT_JS:
+            return {"settled": True, "mutations": 3, "elapsedMs": 5, "count": 10}
+        if script is chat_index._BUILD_JS:
+            self.calls.append(("build",))
+            return dict(self.chats)
+        if script is chat_index._OPEN_JS:
+            name, offset = args["name"], args["offset"]
+            self.calls.append(("open", name, offset))
+            if name not in self.mounted and offset is not None and name in self.chats:
+                # 캐시된 오프셋으로 스크롤하면 해당 행이 마운트됨
+                self.mounted.add(name)
+            if name in self.mounted:
+                confirmed = name not in self.unconfirmed
+                return {"opened": True, "confirmed": confirmed, "offset": self.chats[name]}
+            return {"opened": False, "confirmed": False, "offset": None}
+        raise AssertionError("unexpected script")
+
+
+async def test_open_uses_single_call_for_mounted_row(tmp_path):
+    """마운트된 행은 검색 없이 한 번의 호출로 여는지 테스트"""
+    page = SidebarPage({"HVDC Project": 72}, mounted={"HVDC Project"})
+    index = ChatIndex(tmp_path / "chat_index.json")
+
+    method = await open_chat(page, "HVDC Project", index=index)
+
+    assert method == "index"
+    assert page.calls == [("open", "HVDC Project", None)]
+    assert ChatIndex(tmp_path / "chat_index.json").offsets == {"HVDC Project": 72}
+
+
+async def test_miss_rebuilds_once_then_scrolls_to_cached_offset(tmp_path):
+    """미발견 시 한 번 재구축한 뒤 캐시 오프셋으로 여는지 테스트"""
+    page = SidebarPage({"MR.CHA 전용": 0, "물류 업무": 2880}, mounted={"MR.CHA 전용"})
+    index = ChatIndex(tmp_path / "chat_index.json")
+
+    assert await index.open(page, "물류 업무")
+    assert page.calls == [("open", "물류 업무", None), ("build",), ("open", "물류 업무", 2880)]
+
+    page.mounted = {"MR.CHA 전용"}
+    page.calls.clear()
+    reloaded = ChatIndex(tmp_path / "chat_index.json")
+    assert await reloaded.open(page, "물류 업무")
+    assert page.calls == [("open", "물류 업무", 2880)]
+
+
+async def test_unknown_chat_falls_back_to_search(tmp_path):
+    """인덱스에 없는 채팅은 검색 경로로 여는지 테스트"""
+    page = SidebarPage({"MR.CHA 전용": 0}, mounted={"MR.CHA 전용"})
+    index = ChatIndex(None, rebuild_interval=300)
+    entry = MagicMock()
+    entry.click = AsyncMock()
+
+    with patch.object(chat_index, "locate_search_box", AsyncMock(return_value=MagicMock())) as locate, patch.object(
+        chat_index, "fill_search_box", AsyncMock()
+    ) as fill, patch.object(chat_index, "wait_for_group_entry", AsyncMock(return_value=entry)):
+        method = await open_chat(page, "Archived Group", index=index)
+        assert method == "search"
+        fill.assert_awaited_once()
+        entry.click.assert_awaited_once()
+
+        # 재구축 간격 안에서는 사이드바를 다시 훑지 않음
+        await open_chat(page, "Archived Group", index=index)
+
+    assert [call for call in page.calls if call[0] == "build"] == [("build",)]
+    assert locate.await_count == 2
+    assert index.misses == 2
+
+
+async def test_unconfirmed_index_open_is_invalidated_and_searched(tmp_path):
+    """헤더 확인 없이 열린 경우 인덱스 항목을 무효화하고 검색 경로로 여는지 테스트"""
+    page = SidebarPage({"HVDC Project": 72}, mounted={"HVDC Project"}, unconfirmed={"HVDC Project"})
+    index = ChatIndex(tmp_path / "chat_index.json")
+    index.offsets = {"HVDC Project": 72}
+    entry = MagicMock()
+    entry.click = AsyncMock()
+
+    with patch.object(chat_index, "locate_search_box", AsyncMock(return_value=MagicMock())), patch.object(
+        chat_index, "fill_search_box", AsyncMock()
+    ) as fill, patch.object(chat_index, "wait_for_group_entry", AsyncMock(return_value=entry)):
+        method = await open_chat(page, "HVDC Project", index=index)
+
+    assert method == "search"
+    fill.assert_awaited_once()
+    entry.click.assert_awaited_once()
+    assert page.calls == [("open", "HVDC Project", 72)]
+    assert (index.hits, index.misses) == (0, 1)
+    assert "HVDC Project" not in ChatIndex(tmp_path / "chat_index.json").offsets
@@ -0,0 +1,132 @@
+"""Parquet 메시지 싱크 테스트. Tests for the partitioned Parquet message sink."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from macho_gpt.core.columnar_sink import ParquetMessageSink, read_messages  # noqa: E402
+
+
+def test_sink_appends_row_groups_per_partition(tmp_path):
+    """사이클별 row group 추가 및 파티션 분리 테스트"""
+    with ParquetMessageSink(tmp_path) as sink:
+        for cycle in range(3):
+            sink.write(
+                [
+                    {
+                        "text": f"cycle {cycle}",
+                        "sender": "Ops",
+                        "timestamp": "09:00",
+                        "scraped_at": "2025-07-25T09:00:00+00:00",
+                    }
+                ],
+                "HVDC Project",
+            )
+        sink.write(
+            [{"id": "wa-1", "body": "ETA", "author": "Port", "timestampIso": "2025-07-25T01:00:00Z"}],
+            "MR.CHA 전용",
+            backend="webjs",
+        )
+
+    files = sorted(tmp_path.rglob("*.parquet"))
+    assert len(files) == 2
+    hvdc_file = next(path for path in files if "HVDC" in str(path))
+    assert "date=2025-07-25" in str(hvdc_file)
+    assert pq.ParquetFile(hvdc_file).metadata.num_row_groups == 3
+
+
+def test_read_messages_prunes_groups_and_columns(tmp_path):
+    """그룹 파티션/컬럼 선택 읽기 테스트"""
+    with ParquetMessageSink(tmp_path) as sink:
+        sink.write(["raw line"], "물류 업무", backend="rpa")
+        sink.write([{"text": "other", "sender": "A"}], "HVDC Project")
+
+    table = read_messages(tmp_path, columns=["sender", "text", "group"], groups=["물류 업무"])
+
+    assert table.column_names == ["sender", "text", "group"]
+    assert table.to_pylist() == [{"sender": "Unknown", "text": "raw line", "group": "물류 업무"}]
+    assert str(table.schema.field("sender").type).startswith("dictionary")
+
+
+def test_read_while_sink_is_open_sees_only_finalised_files(tmp_path):
+    """싱크가 열려 있는 동안 읽기가 실패하지 않고 마감된 파일만 읽는지 테스트"""
+    sink = ParquetMessageSink(tmp_path, max_row_groups_per_file=2)
+    try:
+        for cycle in range(3):
+            sink.write([{"text": f"cycle {cycle}", "sender": "Ops"}], "HVDC Project")
+
+        in_progress = list(tmp_path.rglob("*.parquet.tmp"))
+        table = read_messages(tmp_path, columns=["text"])
+
+        assert len(in_progress) == 1
+        assert sorted(table.column("text").to_pylist()) == ["cycle 0", "cycle 1"]
+    finally:
+        sink.close()
+
+    assert list(tmp_path.rglob("*.tmp")) == []
+    assert read_messages(tmp_path).num_rows == 3
+
+
+def test_read_messages_on_empty_root(tmp_path):
+    """마감된 파일이 없을 때 빈 테이블을 반환하는지 테스트"""
+    with ParquetMessageSink(tmp_path) as sink:
+        sink.write([{"text": "open"}], "HVDC Project")
+        assert read_messages(tmp_path, columns=["text"]).num_rows == 0
+
+
+def test_old_files_are_finalised_on_next_write(tmp_path):
+    """max_file_age 경과 후 다음 기록에서 파일이 마감되는지 테스트"""
+    with ParquetMessageSink(tmp_path, max_file_age=0) as sink:
+        sink.write([{"text": "first"}], "HVDC Project")
+
+        assert list(tmp_path.rglob("*.tmp")) == []
+        assert read_messages(tmp_path, columns=["text"]).num_rows == 1
+
+
+def test_backfilled_rows_partition_by_send_date(tmp_path):
+    """백필 행이 발송일 파티션과 WhatsApp data-id를 사용하는지 테스트"""
+    with ParquetMessageSink(tmp_path) as sink:
+        sink.write(
+            [
+                {
+                    "message_id": "false_123@g.us_AAA",
+                    "text": "B/L released",
+                    "sender": "Ops",
+                    "timestamp": "09:15",
+                    "sent_at": "2025-03-02T09:15:00",
+                    "scraped_at": "2025-07-25T09:00:00+00:00",
+                },
+                {"text": "live", "sender": "Ops", "timestamp": "10:00", "scraped_at": "2025-07-25T10:00:00+00:00"},
+            ],
+            "HVDC Project",
+            backend="backfill",
+        )
+
+    table = read_messages(tmp_path, columns=["message_id", "sent_at", "date"])
+    rows = sorted(table.to_pylist(), key=lambda row: row["date"])
+
+    assert [row["date"] for row in rows] == ["2025-03-02", "2025-07-25"]
+    assert rows[0]["message_id"] == "false_123@g.us_AAA"
+    assert rows[0]["sent_at"] == "2025-03-02T09:15:00"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="stale files are only removed on POSIX")
+def test_open_removes_temp_files_of_dead_writers(tmp_path):
+    """종료된 writer가 남긴 .tmp만 삭제하고 실행 중인 writer의 파일은 유지하는지 테스트"""
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    partition = tmp_path / "group=HVDC%20Project" / "date=2025-03-02"
+    partition.mkdir(parents=True)
+    stale = partition / f"part-20250302T091500000000-{dead.stdout.strip()}-1.parquet.tmp"
+    live = partition / f"part-20250302T091500000000-{os.getpid()}-1.parquet.tmp"
+    stale.write_bytes(b"PAR1")
+    live.write_bytes(b"PAR1")
+
+    ParquetMessageSink(tmp_path).close()
+
+    assert not stale.exists()
+    assert live.exists()
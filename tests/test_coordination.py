@@ -0,0 +1,246 @@
+"""그룹 임대 조정 테스트. Tests for lease-based group ownership across nodes."""
+
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from macho_gpt.core.coordination import (
+    FileLeaseBackend,
+    LeaseCoordinator,
+    SqliteLeaseBackend,
+    backend_from_url,
+)
+from unittest.mock import AsyncMock, MagicMock
+
+from macho_gpt.async_scraper.async_scraper import AsyncGroupScraper
+from macho_gpt.async_scraper.group_config import GroupConfig
+from macho_gpt.async_scraper.multi_group_manager import MultiGroupManager
+
+GROUPS = [f"group-{index}" for index in range(6)]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_node(url, node_id, duration, channel):
+    """별도 프로세스에서 노드 하나를 실행하고 최종 소유 그룹을 보고"""
+    coordinator = LeaseCoordinator(backend_from_url(url), GROUPS, node_id=node_id, ttl=0.6, heartbeat=0.1)
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        _, released = coordinator.tick()
+        for group in released:  # 스크래퍼가 즉시 멈춘 것으로 간주
+            coordinator.finish_release(group)
+        time.sleep(coordinator.heartbeat)
+    # 임대를 반환하지 않고 종료 (노드 장애와 동일)
+    channel.put((node_id, sorted(coordinator.owned)))
+
+
+@pytest.mark.parametrize("backend_cls", [SqliteLeaseBackend, FileLeaseBackend])
+def test_backend_lease_lifecycle(tmp_path, backend_cls):
+    """획득/갱신/만료/반환과 펜싱 토큰 증가 테스트"""
+    clock = Clock()
+    target = tmp_path / ("leases.db" if backend_cls is SqliteLeaseBackend else "leases")
+    backend = backend_cls(target, clock=clock)
+
+    first = backend.acquire("group:a", "node-1", ttl=10)
+    assert first.token == 1
+    assert backend.acquire("group:a", "node-2", ttl=10) is None
+    assert backend.renew("group:a", "node-2", ttl=10) is None
+    assert backend.renew("group:a", "node-1", ttl=10).token == 1
+
+    clock.now += 11
+    taken = backend.acquire("group:a", "node-2", ttl=10)
+    assert taken.owner == "node-2" and taken.token == 2
+    assert backend.renew("group:a", "node-1", ttl=10) is None
+
+    backend.release("group:a", "node-2")
+    assert backend.active("group:") == {}
+    assert backend.acquire("group:a", "node-1", ttl=10).token == 3
+
+
+def test_coordinator_rebalances_when_node_joins_and_dies(tmp_path):
+    """노드 합류 시 공평 분배, 노드 소멸 시 TTL 후 인수 테스트"""
+    clock = Clock()
+    backend = SqliteLeaseBackend(tmp_path / "leases.db", clock=clock)
+    first = LeaseCoordinator(backend, GROUPS, node_id="node-1", ttl=10)
+    second = LeaseCoordinator(backend, GROUPS, node_id="node-2", ttl=10)
+
+    acquired, _ = first.tick()
+    assert sorted(acquired) == GROUPS
+
+    second.tick()
+    _, released = first.tick()
+    assert len(released) == 3 and sorted(first.draining) == sorted(released)
+    second.tick()
+    assert second.owned == {}  # 스크래퍼 중지 전에는 인수하지 않음
+
+    for group in released:
+        first.finish_release(group)
+    second.tick()
+    assert len(first.owned) == len(second.owned) == 3
+    assert set(first.owned).isdisjoint(second.owned)
+
+    clock.now += 11  # node-2 정지: 하트비트 없음
+    acquired, _ = first.tick()
+    assert sorted(acquired) == sorted(second.owned)
+    assert sorted(first.owned) == GROUPS
+
+
+def test_coordinator_fences_itself_when_store_is_unreachable(tmp_path):
+    """저장소 장애가 TTL을 넘기면 모든 그룹을 내려놓는지 테스트"""
+    backend = SqliteLeaseBackend(tmp_path / "leases.db")
+    coordinator = LeaseCoordinator(backend, GROUPS[:2], node_id="node-1", ttl=0.05)
+    coordinator.tick()
+    assert len(coordinator.owned) == 2
+
+    backend.acquire = backend.renew = lambda *args: (_ for _ in ()).throw(OSError("nfs down"))
+    assert coordinator.tick() == ([], [])
+    time.sleep(0.06)
+    _, released = coordinator.tick()
+
+    assert sorted(released) == GROUPS[:2]
+    assert coordinator.owned == {}
+
+
+def test_coordinator_fences_before_its_leases_expire(tmp_path):
+    """자가 차단이 임대 만료보다 한 하트비트 먼저 일어나고 중지 한도가 남은 임대 시간 이내인지 테스트"""
+    backend = SqliteLeaseBackend(tmp_path / "leases.db")
+    coordinator = LeaseCoordinator(backend, GROUPS[:2], node_id="node-1", ttl=0.6, heartbeat=0.2)
+    coordinator.tick()
+    backend.acquire = backend.renew = lambda *args: (_ for _ in ()).throw(OSError("nfs down"))
+
+    time.sleep(0.2)
+    assert coordinator.tick() == ([], [])
+    time.sleep(0.21)
+    _, released = coordinator.tick()
+
+    assert sorted(released) == GROUPS[:2]
+    leases = SqliteLeaseBackend(tmp_path / "leases.db").active("group:")
+    assert len(leases) == 2  # 다른 노드가 가져가기 전에 이미 중단
+
+    assert 0 < coordinator.stop_timeout(GROUPS[0]) <= 0.2
+
+
+@pytest.mark.parametrize("scheme", ["sqlite", "file"])
+def test_processes_share_groups_without_overlap_and_take_over(tmp_path, scheme):
+    """여러 프로세스가 겹침 없이 그룹을 나누고 죽은 노드의 그룹을 인수하는지 테스트"""
+    url = f"sqlite:///{tmp_path / 'leases.db'}" if scheme == "sqlite" else f"file:///{tmp_path / 'leases'}"
+    backend_from_url(url)  # 스키마/디렉터리 선생성
+    context = multiprocessing.get_context("spawn")
+    channel = context.Queue()
+    nodes = [
+        context.Process(target=run_node, args=(url, "short", 1.5, channel)),
+        context.Process(target=run_node, args=(url, "long-1", 4.0, channel)),
+        context.Process(target=run_node, args=(url, "long-2", 4.0, channel)),
+    ]
+    for process in nodes:
+        process.start()
+    reports = dict(channel.get(timeout=30) for _ in nodes)
+    for process in nodes:
+        process.join(timeout=10)
+
+    assert len(reports["short"]) == 2  # 3노드 공평 분배
+    survivors = reports["long-1"] + reports["long-2"]
+    assert sorted(survivors) == GROUPS
+    assert len(reports["long-1"]) == len(reports["long-2"]) == 3
+
+
+async def test_manager_runs_only_leased_groups(tmp_path, monkeypatch):
+    """매니저가 임대받은 그룹만 시작하고 종료 시 중지하는지 테스트"""
+    started, stopped = [], []
+    manager = MultiGroupManager(
+        [GroupConfig(name=name, save_file=str(tmp_path / f"{name}.json")) for name in GROUPS[:2]],
+        chrome_data_root=str(tmp_path / "chrome"),
+    )
+
+    async def start_group(config):
+        started.append(config.name)
+
+    async def stop_group(name, timeout=30.0):
+        stopped.append(name)
+        return {"group_name": name, "success": True, "messages_scraped": 4}
+
+    monkeypatch.setattr(manager, "start_group", start_group)
+    monkeypatch.setattr(manager, "stop_group", stop_group)
+    backend = SqliteLeaseBackend(tmp_path / "leases.db")
+    backend.acquire("group:group-1", "other-node", ttl=60)
+    backend.acquire("node:other-node", "other-node", ttl=60)
+    coordinator = LeaseCoordinator(backend, GROUPS[:2], node_id="me", ttl=60, heartbeat=0.01)
+    stop_event = asyncio.Event()
+    asyncio.get_running_loop().call_later(0.1, stop_event.set)
+
+    results = await manager.run_coordinated(coordinator, stop_event)
+
+    assert started == ["group-0"] and stopped == ["group-0"]
+    assert results[0]["group_name"] == "group-0"
+    assert backend.active("group:")["group:group-1"].owner == "other-node"
+    assert "group:group-0" not in backend.active("group:")
+
+
+async def test_handoff_stops_group_before_releasing_lease(tmp_path):
+    """반환할 그룹은 스크래퍼 중지 후 임대를 놓고, 느린 중지 중에도 하트비트가 유지되는지 테스트"""
+    backend = SqliteLeaseBackend(tmp_path / "leases.db")
+    coordinator = LeaseCoordinator(backend, GROUPS[:2], node_id="me", ttl=0.3, heartbeat=0.03)
+    stop_event = asyncio.Event()
+    events = []
+
+    def owner(group):
+        lease = backend.active("group:").get(f"group:{group}")
+        return lease.owner if lease else None
+
+    async def on_acquire(group):
+        events.append(("start", group))
+
+    async def on_release(group):
+        events.append(("stop", group, owner(group)))
+        await asyncio.sleep(0.6)  # TTL보다 긴 스크래퍼 종료
+        events.append(("stopped", group, owner(group)))
+
+    runner = asyncio.create_task(coordinator.run(on_acquire, on_release, stop_event))
+    await asyncio.sleep(0.15)
+    assert sorted(coordinator.owned) == GROUPS[:2]
+
+    backend.acquire("node:other-node", "other-node", ttl=60)  # 노드 합류 -> 공평 몫 1
+    await asyncio.sleep(0.9)
+    (handed,) = [event[1] for event in events if event[0] == "stopped"]
+    (kept,) = set(GROUPS[:2]) - {handed}
+    assert ("stop", handed, "me") in events and ("stopped", handed, "me") in events
+    assert owner(handed) is None
+    assert list(coordinator.owned) == [kept] and owner(kept) == "me"
+
+    stop_event.set()
+    await asyncio.wait_for(runner, 5)
+
+    assert events[-2:] == [("stop", kept, "me"), ("stopped", kept, "me")]
+    assert backend.active("group:") == {}
+    assert list(backend.active("node:")) == ["node:other-node"]
+
+
+async def test_stop_wakes_scraper_interval_sleep(tmp_path):
+    """stop()이 scrape_interval 대기를 즉시 깨우는지 테스트"""
+    scraper = AsyncGroupScraper(
+        GroupConfig(name="HVDC Project", save_file=str(tmp_path / "hvdc.json"), scrape_interval=600),
+        enhancements={"chat_index": {"enabled": False}},
+    )
+    scraper.initialize = AsyncMock()
+    scraper.wait_for_whatsapp_login = AsyncMock(return_value=True)
+    scraper.find_and_click_group = AsyncMock(return_value=True)
+    scraper.run_scraping_cycle = AsyncMock(return_value={"error": None, "messages_scraped": 0})
+    scraper.check_health = AsyncMock(return_value=MagicMock(healthy=True))
+    scraper.watch_memory = AsyncMock()
+    scraper.close = AsyncMock()
+
+    task = asyncio.create_task(scraper.run())
+    await asyncio.sleep(0.05)
+    scraper.stop()
+
+    await asyncio.wait_for(task, 1)
+    scraper.run_scraping_cycle.assert_awaited_once()
+    scraper.close.assert_awaited_once()
@@ -0,0 +1,79 @@
+"""데이터 매니페스트 테스트. Tests for the data/ sidecar manifest."""
+
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+from macho_gpt.core.data_manifest import MANIFEST_NAME, DataManifest, record_data_file
+
+
+def _write(path, payload):
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    record_data_file(path, payload)
+
+
+def test_refresh_uses_recorded_summaries_without_rescanning(tmp_path):
+    """작성자가 기록한 요약을 재파싱 없이 사용하는지 테스트"""
+    results = [
+        {"chat_title": "MR.CHA 전용", "status": "SUCCESS", "message_count": 12},
+        {"chat_title": "HVDC Project", "status": "ERROR", "message_count": 0},
+    ]
+    extraction = tmp_path / "whatsapp_extraction_20250725_090000.json"
+    _write(extraction, results)
+
+    manifest = DataManifest(tmp_path)
+    summaries = manifest.refresh([extraction])
+
+    assert manifest.rescanned == 0
+    summary = summaries[extraction.name]
+    assert summary["status"] == "1/2"
+    assert summary["message_count"] == 12
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_refresh_rescans_only_changed_files(tmp_path):
+    """mtime 변경 파일만 재파싱하고 삭제 파일은 제거하는지 테스트"""
+    first = tmp_path / "whatsapp_extraction_1.json"
+    second = tmp_path / "whatsapp_extraction_2.json"
+    _write(first, {"status": "SUCCESS", "message_count": 3})
+    _write(second, {"status": "SUCCESS", "message_count": 4})
+
+    first.write_text(json.dumps({"status": "ERROR", "message_count": 0}), encoding="utf-8")
+    os.utime(first, ns=(1, 1))
+    second_stat = second.stat()
+
+    manifest = DataManifest(tmp_path)
+    summaries = manifest.refresh([first, second])
+
+    assert manifest.rescanned == 1
+    assert summaries[first.name]["status"] == "ERROR"
+    assert summaries[second.name]["mtime_ns"] == second_stat.st_mtime_ns
+
+    second.unlink()
+    manifest.refresh([first])
+    assert second.name not in DataManifest(tmp_path).files
+
+
+def record_many(directory, worker, count):
+    """별도 프로세스에서 매니페스트에 파일 요약을 기록"""
+    for index in range(count):
+        path = Path(directory) / f"worker{worker}_{index}.json"
+        payload = [{"text": f"{worker}-{index}"}]
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        record_data_file(path, payload)
+
+
+def test_concurrent_processes_do_not_lose_manifest_entries(tmp_path):
+    """여러 프로세스의 동시 기록에서 매니페스트 항목이 유실되지 않는지 테스트"""
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=record_many, args=(str(tmp_path), worker, 25)) for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=60)
+
+    assert [process.exitcode for process in workers] == [0, 0, 0, 0]
+    assert len(DataManifest(tmp_path).files) == 100
@@ -0,0 +1,242 @@
+"""기록 백필 테스트. Tests for the adaptive history backfill engine."""
+
+import json
+from datetime import datetime
+
+from macho_gpt.core import history_backfill, readiness
+from macho_gpt.core.history_backfill import (
+    BackfillCheckpoint,
+    HistoryBackfill,
+    parse_pre_plain_text,
+)
+
+ROW_HEIGHT = 50
+
+
+class VirtualizedChatPage:
+    """스크롤 위치 주변 행만 마운트하는 가상화 대화 패널 대역"""
+
+    def __init__(self, total, window=12, viewport=300):
+        self.messages = [self._row(index) for index in range(total)]
+        self.window = window
+        self.viewport = viewport
+        self.scroll_top = self.max_scroll
+        self._mounted = self._mounted_ids()
+
+    @staticmethod
+    def _row(index):
+        day = 1 + index // 24
+        return {
+            "id": f"m{index}",
+            "text": f"message {index}",
+            "pre_plain": f"[{index % 24:02d}:00, 7/{day}/2025] User{index % 3}: ",
+            "sender": "",
+            "raw_text": f"User{index % 3} message {index}",
+        }
+
+    @property
+    def max_scroll(self):
+        return max(0, len(self.messages) * ROW_HEIGHT - self.viewport)
+
+    def _mounted_ids(self):
+        first = self.scroll_top // ROW_HEIGHT
+        start = max(0, first - (self.window - self.viewport // ROW_HEIGHT) // 2)
+        return [row["id"] for row in self.messages[start : start + self.window]]
+
+    def append(self, count):
+        at_bottom = self.scroll_top == self.max_scroll
+        start = len(self.messages)
+        self.messages.extend(self._row(index) for index in range(start, start + count))
+        if at_bottom:
+            self.scroll_top = self.max_scroll
+
+    async def evaluate(self, script, args=None):
+        if script is readiness._ARM_JS:
+            self._mounted = self._mounted_ids()
+            return True
+        if script is readiness._WAIT_JS:
+            changed = self._mounted_ids() != self._mounted
+            return {"settled": True, "mutations": 4 if changed else 0, "elapsedMs": 1, "count": -1}
+        if script is history_backfill._SCROLL_JS:
+            before = self.scroll_top
+            self.scroll_top = min(self.max_scroll, max(0, before + args["step"]))
+            return {"before": before, "after": self.scroll_top, "viewport": self.viewport}
+        if script is history_backfill._HARVEST_JS:
+            mounted = set(self._mounted_ids())
+            return [dict(row) for row in self.messages if row["id"] in mounted]
+        raise AssertionError(f"unexpected script: {script[:40]}")
+
+
+class Collector:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, batch):
+        self.batches.append(batch)
+
+    @property
+    def ids(self):
+        return [message["message_id"] for batch in self.batches for message in batch]
+
+
+def test_parse_pre_plain_text_formats():
+    """로케일별 data-pre-plain-text 파싱 테스트"""
+    assert parse_pre_plain_text("[10:32, 7/25/2025] Kim: ") == (datetime(2025, 7, 25, 10, 32), "Kim")
+    assert parse_pre_plain_text("[3:05 PM, 25/07/2025] Lee: ")[0] == datetime(2025, 7, 25, 15, 5)
+    assert parse_pre_plain_text("[오전 12:10, 2025. 7. 3.] 박: ")[0] == datetime(2025, 7, 3, 0, 10)
+    assert parse_pre_plain_text("[09:00, 03/07/25] Cha: ", day_first=True)[0] == datetime(2025, 7, 3, 9, 0)
+    assert parse_pre_plain_text("no metadata") == (None, "")
+
+
+async def test_backfill_harvests_every_row_despite_virtualization(tmp_path):
+    """큰 스크롤 간격에서도 언마운트된 행을 놓치지 않는지 테스트"""
+    page = VirtualizedChatPage(total=300)
+    collector = Collector()
+    engine = HistoryBackfill(
+        "HVDC Project", checkpoint_dir=tmp_path, initial_step_px=2000, batch_size=40
+    )
+
+    result = await engine.run(page, collector)
+
+    assert result.stop_reason == "top"
+    assert result.backtracks > 0
+    assert sorted(collector.ids, key=lambda value: int(value[1:])) == [f"m{i}" for i in range(300)]
+    assert len(set(collector.ids)) == 300
+    # 각 배치는 오래된 순으로 정렬되고 이후 배치일수록 더 과거
+    first, second = collector.batches[0], collector.batches[1]
+    assert int(first[0]["message_id"][1:]) < int(first[-1]["message_id"][1:])
+    assert int(second[-1]["message_id"][1:]) < int(first[0]["message_id"][1:])
+    assert first[0]["sender"].startswith("User")
+    assert page.scroll_top == page.max_scroll
+
+
+async def test_backfill_stops_at_target_date(tmp_path):
+    """목표 날짜보다 오래된 메시지에서 중단하는지 테스트"""
+    page = VirtualizedChatPage(total=240)
+    collector = Collector()
+    engine = HistoryBackfill("HVDC Project", checkpoint_dir=tmp_path)
+
+    result = await engine.run(page, collector, until=datetime(2025, 7, 8))
+
+    assert result.stop_reason == "until"
+    sent = [message["sent_at"] for batch in collector.batches for message in batch]
+    assert min(sent) == "2025-07-08T00:00:00"
+    assert len(sent) == 240 - 7 * 24
+
+
+async def test_backfill_resumes_from_checkpoint_and_stops_at_cursor(tmp_path):
+    """중단된 백필이 체크포인트에서 재개되고 다음 실행은 커서에서 멈추는지 테스트"""
+    page = VirtualizedChatPage(total=200)
+    first = Collector()
+    engine = HistoryBackfill("HVDC Project", checkpoint_dir=tmp_path, batch_size=30)
+
+    interrupted = await engine.run(page, first, max_messages=90)
+    checkpoint = BackfillCheckpoint.load("HVDC Project", tmp_path)
+
+    assert interrupted.stop_reason == "max_messages"
+    assert len(first.ids) == 90
+    assert not checkpoint.complete
+    assert checkpoint.oldest_id == "m110"
+
+    second = Collector()
+    resumed = await engine.run(page, second)
+    checkpoint = BackfillCheckpoint.load("HVDC Project", tmp_path)
+
+    assert resumed.resumed and resumed.stop_reason == "top"
+    assert set(first.ids).isdisjoint(second.ids)
+    assert len(first.ids) + len(second.ids) == 200
+    assert checkpoint.complete and checkpoint.cursor_id == "m199"
+
+    page.append(25)
+    third = Collector()
+    incremental = await engine.run(page, third)
+
+    assert incremental.stop_reason == "cursor"
+    assert sorted(third.ids) == sorted(f"m{i}" for i in range(200, 225))
+    assert BackfillCheckpoint.load("HVDC Project", tmp_path).cursor_id == "m224"
+
+
+class FakeNode:
+    def __init__(self, text="", attributes=None):
+        self.text = text
+        self.attributes = attributes or {}
+
+    async def text_content(self):
+        return self.text
+
+    async def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class FakeMessageElement:
+    """scrape_messages가 읽는 메시지 컨테이너 대역 (12시간제 표시)"""
+
+    def __init__(self, row):
+        hour = int(row["pre_plain"][1:3])
+        self.nodes = {
+            '[data-testid="msg-text"]': FakeNode(row["text"]),
+            '[data-testid="msg-meta"]': FakeNode(
+                f"{hour % 12 or 12}:00 {'AM' if hour < 12 else 'PM'}"
+            ),
+            "[data-pre-plain-text]": FakeNode(
+                attributes={"data-pre-plain-text": row["pre_plain"]}
+            ),
+        }
+
+    async def query_selector(self, selector):
+        return self.nodes.get(selector)
+
+
+class ScrapablePage(VirtualizedChatPage):
+    async def wait_for_selector(self, selector):
+        return True
+
+    async def query_selector_all(self, selector):
+        mounted = set(self._mounted_ids())
+        return [FakeMessageElement(row) for row in self.messages if row["id"] in mounted]
+
+
+async def test_scrape_cycle_after_backfill_saves_only_new_messages(tmp_path):
+    """백필 직후 스크래핑 사이클이 백필된 메시지를 다시 저장하지 않는지 테스트"""
+    from macho_gpt.async_scraper.async_scraper import AsyncGroupScraper
+    from macho_gpt.async_scraper.group_config import GroupConfig
+    from macho_gpt.core.metrics import ScraperMetrics
+    from macho_gpt.core.persistence import JsonWriter
+
+    save_file = tmp_path / "hvdc.json"
+    writer = JsonWriter(metrics=ScraperMetrics())
+    scraper = AsyncGroupScraper(
+        GroupConfig(name="HVDC Project", save_file=str(save_file)),
+        enhancements={
+            "chat_index": {"enabled": False},
+            "history_backfill": {"checkpoint_dir": str(tmp_path / "backfill")},
+        },
+        metrics=ScraperMetrics(),
+        json_writer=writer,
+    )
+    scraper.page = ScrapablePage(total=60)
+
+    result = await scraper.backfill_history()
+    assert result.stop_reason == "top"
+
+    scraper.page.append(2)
+    cycle = await scraper.run_scraping_cycle()
+    writer.close()
+
+    assert cycle["messages_scraped"] == 2
+    saved = [message["text"] for message in json.loads(save_file.read_text(encoding="utf-8"))]
+    assert len(saved) == len(set(saved)) == 62
+    assert saved[-2:] == ["message 60", "message 61"]
+
+
+async def test_rpa_harvest_returns_chronological_texts():
+    """RPA 추출기가 백필 결과를 오래된 순 텍스트로 반환하는지 테스트"""
+    from macho_gpt.rpa.logi_rpa_whatsapp_241219 import WhatsAppRPAExtractor
+
+    extractor = WhatsAppRPAExtractor.__new__(WhatsAppRPAExtractor)
+    extractor.history_limit = 50
+    page = VirtualizedChatPage(total=120)
+
+    texts = await extractor._harvest_history(page, "MR.CHA 전용")
+
+    assert texts == [f"User{i % 3} message {i}" for i in range(70, 120)]
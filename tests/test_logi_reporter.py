@@ -78,5 +78,82 @@ class TestWarehouseMonthlyTransactionStructure(unittest.TestCase):
         self.assertEqual(len(pivot_result.columns.levels), 2)
 
 
+class TestVectorizedWarehousePivot(unittest.TestCase):
+    """벡터화/증분 창고 피벗 테스트"""
+
+    def setUp(self):
+        """테스트 셋업"""
+        self.transactions = pd.DataFrame({
+            'date': ['2024-01-15', '2024-01-20', '2024-02-10', '2024-02-11', '2024-03-01'],
+            'warehouse': ['DSV Indoor', 'AAA Storage', 'DSV Outdoor', 'DSV Indoor', 'Unknown Yard'],
+            'transaction_type': ['입고', '출고', '입고', '입고', '출고'],
+            'quantity': [100, 50, 75, 25, 10]
+        })
+
+    def test_classify_locations_should_match_row_classifier(self):
+        """벡터화 분류는 행 단위 분류와 같아야 함"""
+        from macho_gpt.reports.monthly_transaction_generator import (
+            classify_location,
+            classify_locations,
+        )
+
+        rows = pd.DataFrame({
+            'location': ['DSV Indoor', '', 'Laydown', ''],
+            'warehouse': ['DSV_INDOOR_001', 'dsv_mzp_02', 'X', '']
+        })
+
+        result = classify_locations(rows)
+
+        self.assertEqual(
+            result.tolist(),
+            [classify_location(row) for row in rows.to_dict('records')]
+        )
+        self.assertEqual(str(result.dtype), 'category')
+
+    def test_pivot_should_sum_quantities_per_month(self):
+        """월별 수량 합계 테스트"""
+        from macho_gpt.reports.monthly_transaction_generator import create_warehouse_monthly_pivot
+
+        pivot = create_warehouse_monthly_pivot(self.transactions)
+
+        self.assertEqual(list(pivot.index), ['2024-01', '2024-02', '2024-03'])
+        self.assertEqual(pivot.loc['2024-02', ('입고', 'DSV Indoor')], 25)
+        self.assertEqual(pivot.loc['2024-02', ('입고', 'DSV Outdoor')], 75)
+        self.assertEqual(int(pivot.loc['2024-03'].sum()), 0)
+
+    def test_incremental_pivot_should_match_full_pivot(self):
+        """증분 피벗은 전체 재계산 결과와 같아야 함"""
+        from macho_gpt.reports.monthly_transaction_generator import (
+            IncrementalMonthlyPivot,
+            create_warehouse_monthly_pivot,
+        )
+
+        engine = IncrementalMonthlyPivot()
+        engine.update(self.transactions.iloc[:3])
+        touched = engine.update(self.transactions.iloc[3:])
+
+        self.assertEqual(touched, ['2024-02', '2024-03'])
+        pd.testing.assert_frame_equal(
+            engine.pivot(), create_warehouse_monthly_pivot(self.transactions)
+        )
+
+    def test_chunked_pivot_should_match_in_memory_pivot(self):
+        """청크 단위 CSV 피벗은 메모리 피벗과 같아야 함"""
+        from macho_gpt.reports.monthly_transaction_generator import (
+            create_warehouse_monthly_pivot,
+            create_warehouse_monthly_pivot_chunked,
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'transactions.csv')
+            self.transactions.assign(note='memo').to_csv(csv_path, index=False)
+
+            chunked = create_warehouse_monthly_pivot_chunked(csv_path, chunksize=2)
+
+        pd.testing.assert_frame_equal(
+            chunked, create_warehouse_monthly_pivot(self.transactions)
+        )
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -8,14 +8,20 @@ import pytest
 import asyncio
 import tempfile
 import os
+import threading
 from unittest.mock import patch, MagicMock, AsyncMock
 from pathlib import Path
 
 # Skip tests if missing dependency
 try:
     from whatsapp_media_ocr_extractor import (
+        BKTree,
         MediaOCRProcessor,
+        OCRReaderRegistry,
+        OCRResultCache,
         WhatsAppMediaOCRExtractor,
+        compute_dhash,
+        hamming_distance,
     )
 except ImportError:
     pytest.skip(
@@ -83,10 +89,31 @@ class TestMediaOCRProcessor:
     @patch("easyocr.Reader")
     def test_ocr_engine_setup(self, mock_easyocr):
         """OCR 엔진 설정 테스트"""
-        # EasyOCR이 사용 가능한 경우
+        # EasyOCR이 사용 가능한 경우 리더는 최초 사용 시 한 번만 생성
+        registry = OCRReaderRegistry()
         with patch("whatsapp_media_ocr_extractor.EASYOCR_AVAILABLE", True):
-            processor = MediaOCRProcessor()
-            mock_easyocr.assert_called_with(["ko", "en"])
+            processor = MediaOCRProcessor(registry=registry)
+            mock_easyocr.assert_not_called()
+            assert not processor.is_ready()
+
+            assert processor.reader is mock_easyocr.return_value
+            assert MediaOCRProcessor(registry=registry).reader is processor.reader
+            mock_easyocr.assert_called_once_with(["ko", "en"])
+            assert processor.is_ready()
+
+    @patch("easyocr.Reader")
+    def test_reader_warm_up_in_background(self, mock_easyocr):
+        """백그라운드 예열 테스트"""
+        registry = OCRReaderRegistry()
+        with patch("whatsapp_media_ocr_extractor.EASYOCR_AVAILABLE", True):
+            thread = registry.warm_up(["en", "ko"])
+            thread.join(timeout=5)
+
+            assert registry.is_ready(["ko", "en"])
+            mock_easyocr.return_value.readtext.assert_called_once()
+            usage = registry.memory_usage()
+            assert usage["readers"]["en+ko"]["ready"] is True
+            assert usage["total_rss_delta_bytes"] >= 0
 
     @patch("easyocr.Reader")
     async def test_process_image_mock(self, mock_easyocr):
@@ -99,7 +126,7 @@ class TestMediaOCRProcessor:
         mock_easyocr.return_value = mock_reader
 
         with patch("whatsapp_media_ocr_extractor.EASYOCR_AVAILABLE", True):
-            processor = MediaOCRProcessor()
+            processor = MediaOCRProcessor(registry=OCRReaderRegistry())
 
             with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
                 f.write("test image content")
@@ -136,6 +163,301 @@ class TestMediaOCRProcessor:
             os.unlink(temp_file)
 
 
+class TestOCRResultCache:
+    """OCRResultCache 테스트 클래스"""
+
+    def test_cache_hit_returns_previous_result(self, tmp_path):
+        """캐시 적중 시 이전 결과 반환 테스트"""
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(b"same image bytes")
+        processor = MediaOCRProcessor()
+        processor.reader = MagicMock()
+        processor.reader.readtext.return_value = [
+            ([[0, 0], [10, 0], [10, 5], [0, 5]], "B/L 1234", 0.9),
+        ]
+
+        with patch("whatsapp_media_ocr_extractor.EASYOCR_AVAILABLE", True):
+            first = asyncio.run(processor.process_image(image_path))
+            second = asyncio.run(processor.process_image(image_path))
+
+        assert processor.reader.readtext.call_count == 1
+        assert second["cached"] is True
+        assert second["text"] == first["text"] == "B/L 1234"
+        assert second["confidence"] == "0.90"
+        assert second["boxes"] == [[[0.0, 0.0], [10.0, 0.0], [10.0, 5.0], [0.0, 5.0]]]
+
+    def test_cache_persists_across_instances(self, tmp_path):
+        """재시작 후 캐시 유지 테스트"""
+        db_path = tmp_path / "ocr.sqlite3"
+        key = OCRResultCache.build_key("abc", "easyocr", ("ko", "en"))
+        cache = OCRResultCache(db_path)
+        cache.put(key, "abc", "easyocr", ("ko", "en"), {"text": "hello", "confidence": "0.80"})
+        cache.close()
+
+        reopened = OCRResultCache(db_path)
+        assert reopened.get(key)["text"] == "hello"
+        assert reopened.get(OCRResultCache.build_key("abc", "easyocr", ("en",))) is None
+
+    def test_lru_eviction_respects_entry_limit(self):
+        """LRU 제거 테스트"""
+        cache = OCRResultCache(max_entries=2)
+        keys = [OCRResultCache.build_key(str(i), "easyocr", ("ko",)) for i in range(3)]
+        cache.put(keys[0], "0", "easyocr", ("ko",), {"text": "zero"})
+        cache.put(keys[1], "1", "easyocr", ("ko",), {"text": "one"})
+        assert cache.get(keys[0]) is not None
+        cache.put(keys[2], "2", "easyocr", ("ko",), {"text": "two"})
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.stats()["entries"] == 2
+
+
+class TestBatchedOCR:
+    """process_images 배치 처리 테스트 클래스"""
+
+    @staticmethod
+    def _write_png(path, size):
+        image_module = pytest.importorskip("PIL.Image")
+        image_module.new("RGB", size, color=(255, 255, 255)).save(path)
+        return path
+
+    def test_process_images_returns_results_in_input_order(self, tmp_path):
+        """입력 순서 유지 및 크기별 배치 테스트"""
+        small_a = self._write_png(tmp_path / "a.png", (100, 50))
+        large = self._write_png(tmp_path / "b.png", (400, 300))
+        small_b = self._write_png(tmp_path / "c.png", (101, 50))
+
+        processor = MediaOCRProcessor()
+        processor.reader = MagicMock()
+        processor.reader.readtext_batched.side_effect = lambda images, **kwargs: [
+            [(None, f"{image.shape[1]}px", 0.5)] for image in images
+        ]
+
+        results = asyncio.run(
+            processor.process_images(
+                [small_a, large, tmp_path / "missing.png", small_b], batch_size=4
+            )
+        )
+
+        assert [result.get("text") for result in results] == ["100px", "400px", None, "101px"]
+        assert results[2]["error"] == "file_not_found"
+        assert processor.reader.readtext_batched.call_count == 2
+
+    def test_process_images_reuses_cache_and_duplicates(self, tmp_path):
+        """중복 이미지 캐시 재사용 테스트"""
+        first = self._write_png(tmp_path / "a.png", (64, 64))
+        second = tmp_path / "copy.png"
+        second.write_bytes(first.read_bytes())
+
+        processor = MediaOCRProcessor()
+        processor.reader = MagicMock()
+        processor.reader.readtext_batched.side_effect = lambda images, **kwargs: [
+            [(None, "HVDC 010-1234-5678", 0.8)] for _ in images
+        ]
+
+        results = asyncio.run(processor.process_images([first, second]))
+        again = asyncio.run(processor.process_images([second]))
+
+        assert processor.reader.readtext_batched.call_count == 1
+        assert results[0]["text"] == "HVDC [PHONE]"
+        assert results[1]["cached"] is True
+        assert again[0]["cached"] is True
+        assert again[0]["confidence"] == "0.80"
+
+    def test_failed_batch_fills_duplicate_indices(self, tmp_path):
+        """배치 실패 시 중복 입력도 오류 결과를 받아 입력 순서가 유지되는지 테스트"""
+        first = self._write_png(tmp_path / "a.png", (64, 64))
+        copy = tmp_path / "copy.png"
+        copy.write_bytes(first.read_bytes())
+
+        processor = MediaOCRProcessor()
+        processor.reader = MagicMock()
+        processor.reader.readtext_batched.side_effect = RuntimeError("cuda oom")
+
+        paths = [first, tmp_path / "missing.png", copy]
+        results = asyncio.run(processor.process_images(paths))
+
+        assert len(results) == len(paths)
+        assert [result["error"] for result in results] == [
+            "processing_failed",
+            "file_not_found",
+            "processing_failed",
+        ]
+
+
+class TestNearDuplicateOCR:
+    """지각 해시 근사 중복 테스트 클래스"""
+
+    @staticmethod
+    def _document_image(size):
+        image_module = pytest.importorskip("PIL.Image")
+        draw_module = pytest.importorskip("PIL.ImageDraw")
+        image = image_module.new("RGB", (320, 240), color=(255, 255, 255))
+        draw = draw_module.Draw(image)
+        for row in range(6):
+            draw.rectangle([20, 20 + row * 35, 120 + row * 30, 40 + row * 35], fill=(0, 0, 0))
+        return image.resize(size)
+
+    def _encode(self, size, fmt="PNG"):
+        buffer = __import__("io").BytesIO()
+        self._document_image(size).save(buffer, format=fmt)
+        return buffer.getvalue()
+
+    def test_dhash_is_stable_across_resize(self):
+        """해상도 변경 시 해시 근접성 테스트"""
+        import numpy as np
+
+        original = compute_dhash(np.asarray(self._document_image((320, 240))))
+        resized = compute_dhash(np.asarray(self._document_image((160, 120))))
+        assert hamming_distance(original, resized) <= 6
+
+    def test_bk_tree_radius_search(self):
+        """BK-트리 반경 검색 테스트"""
+        tree = BKTree()
+        for value in (0b0000, 0b0001, 0b0111, 0b1111):
+            tree.add(value, value)
+
+        assert [item for _, item in tree.search(0b0000, 1)] == [0b0000, 0b0001]
+        assert len(tree) == 4
+
+    def test_near_duplicate_reuses_cached_result(self, tmp_path):
+        """재압축/축소 이미지 OCR 결과 재사용 테스트"""
+        cache_path = tmp_path / "ocr.sqlite3"
+        processor = MediaOCRProcessor(cache=OCRResultCache(cache_path), near_duplicate_distance=6)
+        processor.reader = MagicMock()
+        processor.reader.readtext.return_value = [(None, "DSV MOSB", 0.9)]
+
+        with patch("whatsapp_media_ocr_extractor.EASYOCR_AVAILABLE", True):
+            first = asyncio.run(processor.process_image_bytes(self._encode((320, 240))))
+            second = asyncio.run(
+                processor.process_image_bytes(self._encode((240, 180), fmt="JPEG"))
+            )
+            reopened = MediaOCRProcessor(
+                cache=OCRResultCache(cache_path), near_duplicate_distance=6
+            )
+            reopened.reader = MagicMock()
+            third = asyncio.run(reopened.process_image_bytes(self._encode((200, 150))))
+
+        assert processor.reader.readtext.call_count == 1
+        reopened.reader.readtext.assert_not_called()
+        assert first["text"] == second["text"] == third["text"] == "DSV MOSB"
+        assert second["near_duplicate"] is True
+        assert third["near_duplicate"] is True
+
+    def test_same_template_documents_are_not_reused_by_default(self):
+        """같은 양식의 다른 문서가 기본 설정에서 서로의 OCR 결과를 재사용하지 않는지 테스트"""
+        draw_module = pytest.importorskip("PIL.ImageDraw")
+        import numpy as np
+
+        def invoice(number):
+            image = self._document_image((320, 240))
+            draw_module.Draw(image).text((200, 210), f"INV-{number}", fill=(0, 0, 0))
+            buffer = __import__("io").BytesIO()
+            image.save(buffer, format="PNG")
+            return image, buffer.getvalue()
+
+        first_image, first_bytes = invoice(1001)
+        second_image, second_bytes = invoice(2002)
+        assert hamming_distance(
+            compute_dhash(np.asarray(first_image)), compute_dhash(np.asarray(second_image))
+        ) <= 6
+
+        processor = MediaOCRProcessor(cache=OCRResultCache(":memory:"))
+        processor.reader = MagicMock()
+        processor.reader.readtext.side_effect = [
+            [(None, "INV-1001", 0.9)],
+            [(None, "INV-2002", 0.9)],
+        ]
+        with patch("whatsapp_media_ocr_extractor.EASYOCR_AVAILABLE", True):
+            first = asyncio.run(processor.process_image_bytes(first_bytes))
+            second = asyncio.run(processor.process_image_bytes(second_bytes))
+
+        assert processor.reader.readtext.call_count == 2
+        assert (first["text"], second["text"]) == ("INV-1001", "INV-2002")
+        assert "near_duplicate" not in second
+
+
+class TestPDFPipeline:
+    """PDF 텍스트 레이어/OCR 보완 테스트 클래스"""
+
+    @staticmethod
+    def _fake_document(page_texts):
+        pages = []
+        for text in page_texts:
+            page = MagicMock()
+            page.get_text.return_value = text
+            pixmap = MagicMock(width=4, height=2, n=3, samples=bytes(4 * 2 * 3))
+            pixmap.tobytes.return_value = b"png"
+            page.get_pixmap.return_value = pixmap
+            pages.append(page)
+        document = MagicMock()
+        document.__enter__.return_value = pages
+        return document, pages
+
+    def test_process_pdf_uses_text_layer_and_ocr_fallback(self, tmp_path):
+        """텍스트 레이어 우선 추출 및 스캔 페이지 OCR 테스트"""
+        pdf_path = tmp_path / "bl.pdf"
+        pdf_path.write_bytes(b"%PDF-1.7 test")
+        document, pages = self._fake_document(
+            ["BILL OF LADING No. HDMU1234567 contact ops@example.com", "", "Invoice INV-2024-001 total"]
+        )
+        processor = MediaOCRProcessor()
+        processor.reader = MagicMock()
+        processor.reader.readtext.return_value = [(None, "scanned customs page", 0.7)]
+
+        with patch("fitz.open", return_value=document), patch(
+            "whatsapp_media_ocr_extractor.PYMUPDF_AVAILABLE", True
+        ):
+            processor.supported_engines.add("pymupdf")
+            result = asyncio.run(processor.process_image(pdf_path, engine="pymupdf"))
+
+        assert [page["source"] for page in result["pages"]] == ["text_layer", "ocr", "text_layer"]
+        assert [page["page"] for page in result["pages"]] == [1, 2, 3]
+        assert "[EMAIL]" in result["text"]
+        assert "scanned customs page" in result["text"]
+        assert result["text_layer_pages"] == 2
+        assert result["ocr_pages"] == 1
+        assert result["confidence"] == "0.90"
+        assert processor.reader.readtext.call_count == 1
+        pages[0].get_pixmap.assert_not_called()
+
+    def test_iter_pdf_pages_streams_in_page_order(self, tmp_path):
+        """페이지 스트리밍 순서 테스트"""
+        pdf_path = tmp_path / "scan.pdf"
+        pdf_path.write_bytes(b"%PDF-1.7 scan")
+        document, _ = self._fake_document(["", "", ""])
+        processor = MediaOCRProcessor()
+        processor.reader = MagicMock()
+        processor.reader.readtext.return_value = [(None, "page", 0.5)]
+
+        async def collect():
+            return [page["page"] async for page in processor.iter_pdf_pages(pdf_path, max_workers=2)]
+
+        with patch("fitz.open", return_value=document):
+            assert asyncio.run(collect()) == [1, 2, 3]
+
+    def test_iter_pdf_pages_extracts_off_the_event_loop(self, tmp_path):
+        """텍스트 레이어 추출 워커 스레드 실행 테스트"""
+        pdf_path = tmp_path / "digital.pdf"
+        pdf_path.write_bytes(b"%PDF-1.7 digital")
+        document, pages = self._fake_document(["Packing list page one", "Packing list page two"])
+        threads = []
+        for page in pages:
+            page.get_text.side_effect = lambda *_args, text=page.get_text.return_value: (
+                threads.append(threading.current_thread().name) or text
+            )
+        processor = MediaOCRProcessor()
+
+        async def collect():
+            return [page async for page in processor.iter_pdf_pages(pdf_path)]
+
+        with patch("fitz.open", return_value=document):
+            result = asyncio.run(collect())
+
+        assert [page["source"] for page in result] == ["text_layer", "text_layer"]
+        assert threads and all(name.startswith("pdf-extract") for name in threads)
+
+
 class TestWhatsAppMediaOCRExtractor:
     """WhatsAppMediaOCRExtractor 테스트 클래스"""
 
@@ -143,6 +465,7 @@ class TestWhatsAppMediaOCRExtractor:
     def setup(self):
         """테스트 설정"""
         self.extractor = WhatsAppMediaOCRExtractor()
+        self.extractor.media_processor.cache = OCRResultCache()
 
     def test_initialization(self):
         """초기화 테스트"""
@@ -202,6 +525,166 @@ class TestWhatsAppMediaOCRExtractor:
 
             shutil.rmtree(download_dir)
 
+    @pytest.mark.asyncio
+    async def test_process_media_element_in_memory(self, tmp_path):
+        """스크린샷 바이트 메모리 OCR 테스트"""
+        image_module = pytest.importorskip("PIL.Image")
+        buffer = __import__("io").BytesIO()
+        image_module.new("RGB", (40, 20), color=(0, 0, 0)).save(buffer, format="PNG")
+        png_bytes = buffer.getvalue()
+
+        mock_element = AsyncMock()
+        mock_element.screenshot.return_value = png_bytes
+        reader = MagicMock()
+        reader.readtext.return_value = [(None, "DSV MZP", 0.95)]
+        self.extractor.media_processor.reader = reader
+
+        with patch("whatsapp_media_ocr_extractor.EASYOCR_AVAILABLE", True):
+            result = await self.extractor.process_media_element(
+                mock_element, download_dir=tmp_path
+            )
+            await self.extractor.flush_media_writes()
+
+        mock_element.screenshot.assert_called_once_with()
+        decoded = reader.readtext.call_args.args[0]
+        assert decoded.shape[:2] == (20, 40)
+        assert result["text"] == "DSV MZP"
+        assert Path(result["file_path"]).read_bytes() == png_bytes
+
+    @pytest.mark.asyncio
+    async def test_crawl_media_pipeline(self, tmp_path):
+        """미디어 크롤 파이프라인 테스트"""
+        image_module = pytest.importorskip("PIL.Image")
+
+        def make_element(index):
+            buffer = __import__("io").BytesIO()
+            image_module.new("RGB", (30 + index, 20), color=(index, 0, 0)).save(
+                buffer, format="PNG"
+            )
+            element = AsyncMock()
+            element.get_attribute.return_value = f"blob:media-{index}"
+            element.screenshot.return_value = buffer.getvalue()
+            return element
+
+        elements = [make_element(index) for index in range(5)]
+        mock_page = AsyncMock()
+        mock_page.query_selector_all.return_value = elements
+        mock_page.keyboard = AsyncMock()
+        mock_page.evaluate.return_value = {"settled": True, "mutations": 0}
+        reader = MagicMock()
+        reader.readtext.return_value = [(None, "DSV", 0.9)]
+        self.extractor.media_processor.reader = reader
+        output_file = tmp_path / "media.jsonl"
+
+        with patch("whatsapp_media_ocr_extractor.EASYOCR_AVAILABLE", True):
+            results, stats = await self.extractor.crawl_media(
+                mock_page, output_file=output_file, persist_batch_size=2
+            )
+
+        assert len(results) == 5
+        assert reader.readtext.call_count == 5
+        assert len(output_file.read_text(encoding="utf-8").splitlines()) == 5
+        assert stats["discover"]["items"] == 5
+        assert stats["capture"]["items"] == 5
+        assert stats["ocr"]["items"] == 5
+        assert stats["persist"]["items"] == 5
+        assert all("throughput_per_sec" in stage for stage in stats.values())
+
+    @pytest.mark.asyncio
+    async def test_crawl_media_dedupes_handles_without_src(self):
+        """src 없는 요소를 안정 키로 중복 제거하고 스크롤 종료 조건이 동작하는지 테스트"""
+
+        def query(selector):
+            # 스크롤마다 새 핸들 객체를 반환하는 실제 Playwright 동작 흉내
+            handles = []
+            for key in ("data-id:msg-1", "bg:blob:media-2", None):
+                handle = AsyncMock()
+                handle.get_attribute.return_value = None
+                handle.evaluate.return_value = key
+                handle.screenshot.return_value = b"not-an-image"
+                handles.append(handle)
+            return handles if selector == self.extractor.media_selectors[0] else []
+
+        mock_page = AsyncMock()
+        mock_page.query_selector_all.side_effect = query
+        mock_page.keyboard = AsyncMock()
+        mock_page.evaluate.return_value = {"settled": True, "mutations": 0}
+        self.extractor.media_processor.process_image_bytes = AsyncMock(return_value={"text": "x"})
+
+        results, stats = await self.extractor.crawl_media(mock_page, max_scrolls=10)
+
+        assert stats["discover"]["items"] == 2
+        assert len(results) == 2
+        assert sorted(result["media_key"] for result in results) == [
+            "bg:blob:media-2",
+            "data-id:msg-1",
+        ]
+        assert mock_page.keyboard.press.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_crawl_media_captures_handles_before_scrolling(self):
+        """가상화 목록에서 스크롤 전에 대기 중인 핸들을 캡처하는지 테스트"""
+        events = []
+        rounds = iter(range(100))
+
+        def query(selector):
+            if selector != self.extractor.media_selectors[0]:
+                return []
+            batch = next(rounds)
+            handles = []
+            for index in range(3):
+                handle = AsyncMock()
+                handle.get_attribute.return_value = f"blob:media-{batch}-{index}"
+                handle.evaluate.return_value = f"msg-{batch}-{index}"
+                handle.screenshot.side_effect = (
+                    lambda *args, name=f"{batch}-{index}", **kwargs: events.append(name)
+                    or b"bytes"
+                )
+                handles.append(handle)
+            return handles if batch < 2 else []
+
+        async def press(_key):
+            events.append("scroll")
+
+        mock_page = AsyncMock()
+        mock_page.query_selector_all.side_effect = query
+        mock_page.keyboard = AsyncMock()
+        mock_page.keyboard.press.side_effect = press
+        mock_page.evaluate.return_value = {"settled": True, "mutations": 0}
+        self.extractor.media_processor.process_image_bytes = AsyncMock(return_value={"text": "x"})
+
+        results, _ = await self.extractor.crawl_media(mock_page, queue_size=1, ocr_workers=3)
+
+        first_scroll = events.index("scroll")
+        assert sorted(events[:first_scroll]) == ["0-0", "0-1", "0-2"]
+        assert {result["message_id"] for result in results} == {
+            f"msg-{batch}-{index}" for batch in range(2) for index in range(3)
+        }
+
+    @pytest.mark.asyncio
+    async def test_crawl_media_propagates_persist_failure(self, tmp_path):
+        """저장 단계 실패 시 다른 단계가 멈추지 않고 오류가 전파되는지 테스트"""
+
+        def make_element(index):
+            element = AsyncMock()
+            element.get_attribute.return_value = f"blob:media-{index}"
+            element.screenshot.return_value = b"bytes"
+            return element
+
+        mock_page = AsyncMock()
+        mock_page.query_selector_all.return_value = [make_element(index) for index in range(8)]
+        mock_page.keyboard = AsyncMock()
+        mock_page.evaluate.return_value = {"settled": True, "mutations": 0}
+        self.extractor.media_processor.process_image_bytes = AsyncMock(return_value={"text": "x"})
+
+        with pytest.raises(IsADirectoryError):
+            await asyncio.wait_for(
+                self.extractor.crawl_media(
+                    mock_page, output_file=tmp_path, queue_size=1, persist_batch_size=1
+                ),
+                timeout=5,
+            )
+
     @pytest.mark.asyncio
     async def test_process_media_file_mock(self):
         """미디어 파일 처리 모의 테스트"""
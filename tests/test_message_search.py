@@ -0,0 +1,112 @@
+"""메시지 전문 검색 테스트. Tests for the sqlite FTS5 message search index."""
+
+import json
+from unittest.mock import AsyncMock, Mock
+
+from macho_gpt.async_scraper.async_scraper import AsyncGroupScraper
+from macho_gpt.async_scraper.group_config import GroupConfig
+from macho_gpt.core.message_search import MessageSearchIndex, main
+
+
+def _seed(index):
+    index.add_messages(
+        [
+            {"text": "MV HYUNDAI 입항 B/L HVDC-BL-0042", "sender": "Port", "timestamp": "09:00",
+             "scraped_at": "2025-07-25T09:00:00+00:00"},
+            {"text": "DSV 창고 입고 완료", "sender": "DSV", "timestamp": "10:00",
+             "scraped_at": "2025-07-26T10:00:00+00:00"},
+        ],
+        "MR.CHA 전용",
+    )
+    index.add_messages(
+        [{"id": "wa-1", "body": "HVDC-BL-0042 통관 지연", "author": "Customs"}],
+        "HVDC Project",
+        backend="webjs",
+    )
+
+
+def test_search_matches_substrings_across_groups():
+    """그룹 간 부분 문자열(B/L 번호) 검색 테스트"""
+    index = MessageSearchIndex(":memory:")
+    _seed(index)
+
+    results = index.search("BL-0042")
+
+    assert {result["group_name"] for result in results} == {"MR.CHA 전용", "HVDC Project"}
+    assert index.search("입고")[0]["sender"] == "DSV"
+
+
+def test_search_filters_groups_and_dates_and_deduplicates():
+    """그룹/기간 필터 및 중복 색인 방지 테스트"""
+    index = MessageSearchIndex(":memory:")
+    _seed(index)
+    _seed(index)
+
+    assert index.count() == 3
+    assert len(index.search("BL-0042", groups=["HVDC Project"])) == 1
+    assert index.search("DSV", date_range=("2025-07-25", "2025-07-25")) == []
+    assert len(index.search("DSV", date_range=("2025-07-26", None))) == 1
+
+
+def test_cli_indexes_json_and_searches(tmp_path, capsys):
+    """CLI 색인 및 검색 테스트"""
+    data_file = tmp_path / "group.json"
+    data_file.write_text(
+        json.dumps(
+            [{"text": "MOSB 하역 일정", "sender": "Ops", "group_name": "물류 업무"}],
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    db_path = str(tmp_path / "search.sqlite3")
+
+    assert main(["--db", db_path, "index", str(data_file)]) == 0
+    assert main(["--db", db_path, "search", "하역", "--group", "물류 업무"]) == 0
+
+    output = capsys.readouterr().out
+    assert "1개 메시지 색인" in output
+    assert "[물류 업무]" in output
+
+
+def test_backfilled_messages_keyed_by_data_id_and_send_date():
+    """같은 시각/발신자/내용의 다른 날 메시지가 모두 색인되고 발송일로 검색되는지 테스트"""
+    index = MessageSearchIndex(":memory:")
+    rows = [
+        {"message_id": f"false_120@g.us_{suffix}", "text": "Gate pass issued", "sender": "Ops",
+         "timestamp": "09:15", "sent_at": sent_at, "scraped_at": "2025-07-25T09:00:00+00:00"}
+        for suffix, sent_at in (("AAA", "2025-03-02T09:15:00"), ("BBB", "2025-03-09T09:15:00"))
+    ]
+
+    assert index.add_messages(rows, "HVDC Project", backend="backfill") == 2
+    results = index.search("Gate pass", date_range=("2025-03-01", "2025-03-05"))
+    assert [result["message_id"] for result in results] == ["false_120@g.us_AAA"]
+    assert results[0]["sent_at"] == "2025-03-02T09:15:00"
+    assert index.search("Gate pass", date_range=("2025-07-25", "2025-07-25")) == []
+
+
+def _live_row(text, clock, pre_plain):
+    """실시간 스크래핑 메시지 요소 대역 (화면에는 HH:MM만 표시)"""
+    values = {'[data-testid="msg-text"]': text, '[data-testid="msg-meta"]': clock}
+    elements = {selector: Mock(text_content=AsyncMock(return_value=value)) for selector, value in values.items()}
+    elements["[data-pre-plain-text]"] = Mock(get_attribute=AsyncMock(return_value=pre_plain))
+    return Mock(query_selector=AsyncMock(side_effect=lambda selector: elements.get(selector)))
+
+
+async def test_live_messages_keep_send_date_across_days(tmp_path):
+    """같은 HH:MM/발신자/내용의 다른 날 실시간 메시지가 모두 색인되고 발송일로 검색되는지 테스트"""
+    scraper = AsyncGroupScraper(
+        GroupConfig(name="HVDC Project", save_file=str(tmp_path / "hvdc.json")),
+        enhancements={"chat_index": {"enabled": False}},
+    )
+    scraper.page = AsyncMock()
+    scraper.page.query_selector_all.return_value = [
+        _live_row("Daily gate pass OK", "09:00", f"[09:00, 3/{day}/2025] Kim: ") for day in (2, 3)
+    ]
+
+    messages = await scraper.scrape_messages()
+
+    assert [message["sent_at"] for message in messages] == ["2025-03-02T09:00:00", "2025-03-03T09:00:00"]
+    index = MessageSearchIndex(":memory:")
+    assert index.add_messages(messages, "HVDC Project") == 2
+    results = index.search("gate pass", date_range=("2025-03-03", "2025-03-03"))
+    assert [result["sent_at"] for result in results] == ["2025-03-03T09:00:00"]
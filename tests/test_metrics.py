@@ -0,0 +1,65 @@
+"""스크래퍼 메트릭 테스트. Tests for scraper metrics and the /metrics endpoint."""
+
+import asyncio
+import json
+
+import pytest
+
+from macho_gpt.core.metrics import MetricsRegistry, ScraperMetrics, start_metrics_server
+
+
+def test_phase_timer_records_latency_and_errors():
+    """단계 계측이 지연과 실패를 기록하는지 테스트"""
+    metrics = ScraperMetrics()
+
+    with metrics.phase("MR.CHA 전용", "scrape_messages"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.phase("MR.CHA 전용", "scrape_messages"):
+            raise RuntimeError("selector timeout")
+    metrics.record_cycle("MR.CHA 전용", "success", messages=7)
+
+    assert metrics.phase_seconds.count(group="MR.CHA 전용", phase="scrape_messages") == 2
+    assert metrics.phase_errors.value(group="MR.CHA 전용", phase="scrape_messages") == 1
+    assert metrics.messages.value(group="MR.CHA 전용") == 7
+
+
+def test_prometheus_rendering_and_json_dump(tmp_path):
+    """Prometheus 텍스트 및 JSON 덤프 형식 테스트"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo latency", ("phase",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, phase="login")
+    histogram.observe(0.5, phase="login")
+    registry.counter("demo_total", "Demo counter", ("group",)).inc(group='A "B"')
+
+    text = registry.render_prometheus()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{phase="login",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{phase="login",le="+Inf"} 2' in text
+    assert 'demo_seconds_count{phase="login"} 2' in text
+    assert 'demo_total{group="A \\"B\\""} 1' in text
+
+    target = tmp_path / "metrics.json"
+    registry.dump_json(target)
+    snapshot = json.loads(target.read_text(encoding="utf-8"))
+    assert snapshot["metrics"]["demo_seconds"]["series"][0]["count"] == 2
+
+
+async def test_metrics_server_serves_prometheus_text():
+    """/metrics 엔드포인트 응답 테스트"""
+    metrics = ScraperMetrics()
+    metrics.record_cycle("HVDC Project", "success", messages=3)
+    server = await start_metrics_server(metrics.registry, port=0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await writer.drain()
+        response = (await reader.read()).decode("utf-8")
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert 'scraper_messages_total{group="HVDC Project"} 3' in response
@@ -157,6 +157,47 @@ ai_integration:
         finally:
             Path(temp_path).unlink()
 
+    async def test_should_pass_yaml_enhancements_to_scrapers(self, tmp_path):
+        """YAML enhancements 값이 실행 경로를 거쳐 스크래퍼까지 전달되는지 테스트"""
+        import run_optimal_scraper
+
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            """
+whatsapp_groups:
+  - name: "Test Group"
+    save_file: "test.json"
+enhancements:
+  page_watchdog:
+    max_js_heap_mb: 256
+  chat_index:
+    enabled: false
+""",
+            encoding="utf-8",
+        )
+        config = MultiGroupConfig.load_from_yaml(str(config_path))
+        assert config.enhancements["page_watchdog"] == {"max_js_heap_mb": 256}
+
+        created = []
+
+        async def fake_run_all_groups(manager):
+            created.extend(manager._create_scraper(g) for g in manager.group_configs)
+            return []
+
+        with patch.object(MultiGroupManager, "run_all_groups", fake_run_all_groups):
+            await run_optimal_scraper._run_playwright_backend(
+                config,
+                config.whatsapp_groups,
+                enhance_loading=False,
+                enhance_stealth=False,
+                max_messages=50,
+                timeout=30000,
+                headless=True,
+            )
+
+        assert created[0].page_watchdog.policy.max_js_heap_mb == 256
+        assert created[0].enhancements["chat_index"] == {"enabled": False}
+
     def test_should_raise_error_for_missing_config_file(self):
         """존재하지 않는 설정 파일에 대한 오류 테스트"""
         with pytest.raises(FileNotFoundError):
@@ -0,0 +1,95 @@
+"""페이지 감시 테스트. Tests for the memory-leak page watchdog."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from macho_gpt.async_scraper.async_scraper import AsyncGroupScraper
+from macho_gpt.async_scraper.browser_pool import BrowserSlot
+from macho_gpt.async_scraper.group_config import GroupConfig
+from macho_gpt.async_scraper.page_watchdog import MB, PageSample, PageWatchdog, WatchdogPolicy
+from macho_gpt.core.metrics import ScraperMetrics
+
+
+def fake_context(heap_mb, nodes=5000):
+    session = AsyncMock()
+
+    async def send(method):
+        if method == "Performance.getMetrics":
+            return {
+                "metrics": [
+                    {"name": "JSHeapUsedSize", "value": heap_mb * MB},
+                    {"name": "JSHeapTotalSize", "value": heap_mb * 2 * MB},
+                    {"name": "Nodes", "value": nodes},
+                ]
+            }
+        return {}
+
+    session.send.side_effect = send
+    context = MagicMock()
+    context.route = AsyncMock()
+    context.new_cdp_session = AsyncMock(return_value=session)
+    return context, session
+
+
+async def test_sample_exports_cdp_metrics_and_reuses_session():
+    """CDP 표본을 메트릭으로 노출하고 세션을 재사용하는지 테스트"""
+    metrics = ScraperMetrics()
+    watchdog = PageWatchdog(metrics=metrics, group_name="HVDC Project")
+    context, session = fake_context(heap_mb=300)
+    page = object()
+
+    sample = await watchdog.sample(context, page, rss=800 * MB)
+    await watchdog.sample(context, page, rss=800 * MB)
+
+    assert sample.js_heap_used == 300 * MB and sample.dom_nodes == 5000
+    assert context.new_cdp_session.await_count == 1
+    assert metrics.js_heap.value(group="HVDC Project") == 300 * MB
+    assert metrics.dom_nodes.value(group="HVDC Project") == 5000
+    assert watchdog.evaluate(sample) is None
+
+
+def test_actions_wait_for_quiet_cycle_and_rss_escalates():
+    """조용한 사이클까지 지연되고 RSS 초과 시 재시작으로 격상되는지 테스트"""
+    watchdog = PageWatchdog(
+        WatchdogPolicy(max_js_heap_mb=512, max_rss_mb=2048, max_defer_cycles=2),
+        metrics=ScraperMetrics(),
+    )
+
+    assert watchdog.evaluate(PageSample(js_heap_used=600 * MB)) == "reload"
+    assert watchdog.due(messages_last_cycle=12) is None
+    assert watchdog.evaluate(PageSample(rss=3000 * MB)) == "recycle"
+    assert watchdog.evaluate(PageSample(js_heap_used=600 * MB)) == "recycle"
+    assert watchdog.due(messages_last_cycle=7) is None
+    assert watchdog.due(messages_last_cycle=9) == "recycle"
+
+    watchdog.completed()
+    assert watchdog.pending is None
+    assert watchdog.metrics.page_recycles.value(group="", action="recycle", reason="rss") == 1
+    assert watchdog.evaluate(PageSample(age_seconds=25 * 3600)) == "reload"
+
+
+async def test_scraper_reloads_page_and_restores_chat(tmp_path):
+    """힙 초과 시 조용한 사이클에 재로딩하고 채팅을 복원하는지 테스트"""
+    metrics = ScraperMetrics()
+    scraper = AsyncGroupScraper(
+        GroupConfig(name="HVDC Project", save_file=str(tmp_path / "hvdc.json")),
+        metrics=metrics,
+        enhancements={"page_watchdog": {"max_js_heap_mb": 256}, "chat_index": {"enabled": False}},
+    )
+    context, _ = fake_context(heap_mb=900)
+    page = AsyncMock()
+    await scraper._attach_slot(BrowserSlot(Path("profile"), context, page))
+    scraper.scraped_messages.add("Kim_hello_10:00")
+    scraper.wait_for_whatsapp_login = AsyncMock(return_value=True)
+    scraper.find_and_click_group = AsyncMock(return_value=True)
+
+    await scraper.watch_memory(messages_last_cycle=3)
+    page.reload.assert_not_awaited()
+
+    await scraper.watch_memory(messages_last_cycle=0)
+
+    page.reload.assert_awaited_once()
+    scraper.find_and_click_group.assert_awaited_once()
+    assert scraper.page_watchdog.pending is None
+    assert "Kim_hello_10:00" in scraper.scraped_messages
+    assert metrics.page_recycles.value(group="HVDC Project", action="reload", reason="js_heap") == 1
@@ -0,0 +1,157 @@
+"""비차단 JSON 저장 테스트. Tests for the coalescing JSON writer thread."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from macho_gpt.async_scraper.async_scraper import AsyncGroupScraper
+from macho_gpt.async_scraper.group_config import GroupConfig
+from macho_gpt.core.logi_workflow_241219 import WorkflowManager
+from macho_gpt.core.metrics import EventLoopLagMonitor, ScraperMetrics
+from macho_gpt.core.persistence import JsonWriter
+
+
+def blocking_update(gate):
+    def update(data):
+        gate.wait(5)
+        return data
+
+    return update
+
+
+def test_pending_writes_to_same_file_are_coalesced(tmp_path):
+    """writer가 바쁜 동안 같은 파일의 작업이 한 번의 저장으로 병합되는지 테스트"""
+    metrics = ScraperMetrics()
+    writer = JsonWriter(metrics=metrics)
+    gate = threading.Event()
+    target = tmp_path / "messages.json"
+    writer.submit_update(tmp_path / "busy.json", blocking_update(gate), manifest=False)
+
+    futures = [
+        writer.submit_update(target, lambda data, n=n: data + [n], default=list) for n in range(3)
+    ]
+    gate.set()
+    assert writer.flush(timeout=5)
+
+    assert json.loads(target.read_text(encoding="utf-8")) == [0, 1, 2]
+    assert all(future.result() == target for future in futures)
+    assert metrics.persist_writes.value(outcome="ok") == 2
+    assert metrics.persist_coalesced.value() == 2
+
+    writer.submit_update(target, lambda data: data + [3], default=list)
+    writer.submit_write(target, ["replaced"])
+    writer.close()
+    assert json.loads(target.read_text(encoding="utf-8")) == ["replaced"]
+    assert "_manifest.json" in {path.name for path in tmp_path.iterdir()}
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    """직렬화 실패 시 기존 파일을 보존하고 임시 파일을 남기지 않는지 테스트"""
+    writer = JsonWriter(metrics=ScraperMetrics())
+    target = tmp_path / "data.json"
+    writer.submit_write(target, {"ok": True}).result(timeout=5)
+
+    future = writer.submit_write(target, {"bad": object()})
+
+    with pytest.raises(TypeError):
+        future.result(timeout=5)
+    assert json.loads(target.read_text(encoding="utf-8")) == {"ok": True}
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == ".tmp"] == []
+    writer.close()
+
+
+async def test_slow_disk_does_not_block_event_loop(tmp_path):
+    """느린 저장 중에도 이벤트 루프 지연이 작고 메시지가 모두 저장되는지 테스트"""
+    metrics = ScraperMetrics()
+    writer = JsonWriter(metrics=metrics)
+    monitor = EventLoopLagMonitor(metrics, interval=0.01)
+    save_file = tmp_path / "hvdc.json"
+    scraper = AsyncGroupScraper(
+        GroupConfig(name="HVDC Project", save_file=str(save_file)),
+        metrics=metrics,
+        json_writer=writer,
+    )
+
+    def slow(data):
+        time.sleep(0.3)  # 느린 디스크 흉내
+        return data
+
+    monitor.start()
+    slow_write = writer.update(tmp_path / "slow.json", slow)
+    await asyncio.gather(
+        slow_write,
+        scraper.save_messages([{"text": "first"}]),
+        scraper.save_messages([{"text": "second"}]),
+    )
+    await monitor.stop()
+
+    assert [message["text"] for message in json.loads(save_file.read_text(encoding="utf-8"))] == [
+        "first",
+        "second",
+    ]
+    assert metrics.loop_lag.count() >= 10
+    assert metrics.loop_lag_max.value() < 0.1
+    writer.close()
+
+
+async def test_cancelled_caller_still_persists(tmp_path):
+    """저장을 기다리던 호출자가 취소되어도 데이터가 저장되는지 테스트"""
+    writer = JsonWriter(metrics=ScraperMetrics())
+    gate = threading.Event()
+    writer.submit_update(tmp_path / "busy.json", blocking_update(gate), manifest=False)
+    target = tmp_path / "data.json"
+
+    task = asyncio.create_task(writer.write(target, {"saved": True}))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    gate.set()
+
+    assert await writer.aflush(timeout=5)
+    assert json.loads(target.read_text(encoding="utf-8")) == {"saved": True}
+    writer.close()
+
+
+def test_workflow_save_returns_future_with_write_errors(tmp_path):
+    """워크플로우 저장 Future로 완료와 저장 오류가 호출자에게 전달되는지 테스트"""
+    manager = WorkflowManager(str(tmp_path / "workflow.json"))
+
+    assert manager.save_data().result(timeout=5) == tmp_path / "workflow.json"
+    assert json.loads((tmp_path / "workflow.json").read_text(encoding="utf-8"))["tasks"]
+
+    blocked = tmp_path / "blocked.json"
+    (blocked / "occupied").mkdir(parents=True)  # 대상 경로가 비어 있지 않은 디렉토리
+    manager.data_file = str(blocked)
+    with pytest.raises(OSError):
+        manager.save_data().result(timeout=5)
+
+
+async def test_save_messages_writes_sinks_off_the_event_loop(tmp_path):
+    """Parquet/검색 색인 기록이 이벤트 루프 스레드 밖에서 실행되는지 테스트"""
+    writer = JsonWriter(metrics=ScraperMetrics())
+    scraper = AsyncGroupScraper(
+        GroupConfig(name="HVDC Project", save_file=str(tmp_path / "hvdc.json")),
+        metrics=ScraperMetrics(),
+        json_writer=writer,
+    )
+    threads = {}
+
+    class RecordingSink:
+        def __init__(self, name):
+            self.name = name
+
+        def write(self, messages, group_name, **kwargs):
+            threads[self.name] = threading.get_ident()
+
+        add_messages = write
+
+    scraper.parquet_sink = RecordingSink("parquet")
+    scraper.search_index = RecordingSink("search")
+
+    await scraper.save_messages([{"text": "hello"}])
+    writer.close()
+
+    assert set(threads) == {"parquet", "search"}
+    assert threading.get_ident() not in threads.values()
@@ -0,0 +1,83 @@
+"""PII 마스킹 엔진 테스트. Tests for the single-pass PII sanitizer."""
+
+import random
+import re
+
+from macho_gpt.core.pii_sanitizer import DEFAULT_PII_PATTERNS, PIISanitizer
+
+
+def test_sanitize_masks_all_categories_in_one_pass():
+    """모든 카테고리 단일 패스 마스킹 테스트"""
+    sanitizer = PIISanitizer()
+    text = (
+        "연락처 010-1234-5678, 메일 test@example.com, "
+        "주민번호 123456-1234567, 카드 1234-5678-9012-3456"
+    )
+
+    sanitized, counts = sanitizer.sanitize_with_counts(text)
+
+    assert sanitized == "연락처 [PHONE], 메일 [EMAIL], 주민번호 [ID_NUMBER], 카드 [CARD_NUMBER]"
+    assert counts == {"PHONE": 1, "EMAIL": 1, "ID_NUMBER": 1, "CARD_NUMBER": 1}
+    assert sanitizer.counts["PHONE"] == 1
+
+
+def test_sanitize_returns_plain_text_unchanged():
+    """PII 없는 텍스트 무변경 테스트"""
+    sanitizer = PIISanitizer()
+
+    assert sanitizer.sanitize("Vessel ETA confirmed at MOSB") == "Vessel ETA confirmed at MOSB"
+    assert sum(sanitizer.counts.values()) == 0
+
+
+def test_sanitize_stream_masks_matches_across_chunk_boundaries():
+    """청크 경계를 넘는 PII 스트리밍 마스킹 테스트"""
+    sanitizer = PIISanitizer(stream_overlap=32)
+    text = ("filler text " * 10) + "call 010-9876-5432 or ops@hvdc.example.org " * 5
+    chunks = [text[index : index + 7] for index in range(0, len(text), 7)]
+
+    streamed = "".join(sanitizer.sanitize_stream(chunks))
+
+    assert streamed == PIISanitizer().sanitize(text)
+    assert sanitizer.counts == {"ID_NUMBER": 0, "CARD_NUMBER": 0, "EMAIL": 5, "PHONE": 5}
+
+
+def test_sanitize_message_only_touches_selected_fields():
+    """메시지 필드 선택 마스킹 테스트"""
+    sanitizer = PIISanitizer()
+    message = {"text": "pls call +971 50 123 4567", "sender": "+971 50 123 4567"}
+
+    sanitized = sanitizer.sanitize_message(message)
+
+    assert sanitized["text"] == "pls call [PHONE]"
+    assert sanitized["sender"] == message["sender"]
+
+
+def sequential_sanitize(text):
+    """이전 구현: 패턴별 순차 치환 (비교 기준)"""
+    for name, regex in DEFAULT_PII_PATTERNS:
+        text = re.sub(regex, f"[{name}]", text)
+    return text
+
+
+def test_overlapping_matches_follow_pattern_priority():
+    """더 긴 ID/카드 번호 안에서 전화번호가 시작하지 않는지 테스트"""
+    sanitizer = PIISanitizer()
+
+    assert sanitizer.sanitize("card 12 1234-5678-9012-3456") == "card 12 [CARD_NUMBER]"
+    assert sanitizer.sanitize("12 900101-1234567") == "12 [ID_NUMBER]"
+
+
+def test_matches_sequential_implementation_on_random_text():
+    """무작위 텍스트에서 이전 순차 치환과 결과가 같은지 차등 테스트"""
+    rng = random.Random(20251019)
+    alphabet = "0123456789" * 4 + "- +@.ab_"
+    sanitizer = PIISanitizer()
+    for _ in range(20000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+        assert sanitizer.sanitize(text) == sequential_sanitize(text), text
+
+    chunked = PIISanitizer(stream_overlap=48)
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(300))
+        chunks = [text[index : index + 11] for index in range(0, len(text), 11)]
+        assert "".join(chunked.sanitize_stream(chunks)) == sequential_sanitize(text)
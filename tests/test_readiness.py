@@ -0,0 +1,66 @@
+"""준비 상태 대기 테스트. Tests for the DOM-quiescence readiness primitives."""
+
+from unittest.mock import AsyncMock
+
+from macho_gpt.core import readiness
+from macho_gpt.core.readiness import (
+    MESSAGE_PANEL_SELECTOR,
+    scroll_and_wait_for_fetch,
+    wait_for_dom_quiet,
+)
+
+
+class FakePage:
+    """평가 호출 순서를 기록하는 페이지 대역"""
+
+    def __init__(self, arm_results, outcome):
+        self.calls = []
+        self._arm_results = list(arm_results)
+        self._outcome = outcome
+        self.keyboard = AsyncMock()
+        self.keyboard.press.side_effect = lambda key: self.calls.append(("press", key))
+
+    async def evaluate(self, script, args):
+        if script is readiness._ARM_JS:
+            self.calls.append(("arm", args["selector"]))
+            return self._arm_results.pop(0)
+        self.calls.append(("wait", args["quietMs"], args["graceMs"]))
+        return self._outcome
+
+    async def wait_for_selector(self, selector, state, timeout):
+        self.calls.append(("wait_for_selector", selector))
+
+
+async def test_observer_is_armed_before_action_runs():
+    """동작 전에 관찰이 설치되는지 테스트"""
+    page = FakePage([True], {"settled": True, "mutations": 12, "count": 40})
+    action = AsyncMock(side_effect=lambda: page.calls.append(("action",)))
+
+    result = await wait_for_dom_quiet(page, MESSAGE_PANEL_SELECTOR, action=action, quiet_ms=250)
+
+    assert [call[0] for call in page.calls] == ["arm", "action", "wait"]
+    assert page.calls[2][1] == 250
+    assert result.settled and result.mutations == 12 and result.count == 40
+
+
+async def test_missing_root_runs_action_then_waits_for_it():
+    """루트가 없으면 동작 후 등장을 기다리는지 테스트"""
+    page = FakePage([False, True], {"settled": True, "mutations": 3})
+    action = AsyncMock(side_effect=lambda: page.calls.append(("action",)))
+
+    result = await wait_for_dom_quiet(page, MESSAGE_PANEL_SELECTOR, action=action)
+
+    assert [call[0] for call in page.calls] == ["arm", "action", "wait_for_selector", "arm", "wait"]
+    action.assert_awaited_once()
+    assert result.settled
+
+
+async def test_scroll_fetch_presses_key_inside_observation():
+    """스크롤 키 입력이 관찰 구간 안에서 실행되는지 테스트"""
+    page = FakePage([True], {"settled": True, "mutations": 0})
+
+    result = await scroll_and_wait_for_fetch(page, "PageUp")
+
+    assert page.calls[:2] == [("arm", MESSAGE_PANEL_SELECTOR), ("press", "PageUp")]
+    assert result.mutations == 0
+
@@ -0,0 +1,71 @@
+"""리소스 필터 테스트. Tests for the context.route resource filter."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from macho_gpt.core.metrics import ScraperMetrics
+from macho_gpt.core.resource_filter import ResourceFilter
+
+
+def _route(resource_type, url):
+    route = AsyncMock()
+    route.request = SimpleNamespace(resource_type=resource_type, url=url)
+    return route
+
+
+def test_text_groups_block_media_hosts_and_heavy_types():
+    """텍스트 그룹의 차단/허용 판정 테스트"""
+    resource_filter = ResourceFilter.for_group(False)
+
+    assert resource_filter.classify("image", "https://web.whatsapp.com/img/logo.png") == "stub"
+    assert resource_filter.classify("font", "https://static.whatsapp.net/font.woff2") == "abort"
+    assert resource_filter.classify("xhr", "https://media-sin6-2.cdn.whatsapp.net/v/t62") == "abort"
+    assert resource_filter.classify("script", "https://static.whatsapp.net/app.js") is None
+    assert resource_filter.classify("image", "data:image/png;base64,AAAA") is None
+
+
+def test_media_ocr_groups_keep_images_and_media():
+    """미디어 OCR 그룹은 이미지/미디어를 허용하는지 테스트"""
+    resource_filter = ResourceFilter.for_group(True)
+
+    assert resource_filter.classify("image", "https://mmg.whatsapp.net/d/f/photo.enc") is None
+    assert resource_filter.classify("media", "https://mmg.whatsapp.net/v/video.enc") is None
+    assert resource_filter.classify("font", "https://static.whatsapp.net/font.woff2") == "abort"
+
+
+async def test_handle_routes_and_reports_cycle_savings():
+    """라우트 처리 및 사이클별 절감량 보고 테스트"""
+    metrics = ScraperMetrics()
+    resource_filter = ResourceFilter.for_group(False, metrics=metrics, group_name="HVDC 물류팀")
+    context = AsyncMock()
+    assert await resource_filter.install(context) is True
+    context.route.assert_awaited_once_with("**/*", resource_filter.handle)
+
+    avatar = _route("image", "https://pps.whatsapp.net/v/t61/avatar.jpg")
+    video = _route("media", "https://mmg.whatsapp.net/v/preview.mp4")
+    script = _route("script", "https://static.whatsapp.net/app.js")
+    for route in (avatar, video, script):
+        await resource_filter.handle(route)
+
+    avatar.fulfill.assert_awaited_once()
+    video.abort.assert_awaited_once_with("blockedbyclient")
+    script.continue_.assert_awaited_once_with()
+
+    stats = resource_filter.take_cycle_stats()
+    assert stats["blocked_requests"] == 2
+    assert stats["stubbed_requests"] == 1
+    assert stats["allowed_requests"] == 1
+    assert stats["by_type"] == {"image": 1, "media": 1}
+    assert stats["estimated_bytes_saved"] > 0
+    assert resource_filter.take_cycle_stats()["blocked_requests"] == 0
+    assert resource_filter.totals.blocked_requests == 2
+    assert metrics.blocked_requests.value(group="HVDC 물류팀", resource_type="media") == 1
+
+
+async def test_disabled_filter_is_not_installed():
+    """비활성화 시 라우트 미설치 테스트"""
+    context = AsyncMock()
+    resource_filter = ResourceFilter.for_group(False, {"enabled": False})
+
+    assert await resource_filter.install(context) is False
+    context.route.assert_not_awaited()
@@ -0,0 +1,109 @@
+"""셀렉터 해석기 테스트. Tests for the racing selector resolver."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from macho_gpt.core.selector_resolver import (
+    GROUP_ENTRY_SELECTORS,
+    SEARCH_BOX_SELECTORS,
+    SelectorResolver,
+    SelectorTimeoutError,
+    wait_for_group_entry,
+)
+
+
+class FakePage:
+    """후보 일치 결과를 돌려주는 페이지 대역"""
+
+    def __init__(self, visible_selectors=(), fail=False):
+        self.visible_selectors = set(visible_selectors)
+        self.fail = fail
+        self.wait_calls = []
+        self.locator = MagicMock(side_effect=lambda selector: MagicMock(selector=selector))
+
+    def _matches(self, arg):
+        matches = [selector in self.visible_selectors for selector in arg["selectors"]]
+        return matches if any(matches) else None
+
+    async def evaluate(self, script, arg):
+        return self._matches(arg)
+
+    async def wait_for_function(self, script, arg, polling, timeout):
+        self.wait_calls.append((list(arg["selectors"]), timeout))
+        if self.fail:
+            raise TimeoutError(f"Timeout {timeout}ms exceeded")
+        handle = AsyncMock()
+        handle.json_value.return_value = self._matches(arg)
+        return handle
+
+
+async def test_races_all_candidates_and_persists_winner(tmp_path):
+    """모든 후보를 한 번에 경합하고 승자를 저장하는지 테스트"""
+    cache_path = tmp_path / "selector_cache.json"
+    resolver = SelectorResolver(cache_path)
+    winner = SEARCH_BOX_SELECTORS[4]
+    page = FakePage([winner])
+
+    locator, selector = await resolver.resolve(page, "search_box", SEARCH_BOX_SELECTORS)
+
+    assert selector == winner
+    assert len(page.wait_calls) == 1
+    assert page.wait_calls[0][1] == 5000
+    page.locator.assert_called_with(f"{winner} >> visible=true")
+
+    reloaded = SelectorResolver(cache_path)
+    assert reloaded.ordered("search_box", SEARCH_BOX_SELECTORS)[0] == winner
+    assert reloaded.hit_rates("search_box")[winner] == 1.0
+    assert reloaded.hit_rates("search_box")[SEARCH_BOX_SELECTORS[0]] == 0.0
+
+
+async def test_cache_is_written_only_when_winner_changes(tmp_path):
+    """같은 승자가 반복되면 저장하지 않고 flush 시 통계를 저장하는지 테스트"""
+    cache_path = tmp_path / "selector_cache.json"
+    resolver = SelectorResolver(cache_path, save_interval=3600)
+    resolver.save = MagicMock(wraps=resolver.save)
+    page = FakePage([SEARCH_BOX_SELECTORS[2]])
+
+    for _ in range(5):
+        await resolver.resolve(page, "search_box", SEARCH_BOX_SELECTORS)
+    assert resolver.save.call_count == 1
+
+    page.visible_selectors = {SEARCH_BOX_SELECTORS[3]}
+    await resolver.resolve(page, "search_box", SEARCH_BOX_SELECTORS)
+    assert resolver.save.call_count == 2
+
+    await resolver.resolve(page, "search_box", SEARCH_BOX_SELECTORS)
+    resolver.flush()
+    resolver.flush()
+    assert resolver.save.call_count == 3
+
+    reloaded = SelectorResolver(cache_path)
+    assert reloaded.ordered("search_box", SEARCH_BOX_SELECTORS)[0] == SEARCH_BOX_SELECTORS[3]
+    assert reloaded.stats["search_box"][SEARCH_BOX_SELECTORS[0]]["attempts"] == 7
+
+
+async def test_miss_costs_one_timeout_and_is_counted(tmp_path):
+    """전체 실패가 단일 타임아웃이며 통계에 기록되는지 테스트"""
+    resolver = SelectorResolver(tmp_path / "selector_cache.json")
+    page = FakePage(fail=True)
+
+    with pytest.raises(SelectorTimeoutError):
+        await resolver.resolve(page, "search_box", SEARCH_BOX_SELECTORS, timeout_ms=1500)
+
+    assert page.wait_calls == [(list(SEARCH_BOX_SELECTORS), 1500)]
+    assert all(entry["attempts"] == 1 for entry in resolver.stats["search_box"].values())
+
+
+async def test_group_entry_templates_are_escaped_and_cached(tmp_path):
+    """그룹 이름 이스케이프 및 템플릿 단위 캐시 테스트"""
+    resolver = SelectorResolver(None)
+    name = 'HVDC "Lightning"'
+    expected = 'span[title="HVDC \\"Lightning\\""]'
+    page = FakePage([expected])
+
+    await wait_for_group_entry(page, name, resolver)
+
+    assert resolver.winners["group_entry"] == GROUP_ENTRY_SELECTORS[1]
+    with pytest.raises(RuntimeError, match="Failed to locate group entry"):
+        await wait_for_group_entry(FakePage(fail=True), "Unknown", resolver)
@@ -0,0 +1,187 @@
+"""샤드 감독자 테스트. Tests for the multi-process shard supervisor."""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from macho_gpt.async_scraper.group_config import GroupConfig
+from macho_gpt.async_scraper.multi_group_manager import MultiGroupManager
+from macho_gpt.async_scraper.shard_supervisor import ShardState, ShardSupervisor, assign_shards
+
+
+def make_group(name, priority="MEDIUM"):
+    return GroupConfig(name=name, save_file=f"data/{name}.json", priority=priority)
+
+
+async def echo_runner(groups, options, report):
+    """워커에서 그룹별 결과와 PID를 돌려주는 샤드 대역"""
+    report({"total_messages": 10 * len(groups), "completed_cycles": len(groups)})
+    return [
+        {"group_name": group.name, "success": True, "pid": os.getpid(), "messages_scraped": 10}
+        for group in groups
+    ]
+
+
+async def poison_runner(groups, options, report):
+    """'poison' 그룹이 포함된 워커를 강제 종료시키는 샤드 대역"""
+    if any(group.name == "poison" for group in groups):
+        os._exit(3)
+    return await echo_runner(groups, options, report)
+
+
+async def idle_runner(groups, options, report):
+    """중지될 때까지 대기하는 샤드 대역"""
+    report({"ready": 1})
+    while True:
+        await asyncio.sleep(1)
+
+
+def _run_in_thread(supervisor):
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(results=supervisor.run(poll_interval=0.05)))
+    thread.start()
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        states = list(supervisor.shards.values())
+        if states and all(state.stats.get("ready") for state in states):
+            break
+        time.sleep(0.05)
+    return thread, outcome
+
+
+def test_assign_shards_balances_priority_weight():
+    """우선순위 가중치로 샤드 부하를 균형 있게 나누는지 테스트"""
+    groups = [
+        make_group("a", "HIGH"),
+        make_group("b", "HIGH"),
+        make_group("c", "LOW"),
+        make_group("d", "LOW"),
+        make_group("e", "MEDIUM"),
+    ]
+
+    shards = assign_shards(groups, workers=2)
+    weights = [sum({"HIGH": 3, "MEDIUM": 2, "LOW": 1}[g.priority] for g in shard) for shard in shards]
+
+    assert len(shards) == 2
+    assert weights == [5, 5]
+    assert assign_shards(groups[:1], workers=4) == [groups[:1]]
+
+
+def test_supervisor_runs_shards_in_separate_processes():
+    """샤드별 독립 프로세스 실행 및 결과/통계 집계 테스트"""
+    groups = [make_group(name) for name in ("alpha", "bravo", "charlie", "delta")]
+    supervisor = ShardSupervisor(groups, workers=2, runner=echo_runner)
+
+    results = supervisor.run(poll_interval=0.05)
+
+    assert [result["group_name"] for result in results] == ["alpha", "bravo", "charlie", "delta"]
+    assert all(result["success"] for result in results)
+    assert len({result["pid"] for result in results}) == 2
+    assert os.getpid() not in {result["pid"] for result in results}
+    stats = supervisor.get_stats()
+    assert stats["total_messages"] == 40 and stats["restarts"] == 0
+
+
+def test_crashing_shard_is_split_and_poison_group_isolated():
+    """반복 크래시 샤드를 분할하여 정상 그룹은 완료되고 문제 그룹만 실패하는지 테스트"""
+    groups = [make_group("healthy"), make_group("poison"), make_group("steady")]
+    supervisor = ShardSupervisor(
+        groups,
+        workers=1,
+        runner=poison_runner,
+        max_restarts=3,
+        backoff_base=0.01,
+        split_after=1,
+    )
+
+    results = {result["group_name"]: result for result in supervisor.run(poll_interval=0.05)}
+
+    assert results["healthy"]["success"] and results["steady"]["success"]
+    assert not results["poison"]["success"]
+    assert results["poison"]["error"] == "worker exit 3"
+    assert supervisor.restarts >= 2
+    assert supervisor.get_stats()["failed_shards"] == 1
+
+
+def test_shards_get_separate_chromium_directories(tmp_path):
+    """샤드마다 대기 브라우저 루트가 다르고 그룹 프로필이 겹치지 않는지 테스트"""
+    groups = [make_group(name) for name in ("alpha", "bravo", "charlie")]
+    options = {
+        "chrome_data_root": str(tmp_path / "chrome"),
+        "enhancements": {"browser_pool": {"enabled": True}, "chat_index": {"enabled": False}},
+    }
+    supervisor = ShardSupervisor(groups, workers=2, manager_options=options)
+
+    dirs = []
+    for shard_id, shard in enumerate(assign_shards(groups, 2)):
+        shard_options = supervisor._shard_options(ShardState(shard_id, shard, slot=shard_id))
+        shard_options.pop("stats_interval")
+        manager = MultiGroupManager(group_configs=shard, **shard_options)
+        assert manager.browser_pool.profile_root == tmp_path / "chrome" / "standby" / f"shard{shard_id}"
+        dirs.append(manager.browser_pool.profile_root)
+        dirs.extend(Path(manager._build_chrome_storage_dir(group)) for group in shard)
+
+    assert len(set(dirs)) == len(dirs) == 5
+
+    with pytest.raises(ValueError, match="Chrome 프로필"):
+        ShardSupervisor([make_group("a.b"), make_group("a_b")], workers=2)
+
+
+def test_split_shards_keep_stable_standby_slots(tmp_path):
+    """분할된 샤드가 슬롯 기반 대기 루트를 쓰고 분할 전 통계가 합계에서 빠지는지 테스트"""
+    groups = [make_group(name) for name in ("alpha", "bravo", "charlie", "delta")]
+    supervisor = ShardSupervisor(
+        groups, workers=2, manager_options={"chrome_data_root": str(tmp_path)}, split_after=1
+    )
+    first = supervisor._add_shard(groups[:2], slot=0)
+    second = supervisor._add_shard(groups[2:], slot=1)
+    first.stats = {"total_messages": 7}
+    second.stats = {"total_messages": 5}
+    second.done = True
+    first.process = type("Exited", (), {"exitcode": 1})()
+
+    supervisor._on_exit(first)
+
+    halves = [state for state in supervisor.shards.values() if state.shard_id > 1]
+    assert [state.slot for state in halves] == [0, 1]
+    assert {supervisor._shard_options(state)["standby_root"] for state in halves} == {
+        str(tmp_path / "standby" / "shard0"),
+        str(tmp_path / "standby" / "shard1"),
+    }
+    stats = supervisor.get_stats()
+    assert stats["total_messages"] == 5
+    assert stats["shards"] == 3
+
+
+def test_sigint_stops_workers_without_restarts():
+    """Ctrl+C(SIGINT)를 받은 워커가 크래시로 재시작되지 않고 감독자가 종료되는지 테스트"""
+    supervisor = ShardSupervisor(
+        [make_group("alpha"), make_group("bravo")], workers=2, runner=idle_runner, backoff_base=0.01
+    )
+    thread, outcome = _run_in_thread(supervisor)
+
+    for state in list(supervisor.shards.values()):
+        os.kill(state.process.pid, signal.SIGINT)
+    thread.join(timeout=15)
+
+    assert not thread.is_alive()
+    assert supervisor.restarts == 0
+    assert [result["error"] for result in outcome["results"]] == ["stopped", "stopped"]
+
+
+def test_stop_from_another_thread_ends_run():
+    """다른 스레드에서 stop()을 호출하면 실행 중인 run()이 워커를 정리하고 반환하는지 테스트"""
+    supervisor = ShardSupervisor([make_group("alpha"), make_group("bravo")], workers=2, runner=idle_runner)
+    thread, _ = _run_in_thread(supervisor)
+
+    supervisor.stop()
+    thread.join(timeout=15)
+
+    assert not thread.is_alive()
+    assert all(state.process is None for state in supervisor.shards.values())
+    assert supervisor.restarts == 0
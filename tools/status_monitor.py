@@ -12,11 +12,15 @@ Samsung C&T Logistics · HVDC Project
 """
 
 import os
+import sys
 import time
-import json
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from macho_gpt.core.data_manifest import LOCK_NAME, MANIFEST_NAME, DataManifest  # noqa: E402
+
 
 def check_log_files():
     """로그 파일 상태 확인"""
@@ -61,47 +65,36 @@ def check_data_files():
         print("[ERROR] data 디렉토리가 없습니다")
         return
 
-    # WhatsApp 추출 결과 파일 확인
+    # WhatsApp 추출 결과 파일 확인 (매니페스트 기반, 변경된 파일만 재파싱)
     extraction_files = list(data_dir.glob("hvdc_whatsapp_extraction_*.json"))
     extraction_files.extend(list(data_dir.glob("whatsapp_extraction_*.json")))
+    manifest = DataManifest(data_dir)
+    summaries = manifest.refresh(extraction_files)
 
-    if extraction_files:
-        print(f"[OK] 추출 결과 파일: {len(extraction_files)}개")
-        for file in sorted(
-            extraction_files, key=lambda x: x.stat().st_mtime, reverse=True
+    if summaries:
+        print(f"[OK] 추출 결과 파일: {len(summaries)}개 (재스캔 {manifest.rescanned}개)")
+        for name, summary in sorted(
+            summaries.items(), key=lambda item: item[1]["mtime_ns"], reverse=True
         ):
-            size = file.stat().st_size
-            mtime = datetime.fromtimestamp(file.stat().st_mtime)
-            print(f"   [FILE] {file.name}")
-            print(f"      [SIZE] 크기: {size} bytes")
+            mtime = datetime.fromtimestamp(summary["mtime_ns"] / 1e9)
+            print(f"   [FILE] {name}")
+            print(f"      [SIZE] 크기: {summary['size']} bytes")
             print(f"      [TIME] 생성시간: {mtime.strftime('%Y-%m-%d %H:%M:%S')}")
 
-            # JSON 파일 내용 미리보기
-            if size > 0:
-                try:
-                    with open(file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        if isinstance(data, list):
-                            success_count = sum(
-                                1 for item in data if item.get("status") == "SUCCESS"
-                            )
-                            total_count = len(data)
-                            print(f"      [STAT] 성공률: {success_count}/{total_count}")
-
-                            # 채팅방별 결과 요약
-                            for item in data:
-                                chat_title = item.get("chat_title", "Unknown")
-                                status = item.get("status", "Unknown")
-                                message_count = item.get("message_count", 0)
-                                print(
-                                    f"         - {chat_title}: {status} ({message_count}개 메시지)"
-                                )
-                        else:
-                            print(
-                                f"      [LOG] 단일 결과: {data.get('status', 'Unknown')}"
-                            )
-                except Exception as e:
-                    print(f"      [ERROR] 파일 읽기 오류: {str(e)}")
+            if "error" in summary:
+                print(f"      [ERROR] 파일 읽기 오류: {summary['error']}")
+            elif summary.get("kind") == "results":
+                print(
+                    f"      [STAT] 성공률: {summary['success_count']}/{summary['total_count']}"
+                )
+                # 채팅방별 결과 요약
+                for entry in summary.get("entries", []):
+                    print(
+                        f"         - {entry['chat_title']}: {entry['status']} "
+                        f"({entry['message_count']}개 메시지)"
+                    )
+            elif summary["size"] > 0:
+                print(f"      [LOG] 단일 결과: {summary['status']}")
             print()
     else:
         print("[ERROR] 추출 결과 파일이 없습니다")
@@ -110,7 +103,9 @@ def check_data_files():
     other_files = [
         f
         for f in data_dir.iterdir()
-        if f.is_file() and not f.name.startswith("hvdc_whatsapp_extraction_")
+        if f.is_file()
+        and not f.name.startswith("hvdc_whatsapp_extraction_")
+        and f.name not in (MANIFEST_NAME, LOCK_NAME)
     ]
     if other_files:
         print(f"[DATA] 기타 데이터 파일: {len(other_files)}개")
@@ -209,7 +204,7 @@ def check_system_status():
 
     # 상태 요약
     log_count = len([f for f in Path("logs").glob("*.log") if f.stat().st_size > 0])
-    data_count = len([f for f in Path("data").glob("*.json")])
+    data_count = len([f for f in Path("data").glob("*.json") if f.name != MANIFEST_NAME])
 
     print(f"[CONTENT] 활성 로그 파일: {log_count}개")
     print(f"[SIZE] 데이터 파일: {data_count}개")
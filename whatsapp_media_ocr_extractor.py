@@ -5,57 +5,571 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import importlib.util
+import io
 import json
 import logging
+import os
 import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 import shutil
-from typing import Any, Dict, List, Optional, Sequence, Set
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
 
+from macho_gpt.core.pii_sanitizer import PIISanitizer
+from macho_gpt.core.readiness import scroll_and_wait_for_fetch
 
 LOGGER = logging.getLogger(__name__)
 
 _EASYOCR_SPEC = importlib.util.find_spec("easyocr")
 EASYOCR_AVAILABLE = _EASYOCR_SPEC is not None
 if EASYOCR_AVAILABLE:
-    from easyocr import Reader  # type: ignore
+    import easyocr  # type: ignore
 else:  # pragma: no cover - optional dependency guard
-    Reader = None  # type: ignore[assignment]
+    easyocr = None  # type: ignore[assignment]
 
 _PYMUPDF_SPEC = importlib.util.find_spec("fitz")
 PYMUPDF_AVAILABLE = _PYMUPDF_SPEC is not None
 if PYMUPDF_AVAILABLE:
     import fitz  # type: ignore  # noqa: F401
 
+_NUMPY_SPEC = importlib.util.find_spec("numpy")
+NUMPY_AVAILABLE = _NUMPY_SPEC is not None
+if NUMPY_AVAILABLE:
+    import numpy as np  # type: ignore
+
+_CV2_SPEC = importlib.util.find_spec("cv2")
+CV2_AVAILABLE = _CV2_SPEC is not None
+if CV2_AVAILABLE:
+    import cv2  # type: ignore
+
+_PIL_SPEC = importlib.util.find_spec("PIL")
+PIL_AVAILABLE = _PIL_SPEC is not None
+if PIL_AVAILABLE:
+    from PIL import Image  # type: ignore
+
+_PSUTIL_SPEC = importlib.util.find_spec("psutil")
+PSUTIL_AVAILABLE = _PSUTIL_SPEC is not None
+if PSUTIL_AVAILABLE:
+    import psutil  # type: ignore
+
+OCR_LANGUAGES: Tuple[str, ...] = ("ko", "en")
+OCR_CACHE_SCHEMA_VERSION = 1
+OCR_CACHE_PATH = Path("data/ocr_cache") / "ocr_results.sqlite3"
+
+
+def _decode_image(data: bytes) -> Optional[Any]:
+    """이미지 바이트 디코딩. Decode encoded image bytes into a NumPy array."""
+
+    if not NUMPY_AVAILABLE:
+        return None
+    try:
+        if CV2_AVAILABLE:
+            return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if PIL_AVAILABLE:
+            with Image.open(io.BytesIO(data)) as image:
+                return np.asarray(image.convert("RGB"))
+    except Exception as exc:  # noqa: BLE001 - decoder errors vary by backend
+        LOGGER.debug("Image decode failed: %s", exc)
+    return None
+
+
+def _read_and_hash(path: Path) -> Tuple[bytes, str]:
+    """파일 읽기 및 내용 해시. Read a file and return its bytes with a SHA-256 digest."""
+
+    data = path.read_bytes()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def _readtext_chunk(reader: Any, images: List[Any], batch_size: int) -> List[Any]:
+    """이미지 묶음 인식. Recognise a chunk of similarly sized images."""
+
+    if hasattr(reader, "readtext_batched"):
+        return reader.readtext_batched(
+            images,
+            n_height=max(image.shape[0] for image in images),
+            n_width=max(image.shape[1] for image in images),
+            batch_size=batch_size,
+        )
+    return [reader.readtext(image) for image in images]
+
+
+def compute_dhash(image: Any, hash_size: int = 8) -> int:
+    """차이 해시 계산. Compute a difference hash of a decoded image with NumPy.
+
+    The grayscale image is area-averaged to ``hash_size x (hash_size + 1)``
+    blocks and each bit records whether a block is brighter than its left
+    neighbour, so rescaled or recompressed copies land within a few bits.
+    """
+
+    pixels = np.asarray(image, dtype=np.float64)
+    if pixels.ndim == 3:
+        pixels = pixels[..., :3].mean(axis=2)
+    height, width = pixels.shape
+    if height < hash_size or width < hash_size + 1:
+        pixels = np.repeat(
+            np.repeat(pixels, -(-hash_size // height), axis=0),
+            -(-(hash_size + 1) // width),
+            axis=1,
+        )
+        height, width = pixels.shape
+    row_edges = np.linspace(0, height, hash_size + 1).astype(int)
+    col_edges = np.linspace(0, width, hash_size + 2).astype(int)
+    sums = np.add.reduceat(
+        np.add.reduceat(pixels, row_edges[:-1], axis=0), col_edges[:-1], axis=1
+    )
+    blocks = sums / np.outer(np.diff(row_edges), np.diff(col_edges))
+    bits = (blocks[:, 1:] > blocks[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(left: int, right: int) -> int:
+    """해밍 거리. Number of differing bits between two hashes."""
+
+    return bin(left ^ right).count("1")
+
+
+class BKTree:
+    """BK-트리 해밍 검색. BK-tree for Hamming-radius lookup of perceptual hashes."""
+
+    def __init__(self) -> None:
+        self._root: Optional[Tuple[int, Any, Dict[int, Any]]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, hash_value: int, item: Any) -> None:
+        """항목 추가. Insert ``item`` under ``hash_value``."""
+
+        node: Tuple[int, Any, Dict[int, Any]] = (hash_value, item, {})
+        self._size += 1
+        if self._root is None:
+            self._root = node
+            return
+        current = self._root
+        while True:
+            distance = hamming_distance(hash_value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, hash_value: int, radius: int) -> List[Tuple[int, Any]]:
+        """반경 검색. Return ``(distance, item)`` pairs within ``radius``, nearest first."""
+
+        if self._root is None:
+            return []
+        matches: List[Tuple[int, Any]] = []
+        stack = [self._root]
+        while stack:
+            node_hash, item, children = stack.pop()
+            distance = hamming_distance(hash_value, node_hash)
+            if distance <= radius:
+                matches.append((distance, item))
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+
+def _current_rss_bytes() -> int:
+    """현재 프로세스 RSS 조회. Return resident set size of this process."""
+
+    if PSUTIL_AVAILABLE:
+        return int(psutil.Process().memory_info().rss)
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):  # pragma: no cover - non-Linux hosts
+        return 0
+
+
+class OCRReaderRegistry:
+    """OCR 리더 레지스트리. Process-wide lazy EasyOCR reader registry."""
+
+    def __init__(self) -> None:
+        self._readers: Dict[Tuple[str, ...], Any] = {}
+        self._memory: Dict[Tuple[str, ...], Dict[str, float]] = {}
+        self._errors: Dict[Tuple[str, ...], str] = {}
+        self._load_locks: Dict[Tuple[str, ...], threading.Lock] = {}
+        self._warmups: Dict[Tuple[str, ...], threading.Thread] = {}
+        self._registry_lock = threading.Lock()
+
+    @staticmethod
+    def _key(languages: Sequence[str]) -> Tuple[str, ...]:
+        """언어 집합 키. Normalise a language sequence into a registry key."""
+
+        return tuple(sorted(set(languages)))
+
+    def _load_lock(self, key: Tuple[str, ...]) -> threading.Lock:
+        """언어별 로딩 잠금. Return the load lock for a language set."""
+
+        with self._registry_lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    def get(self, languages: Sequence[str]) -> Optional[Any]:
+        """리더 조회(지연 로딩). Return the shared reader, loading it on first use."""
+
+        if not EASYOCR_AVAILABLE:
+            return None
+        key = self._key(languages)
+        reader = self._readers.get(key)
+        if reader is not None:
+            return reader
+        with self._load_lock(key):
+            reader = self._readers.get(key)
+            if reader is None:
+                reader = self._load(key, languages)
+        return reader
+
+    def _load(self, key: Tuple[str, ...], languages: Sequence[str]) -> Any:
+        """리더 생성 및 메모리 측정. Build a reader and record its load cost."""
+
+        rss_before = _current_rss_bytes()
+        started = time.perf_counter()
+        reader = easyocr.Reader(list(languages))  # type: ignore[union-attr]
+        self._memory[key] = {
+            "rss_delta_bytes": max(_current_rss_bytes() - rss_before, 0),
+            "load_seconds": round(time.perf_counter() - started, 3),
+        }
+        self._readers[key] = reader
+        self._errors.pop(key, None)
+        LOGGER.info(
+            "EasyOCR reader loaded for %s in %.2fs", "+".join(key), self._memory[key]["load_seconds"]
+        )
+        return reader
+
+    def warm_up(
+        self, languages: Sequence[str], *, background: bool = True
+    ) -> Optional[threading.Thread]:
+        """모델 예열. Load the reader and run one tiny inference to warm kernels."""
+
+        key = self._key(languages)
+        if not background:
+            self._warm_up_worker(key, languages)
+            return None
+        with self._registry_lock:
+            existing = self._warmups.get(key)
+            if existing is not None and existing.is_alive():
+                return existing
+            thread = threading.Thread(
+                target=self._warm_up_worker,
+                args=(key, languages),
+                name=f"ocr-warmup-{'+'.join(key)}",
+                daemon=True,
+            )
+            self._warmups[key] = thread
+        thread.start()
+        return thread
+
+    def _warm_up_worker(self, key: Tuple[str, ...], languages: Sequence[str]) -> None:
+        """예열 작업자. Warm-up worker executed in the foreground or a thread."""
+
+        try:
+            reader = self.get(languages)
+            if reader is not None and NUMPY_AVAILABLE:
+                reader.readtext(np.zeros((32, 32, 3), dtype=np.uint8))
+        except Exception as exc:  # pragma: no cover - defensive guard
+            self._errors[key] = str(exc)
+            LOGGER.error("OCR warm-up failed for %s: %s", "+".join(key), exc)
+
+    def is_ready(self, languages: Sequence[str]) -> bool:
+        """준비 상태 확인. Return True when the reader is loaded."""
+
+        return self._key(languages) in self._readers
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """메모리 사용량 보고. Report per-language-set load cost."""
+
+        readers = {
+            "+".join(key): {**stats, "ready": key in self._readers}
+            for key, stats in self._memory.items()
+        }
+        return {
+            "readers": readers,
+            "total_rss_delta_bytes": sum(
+                int(stats["rss_delta_bytes"]) for stats in self._memory.values()
+            ),
+            "errors": {"+".join(key): error for key, error in self._errors.items()},
+        }
+
+    def clear(self) -> None:
+        """레지스트리 초기화. Drop all loaded readers."""
+
+        with self._registry_lock:
+            self._readers.clear()
+            self._memory.clear()
+            self._errors.clear()
+            self._warmups.clear()
+
+
+READER_REGISTRY = OCRReaderRegistry()
+
+
+class OCRResultCache:
+    """OCR 결과 영구 캐시. Persistent content-addressed OCR result cache."""
+
+    def __init__(
+        self,
+        db_path: str | Path = ":memory:",
+        *,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ocr_results (
+                    cache_key TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    languages TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    confidence TEXT NOT NULL,
+                    boxes TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_access REAL NOT NULL,
+                    phash TEXT
+                )
+                """
+            )
+            columns = {
+                row[1] for row in self._connection.execute("PRAGMA table_info(ocr_results)")
+            }
+            if "phash" not in columns:
+                self._connection.execute("ALTER TABLE ocr_results ADD COLUMN phash TEXT")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ocr_results_last_access "
+                "ON ocr_results (last_access)"
+            )
+        row = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM ocr_results"
+        ).fetchone()
+        self._entry_count = int(row[0])
+        self._total_bytes = int(row[1])
+
+    @staticmethod
+    def build_key(content_hash: str, engine: str, languages: Sequence[str]) -> str:
+        """캐시 키 생성. Build cache key from content hash, engine and languages."""
+
+        language_key = "+".join(languages)
+        return f"v{OCR_CACHE_SCHEMA_VERSION}:{engine}:{language_key}:{content_hash}"
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회. Return cached OCR result and refresh its LRU position."""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT text, confidence, boxes, created_at FROM ocr_results "
+                "WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE ocr_results SET last_access = ? WHERE cache_key = ?",
+                    (time.time(), cache_key),
+                )
+            self.hits += 1
+        text, confidence, boxes, created_at = row
+        return {
+            "text": text,
+            "confidence": confidence,
+            "boxes": json.loads(boxes),
+            "cached_at": created_at,
+        }
+
+    def put(
+        self,
+        cache_key: str,
+        content_hash: str,
+        engine: str,
+        languages: Sequence[str],
+        result: Dict[str, Any],
+        *,
+        phash: Optional[int] = None,
+    ) -> None:
+        """캐시 저장. Store OCR result and evict least recently used entries."""
+
+        text = str(result.get("text", ""))
+        confidence = str(result.get("confidence", "0.00"))
+        boxes = json.dumps(result.get("boxes", []), ensure_ascii=False)
+        size_bytes = len(text.encode("utf-8")) + len(boxes)
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size_bytes FROM ocr_results WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO ocr_results (cache_key, content_hash, engine, "
+                    "languages, text, confidence, boxes, size_bytes, created_at, last_access, "
+                    "phash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        cache_key,
+                        content_hash,
+                        engine,
+                        "+".join(languages),
+                        text,
+                        confidence,
+                        boxes,
+                        size_bytes,
+                        datetime.utcnow().isoformat(),
+                        time.time(),
+                        f"{phash:016x}" if phash is not None else None,
+                    ),
+                )
+            if previous is None:
+                self._entry_count += 1
+            else:
+                self._total_bytes -= int(previous[0])
+            self._total_bytes += size_bytes
+            self._evict()
+
+    def iter_phashes(
+        self, engine: str, languages: Sequence[str]
+    ) -> List[Tuple[int, str]]:
+        """지각 해시 목록. Return ``(phash, cache_key)`` pairs stored for an engine."""
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT phash, cache_key FROM ocr_results "
+                "WHERE engine = ? AND languages = ? AND phash IS NOT NULL",
+                (engine, "+".join(languages)),
+            ).fetchall()
+        return [(int(phash, 16), cache_key) for phash, cache_key in rows]
+
+    def _evict(self) -> None:
+        """LRU 제거. Evict least recently used rows until within bounds."""
+
+        if self._entry_count <= self.max_entries and self._total_bytes <= self.max_bytes:
+            return
+        victims: List[str] = []
+        entry_count = self._entry_count
+        total_bytes = self._total_bytes
+        cursor = self._connection.execute(
+            "SELECT cache_key, size_bytes FROM ocr_results ORDER BY last_access ASC, rowid ASC"
+        )
+        for cache_key, size_bytes in cursor:
+            if entry_count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            victims.append(cache_key)
+            entry_count -= 1
+            total_bytes -= int(size_bytes)
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM ocr_results WHERE cache_key = ?",
+                [(key,) for key in victims],
+            )
+        self._entry_count = entry_count
+        self._total_bytes = total_bytes
+        LOGGER.debug("Evicted %d OCR cache entries", len(victims))
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계. Return cache statistics."""
+
+        return {
+            "entries": self._entry_count,
+            "size_bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """연결 종료. Close the underlying sqlite connection."""
+
+        with self._lock:
+            self._connection.close()
+
 
 class MediaOCRProcessor:
     """미디어 OCR 처리기 클래스. Media OCR processor class."""
 
-    def __init__(self, max_file_size_mb: int = 5) -> None:
+    def __init__(
+        self,
+        max_file_size_mb: int = 5,
+        *,
+        cache: Optional[OCRResultCache] = None,
+        languages: Sequence[str] = OCR_LANGUAGES,
+        registry: Optional[OCRReaderRegistry] = None,
+        warm_up: bool = False,
+        sanitizer: Optional[PIISanitizer] = None,
+        near_duplicate_distance: Optional[int] = None,
+    ) -> None:
         self.max_file_size_mb = max_file_size_mb
+        self.languages: Tuple[str, ...] = tuple(languages)
         self.supported_engines: Set[str] = {"easyocr"}
         if PYMUPDF_AVAILABLE:
             self.supported_engines.add("pymupdf")
         self.processed_files: Set[str] = set()
-        self._reader: Optional[Any] = None
-        if EASYOCR_AVAILABLE:
-            self._reader = Reader(["ko", "en"])  # type: ignore[arg-type]
+        self.pdf_min_text_chars = 20
+        self.pdf_ocr_dpi = 200
+        self.pdf_ocr_workers = 2
+        # 기본값은 실행 간 재사용되는 영구 캐시 (OCR_CACHE_PATH), 테스트 등은 ":memory:" 캐시를 주입
+        self.cache = cache if cache is not None else OCRResultCache(OCR_CACHE_PATH)
+        self.sanitizer = sanitizer if sanitizer is not None else PIISanitizer()
+        self.registry = registry if registry is not None else READER_REGISTRY
+        self._reader_override: Optional[Any] = None
+        self.near_duplicate_distance = near_duplicate_distance
+        self._phash_index: Optional[BKTree] = None
+        if warm_up and EASYOCR_AVAILABLE:
+            self.registry.warm_up(self.languages)
+
+    @property
+    def reader(self) -> Optional[Any]:
+        """공유 OCR 리더(지연 로딩). Shared OCR reader, loaded on first access."""
+
+        if self._reader_override is not None:
+            return self._reader_override
+        return self.registry.get(self.languages)
+
+    @reader.setter
+    def reader(self, value: Optional[Any]) -> None:
+        self._reader_override = value
+
+    def is_ready(self) -> bool:
+        """OCR 준비 상태. Return True when no model load is pending."""
+
+        return self._reader_override is not None or self.registry.is_ready(self.languages)
 
     def sanitize_ocr_text(self, text: str) -> str:
         """OCR 텍스트 개인정보 마스킹. Mask sensitive data in OCR text."""
 
-        patterns = [
-            (r"\d{6}-\d{7}", "[ID_NUMBER]"),
-            (r"\d{4}-\d{4}-\d{4}-\d{4}", "[CARD_NUMBER]"),
-            (r"[\w.%-]+@[\w.-]+\.[A-Za-z]{2,4}", "[EMAIL]"),
-            (r"(\+?\d{2,3}[- ]?)?\d{2,4}[- ]?\d{3,4}[- ]?\d{4}", "[PHONE]"),
-        ]
-
-        sanitized = text
-        for pattern, replacement in patterns:
-            sanitized = re.sub(pattern, replacement, sanitized)
-        return sanitized
+        return self.sanitizer.sanitize(text)
 
     def get_file_hash(self, file_path: str | Path) -> str:
         """파일 해시(MD5) 계산. Compute MD5 hash of a file."""
@@ -67,6 +581,120 @@ class MediaOCRProcessor:
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
 
+    def get_content_hash(self, file_path: str | Path) -> str:
+        """콘텐츠 해시(SHA-256) 계산. Compute SHA-256 content hash of a file."""
+
+        path = Path(file_path)
+        hash_sha256 = hashlib.sha256()
+        with path.open("rb") as file_handle:
+            for chunk in iter(lambda: file_handle.read(1024 * 1024), b""):
+                hash_sha256.update(chunk)
+        return hash_sha256.hexdigest()
+
+    @staticmethod
+    def _normalize_box(bbox: Any) -> List[List[float]]:
+        """바운딩 박스 정규화. Convert an OCR bounding box to JSON-safe lists."""
+
+        if bbox is None:
+            return []
+        try:
+            return [[float(point[0]), float(point[1])] for point in bbox]
+        except (TypeError, ValueError, IndexError):
+            return []
+
+    def _build_result(self, ocr_result: Sequence[Any], engine: str) -> Dict[str, Any]:
+        """OCR 결과 집계. Sanitize text and aggregate confidence for one image."""
+
+        text_items: List[str] = []
+        confidences: List[float] = []
+        boxes: List[List[List[float]]] = []
+        for bbox, text, confidence in ocr_result:
+            text_items.append(text)
+            confidences.append(confidence)
+            boxes.append(self._normalize_box(bbox))
+        sanitized_text = self.sanitize_ocr_text("\n".join(text_items))
+        confidence_score = (
+            f"{(sum(confidences) / len(confidences)):.2f}" if confidences else "0.00"
+        )
+        return {
+            "text": sanitized_text,
+            "confidence": confidence_score,
+            "boxes": boxes,
+            "engine": engine,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    def compute_phash(self, image: Optional[Any]) -> Optional[int]:
+        """근사 중복 해시. Perceptual hash of a decoded image, if enabled."""
+
+        if image is None or self.near_duplicate_distance is None:
+            return None
+        try:
+            phash = compute_dhash(image)
+        except (ValueError, TypeError) as exc:  # pragma: no cover - degenerate images
+            LOGGER.debug("Perceptual hash failed: %s", exc)
+            return None
+        # 단색 이미지는 해시가 0이 되어 무관한 이미지와 일치하므로 제외
+        return phash or None
+
+    def _near_duplicate_index(self) -> BKTree:
+        """근사 중복 색인. BK-tree over cached hashes, built from the cache once."""
+
+        if self._phash_index is None:
+            index = BKTree()
+            for phash, cache_key in self.cache.iter_phashes("easyocr", self.languages):
+                index.add(phash, cache_key)
+            self._phash_index = index
+        return self._phash_index
+
+    def _decode_with_phash(self, data: bytes) -> Tuple[Optional[Any], Optional[int]]:
+        """디코딩 및 지각 해시. Decode image bytes and hash them in one worker call."""
+
+        image = _decode_image(data)
+        return image, self.compute_phash(image)
+
+    def find_near_duplicate(self, phash: Optional[int], engine: str) -> Optional[Dict[str, Any]]:
+        """근사 중복 결과 조회. Reuse the cached result of a visually similar image.
+
+        Opt-in via ``near_duplicate_distance``: a 64-bit dHash cannot tell
+        apart documents that share a template (B/L forms, invoices, customs
+        declarations), so reuse is off by default and should only be enabled
+        for media where re-sent photos dominate.
+        """
+
+        if phash is None or self.near_duplicate_distance is None:
+            return None
+        for distance, cache_key in self._near_duplicate_index().search(
+            phash, self.near_duplicate_distance
+        ):
+            cached_result = self.cache.get(cache_key)
+            if cached_result is not None:
+                return {
+                    **cached_result,
+                    "engine": engine,
+                    "cached": True,
+                    "near_duplicate": True,
+                    "distance": distance,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+        return None
+
+    def _store_result(
+        self,
+        cache_key: str,
+        content_hash: str,
+        engine: str,
+        result: Dict[str, Any],
+        phash: Optional[int] = None,
+    ) -> None:
+        """결과 캐시 등록. Record a fresh result in the cache and hash index."""
+
+        self.processed_files.add(content_hash)
+        stored_phash = None if result.get("near_duplicate") else phash
+        self.cache.put(cache_key, content_hash, engine, self.languages, result, phash=stored_phash)
+        if stored_phash is not None:
+            self._near_duplicate_index().add(stored_phash, cache_key)
+
     async def process_image(self, file_path: str | Path, engine: str = "easyocr") -> Dict[str, Any]:
         """이미지 OCR 처리. Perform OCR on an image file."""
 
@@ -88,91 +716,434 @@ class MediaOCRProcessor:
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        file_hash = self.get_file_hash(file_path)
-        if file_hash in self.processed_files:
+        if chosen_engine not in self.supported_engines:
             return {
-                "text": "",
-                "confidence": "0.00",
+                "error": "unsupported_engine",
                 "engine": chosen_engine,
-                "cached": True,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        if chosen_engine not in self.supported_engines:
+        if chosen_engine == "easyocr" and not EASYOCR_AVAILABLE:
+            return {
+                "error": "engine_not_available",
+                "engine": chosen_engine,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+        return await self._recognize(file_path.read_bytes(), chosen_engine, file_path=file_path)
+
+    async def process_image_bytes(
+        self, data: bytes, engine: str = "easyocr", *, offload: bool = False
+    ) -> Dict[str, Any]:
+        """메모리 이미지 OCR 처리. Perform OCR on encoded image bytes without disk I/O.
+
+        With ``offload=True`` decoding and recognition run in a worker thread so
+        the event loop keeps serving other pipeline stages.
+        """
+
+        chosen_engine = engine.lower()
+        size_mb = len(data) / (1024 * 1024)
+        if size_mb > self.max_file_size_mb:
+            return {
+                "error": "file_too_large",
+                "engine": chosen_engine,
+                "size_mb": f"{size_mb:.2f}",
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+        if chosen_engine != "easyocr":
             return {
                 "error": "unsupported_engine",
                 "engine": chosen_engine,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        if chosen_engine == "easyocr" and not EASYOCR_AVAILABLE:
+        if not EASYOCR_AVAILABLE:
             return {
                 "error": "engine_not_available",
                 "engine": chosen_engine,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
+        return await self._recognize(data, chosen_engine, offload=offload)
+
+    async def _recognize(
+        self,
+        data: bytes,
+        engine: str,
+        *,
+        file_path: Optional[Path] = None,
+        offload: bool = False,
+    ) -> Dict[str, Any]:
+        """해시·캐시·OCR 공통 경로. Hash once, consult the cache and run OCR."""
+
+        content_hash = hashlib.sha256(data).hexdigest()
+        cache_key = OCRResultCache.build_key(content_hash, engine, self.languages)
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            return {
+                **cached_result,
+                "engine": engine,
+                "cached": True,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+        phash: Optional[int] = None
         try:
-            if chosen_engine == "easyocr" and self._reader is not None:
-                ocr_result = self._reader.readtext(str(file_path))
-                text_items: List[str] = []
-                confidences: List[float] = []
-                for _, text, confidence in ocr_result:
-                    text_items.append(text)
-                    confidences.append(confidence)
-                sanitized_text = self.sanitize_ocr_text("\n".join(text_items))
-                confidence_score = (
-                    f"{(sum(confidences) / len(confidences)):.2f}"
-                    if confidences
-                    else "0.00"
+            reader = self.reader if engine == "easyocr" else None
+            if engine == "easyocr" and reader is not None:
+                image = await asyncio.to_thread(_decode_image, data) if offload else _decode_image(data)
+                phash = self.compute_phash(image)
+                near_duplicate = self.find_near_duplicate(phash, engine)
+                if near_duplicate is not None:
+                    self._store_result(cache_key, content_hash, engine, near_duplicate)
+                    return near_duplicate
+                source = image if image is not None else data
+                ocr_result = (
+                    await asyncio.to_thread(reader.readtext, source)
+                    if offload
+                    else reader.readtext(source)
                 )
-                result = {
-                    "text": sanitized_text,
-                    "confidence": confidence_score,
-                    "engine": chosen_engine,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            elif chosen_engine == "pymupdf" and PYMUPDF_AVAILABLE:
-                result = {
-                    "text": "",
-                    "confidence": "0.00",
-                    "engine": chosen_engine,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "error": "not_implemented",
-                }
+                result = self._build_result(ocr_result, engine)
+            elif engine == "pymupdf" and PYMUPDF_AVAILABLE and file_path is not None:
+                result = await self.process_pdf(file_path)
             else:
                 result = {
                     "error": "engine_not_available",
-                    "engine": chosen_engine,
+                    "engine": engine,
                     "timestamp": datetime.utcnow().isoformat(),
                 }
         except Exception as exc:  # pragma: no cover - defensive guard
             LOGGER.error("OCR processing failed: %s", exc)
             result = {
                 "error": "processing_failed",
-                "engine": chosen_engine,
+                "engine": engine,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
         if "error" not in result:
-            self.processed_files.add(file_hash)
+            self._store_result(cache_key, content_hash, engine, result, phash)
         return result
 
+    def _rasterize_pdf_page(self, page: Any) -> Any:
+        """PDF 페이지 래스터화. Render a PDF page for OCR."""
+
+        pixmap = page.get_pixmap(dpi=self.pdf_ocr_dpi)
+        if not NUMPY_AVAILABLE:
+            return pixmap.tobytes("png")
+        image = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(
+            pixmap.height, pixmap.width, pixmap.n
+        )
+        return image[:, :, :3] if pixmap.n == 4 else image
+
+    def _extract_next_pdf_page(self, pages: Iterator[Any]) -> Optional[Tuple[str, Any]]:
+        """다음 PDF 페이지 추출. Return the next page's text layer or raster image.
+
+        Runs on the extraction thread; returns ``None`` once the document is
+        exhausted and ``(text, None)`` for pages whose text layer is usable.
+        """
+
+        page = next(pages, None)
+        if page is None:
+            return None
+        text = (page.get_text("text") or "").strip()
+        if len(text) >= self.pdf_min_text_chars:
+            return text, None
+        return "", self._rasterize_pdf_page(page)
+
+    def _ocr_pdf_page(self, page_number: int, image: Any) -> Dict[str, Any]:
+        """텍스트 없는 PDF 페이지 OCR. OCR a rasterized page without a text layer."""
+
+        reader = self.reader
+        if reader is None:
+            return {
+                "page": page_number,
+                "source": "ocr",
+                "text": "",
+                "confidence": "0.00",
+                "boxes": [],
+                "error": "engine_not_available",
+            }
+        page_result = self._build_result(reader.readtext(image), "pymupdf")
+        return {
+            "page": page_number,
+            "source": "ocr",
+            "text": page_result["text"],
+            "confidence": page_result["confidence"],
+            "boxes": page_result["boxes"],
+        }
+
+    async def iter_pdf_pages(
+        self, file_path: str | Path, *, max_workers: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """PDF 페이지 스트리밍 처리. Stream per-page PDF results in page order.
+
+        Pages with an embedded text layer are returned directly; only pages
+        without text are rasterized and sent to the OCR reader, at most
+        ``max_workers`` at a time on a thread pool.
+        """
+
+        loop = asyncio.get_running_loop()
+        workers = max(1, max_workers or self.pdf_ocr_workers)
+        in_flight: Deque["asyncio.Future[Dict[str, Any]]"] = deque()
+        # PyMuPDF 문서는 스레드 간 공유가 안전하지 않으므로 전용 스레드 하나에서만 접근
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="pdf-extract"
+        ) as extractor, ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pdf-ocr"
+        ) as executor:
+            with ExitStack() as stack:
+                try:
+                    document = await loop.run_in_executor(
+                        extractor, lambda: stack.enter_context(fitz.open(str(file_path)))
+                    )
+                    pages = iter(document)
+                    page_number = 0
+                    while True:
+                        extracted = await loop.run_in_executor(
+                            extractor, self._extract_next_pdf_page, pages
+                        )
+                        if extracted is None:
+                            break
+                        page_number += 1
+                        text, image = extracted
+                        if image is None:
+                            future: "asyncio.Future[Dict[str, Any]]" = loop.create_future()
+                            future.set_result(
+                                {
+                                    "page": page_number,
+                                    "source": "text_layer",
+                                    "text": self.sanitize_ocr_text(text),
+                                    "confidence": "1.00",
+                                    "boxes": [],
+                                }
+                            )
+                        else:
+                            future = loop.run_in_executor(
+                                executor, self._ocr_pdf_page, page_number, image
+                            )
+                        in_flight.append(future)
+                        while in_flight and (in_flight[0].done() or len(in_flight) > workers):
+                            yield await in_flight.popleft()
+                finally:
+                    await loop.run_in_executor(extractor, stack.close)
+            while in_flight:
+                yield await in_flight.popleft()
+
+    async def process_pdf(
+        self, file_path: str | Path, *, max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """PDF 텍스트 추출(OCR 보완). Extract PDF text, OCR-ing only textless pages."""
+
+        pages = [page async for page in self.iter_pdf_pages(file_path, max_workers=max_workers)]
+        confidences = [float(page["confidence"]) for page in pages if "error" not in page]
+        return {
+            "text": "\n\n".join(page["text"] for page in pages if page["text"]),
+            "confidence": (
+                f"{(sum(confidences) / len(confidences)):.2f}" if confidences else "0.00"
+            ),
+            "boxes": [page["boxes"] for page in pages],
+            "pages": pages,
+            "text_layer_pages": sum(1 for page in pages if page["source"] == "text_layer"),
+            "ocr_pages": sum(1 for page in pages if page["source"] == "ocr"),
+            "engine": "pymupdf",
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    async def process_images(
+        self,
+        file_paths: Sequence[str | Path],
+        *,
+        batch_size: int = 8,
+        engine: str = "easyocr",
+        bucket_px: int = 64,
+    ) -> List[Dict[str, Any]]:
+        """이미지 일괄 OCR 처리. Run batched OCR and return results in input order.
+
+        Each file is read and decoded once, grouped into buckets of similar
+        dimensions and recognised with ``readtext_batched``. Files that cannot
+        be decoded in memory fall back to :meth:`process_image`.
+        """
+
+        chosen_engine = engine.lower()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+        reader = self.reader if chosen_engine == "easyocr" else None
+        if reader is None or not NUMPY_AVAILABLE:
+            for index, file_path in enumerate(file_paths):
+                results[index] = await self.process_image(file_path, engine=chosen_engine)
+            return cast(List[Dict[str, Any]], results)
+
+        # (입력 인덱스, 내용 해시, 캐시 키, 디코딩 이미지, 지각 해시)
+        buckets: Dict[Tuple[int, int], List[Tuple[int, str, str, Any, Optional[int]]]] = {}
+        duplicates: Dict[str, List[int]] = {}
+        for index, file_path in enumerate(file_paths):
+            path = Path(file_path)
+            try:
+                size_bytes = path.stat().st_size
+            except OSError:
+                results[index] = {
+                    "error": "file_not_found",
+                    "engine": chosen_engine,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+                continue
+
+            file_size_mb = size_bytes / (1024 * 1024)
+            if file_size_mb > self.max_file_size_mb:
+                results[index] = {
+                    "error": "file_too_large",
+                    "engine": chosen_engine,
+                    "size_mb": f"{file_size_mb:.2f}",
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+                continue
+
+            data, content_hash = await asyncio.to_thread(_read_and_hash, path)
+            cache_key = OCRResultCache.build_key(content_hash, chosen_engine, self.languages)
+            cached_result = self.cache.get(cache_key)
+            if cached_result is not None:
+                results[index] = {
+                    **cached_result,
+                    "engine": chosen_engine,
+                    "cached": True,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+                continue
+
+            if cache_key in duplicates:
+                duplicates[cache_key].append(index)
+                continue
+
+            image, phash = await asyncio.to_thread(self._decode_with_phash, data)
+            if image is None:
+                results[index] = await self.process_image(path, engine=chosen_engine)
+                continue
+            near_duplicate = self.find_near_duplicate(phash, chosen_engine)
+            if near_duplicate is not None:
+                self._store_result(cache_key, content_hash, chosen_engine, near_duplicate)
+                results[index] = near_duplicate
+                continue
+            duplicates[cache_key] = []
+
+            height, width = image.shape[:2]
+            bucket = (round(height / bucket_px), round(width / bucket_px))
+            buckets.setdefault(bucket, []).append((index, content_hash, cache_key, image, phash))
+
+        for members in buckets.values():
+            for start in range(0, len(members), batch_size):
+                chunk = members[start : start + batch_size]
+                images = [image for _, _, _, image, _ in chunk]
+                try:
+                    # 추론은 워커 스레드에서 실행해 이벤트 루프를 막지 않음
+                    batch_output = await asyncio.to_thread(
+                        _readtext_chunk, reader, images, batch_size
+                    )
+                except Exception as exc:  # pragma: no cover - defensive guard
+                    LOGGER.error("Batched OCR processing failed: %s", exc)
+                    for index, _, cache_key, _, _ in chunk:
+                        error_result = {
+                            "error": "processing_failed",
+                            "engine": chosen_engine,
+                            "timestamp": datetime.utcnow().isoformat(),
+                        }
+                        # 같은 내용의 중복 입력도 오류 결과로 채워 입력 순서 유지
+                        for failed_index in [index, *duplicates.get(cache_key, [])]:
+                            results[failed_index] = dict(error_result)
+                    continue
+
+                for (index, content_hash, cache_key, _, phash), ocr_result in zip(
+                    chunk, batch_output
+                ):
+                    result = self._build_result(ocr_result, chosen_engine)
+                    self._store_result(cache_key, content_hash, chosen_engine, result, phash)
+                    results[index] = result
+                    for duplicate_index in duplicates.get(cache_key, []):
+                        results[duplicate_index] = {**result, "cached": True}
+
+        # 모든 입력 인덱스가 채워지므로 호출자는 file_paths와 zip 가능
+        return cast(List[Dict[str, Any]], results)
+
+
+@dataclass
+class PipelineStageStats:
+    """파이프라인 단계 통계. Per-stage counters for the media crawl pipeline."""
+
+    name: str
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: Optional[float] = None
+
+    def observe_queue(self, queue: "asyncio.Queue[Any]") -> None:
+        """입력 큐 깊이 기록. Sample the depth of the stage's input queue."""
+
+        self.queue_depth = queue.qsize()
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """단계 경과 시간. Wall-clock seconds since the stage started."""
+
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """초당 처리량. Items completed per wall-clock second."""
+
+        elapsed = self.elapsed_seconds
+        return self.items / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """직렬화. Serialize stats for logging or JSON output."""
+
+        return {
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "throughput_per_sec": round(self.throughput, 3),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+# src가 없는 미디어(뷰어 div 등)의 스크롤 간 안정 키: 배경 이미지 URL 또는 메시지 data-id
+_MEDIA_KEY_JS = """
+el => {
+  const match = getComputedStyle(el).backgroundImage.match(/url\\(["']?(.*?)["']?\\)/);
+  if (match) return 'bg:' + match[1];
+  const row = el.closest('[data-id]');
+  return row ? 'data-id:' + row.getAttribute('data-id') : null;
+}
+"""
+
+_MEDIA_MESSAGE_ID_JS = """
+el => {
+  const row = el.closest('[data-id]');
+  return row ? row.getAttribute('data-id') : null;
+}
+"""
+
 
 class WhatsAppMediaOCRExtractor:
     """WhatsApp 미디어 OCR 추출기. WhatsApp media OCR extractor."""
 
-    def __init__(self, chat_title: Optional[str] = None) -> None:
+    def __init__(self, chat_title: Optional[str] = None, *, warm_up_ocr: bool = False) -> None:
         self.chat_title = chat_title or "MR.CHA 전용"
         self.download_root = Path("data/ocr_media")
         self.download_root.mkdir(parents=True, exist_ok=True)
         self.user_data_dir = Path("data/ocr_sessions") / self.sanitize_filename(self.chat_title)
         self.user_data_dir.mkdir(parents=True, exist_ok=True)
-        self.media_processor = MediaOCRProcessor()
+        self.media_processor = MediaOCRProcessor(warm_up=warm_up_ocr)
         self.media_selectors: List[str] = [
             "div[data-testid='media-viewer']",
             "img[alt='Media']",
         ]
+        self._pending_writes: Set["asyncio.Task[None]"] = set()
         self.browser_default_arguments: List[str] = [
             "--disable-blink-features=AutomationControlled",
             "--disable-dev-shm-usage",
@@ -268,6 +1239,252 @@ class WhatsAppMediaOCRExtractor:
         await element.screenshot(path=str(file_path))
         return str(file_path)
 
+    async def capture_media(self, element: Any) -> bytes:
+        """미디어 바이트 캡처. Capture an element screenshot as PNG bytes."""
+
+        return await element.screenshot()
+
+    def _schedule_media_write(self, data: bytes, download_dir: str | Path) -> Path:
+        """비동기 디스크 저장 예약. Persist captured bytes in a background thread."""
+
+        target_dir = Path(download_dir)
+        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+        file_path = target_dir / f"media_{timestamp}.png"
+
+        def _write() -> None:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(data)
+
+        task = asyncio.create_task(asyncio.to_thread(_write))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+        return file_path
+
+    async def process_media_element(
+        self,
+        element: Any,
+        engine: str = "easyocr",
+        *,
+        download_dir: Optional[str | Path] = None,
+    ) -> Dict[str, Any]:
+        """요소 메모리 OCR 처리. Screenshot an element and OCR the bytes in memory.
+
+        When ``download_dir`` is given the PNG is also written to disk in the
+        background; call :meth:`flush_media_writes` before exiting.
+        """
+
+        data = await self.capture_media(element)
+        result = await self.media_processor.process_image_bytes(data, engine=engine)
+        if download_dir is not None:
+            result["file_path"] = str(self._schedule_media_write(data, download_dir))
+        return result
+
+    async def flush_media_writes(self) -> None:
+        """대기 중인 저장 완료. Wait for pending background media writes."""
+
+        if self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes), return_exceptions=True)
+
+    async def _media_key(self, element: Any) -> Optional[str]:
+        """미디어 식별 키. Stable key used to skip media seen on earlier scrolls.
+
+        Element handles are new objects on every query, so only DOM data that
+        survives a scroll is used: ``src``, the enclosing message ``data-id``
+        or a background-image URL. Returns None when none is available.
+        """
+
+        try:
+            source = await element.get_attribute("src")
+            if source:
+                return source
+            key = await element.evaluate(_MEDIA_KEY_JS)
+        except Exception:  # pragma: no cover - defensive guard
+            return None
+        return key if isinstance(key, str) and key else None
+
+    async def _media_message_id(self, element: Any) -> Optional[str]:
+        """미디어 메시지 ID. ``data-id`` of the message row containing the media."""
+
+        try:
+            message_id = await element.evaluate(_MEDIA_MESSAGE_ID_JS)
+        except Exception:  # pragma: no cover - defensive guard
+            return None
+        return message_id if isinstance(message_id, str) and message_id else None
+
+    async def crawl_media(
+        self,
+        page: Any,
+        chat_title: Optional[str] = None,
+        *,
+        engine: str = "easyocr",
+        output_file: Optional[str | Path] = None,
+        max_scrolls: int = 10,
+        queue_size: int = 16,
+        ocr_workers: int = 2,
+        persist_batch_size: int = 20,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """미디어 크롤 파이프라인. Discover, capture, OCR and persist media concurrently.
+
+        Four stages are connected by bounded queues: discovery scrolls the chat
+        and enqueues new media elements, capture takes screenshot bytes, a pool
+        of OCR workers recognizes them off the event loop, and persistence
+        appends results to ``output_file`` as JSON lines in batches.
+
+        Every result carries the ``media_key`` and the message ``message_id``
+        it came from, since OCR workers finish out of order. Discovery waits
+        for capture to drain before scrolling again: the message list is
+        virtualized, so rows scrolled out of view lose their element handles.
+
+        Returns:
+            (결과 목록, 단계별 통계)
+        """
+
+        stats = {
+            name: PipelineStageStats(name)
+            for name in ("discover", "capture", "ocr", "persist")
+        }
+        capture_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=queue_size)
+        ocr_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=queue_size)
+        persist_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=queue_size)
+        results: List[Dict[str, Any]] = []
+        output_path = Path(output_file) if output_file is not None else None
+
+        async def discover() -> None:
+            stage = stats["discover"]
+            seen: Set[str] = set()
+            try:
+                elements = await self.find_media_messages(page, chat_title or self.chat_title)
+                for scroll in range(max_scrolls + 1):
+                    if scroll:
+                        # 스크롤 전 대기 중인 핸들을 모두 캡처해 언마운트로 잃지 않도록 함
+                        await capture_queue.join()
+                        await scroll_and_wait_for_fetch(page, "PageUp")
+                        elements = []
+                        for media_selector in self.media_selectors:
+                            try:
+                                elements.extend(await page.query_selector_all(media_selector))
+                            except Exception as exc:  # pragma: no cover - defensive guard
+                                LOGGER.debug("Selector %s lookup failed: %s", media_selector, exc)
+                    new_items = 0
+                    for element in elements:
+                        key = await self._media_key(element)
+                        if key is None:
+                            LOGGER.debug("Skipping media element without a stable key")
+                            continue
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        new_items += 1
+                        message_id = await self._media_message_id(element)
+                        await capture_queue.put((key, message_id, element))
+                        stage.items += 1
+                        stage.observe_queue(capture_queue)
+                    if scroll and not new_items:
+                        break
+            finally:
+                stage.finished_at = time.perf_counter()
+            await capture_queue.put(None)
+
+        async def capture() -> None:
+            stage = stats["capture"]
+            try:
+                while True:
+                    item = await capture_queue.get()
+                    if item is None:
+                        capture_queue.task_done()
+                        break
+                    key, message_id, element = item
+                    stage.observe_queue(capture_queue)
+                    started = time.perf_counter()
+                    try:
+                        data = await self.capture_media(element)
+                    except Exception as exc:
+                        stage.errors += 1
+                        LOGGER.warning("Media capture failed for %s: %s", key, exc)
+                        continue
+                    finally:
+                        stage.busy_seconds += time.perf_counter() - started
+                        capture_queue.task_done()
+                    stage.items += 1
+                    await ocr_queue.put((key, message_id, data))
+            finally:
+                stage.finished_at = time.perf_counter()
+            for _ in range(ocr_workers):
+                await ocr_queue.put(None)
+
+        async def recognize() -> None:
+            stage = stats["ocr"]
+            while True:
+                item = await ocr_queue.get()
+                if item is None:
+                    break
+                key, message_id, data = item
+                stage.observe_queue(ocr_queue)
+                started = time.perf_counter()
+                result = await self.media_processor.process_image_bytes(
+                    data, engine=engine, offload=True
+                )
+                result = {**result, "media_key": key, "message_id": message_id}
+                stage.busy_seconds += time.perf_counter() - started
+                if "error" in result:
+                    stage.errors += 1
+                stage.items += 1
+                await persist_queue.put(result)
+
+        def _append_lines(batch: Sequence[Dict[str, Any]]) -> None:
+            assert output_path is not None
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("a", encoding="utf-8") as file_handle:
+                for item in batch:
+                    file_handle.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+        async def persist() -> None:
+            stage = stats["persist"]
+            batch: List[Dict[str, Any]] = []
+
+            async def flush() -> None:
+                if output_path is not None and batch:
+                    started = time.perf_counter()
+                    await asyncio.to_thread(_append_lines, list(batch))
+                    stage.busy_seconds += time.perf_counter() - started
+                stage.items += len(batch)
+                batch.clear()
+
+            while True:
+                result = await persist_queue.get()
+                if result is None:
+                    break
+                stage.observe_queue(persist_queue)
+                results.append(result)
+                batch.append(result)
+                if len(batch) >= persist_batch_size:
+                    await flush()
+            await flush()
+            stage.finished_at = time.perf_counter()
+
+        async def run_ocr_pool() -> None:
+            try:
+                await asyncio.gather(*(recognize() for _ in range(ocr_workers)))
+            finally:
+                stats["ocr"].finished_at = time.perf_counter()
+            await persist_queue.put(None)
+
+        # 한 단계가 실패하면 가득 찬 큐에서 대기 중인 나머지 단계를 취소하고 오류 전파
+        stages = [
+            asyncio.ensure_future(stage)
+            for stage in (discover(), capture(), run_ocr_pool(), persist())
+        ]
+        done, pending = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+        failed = next((task for task in done if task.exception() is not None), None)
+        if failed is not None:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise failed.exception()
+        report = {name: stage.to_dict() for name, stage in stats.items()}
+        LOGGER.info("Media crawl pipeline stats: %s", report)
+        return results, report
+
     async def process_media_file(self, file_path: str | Path, engine: str = "easyocr") -> Dict[str, Any]:
         """미디어 파일 OCR 처리. Process media file with OCR."""
 